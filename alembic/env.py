@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 from api_v1 import auth  # noqa: F401 - because use to find models for migrations.
+from api_v1.game import models  # noqa: F401 - same, for game models.
 from core.config import settings
 from database.base import Base
 
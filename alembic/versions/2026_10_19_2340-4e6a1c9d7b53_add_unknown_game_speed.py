@@ -0,0 +1,43 @@
+"""add unknown game speed.
+
+Games without known time control (stored as 0+0) were counted as bullet.
+Stats are derived from games, so they are cleared and games marked
+uncounted; run `python -m api_v1.game.jobs player-stats` after upgrade to
+count them again.
+
+Revision ID: 4e6a1c9d7b53
+Revises: d83b5f6a2c17
+Create Date: 2026-10-19 23:40:27.318504
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4e6a1c9d7b53"
+down_revision: Union[str, None] = "d83b5f6a2c17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE game_speed_enum ADD VALUE IF NOT EXISTS 'UNKNOWN'")
+    op.execute("DELETE FROM player_stats")
+    op.execute("UPDATE games SET stats_counted = false WHERE stats_counted")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM player_stats WHERE speed = 'UNKNOWN'")
+    op.execute("ALTER TYPE game_speed_enum RENAME TO game_speed_enum_old")
+    op.execute(
+        "CREATE TYPE game_speed_enum AS ENUM ('BULLET', 'BLITZ', 'RAPID', 'CLASSICAL')"
+    )
+    op.execute(
+        "ALTER TABLE player_stats ALTER COLUMN speed TYPE game_speed_enum "
+        "USING speed::text::game_speed_enum"
+    )
+    op.execute("DROP TYPE game_speed_enum_old")
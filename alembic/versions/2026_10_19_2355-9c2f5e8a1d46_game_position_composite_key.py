@@ -0,0 +1,42 @@
+"""game position composite key.
+
+Surrogate Integer ID of game positions would overflow on large index and
+was never used; `(zobrist_key, game_id)` is unique and becomes primary
+key, which also serves lookup of newest games by position.
+
+Revision ID: 9c2f5e8a1d46
+Revises: 4e6a1c9d7b53
+Create Date: 2026-10-19 23:55:12.604173
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c2f5e8a1d46"
+down_revision: Union[str, None] = "4e6a1c9d7b53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("idx_game_positions_zobrist_key", table_name="game_positions")
+    op.drop_column("game_positions", "id")
+    op.create_primary_key(
+        "game_positions_pkey", "game_positions", ["zobrist_key", "game_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("game_positions_pkey", "game_positions", type_="primary")
+    op.execute("ALTER TABLE game_positions ADD COLUMN id SERIAL PRIMARY KEY")
+    op.create_index(
+        "idx_game_positions_zobrist_key",
+        "game_positions",
+        ["zobrist_key"],
+        unique=False,
+    )
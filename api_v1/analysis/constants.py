@@ -0,0 +1,12 @@
+# Analysis depth
+MIN_ANALYSIS_DEPTH = 1
+MAX_ANALYSIS_DEPTH = 40
+DEFAULT_ANALYSIS_DEPTH = 16
+
+# Built-in stub engine
+# Plies stub engine really searches, whatever depth is asked
+STUB_ENGINE_MAX_DEPTH = 2
+# Centipawn values of pawn, knight, bishop, rook, queen and king
+STUB_ENGINE_PIECE_VALUES = (100, 320, 330, 500, 900, 0)
+# Score of tablebase win, less DTZ, below any mate score
+STUB_ENGINE_TABLEBASE_SCORE = 20_000
@@ -0,0 +1,207 @@
+"""Long-lived UCI engine process driven over its standard streams.
+
+Engine is started once and analyses one position at a time:
+
+    > position fen <fen>
+    > go depth <depth>
+    < info depth 12 seldepth 18 score cp 34 nodes 81234 pv e2e4 e7e5 g1f3
+    < bestmove e2e4 ponder e7e5
+
+Last `info` line with exact score is result of search. Engine that exits,
+prints garbage or does not finish search within timeout is killed and
+started again on next analysis.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+from .exceptions import EngineError
+
+
+class Evaluation(NamedTuple):
+    """Result of engine search.
+
+    Attributes:
+        depth (int): Depth reached by search.
+        score_cp (int): Score in centipawns, None if mate is found.
+        mate (int): Moves to mate, negative if side is mated, None if no mate
+        is found.
+        best_move (str): Best move in UCI notation, None if game is over.
+        pv (tuple[str, ...]): Principal variation in UCI notation.
+
+    """
+
+    depth: int
+    score_cp: int | None
+    mate: int | None
+    best_move: str | None
+    pv: tuple[str, ...]
+
+
+def parse_info(line: str) -> Evaluation | None:
+    """Return evaluation of `info` line, None if it holds no exact score.
+
+    Bound scores of aspiration windows and lines of secondary variations
+    are skipped.
+    """
+    tokens = line.split()
+    depth = score_cp = mate = None
+    pv: tuple[str, ...] = ()
+    index = 1
+    try:
+        while index < len(tokens):
+            token = tokens[index]
+            if token == "depth":
+                depth = int(tokens[index + 1])
+                index += 2
+            elif token == "score":
+                kind, value = tokens[index + 1], int(tokens[index + 2])
+                if kind == "cp":
+                    score_cp = value
+                elif kind == "mate":
+                    mate = value
+                index += 3
+            elif token in ("lowerbound", "upperbound"):
+                return None
+            elif token == "multipv":
+                if tokens[index + 1] != "1":
+                    return None
+                index += 2
+            elif token == "pv":
+                pv = tuple(tokens[index + 1 :])
+                break
+            elif token == "string":
+                return None
+            else:
+                index += 1
+    except (IndexError, ValueError):
+        return None
+    if depth is None or (score_cp is None and mate is None):
+        return None
+    return Evaluation(depth, score_cp, mate, pv[0] if pv else None, pv)
+
+
+class UciEngine:
+    """Engine process speaking UCI protocol.
+
+    Attributes:
+        command (Sequence[str]): Program and arguments starting engine.
+        options (Mapping[str, str]): UCI options set after start, e.g. `Hash`.
+        timeout (float): Max seconds of one search, or of start.
+        cwd (Path): Working directory of engine, None for current one.
+
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        options: Mapping[str, str] | None = None,
+        timeout: float = 30.0,
+        cwd: Path | None = None,
+    ):
+        self.command = command
+        self.options = options or {}
+        self.timeout = timeout
+        self.cwd = cwd
+        self._process: asyncio.subprocess.Process | None = None
+
+    async def start(self) -> None:
+        """Start engine and wait until it is ready.
+
+        Raises:
+            EngineError: If engine can not be started or does not answer.
+
+        """
+        if self._process is not None:
+            return
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                cwd=self.cwd,
+            )
+        except OSError as exc:
+            raise EngineError(f"Engine {self.command[0]!r} can not start") from exc
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._send("uci")
+                await self._read_until("uciok")
+                for name, value in self.options.items():
+                    await self._send(f"setoption name {name} value {value}")
+                await self._send("isready")
+                await self._read_until("readyok")
+        except (TimeoutError, EngineError) as exc:
+            await self.close()
+            raise EngineError("Engine did not complete UCI handshake") from exc
+
+    async def analyse(self, fen: str, depth: int) -> Evaluation:
+        """Search position to depth, starting engine if it is not running.
+
+        Score is from point of view of side to move, as engine reports it.
+
+        Raises:
+            EngineError: If engine fails or search exceeds timeout; engine is
+            killed then.
+
+        """
+        await self.start()
+        evaluation = None
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._send(f"position fen {fen}", f"go depth {depth}")
+                while True:
+                    line = await self._readline()
+                    if line.startswith("info "):
+                        evaluation = parse_info(line) or evaluation
+                    elif line.startswith("bestmove"):
+                        break
+        except (TimeoutError, EngineError) as exc:
+            await self.close()
+            raise EngineError(f"Engine failed analysing {fen!r}") from exc
+        if evaluation is None:
+            raise EngineError(f"Engine reported no score for {fen!r}")
+        tokens = line.split()
+        best_move = tokens[1] if len(tokens) > 1 else "(none)"
+        if best_move in ("(none)", "0000"):
+            return evaluation._replace(best_move=None)
+        return evaluation._replace(best_move=best_move)
+
+    async def close(self) -> None:
+        """Stop engine, killing it if it does not quit at once."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.returncode is None:
+            with contextlib.suppress(OSError):
+                process.stdin.write(b"quit\n")
+                process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), 1.0)
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+
+    async def _send(self, *commands: str) -> None:
+        if self._process is None:
+            raise EngineError("Engine is not running")
+        self._process.stdin.write("".join(f"{c}\n" for c in commands).encode())
+        try:
+            await self._process.stdin.drain()
+        except OSError as exc:
+            raise EngineError("Engine closed its input") from exc
+
+    async def _readline(self) -> str:
+        if self._process is None:
+            raise EngineError("Engine is not running")
+        line = await self._process.stdout.readline()
+        if not line:
+            raise EngineError(f"Engine exited with code {self._process.returncode}")
+        return line.decode(errors="replace").strip()
+
+    async def _read_until(self, token: str) -> None:
+        while await self._readline() != token:
+            pass
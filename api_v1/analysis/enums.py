@@ -0,0 +1,9 @@
+from enum import IntEnum
+
+
+class AnalysisPriorityEnum(IntEnum):
+    """Enumeration for priority of analysis job, lower value runs first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
@@ -0,0 +1,9 @@
+from exceptions import BaseExternalError, BaseLogicError
+
+
+class EngineError(BaseExternalError):
+    """Raised when analysis engine fails, stops responding or exits."""
+
+
+class AnalysisQuotaError(BaseLogicError):
+    """Raised when user already has max number of analysis jobs queued."""
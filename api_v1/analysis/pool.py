@@ -0,0 +1,258 @@
+"""Queue of position analysis jobs served by pool of engine processes.
+
+Engines are long-lived processes, each driven by its own worker task that
+takes jobs from one priority queue, so busy engine never delays job another
+engine could run. Jobs of equal priority run in order of submission.
+
+Results are cached by Zobrist key of position and depth, so popular
+position costs one search; request for position already being searched
+waits for that search instead of queueing another one. Each user may have
+at most `user_quota` jobs queued or running, so one user can not hold all
+engines.
+"""
+
+import asyncio
+import itertools
+import sys
+import time
+from collections.abc import Mapping, Sequence
+
+from api_v1.game.position import Position
+from core.cache import TTLCache
+from core.config import BASE_DIR, AnalysisSettings, TablebaseSettings, settings
+from core.metrics import registry
+from logger import setup_logging
+
+from .engine import Evaluation, UciEngine
+from .enums import AnalysisPriorityEnum
+from .exceptions import AnalysisQuotaError, EngineError
+
+log = setup_logging()
+
+STUB_ENGINE_COMMAND = (sys.executable, "-m", "api_v1.analysis.stub_engine")
+
+_requests_counter = registry.counter(
+    "analysis_requests_total", "Analysis requests by source of their result."
+)
+_latency_histogram = registry.histogram(
+    "analysis_job_seconds",
+    "Seconds from submission of analysis job to its result.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+
+class _Job:
+    """Search of position waited for by one or more requests."""
+
+    __slots__ = ("depth", "fen", "future", "key", "submitted_at", "user_id")
+
+    def __init__(
+        self,
+        key: tuple[int, int],
+        fen: str,
+        depth: int,
+        user_id: int,
+        future: asyncio.Future[Evaluation],
+    ):
+        self.key = key
+        self.fen = fen
+        self.depth = depth
+        self.user_id = user_id
+        self.future = future
+        self.submitted_at = time.monotonic()
+
+
+class AnalysisPool:
+    """Priority queue of analysis jobs and engine processes serving it.
+
+    Attributes:
+        command (Sequence[str]): Program and arguments starting engine, run
+        in project directory.
+        options (Mapping[str, str]): UCI options of engines.
+        workers (int): Number of engine processes.
+        user_quota (int): Max jobs of one user queued or running.
+        timeout (float): Max seconds of one search.
+        cache (TTLCache): Evaluations by Zobrist key and depth.
+
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str] = STUB_ENGINE_COMMAND,
+        options: Mapping[str, str] | None = None,
+        workers: int = 2,
+        user_quota: int = 4,
+        timeout: float = 30.0,
+        cache_size: int = 100_000,
+        cache_ttl: float = 86400,
+    ):
+        self.command = command
+        self.options = options or {}
+        self.workers = workers
+        self.user_quota = user_quota
+        self.timeout = timeout
+        self.cache: TTLCache[tuple[int, int], Evaluation] = TTLCache(
+            "analysis", cache_size, cache_ttl
+        )
+        self._queue: asyncio.PriorityQueue[tuple[int, int, _Job]] = (
+            asyncio.PriorityQueue()
+        )
+        self._order = itertools.count()
+        self._searching: dict[tuple[int, int], _Job] = {}
+        self._user_jobs: dict[int, int] = {}
+        self._engines: list[UciEngine] = []
+        self._tasks: list[asyncio.Task[None]] = []
+        registry.gauge(
+            "analysis_queue_depth", "Analysis jobs waiting for engine."
+        ).set_function(self._queue.qsize)
+
+    @classmethod
+    def from_settings(
+        cls, config: AnalysisSettings, tablebase_config: TablebaseSettings
+    ) -> "AnalysisPool":
+        """Create pool from its settings, stub engine if no engine is set.
+
+        Stub engine probes tables of tablebase directory.
+        """
+        command = (config.engine_path,)
+        options = config.engine_options
+        if not config.engine_path:
+            command = STUB_ENGINE_COMMAND
+            options = {
+                "TablebaseBlocks": str(tablebase_config.max_cached_blocks),
+                "TablebasePath": str(BASE_DIR / tablebase_config.directory),
+                **options,
+            }
+        return cls(
+            command=command,
+            options=options,
+            workers=config.workers,
+            user_quota=config.user_quota,
+            timeout=config.timeout_seconds,
+            cache_size=config.cache_size,
+            cache_ttl=config.cache_ttl_seconds,
+        )
+
+    async def start(self) -> None:
+        """Start engines and their workers.
+
+        Raises:
+            EngineError: If engine can not be started.
+
+        """
+        if self._tasks:
+            return
+        self._engines = [
+            UciEngine(self.command, self.options, self.timeout, BASE_DIR)
+            for _ in range(self.workers)
+        ]
+        try:
+            await asyncio.gather(*(engine.start() for engine in self._engines))
+        except EngineError:
+            await asyncio.gather(*(engine.close() for engine in self._engines))
+            raise
+        self._tasks = [
+            asyncio.create_task(self._work(engine)) for engine in self._engines
+        ]
+
+    async def stop(self) -> None:
+        """Stop workers and engines, failing jobs not finished."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.gather(*(engine.close() for engine in self._engines))
+        self._engines = []
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        for job in list(self._searching.values()):
+            self._finish(job, EngineError("Analysis is stopped"))
+
+    async def analyse(
+        self,
+        user_id: int,
+        fen: str,
+        depth: int,
+        priority: AnalysisPriorityEnum = AnalysisPriorityEnum.NORMAL,
+    ) -> Evaluation:
+        """Return evaluation of position, score from point of view of white.
+
+        Raises:
+            FenValidationError: If FEN is malformed.
+            AnalysisQuotaError: If user has `user_quota` jobs already.
+            EngineError: If engine fails to analyse position.
+
+        """
+        if not self._tasks:
+            raise RuntimeError("Analysis pool is not started")
+        position = Position(fen)
+        key = (position.key, depth)
+        evaluation = self.cache.get(key)
+        if evaluation is not None:
+            _requests_counter.inc(source="cache")
+            return evaluation
+        job = self._searching.get(key)
+        if job is not None:
+            _requests_counter.inc(source="shared")
+        else:
+            if self._user_jobs.get(user_id, 0) >= self.user_quota:
+                raise AnalysisQuotaError(
+                    f"At most {self.user_quota} analysis jobs may run at once"
+                )
+            future = asyncio.get_running_loop().create_future()
+            job = _Job(key, position.fen(), depth, user_id, future)
+            self._searching[key] = job
+            self._user_jobs[user_id] = self._user_jobs.get(user_id, 0) + 1
+            self._queue.put_nowait((priority, next(self._order), job))
+            _requests_counter.inc(source="engine")
+        # Request that gives up does not cancel search others may wait for.
+        return await asyncio.shield(job.future)
+
+    async def _work(self, engine: UciEngine) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                evaluation = await self._search(engine, job)
+            except EngineError as exc:
+                log.warning("Analysis of %r failed: %s", job.fen, exc)
+                self._finish(job, exc)
+                continue
+            except asyncio.CancelledError:
+                self._finish(job, EngineError("Analysis is stopped"))
+                raise
+            self.cache.set(job.key, evaluation)
+            self._finish(job, evaluation)
+
+    async def _search(self, engine: UciEngine, job: _Job) -> Evaluation:
+        """Search position of job, retrying once on restarted engine."""
+        try:
+            evaluation = await engine.analyse(job.fen, job.depth)
+        except EngineError:
+            log.warning("Engine failed, restarting it", exc_info=True)
+            evaluation = await engine.analyse(job.fen, job.depth)
+        if job.fen.split()[1] == "b":
+            score_cp = None if evaluation.score_cp is None else -evaluation.score_cp
+            mate = None if evaluation.mate is None else -evaluation.mate
+            evaluation = evaluation._replace(score_cp=score_cp, mate=mate)
+        return evaluation
+
+    def _finish(self, job: _Job, outcome: Evaluation | EngineError) -> None:
+        if self._searching.get(job.key) is job:
+            del self._searching[job.key]
+        count = self._user_jobs.pop(job.user_id, 0) - 1
+        if count > 0:
+            self._user_jobs[job.user_id] = count
+        if job.future.done():
+            return
+        if isinstance(outcome, EngineError):
+            job.future.set_exception(outcome)
+            # Mark exception retrieved, every waiter may have given up.
+            job.future.exception()
+            result = "error"
+        else:
+            job.future.set_result(outcome)
+            result = "ok"
+        _latency_histogram.observe(time.monotonic() - job.submitted_at, result=result)
+
+
+analysis_pool = AnalysisPool.from_settings(settings.analysis, settings.tablebase)
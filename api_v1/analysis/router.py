@@ -0,0 +1,67 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from api_v1.auth.dependencies import get_current_active_user
+from api_v1.auth.models import User
+from api_v1.game.constants import MAX_LENGTH_FEN
+from api_v1.game.exceptions import FenValidationError
+from core.config import settings
+
+from .constants import DEFAULT_ANALYSIS_DEPTH, MAX_ANALYSIS_DEPTH, MIN_ANALYSIS_DEPTH
+from .enums import AnalysisPriorityEnum
+from .exceptions import AnalysisQuotaError, EngineError
+from .pool import analysis_pool
+from .schemas import EvaluationSchema
+
+router = APIRouter(prefix="/analysis", tags=["Analysis"])
+
+
+@router.get("/", response_model=EvaluationSchema)
+async def analyse_position(
+    fen: Annotated[str, Query(max_length=MAX_LENGTH_FEN)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    depth: Annotated[
+        int, Query(ge=MIN_ANALYSIS_DEPTH, le=MAX_ANALYSIS_DEPTH)
+    ] = DEFAULT_ANALYSIS_DEPTH,
+) -> EvaluationSchema:
+    """Return engine evaluation of position, searched to given depth.
+
+    Evaluations are cached, so popular positions are answered at once.
+    Shallow searches are queued ahead of deep ones; user may have few jobs
+    queued at once.
+    """
+    config = settings.analysis
+    if not config.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis is disabled",
+        )
+    priority = (
+        AnalysisPriorityEnum.HIGH
+        if depth <= config.quick_depth
+        else AnalysisPriorityEnum.NORMAL
+    )
+    try:
+        evaluation = await analysis_pool.analyse(user.id, fen, depth, priority)
+    except FenValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    except AnalysisQuotaError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc)
+        ) from exc
+    except EngineError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis failed",
+        ) from exc
+    return EvaluationSchema(
+        fen=fen,
+        depth=evaluation.depth,
+        score_cp=evaluation.score_cp,
+        mate=evaluation.mate,
+        best_move=evaluation.best_move,
+        pv=list(evaluation.pv),
+    )
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from schemas import ChessBaseSchema
+
+
+class EvaluationSchema(ChessBaseSchema):
+    """Schema for engine evaluation of position.
+
+    Attributes:
+        fen (str): Analysed position in FEN.
+        depth (int): Depth of search.
+        score_cp (int): Score in centipawns from point of view of white, None
+        if mate is found (Optional).
+        mate (int): Moves to mate, positive if white mates, None if no mate is
+        found (Optional).
+        best_move (str): Best move in UCI notation, None if game is over
+        (Optional).
+        pv (list[str]): Principal variation in UCI notation.
+
+    """
+
+    fen: str
+    depth: int
+    score_cp: Optional[int] = None
+    mate: Optional[int] = None
+    best_move: Optional[str] = None
+    pv: list[str]
@@ -0,0 +1,167 @@
+"""Minimal UCI engine on top of game move generator, for tests and development.
+
+Engine searches at most `STUB_ENGINE_MAX_DEPTH` plies with material-only
+evaluation, whatever depth is asked, so it answers in milliseconds and needs
+no engine binary installed. It reports asked depth, so results are cached as
+if real engine searched that deep. With `TablebasePath` option set, positions
+held by tablebase are scored from it instead of searched; `TablebaseBlocks`
+bounds its cache of decoded blocks.
+
+Usage:
+    python -m api_v1.analysis.stub_engine
+"""
+
+import sys
+
+from api_v1.game.exceptions import (
+    FenValidationError,
+    IllegalMoveError,
+    MoveNotationError,
+)
+from api_v1.game.move import move_to_uci
+from api_v1.game.position import Position
+from api_v1.game.tablebase import Tablebase
+
+from .constants import (
+    STUB_ENGINE_MAX_DEPTH,
+    STUB_ENGINE_PIECE_VALUES,
+    STUB_ENGINE_TABLEBASE_SCORE,
+)
+
+MATE_SCORE = 100_000
+
+
+def evaluate(position: Position) -> int:
+    """Return material balance in centipawns for side to move."""
+    pieces = position.pieces
+    score = sum(
+        value * (pieces[piece].bit_count() - pieces[piece + 6].bit_count())
+        for piece, value in enumerate(STUB_ENGINE_PIECE_VALUES)
+    )
+    return -score if position.side else score
+
+
+def search(
+    position: Position,
+    depth: int,
+    alpha: int,
+    beta: int,
+    tablebase: Tablebase | None = None,
+) -> int:
+    """Return negamax score of position for side to move.
+
+    Tablebase win scores less than mate, the sooner capture or mate comes the
+    higher.
+    """
+    moves = position.legal_moves()
+    if not moves:
+        return -MATE_SCORE if position.is_check() else 0
+    entry = None if tablebase is None else tablebase.probe(position)
+    if entry is not None:
+        return STUB_ENGINE_TABLEBASE_SCORE * (entry.wdl // 2) - entry.dtz
+    if depth == 0:
+        return evaluate(position)
+    for move in moves:
+        position.make_move(move)
+        score = -search(position, depth - 1, -beta, -alpha, tablebase)
+        position.unmake_move()
+        if score >= beta:
+            return score
+        alpha = max(alpha, score)
+    return alpha
+
+
+def go(position: Position, depth: int, tablebase: Tablebase | None = None) -> list[str]:
+    """Return `info` and `bestmove` lines of search of position."""
+    moves = position.legal_moves()
+    if not moves:
+        score = "mate 0" if position.is_check() else "cp 0"
+        return [f"info depth 0 score {score}", "bestmove (none)"]
+    best_move, best_score = moves[0], -MATE_SCORE - 1
+    for move in moves:
+        position.make_move(move)
+        score = -search(
+            position,
+            min(depth, STUB_ENGINE_MAX_DEPTH) - 1,
+            -MATE_SCORE,
+            -best_score,
+            tablebase,
+        )
+        position.unmake_move()
+        if score > best_score:
+            best_move, best_score = move, score
+    uci = move_to_uci(best_move)
+    if best_score == MATE_SCORE:
+        score = "mate 1"
+    elif best_score == -MATE_SCORE:
+        score = "mate -1"
+    else:
+        score = f"cp {best_score}"
+    return [f"info depth {depth} score {score} pv {uci}", f"bestmove {uci}"]
+
+
+def set_position(tokens: list[str]) -> Position:
+    """Return position of `position` command split into tokens."""
+    moves_at = tokens.index("moves") if "moves" in tokens else len(tokens)
+    if tokens[1] == "startpos":
+        position = Position()
+    else:
+        position = Position(" ".join(tokens[2:moves_at]))
+    for uci in tokens[moves_at + 1 :]:
+        position.push_uci(uci)
+    return position
+
+
+def main() -> None:
+    """Answer UCI commands read from standard input until `quit`."""
+    position = Position()
+    tablebase = None
+    max_blocks = 1024
+    for line in sys.stdin:
+        tokens = line.split()
+        if not tokens:
+            continue
+        command = tokens[0]
+        replies = []
+        if command == "uci":
+            replies = [
+                "id name Stub",
+                "id author Chess API",
+                "option name TablebasePath type string default <empty>",
+                "option name TablebaseBlocks type spin default 1024 min 1 max 65536",
+                "uciok",
+            ]
+        elif command == "isready":
+            replies = ["readyok"]
+        elif tokens[:3] == ["setoption", "name", "TablebaseBlocks"]:
+            if tokens[4:5] and tokens[4].isdigit():
+                max_blocks = int(tokens[4])
+        elif tokens[:3] == ["setoption", "name", "TablebasePath"]:
+            if tablebase is not None:
+                tablebase.close()
+            path = " ".join(tokens[4:])
+            tablebase = Tablebase(path, max_blocks) if path else None
+        elif command == "position" and len(tokens) > 1:
+            try:
+                position = set_position(tokens)
+            except (
+                FenValidationError,
+                IllegalMoveError,
+                MoveNotationError,
+                ValueError,
+            ) as exc:
+                replies = [f"info string {exc}"]
+        elif command == "go":
+            depth = 1
+            if tokens[1:2] == ["depth"] and tokens[2:3] and tokens[2].isdigit():
+                depth = int(tokens[2])
+            replies = go(position, max(depth, 1), tablebase)
+        elif command == "quit":
+            break
+        for reply in replies:
+            sys.stdout.write(f"{reply}\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import json
+import time
+from typing import Any
+
+from core.cache import TTLCache
+from core.config import SharedCacheSettings, settings
+from core.shm_cache import SharedMemoryCache
+from database.invalidation import invalidation_bus
+
+from .models import (
+    Country,
+    Privilege,
+    Rank,
+    Role,
+    RolePrivilegeAssociation,
+    User,
+    UserRoleAssociation,
+)
+
+# Detached users by username, used to resolve token owner without query.
+user_cache: TTLCache[str, User] = TTLCache(
+    "user",
+    maxsize=settings.cache.user_maxsize,
+    ttl=settings.cache.user_ttl_seconds,
+)
+
+
+class VerifiedTokenCache:
+    """Payloads of verified tokens shared by all workers on host.
+
+    Lets worker skip signature check of token already verified by any worker
+    on the same host. Token payload is immutable, so entry lives until token
+    expires or `ttl_seconds` passes, whichever comes first. Segment is
+    attached on first use; if launcher did not create it (single process
+    dev run), worker creates it and destroys on `close()`.
+    """
+
+    def __init__(self, config: SharedCacheSettings):
+        self.config = config
+        self._cache: SharedMemoryCache | None = None
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Return payload of previously verified token or None."""
+        if (cache := self._get_cache()) is None:
+            return None
+        if (value := cache.get(token.encode())) is None:
+            return None
+        return json.loads(value)
+
+    def set(self, token: str, payload: dict[str, Any]) -> None:
+        """Store payload of token whose signature has just been verified."""
+        if (cache := self._get_cache()) is None:
+            return
+        ttl = min(self.config.ttl_seconds, payload.get("exp", 0) - time.time())
+        if ttl > 0:
+            cache.set(token.encode(), json.dumps(payload).encode(), ttl)
+
+    def close(self) -> None:
+        """Detach from segment, destroying it if this worker created it."""
+        if self._cache is not None:
+            self._cache.close()
+            if self._cache.owner:
+                self._cache.unlink()
+            self._cache = None
+
+    def _get_cache(self) -> SharedMemoryCache | None:
+        if self._cache is None and self.config.enabled:
+            self._cache = SharedMemoryCache.open(
+                self.config.name,
+                self.config.buckets,
+                self.config.ways,
+                self.config.slot_size,
+            )
+        return self._cache
+
+
+token_cache = VerifiedTokenCache(settings.shared_cache)
+
+
+def _invalidate_user(username: str | None) -> None:
+    if username is None:
+        user_cache.clear()
+    else:
+        user_cache.invalidate(username)
+
+
+invalidation_bus.watch(User, "user", key_attr="username")
+invalidation_bus.watch(UserRoleAssociation, "role")
+invalidation_bus.watch(Role, "role")
+invalidation_bus.watch(RolePrivilegeAssociation, "privilege")
+invalidation_bus.watch(Privilege, "privilege")
+invalidation_bus.watch(Country, "country")
+invalidation_bus.watch(Rank, "rank")
+
+invalidation_bus.subscribe("user", _invalidate_user)
+# Authorization of cached user depends on its roles and their privileges.
+invalidation_bus.subscribe("role", lambda _: user_cache.clear())
+invalidation_bus.subscribe("privilege", lambda _: user_cache.clear())
+invalidation_bus.on_reconnect(user_cache.clear)
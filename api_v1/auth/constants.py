@@ -14,6 +14,10 @@ MAX_LENGTH_NAME = 30
 MAX_LENGTH_SURNAME = 40
 MAX_LENGTH_BIOGRAPHY = 300
 MAX_LENGTH_AVATAR_URL = 255
+# Default Glicko-2 rating for 'Profile' model
+DEFAULT_RATING = 1500.0
+DEFAULT_RATING_DEVIATION = 350.0
+DEFAULT_RATING_VOLATILITY = 0.06
 # Max length for 'Country' model
 MAX_LENGTH_COUNTRY_NAME = 50
 MAX_LENGTH_COUNTRY_CODE = 2
@@ -1,27 +1,65 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, AsyncGenerator
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt.exceptions import InvalidTokenError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.config import settings
+from core.exceptions import ConcurrencyLimitExceededError
+from core.limiter import AdaptiveConcurrencyLimiter
 from database.db_helper import db_helper
 
+from .cache import token_cache
 from .constants import ACCESS_TOKEN_TYPE, REFRESH_TOKEN_TYPE, TOKEN_TYPE_FIELD
 from .models import User
-from .services import get_user_by_username
-from .utils import check_password, decode_jwt
+from .services import get_user_by_username_shared
+from .utils import check_password_async, decode_jwt
 
 http_bearer = HTTPBearer(auto_error=False)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/jwt/login/")
 
 
+class ConcurrencyLimitGuard:
+    """Dependency holding slot of adaptive concurrency limiter during request."""
+
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter):
+        self.limiter = limiter
+
+    async def __call__(self) -> AsyncGenerator[None, None]:
+        """Acquire slot or reject request with 503 and `Retry-After`."""
+        try:
+            permit = await self.limiter.acquire()
+        except ConcurrencyLimitExceededError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is overloaded, retry later",
+                headers={"Retry-After": str(exc.retry_after)},
+            ) from None
+        try:
+            yield
+        finally:
+            permit.release()
+
+
+login_limit = ConcurrencyLimitGuard(
+    AdaptiveConcurrencyLimiter.from_settings("login", settings.limiter.login)
+)
+authenticated_limit = ConcurrencyLimitGuard(
+    AdaptiveConcurrencyLimiter.from_settings(
+        "authenticated", settings.limiter.authenticated
+    )
+)
+
+
 def get_current_token_payload(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> dict[str, Any]:
-    """Get payload from token."""
+    """Get payload from token, skipping signature check for cached token."""
+    if payload := token_cache.get(token):
+        return payload
     try:
-        payload: dict = decode_jwt(token=token)
+        payload = decode_jwt(token=token)
 
     except InvalidTokenError:
         raise HTTPException(
@@ -29,6 +67,7 @@ def get_current_token_payload(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         ) from None
+    token_cache.set(token, payload)
     return payload
 
 
@@ -63,10 +102,10 @@ async def validate_auth_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    if not (user := await get_user_by_username(session, form_data.username)):
+    if not (user := await get_user_by_username_shared(session, form_data.username)):
         raise unauth_exc
 
-    if not check_password(
+    if not await check_password_async(
         raw_password=form_data.password, hash_password=user.password_hash
     ):
         raise unauth_exc
@@ -94,7 +133,7 @@ def validate_token_type(payload: dict, token_type: str) -> bool:
 async def get_user_by_token_username(session: AsyncSession, payload: dict) -> User:
     """Retrieve user from database based on username from token."""
     username: str = payload.get("username", "")
-    if user := await get_user_by_username(session=session, username=username):
+    if user := await get_user_by_username_shared(session=session, username=username):
         return user
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
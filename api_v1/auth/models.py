@@ -12,6 +12,9 @@ from mixins import DescriptionMixin, TimestampMixin
 from utils import now_with_tz_utc
 
 from .constants import (
+    DEFAULT_RATING,
+    DEFAULT_RATING_DEVIATION,
+    DEFAULT_RATING_VOLATILITY,
     MAX_LENGTH_AVATAR_URL,
     MAX_LENGTH_BIOGRAPHY,
     MAX_LENGTH_COUNTRY_CODE,
@@ -97,6 +100,9 @@ class Profile(TimestampMixin, Base):
         user_id (int): ID of user associated with profile (One-To-One).
         country_id (int): ID of user country, linked to `Country` model.
         rank_id (int): ID of user rank, linked to `Rank` model. Default is None.
+        rating (float): Glicko-2 rating. Default is 1500.
+        rating_deviation (float): Glicko-2 rating deviation. Default is 350.
+        rating_volatility (float): Glicko-2 rating volatility. Default is 0.06.
 
     Relationships:
         user (User): One-To-One relationship with `User` model.
@@ -125,6 +131,18 @@ class Profile(TimestampMixin, Base):
         ForeignKey("ranks.id"),
         default=None,
     )
+    rating: Mapped[float] = mapped_column(
+        default=DEFAULT_RATING,
+        server_default=str(DEFAULT_RATING),
+    )
+    rating_deviation: Mapped[float] = mapped_column(
+        default=DEFAULT_RATING_DEVIATION,
+        server_default=str(DEFAULT_RATING_DEVIATION),
+    )
+    rating_volatility: Mapped[float] = mapped_column(
+        default=DEFAULT_RATING_VOLATILITY,
+        server_default=str(DEFAULT_RATING_VOLATILITY),
+    )
 
     user: Mapped[User] = relationship(back_populates="profile")
     country: Mapped[Country] = relationship(back_populates="profiles")
@@ -176,6 +194,8 @@ class Rank(DescriptionMixin, TimestampMixin, Base):
     Attributes:
         name (str): The name of rank (e.g., Grandmaster, International Master).
         abbreviation (str): The abbreviation for rank (e.g., GM, IM).
+        min_rating (float): Lowest rating of player holding rank, rank is not
+        assigned by rating if None.
         description(str): Optional description for rank. Submitted from:
         DescriptionMixin.
         created_at (datetime): Timestamp created rank. Submitted from: TimestampMixin.
@@ -197,6 +217,7 @@ class Rank(DescriptionMixin, TimestampMixin, Base):
         String(MAX_LENGTH_RANK_ABBREVIATION),
         unique=True,
     )
+    min_rating: Mapped[Optional[float]] = mapped_column(default=None)
 
     profiles: Mapped[Profile] = relationship(back_populates="rank")
 
@@ -3,9 +3,11 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 
 from .dependencies import (
+    authenticated_limit,
     get_current_active_user,
     get_current_auth_user_for_refresh,
     http_bearer,
+    login_limit,
     validate_auth_user,
 )
 from .jwt_auth import create_access_token, create_refresh_token
@@ -19,7 +21,7 @@ router = APIRouter(
 )
 
 
-@router.post("/token/")
+@router.post("/token/", dependencies=[Depends(login_limit)])
 def auth_user_ussues_jwt(
     user: Annotated[User, Depends(validate_auth_user)],
 ) -> TokenSchema:
@@ -34,7 +36,7 @@ def auth_user_ussues_jwt(
     return TokenSchema(access_token=access_token, refresh_token=refresh_token)
 
 
-@router.get("/users/me/")
+@router.get("/users/me/", dependencies=[Depends(authenticated_limit)])
 def user_check_self_info(
     user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
@@ -49,7 +51,11 @@ def user_check_self_info(
     }
 
 
-@router.post("/refresh/", response_model_exclude_none=True)
+@router.post(
+    "/refresh/",
+    response_model_exclude_none=True,
+    dependencies=[Depends(authenticated_limit)],
+)
 def auth_refresh_jwt(
     user: Annotated[User, Depends(get_current_auth_user_for_refresh)],
 ) -> TokenSchema:
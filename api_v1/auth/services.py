@@ -2,9 +2,18 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .models import User
+from core.singleflight import SingleFlight
+from database.db_helper import db_helper
+
+from .cache import user_cache
+from .constants import DEFAULT_RATING
+from .models import Profile, User
 from .schemas import UserRegisterSchema
 
+user_by_username_flight: SingleFlight[str, User | None] = SingleFlight(
+    "user_by_username"
+)
+
 
 async def create_user(session: AsyncSession, user_in: UserRegisterSchema) -> User:
     """Create new user in database."""
@@ -30,3 +39,47 @@ async def get_user_by_username(session: AsyncSession, username: str) -> User | N
     user = result.scalar_one_or_none()
 
     return user
+
+
+async def get_user_by_username_shared(
+    session: AsyncSession, username: str
+) -> User | None:
+    """Search user by username, sharing query with identical concurrent lookups.
+
+    User is taken from `user_cache` if present. On miss, query runs once per
+    burst of concurrent callers in its own short-lived session, so cancelled
+    caller does not break others. Loaded user is merged into caller's session
+    without extra query.
+    """
+    user = user_cache.get(username)
+    if user is None:
+        user = await user_by_username_flight.do(
+            username, lambda: _get_detached_user_by_username(username)
+        )
+    if user is None:
+        return None
+    return await session.merge(user, load=False)
+
+
+async def _get_detached_user_by_username(username: str) -> User | None:
+    # User invalidated while loading is not cached, it may be stale.
+    generation = user_cache.generation
+    async with db_helper.session_factory() as session:
+        user = await get_user_by_username(session, username)
+        if user is not None:
+            session.expunge(user)
+            user_cache.set(username, user, generation)
+        return user
+
+
+async def get_usernames(session: AsyncSession, user_ids: list[int]) -> dict[int, str]:
+    """Return usernames of users by their IDs."""
+    stmt = select(User.id, User.username).where(User.id.in_(user_ids))
+    return dict((await session.execute(stmt)).tuples().all())
+
+
+async def get_user_rating(session: AsyncSession, user_id: int) -> float:
+    """Return rating from user's profile, default rating if user has none."""
+    stmt = select(Profile.rating).where(Profile.user_id == user_id)
+    rating = await session.scalar(stmt)
+    return DEFAULT_RATING if rating is None else rating
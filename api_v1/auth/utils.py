@@ -1,5 +1,7 @@
+import asyncio
 import datetime
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import jwt
 from argon2.exceptions import HashingError, InvalidHashError, VerifyMismatchError
@@ -11,6 +13,13 @@ from .exceptions import PasswordHashError, PasswordHashingIsError
 
 log = setup_logging()
 
+# Argon2 releases GIL, so verification runs in dedicated threads sized by
+# login concurrency limit instead of default pool shared by sync endpoints.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.limiter.login.max_limit,
+    thread_name_prefix="argon2",
+)
+
 
 def encode_jwt(
     payload: dict,
@@ -114,3 +123,11 @@ def check_password(raw_password: str, hash_password: str) -> bool:
     except Exception as exc:
         log.exception("Произошла неизвестная ошибка при проверке пароля: %s", exc)
         return False
+
+
+async def check_password_async(raw_password: str, hash_password: str) -> bool:
+    """Check password in `password_executor` without blocking event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, check_password, raw_password, hash_password
+    )
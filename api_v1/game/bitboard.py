@@ -0,0 +1,143 @@
+# Square index is `rank * 8 + file` (a1 = 0, h8 = 63), bit `1 << square` of
+# 64-bit integer marks square. Slider attacks use PEXT-style lookup: occupancy
+# is masked with relevant squares of slider (ray squares without board edge)
+# and masked value is key of per-square table holding attack set.
+
+FULL = 0xFFFF_FFFF_FFFF_FFFF
+FILE_A = 0x0101_0101_0101_0101
+FILE_H = FILE_A << 7
+RANK_1 = 0xFF
+RANK_2 = RANK_1 << 8
+RANK_7 = RANK_1 << 48
+RANK_8 = RANK_1 << 56
+
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+KNIGHT_OFFSETS = (
+    (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2),
+)  # fmt: skip
+KING_OFFSETS = (
+    (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1),
+)  # fmt: skip
+
+
+def lsb(bb: int) -> int:
+    """Return index of least significant set bit."""
+    return (bb & -bb).bit_length() - 1
+
+
+def squares(bb: int) -> list[int]:
+    """Return indexes of all set bits, from least significant."""
+    result = []
+    while bb:
+        bit = bb & -bb
+        result.append(bit.bit_length() - 1)
+        bb ^= bit
+    return result
+
+
+def popcount(bb: int) -> int:
+    """Return number of set bits."""
+    return bb.bit_count()
+
+
+def _leaper_attacks(offsets: tuple[tuple[int, int], ...]) -> list[int]:
+    table = []
+    for square in range(64):
+        file, rank = square & 7, square >> 3
+        attacks = 0
+        for df, dr in offsets:
+            f, r = file + df, rank + dr
+            if 0 <= f < 8 and 0 <= r < 8:
+                attacks |= 1 << (r * 8 + f)
+        table.append(attacks)
+    return table
+
+
+def _pawn_attacks(direction: int) -> list[int]:
+    return _leaper_attacks(((1, direction), (-1, direction)))
+
+
+def _ray(square: int, df: int, dr: int) -> list[int]:
+    file, rank = square & 7, square >> 3
+    ray = []
+    f, r = file + df, rank + dr
+    while 0 <= f < 8 and 0 <= r < 8:
+        ray.append(r * 8 + f)
+        f, r = f + df, r + dr
+    return ray
+
+
+def _slider_tables(
+    directions: tuple[tuple[int, int], ...],
+) -> tuple[list[int], list[dict[int, int]]]:
+    masks = []
+    tables = []
+    for square in range(64):
+        rays = [_ray(square, df, dr) for df, dr in directions]
+        mask = 0
+        for ray in rays:
+            for target in ray[:-1]:
+                mask |= 1 << target
+        table = {}
+        subset = 0
+        while True:
+            attacks = 0
+            for ray in rays:
+                for target in ray:
+                    attacks |= 1 << target
+                    if subset >> target & 1:
+                        break
+            table[subset] = attacks
+            subset = (subset - mask) & mask
+            if not subset:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+def _between_and_lines() -> tuple[list[list[int]], list[list[int]]]:
+    between = [[0] * 64 for _ in range(64)]
+    lines = [[0] * 64 for _ in range(64)]
+    for square in range(64):
+        for df, dr in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+            ray = _ray(square, df, dr)
+            full_line = 1 << square
+            for target in ray + _ray(square, -df, -dr):
+                full_line |= 1 << target
+            path = 0
+            for target in ray:
+                between[square][target] = path
+                lines[square][target] = full_line
+                path |= 1 << target
+    return between, lines
+
+
+KNIGHT_ATTACKS = _leaper_attacks(KNIGHT_OFFSETS)
+KING_ATTACKS = _leaper_attacks(KING_OFFSETS)
+# PAWN_ATTACKS[color][square]: squares attacked by pawn of color on square.
+PAWN_ATTACKS = (_pawn_attacks(1), _pawn_attacks(-1))
+ROOK_MASKS, ROOK_TABLES = _slider_tables(ROOK_DIRECTIONS)
+BISHOP_MASKS, BISHOP_TABLES = _slider_tables(BISHOP_DIRECTIONS)
+# BETWEEN[a][b]: squares strictly between a and b on common line, or 0.
+# LINE[a][b]: whole line through a and b, or 0 if not on common line.
+BETWEEN, LINE = _between_and_lines()
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """Return squares attacked by rook on square with given occupancy."""
+    return ROOK_TABLES[square][occupied & ROOK_MASKS[square]]
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """Return squares attacked by bishop on square with given occupancy."""
+    return BISHOP_TABLES[square][occupied & BISHOP_MASKS[square]]
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    """Return squares attacked by queen on square with given occupancy."""
+    return (
+        ROOK_TABLES[square][occupied & ROOK_MASKS[square]]
+        | BISHOP_TABLES[square][occupied & BISHOP_MASKS[square]]
+    )
@@ -0,0 +1,154 @@
+import asyncio
+
+from sqlalchemy import select
+
+from api_v1.auth.models import Profile
+from core.config import LeaderboardSettings, settings
+from core.metrics import registry
+from database.db_helper import db_helper
+from database.invalidation import invalidation_bus
+from logger import setup_logging
+
+from .exceptions import LeaderboardUnavailableError
+from .leaderboard import Leaderboards
+
+log = setup_logging()
+
+# Event of changed profile, key is user ID; no key means all profiles changed.
+PROFILE_EVENT = "profile"
+
+
+class LeaderboardCache:
+    """Leaderboards of current worker, kept in sync with profiles.
+
+    Leaderboards are built by streaming all profiles when worker starts and
+    whenever all ratings change (rating period publishes `profile` event
+    without key). Change of single profile only reloads that player. Reloads
+    run in one background task, so events arriving while it is busy are
+    merged and applied by its next run. Full rebuild fills new leaderboards
+    and swaps them in at once, so readers never see half-built leaderboards.
+    New profiles publish the same event, so new players appear on leaderboards
+    without rebuild.
+
+    Attributes:
+        boards (Leaderboards): Current leaderboards, empty until first build.
+        ready_timeout (float): Max seconds `wait_ready` waits for first build.
+
+    """
+
+    def __init__(self, batch_size: int, retry_delay: float, ready_timeout: float):
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.ready_timeout = ready_timeout
+        self.boards = Leaderboards()
+        self._ready = asyncio.Event()
+        self._changed = asyncio.Event()
+        self._rebuild = True
+        self._dirty: set[int] = set()
+        self._task: asyncio.Task[None] | None = None
+        registry.gauge(
+            "leaderboard_players", "Players on global leaderboard of worker."
+        ).set_function(lambda: len(self.boards))
+
+    @classmethod
+    def from_settings(cls, config: LeaderboardSettings) -> "LeaderboardCache":
+        """Create leaderboard cache from leaderboard settings."""
+        return cls(
+            batch_size=config.batch_size,
+            retry_delay=config.retry_delay_seconds,
+            ready_timeout=config.ready_timeout_seconds,
+        )
+
+    def start(self) -> None:
+        """Start background task building and refreshing leaderboards."""
+        if self._task is None:
+            self._changed.set()
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        """Stop background refresh task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def wait_ready(self) -> Leaderboards:
+        """Wait for first build of leaderboards and return current ones.
+
+        Raises:
+            LeaderboardUnavailableError: If first build does not finish in
+            `ready_timeout` seconds, e.g. database is down since start.
+
+        """
+        try:
+            async with asyncio.timeout(self.ready_timeout):
+                await self._ready.wait()
+        except TimeoutError:
+            raise LeaderboardUnavailableError("Leaderboards are not ready") from None
+        return self.boards
+
+    def invalidate(self, key: str | None) -> None:
+        """Schedule reload of changed player, or rebuild if key is None."""
+        if key is None:
+            self._rebuild = True
+            self._dirty.clear()
+        elif not self._rebuild:
+            self._dirty.add(int(key))
+        self._changed.set()
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            rebuild, self._rebuild = self._rebuild, False
+            dirty, self._dirty = self._dirty, set()
+            try:
+                if rebuild:
+                    self.boards = await self._load_all()
+                    self._ready.set()
+                elif dirty:
+                    await self._reload(dirty)
+            except Exception:
+                log.exception("Leaderboard refresh failed")
+                self._rebuild = self._rebuild or rebuild
+                self._dirty |= dirty
+                self._changed.set()
+                await asyncio.sleep(self.retry_delay)
+
+    async def _load_all(self) -> Leaderboards:
+        """Stream all profiles into new leaderboards."""
+        stmt = select(Profile.user_id, Profile.country_id, Profile.rating)
+        players = []
+        async with db_helper.session_factory() as session:
+            result = await session.stream(
+                stmt.execution_options(yield_per=self.batch_size)
+            )
+            async for partition in result.partitions():
+                players.extend(partition)
+        # Building takes seconds for millions of players, thread lets event
+        # loop serve requests in between.
+        return await asyncio.to_thread(Leaderboards, players)
+
+    async def _reload(self, user_ids: set[int]) -> None:
+        """Apply current rating and country of changed players."""
+        ids = list(user_ids)
+        async with db_helper.session_factory() as session:
+            for start in range(0, len(ids), self.batch_size):
+                chunk = ids[start : start + self.batch_size]
+                stmt = select(
+                    Profile.user_id, Profile.country_id, Profile.rating
+                ).where(Profile.user_id.in_(chunk))
+                found = set()
+                for user_id, country_id, rating in await session.execute(stmt):
+                    self.boards.update(user_id, country_id, rating)
+                    found.add(user_id)
+                for user_id in set(chunk) - found:
+                    self.boards.remove(user_id)
+
+
+leaderboard_cache = LeaderboardCache.from_settings(settings.leaderboard)
+
+invalidation_bus.watch(Profile, PROFILE_EVENT, key_attr="user_id")
+invalidation_bus.subscribe(PROFILE_EVENT, leaderboard_cache.invalidate)
+# Events sent while listener was offline are lost.
+invalidation_bus.on_reconnect(lambda: leaderboard_cache.invalidate(None))
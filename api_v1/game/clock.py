@@ -0,0 +1,152 @@
+from .constants import BLACK, WHITE
+from .enums import IncrementModeEnum
+
+
+class GameClock:
+    """Chess clock of both players measured with monotonic time.
+
+    Clock starts with first move: white's first move is not timed, then
+    clock of side to move runs until it presses clock by moving.
+
+    Network lag is compensated from quota of each player: time for move is
+    reduced by lag reported with it, but by no more than quota left, and
+    every move refills quota by `lag_quota_gain` up to `max_lag_quota`. So
+    honest players on slow connections are credited transit time of their
+    moves, while inflated reports can not gain more than quota over game.
+
+    Attributes:
+        remaining (list[float]): Seconds left of white and black as of last
+        press of clock; running clock is not decreased until it is pressed.
+        increment (float): Increment per move in seconds.
+        mode (IncrementModeEnum): How increment is added.
+        side (int): Color whose clock runs or runs next.
+        turn_started_at (float): Monotonic time running clock was started,
+        None while clock is stopped.
+        lag_quotas (list[float]): Lag compensation quota of white and black.
+
+    """
+
+    __slots__ = (
+        "increment",
+        "lag_quota_gain",
+        "lag_quotas",
+        "max_lag_quota",
+        "mode",
+        "remaining",
+        "side",
+        "turn_started_at",
+    )
+
+    def __init__(
+        self,
+        initial: float,
+        increment: float,
+        mode: IncrementModeEnum = IncrementModeEnum.FISCHER,
+        lag_quota_gain: float = 0.1,
+        max_lag_quota: float = 1.0,
+        remaining: tuple[float, float] | None = None,
+        side: int = WHITE,
+    ):
+        self.remaining = list(remaining) if remaining else [initial, initial]
+        self.increment = increment
+        self.mode = mode
+        self.lag_quota_gain = lag_quota_gain
+        self.max_lag_quota = max_lag_quota
+        self.lag_quotas = [max_lag_quota, max_lag_quota]
+        self.side = side
+        self.turn_started_at: float | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether clock of side to move is running."""
+        return self.turn_started_at is not None
+
+    def start(self, now: float) -> None:
+        """Start clock of side to move, used when game is resumed."""
+        if self.turn_started_at is None:
+            self.turn_started_at = now
+
+    def stop(self, now: float) -> None:
+        """Stop running clock and charge time used so far, used on game end."""
+        if self.turn_started_at is not None:
+            used = now - self.turn_started_at
+            self.remaining[self.side] = max(0.0, self.remaining[self.side] - used)
+            self.turn_started_at = None
+
+    def time_left(self, color: int, now: float) -> float:
+        """Return seconds left of player at monotonic time `now`."""
+        left = self.remaining[color]
+        if color == self.side and self.turn_started_at is not None:
+            left -= now - self.turn_started_at
+        return max(0.0, left)
+
+    def deadline(self) -> float | None:
+        """Return monotonic time side to move flags, None if clock is stopped.
+
+        Unused lag quota is included: move arriving before deadline may still
+        be in time after compensation.
+        """
+        if self.turn_started_at is None:
+            return None
+        return (
+            self.turn_started_at
+            + self.remaining[self.side]
+            + self.lag_quotas[self.side]
+        )
+
+    def press(self, color: int, now: float, lag: float = 0.0) -> bool:
+        """Stop clock of player who moved and start clock of opponent.
+
+        Args:
+            color (int): Color of player who moved, must be side to move.
+            now (float): Monotonic time move was received.
+            lag (float): Network lag of move reported by client in seconds.
+
+        Returns:
+            False if player ran out of time, clock is left unchanged then.
+
+        """
+        other = BLACK if color == WHITE else WHITE
+        if self.turn_started_at is None:
+            self.side = other
+            self.turn_started_at = now
+            return True
+        compensation = min(max(lag, 0.0), self.lag_quotas[color])
+        used = max(0.0, now - self.turn_started_at - compensation)
+        left = self.remaining[color] - used
+        if left <= 0:
+            return False
+        if self.mode == IncrementModeEnum.BRONSTEIN:
+            left += min(self.increment, used)
+        else:
+            left += self.increment
+        self.remaining[color] = left
+        self.lag_quotas[color] = min(
+            self.lag_quotas[color] - compensation + self.lag_quota_gain,
+            self.max_lag_quota,
+        )
+        self.side = other
+        self.turn_started_at = now
+        return True
+
+    def sync(
+        self, remaining: tuple[float, float], side: int, now: float | None
+    ) -> None:
+        """Set clock to state reported by other replica of game.
+
+        Args:
+            remaining (tuple[float, float]): Seconds left of white and black as
+            of last press of clock.
+            side (int): Color whose clock runs or runs next.
+            now (float): Monotonic time clock of `side` starts running, None
+            to leave clock stopped.
+
+        """
+        self.remaining = list(remaining)
+        self.side = side
+        self.turn_started_at = now
+
+    def flagged(self, now: float) -> bool:
+        """Whether side to move ran out of time, including lag quota."""
+        deadline = self.deadline()
+        return deadline is not None and now >= deadline
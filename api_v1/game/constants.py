@@ -0,0 +1,93 @@
+# Colors
+WHITE = 0
+BLACK = 1
+
+# Piece types, piece code is `color * 6 + piece type`
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+EMPTY = -1
+
+PIECE_SYMBOLS = "PNBRQKpnbrqk"
+
+# Castling rights bits
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+CASTLING_SYMBOLS = "KQkq"
+
+# Move code is 16 bits: from square (6) | to square (6) << 6 | flag (4) << 12
+MOVE_FROM_MASK = 0x3F
+MOVE_TO_SHIFT = 6
+MOVE_FLAG_SHIFT = 12
+NULL_MOVE = 0
+
+# Move flags
+QUIET = 0
+DOUBLE_PAWN_PUSH = 1
+KING_CASTLE = 2
+QUEEN_CASTLE = 3
+CAPTURE = 4
+EN_PASSANT = 5
+PROMOTION = 8
+# Promotion flags: PROMOTION | (promoted piece type - KNIGHT), plus CAPTURE
+PROMOTION_KNIGHT = 8
+PROMOTION_BISHOP = 9
+PROMOTION_ROOK = 10
+PROMOTION_QUEEN = 11
+
+# Squares
+A1, H1, A8, H8 = 0, 7, 56, 63
+E1, E8 = 4, 60
+FILE_NAMES = "abcdefgh"
+RANK_NAMES = "12345678"
+SQUARE_NAMES = [f + r for r in RANK_NAMES for f in FILE_NAMES]
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Models
+# Max length for 'Game' model
+MAX_LENGTH_FEN = 90
+# Max length for 'PgnImport' model
+MAX_LENGTH_PGN_SOURCE = 1024
+# Max length of ECO code for 'Game' model
+MAX_LENGTH_ECO = 3
+
+# Schemas
+# Seek Schema
+MAX_TIME_CONTROL_INITIAL = 3 * 60 * 60
+MAX_TIME_CONTROL_INCREMENT = 60
+# Game Command Schema
+MAX_REPORTED_LAG_MS = 10_000
+
+# Live games
+# WebSocket close code for connection that can not keep up with messages
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# Halfmoves without capture or pawn move that end game in draw
+FIFTY_MOVE_RULE_PLIES = 100
+
+# Leaderboard
+DEFAULT_LEADERBOARD_PAGE_SIZE = 50
+MAX_LEADERBOARD_PAGE_SIZE = 100
+
+# Replay
+# Plies whose positions one replay request may ask for
+MAX_REPLAY_PLIES = 200
+
+# Player stats
+# Moves of game assumed when estimating its duration from time control
+ESTIMATED_GAME_MOVES = 40
+# Longest estimated duration in seconds of bullet, blitz and rapid game
+BULLET_MAX_SECONDS = 179
+BLITZ_MAX_SECONDS = 479
+RAPID_MAX_SECONDS = 1499
+
+# Tablebase
+# Pawnless tables generated by `tablebase` job, each after tables it probes
+GENERATED_TABLEBASES = ("KNvK", "KBvK", "KRvK", "KQvK")
+# Most pieces of live game position probed in tablebase for adjudication
+MAX_ADJUDICATED_PIECES = 5
@@ -0,0 +1,48 @@
+from typing import Annotated
+
+from fastapi import HTTPException, Query, WebSocket, WebSocketException, status
+
+from api_v1.auth.constants import ACCESS_TOKEN_TYPE
+from api_v1.auth.dependencies import get_current_token_payload, validate_token_type
+from api_v1.auth.models import User
+from api_v1.auth.services import get_user_by_username_shared
+from database.db_helper import db_helper
+
+
+async def get_websocket_user(
+    websocket: WebSocket,
+    token: Annotated[str | None, Query()] = None,
+) -> User:
+    """Authenticate WebSocket once at handshake by access JWT.
+
+    Token is taken from `token` query parameter (browsers can not set headers
+    on WebSocket) or from `Authorization: Bearer` header. Handshake is
+    rejected with policy violation code on any authentication failure.
+    """
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(
+            " "
+        )
+        if scheme.lower() == "bearer" and credentials:
+            token = credentials
+    if token is None:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Missing access token"
+        )
+    try:
+        payload = get_current_token_payload(token)
+        validate_token_type(payload, ACCESS_TOKEN_TYPE)
+    except HTTPException as exc:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail
+        ) from None
+
+    # Short session: connection may live for hours and must not hold pool slot.
+    async with db_helper.session_factory() as session:
+        user = await get_user_by_username_shared(session, payload.get("username", ""))
+    if user is None or not user.is_active:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason="Invalid authentication credentials",
+        )
+    return user
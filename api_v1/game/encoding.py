@@ -0,0 +1,65 @@
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+
+from .constants import START_FEN
+from .exceptions import MoveEncodingError
+from .position import Position
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# Bytes of one packed move code.
+MOVE_SIZE = 2
+
+
+def encode_moves(moves: Iterable[int]) -> bytes:
+    """Pack 16-bit move codes into little-endian bytes for storage."""
+    data = array("H", moves)
+    if not _LITTLE_ENDIAN:
+        data.byteswap()
+    return data.tobytes()
+
+
+def decode_moves(data: bytes | bytearray | memoryview) -> Sequence[int]:
+    """Return move codes stored in bytes.
+
+    On little-endian host result is `memoryview` over `data` itself, so no
+    bytes are copied; on big-endian host moves are copied and byte-swapped.
+
+    Raises:
+        MoveEncodingError: If data length is odd.
+
+    """
+    if len(data) % 2:
+        raise MoveEncodingError(f"Packed moves must have even length: {len(data)}")
+    if _LITTLE_ENDIAN:
+        return memoryview(data).cast("B").cast("H")
+    moves = array("H")
+    moves.frombytes(data)
+    moves.byteswap()
+    return moves
+
+
+def append_moves(data: bytes, moves: Iterable[int]) -> bytes:
+    """Return packed moves with new moves added to the end."""
+    return data + encode_moves(moves)
+
+
+def replay(
+    moves: Iterable[int], initial_fen: str | None = None, plies: int | None = None
+) -> Position:
+    """Return position after making stored moves from initial position.
+
+    Args:
+        moves (Iterable[int]): Move codes, e.g. from `decode_moves`.
+        initial_fen (str, Optional): Starting position, standard if omitted.
+        plies (int, Optional): Stop after this number of moves.
+
+    """
+    position = Position(initial_fen or START_FEN)
+    make_move = position.make_move
+    for ply, move in enumerate(moves):
+        if plies is not None and ply >= plies:
+            break
+        make_move(move)
+    return position
@@ -0,0 +1,50 @@
+from enum import StrEnum
+
+
+class GameResultEnum(StrEnum):
+    """Enumeration for game result, values are PGN result tokens."""
+
+    WHITE_WIN = "1-0"
+    BLACK_WIN = "0-1"
+    DRAW = "1/2-1/2"
+    ONGOING = "*"
+
+
+class IncrementModeEnum(StrEnum):
+    """Enumeration for how time is added to clock after move.
+
+    Fischer adds full increment after every move, so time can accumulate.
+    Bronstein gives back time used for move, but no more than increment.
+    """
+
+    FISCHER = "fischer"
+    BRONSTEIN = "bronstein"
+
+
+class ColorEnum(StrEnum):
+    """Enumeration for color player plays."""
+
+    WHITE = "white"
+    BLACK = "black"
+
+
+class GameSpeedEnum(StrEnum):
+    """Enumeration for speed of game by its estimated duration.
+
+    Duration is initial time plus increment of `ESTIMATED_GAME_MOVES`
+    moves, see `stats.game_speed`; games without known time control, such
+    as imported ones lacking it, are of unknown speed.
+    """
+
+    BULLET = "bullet"
+    BLITZ = "blitz"
+    RAPID = "rapid"
+    CLASSICAL = "classical"
+    UNKNOWN = "unknown"
+
+
+class ExportFormatEnum(StrEnum):
+    """Enumeration for format of exported game history."""
+
+    PGN = "pgn"
+    NDJSON = "ndjson"
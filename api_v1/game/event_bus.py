@@ -0,0 +1,20 @@
+from core.config import GameEventSettings, settings
+from core.pubsub import Transport, UnixSocketTransport
+from database.db_helper import db_helper
+from database.pubsub import PostgresTransport
+
+from .events import GameEventBus
+
+
+def transport_from_settings(config: GameEventSettings) -> Transport:
+    """Create transport of game events chosen in settings."""
+    if config.transport == "unix":
+        return UnixSocketTransport(config.socket_path, config.retry_delay_seconds)
+    return PostgresTransport(
+        db_helper.engine, config.channel, config.retry_delay_seconds
+    )
+
+
+game_event_bus = GameEventBus.from_settings(
+    settings.game_events, transport_from_settings(settings.game_events)
+)
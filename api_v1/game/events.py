@@ -0,0 +1,268 @@
+"""Game events exchanged between workers serving the same game.
+
+Players and spectators of one game may be connected to different workers,
+each holding own replica of live game. Worker that accepts move or finishes
+game publishes event; other workers apply it to their replica and broadcast
+it to their subscribers.
+
+Events are batched into one transport message per flush, encoded in binary:
+
+    batch: origin u64 | first sequence number u64 | count u16 | events
+    event: game ID u64 | kind u8 | ply u32 | move u16 | white ms i32 |
+           black ms i32 | result u8
+
+Sequence numbers are consecutive per origin worker, so receiver drops
+duplicates of batch resent after failed send (delivery is at-least-once)
+and detects lost batches. Events of one origin arrive in order; events of
+one game from different origins are ordered by ply, see
+`LiveGame.apply_event`.
+"""
+
+import asyncio
+import os
+import struct
+from collections.abc import Callable
+from typing import NamedTuple
+
+from core.config import GameEventSettings
+from core.metrics import registry
+from core.pubsub import Transport
+from logger import setup_logging
+
+from .enums import GameResultEnum
+from .frames import RESULT_CODES, RESULTS
+
+log = setup_logging()
+
+EVENT_MOVE = 1
+EVENT_RESULT = 2
+NO_CLOCK = -1
+
+_BATCH = struct.Struct("<QQH")
+_EVENT = struct.Struct("<QBIHiiB")
+
+_events_counter = registry.counter(
+    "game_events_total", "Game events exchanged between workers."
+)
+_lost_counter = registry.counter(
+    "game_event_batches_lost_total", "Batches of game events detected as lost."
+)
+_dropped_counter = registry.counter(
+    "game_events_dropped_total", "Unsent game events dropped while sends failed."
+)
+
+
+class GameEvent(NamedTuple):
+    """Move made or result reached in game.
+
+    Attributes:
+        game_id (int): ID of game.
+        kind (int): `EVENT_MOVE` or `EVENT_RESULT`.
+        ply (int): Number of moves made in game including this one.
+        move (int): Code of move, null move for result event.
+        clocks_ms (tuple[int, int]): Milliseconds left of white and black as of
+        last press of clock, None for untimed game.
+        result (GameResultEnum): Result of game after event.
+
+    """
+
+    game_id: int
+    kind: int
+    ply: int
+    move: int
+    clocks_ms: tuple[int, int] | None
+    result: GameResultEnum
+
+
+def encode_batch(origin: int, first_seq: int, events: list[GameEvent]) -> bytes:
+    """Return message of events numbered from `first_seq`."""
+    parts = [_BATCH.pack(origin, first_seq, len(events))]
+    for event in events:
+        white_ms, black_ms = event.clocks_ms or (NO_CLOCK, NO_CLOCK)
+        parts.append(
+            _EVENT.pack(
+                event.game_id,
+                event.kind,
+                event.ply,
+                event.move,
+                white_ms,
+                black_ms,
+                RESULT_CODES[event.result],
+            )
+        )
+    return b"".join(parts)
+
+
+def decode_batch(message: bytes) -> tuple[int, int, list[GameEvent]]:
+    """Return origin, first sequence number and events of message.
+
+    Raises:
+        ValueError: If message is malformed.
+
+    """
+    try:
+        origin, first_seq, count = _BATCH.unpack_from(message)
+        if len(message) != _BATCH.size + count * _EVENT.size:
+            raise ValueError("Batch length does not match its count")
+        events = []
+        for offset in range(_BATCH.size, len(message), _EVENT.size):
+            game_id, kind, ply, move, white_ms, black_ms, result = _EVENT.unpack_from(
+                message, offset
+            )
+            clocks_ms = None if white_ms == NO_CLOCK else (white_ms, black_ms)
+            events.append(
+                GameEvent(game_id, kind, ply, move, clocks_ms, RESULTS[result])
+            )
+    except (struct.error, IndexError) as exc:
+        raise ValueError(f"Malformed batch: {exc}") from None
+    return origin, first_seq, events
+
+
+class GameEventBus:
+    """Publishes game events of worker and delivers events of others.
+
+    Published events are queued and sent by one task: it waits
+    `flush_interval` after first event to collect more, then sends all
+    queued events in batches of at most `batch_size`. Failed send is retried
+    with the same sequence numbers until it succeeds; while it fails, at
+    most `max_pending` events are kept and oldest are dropped, their
+    sequence numbers skipped so that other workers resync.
+
+    Resync handlers are called when transport (re)connects and when batch of
+    other worker was lost; they should reload state of live games.
+
+    Attributes:
+        transport (Transport): Channel between workers.
+        origin (int): Random ID of this worker.
+        batch_size (int): Max events per message.
+        max_pending (int): Max unsent events kept while sends fail.
+
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        batch_size: int = 200,
+        flush_interval: float = 0.002,
+        retry_delay: float = 0.5,
+        max_pending: int = 100_000,
+    ):
+        self.transport = transport
+        self.origin = int.from_bytes(os.urandom(8), "little")
+        self.batch_size = max(
+            1,
+            min(batch_size, (transport.max_message_size - _BATCH.size) // _EVENT.size),
+        )
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.max_pending = max_pending
+        self._sent_seq = 0
+        self._pending: list[GameEvent] = []
+        self._last_seq: dict[int, int] = {}
+        self._handlers: list[Callable[[GameEvent], None]] = []
+        self._resync_handlers: list[Callable[[], None]] = []
+        self._queued = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @classmethod
+    def from_settings(
+        cls, config: GameEventSettings, transport: Transport
+    ) -> "GameEventBus":
+        """Create bus over transport from game event settings."""
+        return cls(
+            transport,
+            batch_size=config.batch_size,
+            flush_interval=config.flush_interval_seconds,
+            retry_delay=config.retry_delay_seconds,
+            max_pending=config.max_pending_events,
+        )
+
+    def subscribe(self, handler: Callable[[GameEvent], None]) -> None:
+        """Call `handler(event)` for each event published by other worker."""
+        self._handlers.append(handler)
+
+    def on_resync(self, handler: Callable[[], None]) -> None:
+        """Call `handler()` on (re)connect and after events were lost."""
+        self._resync_handlers.append(handler)
+
+    def publish(self, event: GameEvent) -> None:
+        """Queue event to other workers without waiting."""
+        self._pending.append(event)
+        self._queued.set()
+
+    async def start(self) -> None:
+        """Start transport and sender task."""
+        if self._task is None:
+            await self.transport.start(self._receive, self._resync)
+            self._task = asyncio.create_task(self._send_forever())
+
+    async def stop(self) -> None:
+        """Stop sender task and transport, unsent events are dropped."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            await self.transport.stop()
+
+    async def _send_forever(self) -> None:
+        while True:
+            await self._queued.wait()
+            if self.flush_interval:
+                await asyncio.sleep(self.flush_interval)
+            self._queued.clear()
+            while self._pending:
+                batch = self._pending[: self.batch_size]
+                message = encode_batch(self.origin, self._sent_seq + 1, batch)
+                try:
+                    await self.transport.send(message)
+                except Exception as exc:
+                    log.warning("Sending game events failed, retrying: %s", exc)
+                    await asyncio.sleep(self.retry_delay)
+                    self._drop_overflow()
+                    continue
+                del self._pending[: len(batch)]
+                self._sent_seq += len(batch)
+                _events_counter.inc(len(batch), direction="sent")
+
+    def _drop_overflow(self) -> None:
+        """Drop oldest unsent events beyond `max_pending`."""
+        overflow = len(self._pending) - self.max_pending
+        if overflow <= 0:
+            return
+        del self._pending[:overflow]
+        # Skipped sequence numbers are detected as lost by other workers.
+        self._sent_seq += overflow
+        _dropped_counter.inc(overflow)
+        log.warning("Dropped %d unsent game events", overflow)
+
+    def _receive(self, message: bytes) -> None:
+        try:
+            origin, first_seq, events = decode_batch(message)
+        except ValueError as exc:
+            log.error("Dropped game event batch: %s", exc)
+            return
+        if origin == self.origin:
+            return
+        # Events sent before this worker first heard of origin were covered
+        # by resync on connect.
+        last_seq = self._last_seq.get(origin, first_seq - 1)
+        if first_seq > last_seq + 1:
+            _lost_counter.inc()
+            log.warning("Lost game events %d-%d", last_seq + 1, first_seq - 1)
+            self._resync()
+        skip = max(0, last_seq + 1 - first_seq)
+        self._last_seq[origin] = max(last_seq, first_seq + len(events) - 1)
+        for event in events[skip:]:
+            _events_counter.inc(direction="received")
+            for handler in self._handlers:
+                try:
+                    handler(event)
+                except Exception:
+                    log.exception("Game event handler failed for %s", event)
+
+    def _resync(self) -> None:
+        for handler in self._resync_handlers:
+            try:
+                handler()
+            except Exception:
+                log.exception("Game event resync handler failed")
@@ -0,0 +1,70 @@
+from exceptions import (
+    BaseInfraError,
+    BaseLogicError,
+    BaseSystemError,
+    BaseValidationError,
+)
+
+
+class FenValidationError(BaseValidationError):
+    """Raised when FEN string can not be parsed into position."""
+
+
+class IllegalMoveError(BaseLogicError):
+    """Raised when move is not legal in current position."""
+
+
+class MoveNotationError(BaseValidationError):
+    """Raised when move notation can not be parsed."""
+
+
+class MoveEncodingError(BaseValidationError):
+    """Raised when stored moves can not be decoded."""
+
+
+class GameNotFoundError(BaseLogicError):
+    """Raised when game does not exist."""
+
+
+class GameAccessError(BaseLogicError):
+    """Raised when user is not allowed to perform action in game."""
+
+
+class LeaderboardCursorError(BaseValidationError):
+    """Raised when leaderboard page cursor can not be decoded."""
+
+
+class LeaderboardUnavailableError(BaseInfraError):
+    """Raised when leaderboards are not built in time."""
+
+
+class PlyOutOfRangeError(BaseValidationError):
+    """Raised when requested ply is not in game."""
+
+
+class PgnFormatError(BaseValidationError):
+    """Raised when PGN game can not be parsed."""
+
+
+class PgnImportConflictError(BaseLogicError):
+    """Raised when the same PGN file is imported by another process."""
+
+
+class ShardError(BaseSystemError):
+    """Raised when game shard process can not serve request."""
+
+
+class JournalError(BaseInfraError):
+    """Raised when journal of live game writes can not be opened."""
+
+
+class TablebaseError(BaseInfraError):
+    """Raised when tablebase file is malformed or corrupt."""
+
+
+class OpeningBookError(BaseInfraError):
+    """Raised when opening book source or compiled book is malformed."""
+
+
+class SeekError(BaseLogicError):
+    """Raised when seek can not be posted or accepted."""
@@ -0,0 +1,128 @@
+"""Streaming export of game histories as PGN or NDJSON.
+
+Games are read in keyset chunks, each in its own short session, so pooled
+connection is returned before chunk is sent and slow client never holds one
+while it reads. Chunk is encoded, and compressed if asked, before next one
+is read, so memory of export does not grow with length of history.
+"""
+
+import asyncio
+import json
+import zlib
+from collections.abc import AsyncIterator
+
+from api_v1.auth.services import get_usernames
+from database.db_helper import db_helper
+
+from .encoding import decode_moves
+from .enums import ExportFormatEnum
+from .models import Game
+from .move import move_to_uci
+from .notation import moves_to_movetext
+from .services import get_player_games
+
+MEDIA_TYPES = {
+    ExportFormatEnum.PGN: "application/x-chess-pgn",
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+}
+
+
+def game_to_pgn(game: Game, usernames: dict[int, str]) -> str:
+    """Return game as PGN with Seven Tag Roster and time control."""
+    tags = [
+        ("Event", "?"),
+        ("Site", "?"),
+        ("Date", game.created_at.strftime("%Y.%m.%d")),
+        ("Round", "-"),
+        ("White", usernames.get(game.white_id, "?")),
+        ("Black", usernames.get(game.black_id, "?")),
+        ("Result", game.result.value),
+        ("GameId", str(game.id)),
+        (
+            "TimeControl",
+            f"{game.time_control_initial}+{game.time_control_increment}",
+        ),
+    ]
+    if game.initial_fen is not None:
+        tags += [("SetUp", "1"), ("FEN", game.initial_fen)]
+    header = "".join(f'[{name} "{_escape(value)}"]\n' for name, value in tags)
+    movetext = moves_to_movetext(decode_moves(game.moves), game.initial_fen)
+    return f"{header}\n{' '.join(filter(None, (movetext, game.result.value)))}\n\n"
+
+
+def _escape(value: str) -> str:
+    """Escape backslashes and quotes of PGN tag value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def game_to_ndjson(game: Game, usernames: dict[int, str]) -> str:
+    """Return game as one JSON line with moves in UCI notation."""
+    return (
+        json.dumps(
+            {
+                "id": game.id,
+                "white": usernames.get(game.white_id),
+                "black": usernames.get(game.black_id),
+                "result": game.result.value,
+                "time_control_initial": game.time_control_initial,
+                "time_control_increment": game.time_control_increment,
+                "initial_fen": game.initial_fen,
+                "moves": " ".join(map(move_to_uci, decode_moves(game.moves))),
+                "created_at": game.created_at.isoformat(),
+            },
+            separators=(",", ":"),
+        )
+        + "\n"
+    )
+
+
+ENCODERS = {
+    ExportFormatEnum.PGN: game_to_pgn,
+    ExportFormatEnum.NDJSON: game_to_ndjson,
+}
+
+
+def encode_games(
+    games: list[Game], usernames: dict[int, str], export_format: ExportFormatEnum
+) -> bytes:
+    """Return chunk of games encoded in export format."""
+    encode = ENCODERS[export_format]
+    return "".join(encode(game, usernames) for game in games).encode()
+
+
+async def stream_games(
+    user_id: int,
+    export_format: ExportFormatEnum,
+    chunk_size: int,
+    gzip_level: int | None = None,
+    include_private: bool = False,
+) -> AsyncIterator[bytes]:
+    """Yield finished games of player, newest first, encoded in chunks.
+
+    Private games are included only if `include_private` is set. Output is
+    gzip stream if `gzip_level` is given; it is flushed after each chunk, so
+    client can decompress games as they arrive.
+    """
+    compressor = None if gzip_level is None else zlib.compressobj(gzip_level, wbits=31)
+    before = None
+    while True:
+        async with db_helper.session_factory() as session:
+            games = await get_player_games(
+                session, user_id, chunk_size, before, include_private
+            )
+            player_ids = {game.white_id for game in games}
+            player_ids |= {game.black_id for game in games}
+            usernames = await get_usernames(session, list(player_ids))
+        if games:
+            # Generating SAN replays every game, thread keeps event loop free.
+            data = await asyncio.to_thread(
+                encode_games, games, usernames, export_format
+            )
+            if compressor is not None:
+                data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield data
+        if len(games) < chunk_size:
+            break
+        before = (games[-1].created_at, games[-1].id)
+    if compressor is not None:
+        yield compressor.flush()
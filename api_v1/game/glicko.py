@@ -0,0 +1,163 @@
+"""Glicko-2 rating system computed over NumPy arrays.
+
+Whole rating period is computed at once: players are rows of `ratings`,
+`deviations` and `volatilities` arrays, games are rows of `players`,
+`opponents` and `scores` arrays (one row per side of game, see
+`game_sides`). Sums over opponents of each player are done with
+`np.bincount`, so no Python loop runs per player or per game.
+
+See http://www.glicko.net/glicko/glicko2.pdf for the algorithm.
+"""
+
+import numpy as np
+
+from api_v1.auth.constants import DEFAULT_RATING, DEFAULT_RATING_DEVIATION
+
+# Scale between Glicko and Glicko-2 rating units.
+GLICKO2_SCALE = 173.7178
+# Convergence tolerance of volatility iteration.
+VOLATILITY_EPSILON = 1e-6
+# Max iterations of volatility iteration, converges in far less in practice.
+VOLATILITY_MAX_ITERATIONS = 100
+
+
+def game_sides(
+    white: np.ndarray, black: np.ndarray, white_scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return `(players, opponents, scores)` with row per side of each game.
+
+    Args:
+        white (np.ndarray): Player index of white per game.
+        black (np.ndarray): Player index of black per game.
+        white_scores (np.ndarray): Score of white per game: 1, 0.5 or 0.
+
+    """
+    players = np.concatenate((white, black))
+    opponents = np.concatenate((black, white))
+    scores = np.concatenate((white_scores, 1.0 - white_scores))
+    return players, opponents, scores
+
+
+def rate_period(
+    ratings: np.ndarray,
+    deviations: np.ndarray,
+    volatilities: np.ndarray,
+    players: np.ndarray,
+    opponents: np.ndarray,
+    scores: np.ndarray,
+    tau: float = 0.5,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute ratings after rating period, input arrays are not changed.
+
+    Players without games keep rating and volatility, their deviation grows.
+
+    Args:
+        ratings (np.ndarray): Rating per player.
+        deviations (np.ndarray): Rating deviation per player.
+        volatilities (np.ndarray): Rating volatility per player.
+        players (np.ndarray): Player index per game side.
+        opponents (np.ndarray): Opponent index per game side.
+        scores (np.ndarray): Score of player per game side: 1, 0.5 or 0.
+        tau (float): System constant constraining volatility change.
+
+    Returns:
+        New ratings, deviations and volatilities.
+
+    """
+    count = len(ratings)
+    mu = (ratings - DEFAULT_RATING) / GLICKO2_SCALE
+    phi = deviations / GLICKO2_SCALE
+
+    g = 1.0 / np.sqrt(1.0 + 3.0 * phi[opponents] ** 2 / np.pi**2)
+    expected = 1.0 / (1.0 + np.exp(-g * (mu[players] - mu[opponents])))
+    information = np.bincount(
+        players, weights=g * g * expected * (1.0 - expected), minlength=count
+    )
+    improvement = np.bincount(players, weights=g * (scores - expected), minlength=count)
+
+    played = information > 0
+    variance = 1.0 / information[played]
+    delta = variance * improvement[played]
+
+    new_volatilities = volatilities.copy()
+    new_volatilities[played] = _new_volatility(
+        phi[played], volatilities[played], variance, delta, tau
+    )
+
+    phi_star = np.sqrt(phi**2 + new_volatilities**2)
+    new_phi = phi_star.copy()
+    new_phi[played] = 1.0 / np.sqrt(1.0 / phi_star[played] ** 2 + information[played])
+    new_mu = mu + new_phi**2 * improvement
+
+    new_ratings = new_mu * GLICKO2_SCALE + DEFAULT_RATING
+    new_deviations = np.minimum(new_phi * GLICKO2_SCALE, DEFAULT_RATING_DEVIATION)
+    return new_ratings, new_deviations, new_volatilities
+
+
+def _new_volatility(
+    phi: np.ndarray,
+    volatility: np.ndarray,
+    variance: np.ndarray,
+    delta: np.ndarray,
+    tau: float,
+) -> np.ndarray:
+    """Solve volatility equation by Illinois method for all players at once."""
+    a = np.log(volatility**2)
+    phi2 = phi**2
+    delta2 = delta**2
+
+    def f(x: np.ndarray, rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        ex = np.exp(x)
+        denominator = phi2[rows] + variance[rows] + ex
+        return (
+            ex * (delta2[rows] - denominator) / (2.0 * denominator**2)
+            - (x - a[rows]) / tau**2
+        )
+
+    upper = a.copy()
+    large = delta2 > phi2 + variance
+    upper[large] = np.log(delta2[large] - phi2[large] - variance[large])
+    small = ~large
+    if small.any():
+        rows = np.flatnonzero(small)
+        k = np.ones(len(rows))
+        while True:
+            below = f(a[rows] - k * tau, rows) < 0
+            if not below.any():
+                break
+            k[below] += 1
+        upper[rows] = a[rows] - k * tau
+    lower = a.copy()
+
+    f_lower = f(lower)
+    f_upper = f(upper)
+    active = np.flatnonzero(np.abs(upper - lower) > VOLATILITY_EPSILON)
+    for _ in range(VOLATILITY_MAX_ITERATIONS):
+        if not len(active):
+            break
+        lo, up = lower[active], upper[active]
+        f_lo, f_up = f_lower[active], f_upper[active]
+        new = lo + (lo - up) * f_lo / (f_up - f_lo)
+        f_new = f(new, active)
+        replace = f_new * f_up <= 0
+        lower[active] = np.where(replace, up, lo)
+        f_lower[active] = np.where(replace, f_up, f_lo / 2.0)
+        upper[active] = new
+        f_upper[active] = f_new
+        active = active[np.abs(new - lower[active]) > VOLATILITY_EPSILON]
+    return np.exp(lower / 2.0)
+
+
+def assign_ranks(
+    ratings: np.ndarray, rank_ids: np.ndarray, min_ratings: np.ndarray
+) -> np.ndarray:
+    """Return rank ID per player by rating thresholds, -1 below lowest rank.
+
+    Args:
+        ratings (np.ndarray): Rating per player.
+        rank_ids (np.ndarray): Rank IDs sorted by `min_ratings`.
+        min_ratings (np.ndarray): Ascending min rating of each rank.
+
+    """
+    index = np.searchsorted(min_ratings, ratings, side="right") - 1
+    return np.where(index >= 0, rank_ids[np.maximum(index, 0)], -1)
@@ -0,0 +1,976 @@
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import NamedTuple, Protocol
+
+from core.config import LiveGameSettings, settings
+from core.metrics import registry
+from core.singleflight import SingleFlight
+from core.timer_wheel import Timer, TimerWheel
+from logger import setup_logging
+
+from .clock import GameClock
+from .constants import (
+    BLACK,
+    NULL_MOVE,
+    SLOW_CONSUMER_CLOSE_CODE,
+    START_FEN,
+    WHITE,
+)
+from .enums import GameResultEnum, IncrementModeEnum
+from .events import EVENT_MOVE, EVENT_RESULT, GameEvent, GameEventBus
+from .exceptions import GameAccessError, IllegalMoveError
+from .frames import FrameLog, encode_delta, encode_snapshot
+from .move import move_to_uci
+from .openings import OUT_OF_BOOK, ROOT_NODE, Opening, OpeningBook
+from .position import Position
+from .repetition import RepetitionTracker
+from .rules import adjudicate
+from .shards import ShardPool
+from .tablebase import Tablebase
+
+log = setup_logging()
+
+_slow_consumers_counter = registry.counter(
+    "live_game_slow_consumers_total",
+    "Connections closed because their send queue overflowed or send timed out.",
+)
+_catch_ups_counter = registry.counter(
+    "live_game_catch_ups_total",
+    "Binary subscribers that fell behind and were sent snapshot instead.",
+)
+
+
+class Connection(Protocol):
+    """Outgoing side of WebSocket, as provided by `starlette.WebSocket`."""
+
+    async def send_text(self, data: str) -> None:
+        """Send text message."""
+
+    async def send_bytes(self, data: bytes) -> None:
+        """Send binary message."""
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        """Close connection."""
+
+
+class Subscriber:
+    """Connection subscribed to game, with bounded queue of outgoing messages.
+
+    Messages are written to socket by own writer task, so broadcasting never
+    waits for slow client. When queue overflows or one write takes longer
+    than `send_timeout`, subscriber is closed as slow consumer: memory used
+    by connection never exceeds `queue_size` messages. Binary subscriber
+    whose queue overflows is caught up instead: its pending frames are
+    replaced by snapshot of game and deltas made since.
+
+    Attributes:
+        connection (Connection): Underlying WebSocket.
+        user_id (int): ID of authenticated user.
+        binary (bool): Whether game events are sent as binary frames (see
+        `frames`) instead of JSON.
+        close_code (int): Code connection was closed with, None while open.
+
+    """
+
+    __slots__ = (
+        "_queue",
+        "_writer",
+        "binary",
+        "close_code",
+        "connection",
+        "send_timeout",
+        "user_id",
+    )
+
+    def __init__(
+        self,
+        connection: Connection,
+        user_id: int,
+        queue_size: int,
+        send_timeout: float,
+        binary: bool = False,
+    ):
+        self.connection = connection
+        self.user_id = user_id
+        self.send_timeout = send_timeout
+        self.binary = binary
+        self.close_code: int | None = None
+        self._queue: asyncio.Queue[str | bytes] = asyncio.Queue(queue_size)
+        self._writer: asyncio.Task[None] | None = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether subscriber no longer accepts messages."""
+        return self.close_code is not None
+
+    def start(self) -> None:
+        """Start writer task, must be called from running event loop."""
+        self._writer = asyncio.create_task(self._write_forever())
+
+    def offer(
+        self,
+        message: str | bytes,
+        catch_up: Callable[[], list[bytes]] | None = None,
+    ) -> bool:
+        """Queue message without waiting, return False if subscriber is closed.
+
+        Overflowing queue closes subscriber as slow consumer, unless
+        `catch_up` is given: pending messages are then replaced by frames it
+        returns, which must bring subscriber to current state.
+        """
+        if self.close_code is not None:
+            return False
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            if catch_up is not None and self.replace(catch_up()):
+                _catch_ups_counter.inc()
+                return True
+            _slow_consumers_counter.inc()
+            self.close(SLOW_CONSUMER_CLOSE_CODE)
+            return False
+        return True
+
+    def replace(self, messages: list[bytes]) -> bool:
+        """Drop pending messages and queue given ones, False if they do not fit."""
+        if len(messages) > self._queue.maxsize > 0:
+            return False
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        for message in messages:
+            self._queue.put_nowait(message)
+        return True
+
+    def close(self, code: int = 1000) -> None:
+        """Drop pending messages and close connection with code in background."""
+        if self.close_code is not None:
+            return
+        self.close_code = code
+        if self._writer is not None:
+            self._writer.cancel()
+
+    async def wait_closed(self) -> None:
+        """Close with normal code unless already closed and wait for writer."""
+        self.close()
+        if self._writer is not None:
+            await asyncio.wait([self._writer])
+
+    async def _write_forever(self) -> None:
+        connection = self.connection
+        try:
+            while self.close_code is None:
+                message = await self._queue.get()
+                async with asyncio.timeout(self.send_timeout):
+                    if isinstance(message, bytes):
+                        await connection.send_bytes(message)
+                    else:
+                        await connection.send_text(message)
+        except asyncio.CancelledError:
+            pass
+        except TimeoutError:
+            _slow_consumers_counter.inc()
+            self.close_code = SLOW_CONSUMER_CLOSE_CODE
+        except Exception:  # Peer is gone, nothing to close.
+            self.close_code = self.close_code or 1006
+            return
+        try:
+            await connection.close(self.close_code or 1000)
+        except Exception:  # Peer disconnected first.
+            pass
+
+
+class LiveGame:
+    """In-memory state of game being played, with its subscribers.
+
+    Players and spectators subscribe to game; every event is serialized once
+    to JSON and once to binary delta frame, and queued to all subscribers
+    without waiting for them. Binary subscribers join and catch up from
+    snapshot kept by `frames` log instead of state serialized for each.
+
+    Game with clock keeps flag timer of side to move on timer wheel, so time
+    running out is detected even if nobody moves; `on_timeout` is called
+    after game is lost on time.
+
+    Game may be live on several workers at once, when its subscribers are
+    connected to different ones. Moves and results made on this replica are
+    passed to `on_event` for other workers, which apply them with
+    `apply_event`.
+
+    Attributes:
+        game_id (int): ID of game.
+        white_id (int): ID of user playing white.
+        black_id (int): ID of user playing black.
+        initial_fen (str): Starting position if it is not standard (Optional).
+        position (Position): Current position.
+        moves (list[int]): Moves made in game.
+        result (GameResultEnum): Result of game, stored one for game loaded after
+        it ended.
+        subscribers (set[Subscriber]): Connected players and spectators.
+        spectators (int): Number of subscribed spectators.
+        clock (GameClock): Clock of game, None for untimed game (Optional).
+        is_private (bool): Whether only players may watch game.
+        frames (FrameLog): Snapshot and deltas for binary subscribers.
+        book (OpeningBook): Book game is classified by, None if it is not
+        classified (Optional).
+        opening (Opening): Deepest book opening game reached so far
+        (Optional).
+        tablebase (Tablebase): Tables adjudicating endgames, None if they
+        are not consulted (Optional).
+
+    """
+
+    def __init__(
+        self,
+        game_id: int,
+        white_id: int,
+        black_id: int,
+        initial_fen: str | None = None,
+        moves: Iterable[int] = (),
+        max_spectators: int = 1_000,
+        clock: GameClock | None = None,
+        timers: TimerWheel | None = None,
+        on_timeout: Callable[["LiveGame"], None] | None = None,
+        is_private: bool = False,
+        snapshot_interval: int = 32,
+        on_event: Callable[[GameEvent], None] | None = None,
+        book: OpeningBook | None = None,
+        result: GameResultEnum = GameResultEnum.ONGOING,
+        tablebase: Tablebase | None = None,
+    ):
+        self.game_id = game_id
+        self.tablebase = tablebase
+        self.white_id = white_id
+        self.black_id = black_id
+        self.initial_fen = initial_fen
+        self.max_spectators = max_spectators
+        self.is_private = is_private
+        self.frames = FrameLog(snapshot_interval)
+        self.position = Position(initial_fen or START_FEN)
+        self.repetitions = RepetitionTracker(self.position.key)
+        # Book lines start from standard position only.
+        self.book = book if initial_fen is None else None
+        self.opening: Opening | None = None
+        self._book_node = OUT_OF_BOOK if self.book is None else ROOT_NODE
+        self.moves: list[int] = []
+        for move in moves:
+            self.position.make_move(move)
+            self.repetitions.push(self.position.key)
+            self.moves.append(move)
+            self._follow_book(move)
+        self.result = result
+        self.subscribers: set[Subscriber] = set()
+        self.spectators = 0
+        self.clock = clock
+        self.timers = timers
+        self.on_timeout = on_timeout
+        self.on_event = on_event
+        self._flag_timer: Timer | None = None
+        # Stored result of ended game (resignation, timeout) is kept and its
+        # clock stays stopped.
+        if result == GameResultEnum.ONGOING:
+            self._update_result()
+            if clock is not None and self.moves:
+                # Resumed game: time server was down is not charged.
+                clock.side = self.position.side
+                clock.start(time.monotonic())
+            self._schedule_flag()
+
+    def color_of(self, user_id: int) -> int | None:
+        """Return color played by user, None for spectator."""
+        if user_id == self.white_id:
+            return WHITE
+        if user_id == self.black_id:
+            return BLACK
+        return None
+
+    def can_watch(self, user_id: int) -> bool:
+        """Whether user may subscribe to game, private games are for players."""
+        return not self.is_private or self.color_of(user_id) is not None
+
+    def join(self, subscriber: Subscriber) -> bool:
+        """Subscribe connection and queue current state to it.
+
+        Returns:
+            False if game already has `max_spectators` spectators, players are
+            always admitted.
+
+        Raises:
+            GameAccessError: If user may not watch private game.
+
+        """
+        if subscriber in self.subscribers:
+            return True
+        if not self.can_watch(subscriber.user_id):
+            raise GameAccessError("Game is private")
+        if self.color_of(subscriber.user_id) is None:
+            if self.spectators >= self.max_spectators:
+                return False
+            self.spectators += 1
+        self.subscribers.add(subscriber)
+        if subscriber.binary:
+            subscriber.replace(self.catch_up_frames())
+        else:
+            subscriber.offer(self.state_message())
+        return True
+
+    def leave(self, subscriber: Subscriber) -> None:
+        """Unsubscribe connection."""
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+            if self.color_of(subscriber.user_id) is None:
+                self.spectators -= 1
+
+    def play(self, user_id: int, uci: str, lag: float = 0.0) -> int:
+        """Make move of player given in UCI notation and broadcast it.
+
+        Args:
+            user_id (int): ID of user making move.
+            uci (str): Move in UCI notation.
+            lag (float): Network lag of move reported by client in seconds,
+            compensated on clock within lag quota.
+
+        Raises:
+            GameAccessError: If user is not player of game.
+            IllegalMoveError: If game is over, it is not user's turn, move
+            is illegal or player ran out of time (game is lost then).
+            MoveNotationError: If notation is malformed.
+
+        """
+        color = self._mover(user_id)
+        move = self.position.parse_uci(uci)
+        if self.clock is not None and not self.clock.press(
+            color, time.monotonic(), lag
+        ):
+            self._time_out()
+            raise IllegalMoveError("Time is up")
+        self._make_move(move)
+        self._update_result()
+        self._move_made(move)
+        return move
+
+    async def play_on(
+        self, shards: ShardPool, user_id: int, uci: str, lag: float = 0.0
+    ) -> int:
+        """Make move of player validated by shard owning game, like `play`.
+
+        Legal move generation and adjudication run in shard process; clock
+        is pressed as of time move was received.
+
+        Raises:
+            GameAccessError: If user is not player of game.
+            IllegalMoveError: If game is over, it is not user's turn, move
+            is illegal or player ran out of time (game is lost then).
+            MoveNotationError: If notation is malformed.
+            ShardError: If shard is not running.
+
+        """
+        color = self._mover(user_id)
+        received = time.monotonic()
+        ply = len(self.moves) + 1
+        move, result = await shards.play(self.game_id, ply, uci)
+        if self.result != GameResultEnum.ONGOING or len(self.moves) != ply - 1:
+            # Game ended or other move was applied while shard was deciding,
+            # shard is reloaded to drop move this replica did not make.
+            shards.load(self.game_id, self.initial_fen, self.moves)
+            raise IllegalMoveError(
+                "Not your turn"
+                if self.result == GameResultEnum.ONGOING
+                else "Game is over"
+            )
+        if self.clock is not None and not self.clock.press(color, received, lag):
+            shards.load(self.game_id, self.initial_fen, self.moves)
+            self._time_out()
+            raise IllegalMoveError("Time is up")
+        self._make_move(move)
+        self.result = result
+        self._move_made(move)
+        return move
+
+    def resign(self, user_id: int) -> None:
+        """Finish game as loss of resigning player and broadcast result.
+
+        Raises:
+            GameAccessError: If user is not player of game.
+            IllegalMoveError: If game is over.
+
+        """
+        color = self.color_of(user_id)
+        if color is None:
+            raise GameAccessError("Only players can resign")
+        if self.result != GameResultEnum.ONGOING:
+            raise IllegalMoveError("Game is over")
+        self.result = (
+            GameResultEnum.BLACK_WIN if color == WHITE else GameResultEnum.WHITE_WIN
+        )
+        self._schedule_flag()
+        self.broadcast(self.result_message(), self.delta_frame(NULL_MOVE))
+        self._publish(EVENT_RESULT, NULL_MOVE)
+
+    def apply_event(self, event: GameEvent, validate: bool = True) -> bool:
+        """Apply move or result made on replica of game on other worker.
+
+        Events already applied are ignored; event is applied only when it
+        follows last move of this replica. Worker that made event saves it.
+        Legality of move is checked unless `validate` is False, when it is
+        checked by shard instead.
+
+        Returns:
+            False if events before this one are missing or its move is not
+            legal here, replica has to be reloaded then.
+
+        """
+        if event.kind == EVENT_MOVE:
+            if event.ply <= len(self.moves):
+                return True
+            if (
+                event.ply > len(self.moves) + 1
+                or self.result != GameResultEnum.ONGOING
+                or (validate and event.move not in self.position.legal_moves())
+            ):
+                return False
+            self._make_move(event.move)
+        elif self.result != GameResultEnum.ONGOING:
+            return True
+        elif event.ply != len(self.moves):
+            return event.ply < len(self.moves)
+        self.result = event.result
+        if self.clock is not None and event.clocks_ms is not None:
+            white_ms, black_ms = event.clocks_ms
+            running = event.ply > 0 and self.result == GameResultEnum.ONGOING
+            self.clock.sync(
+                (white_ms / 1000, black_ms / 1000),
+                self.position.side,
+                time.monotonic() if running else None,
+            )
+        self._schedule_flag()
+        if event.kind == EVENT_MOVE:
+            self.broadcast(self.move_message(event.move), self.delta_frame(event.move))
+        else:
+            self.broadcast(self.result_message(), self.delta_frame(NULL_MOVE))
+        return True
+
+    def merge(
+        self,
+        moves: Sequence[int],
+        result: GameResultEnum,
+        clocks_ms: tuple[int, int] | None,
+    ) -> bool:
+        """Catch up with moves and result of game stored by other worker.
+
+        Returns:
+            False if stored moves do not continue moves of this replica.
+
+        """
+        for ply in range(len(self.moves), len(moves)):
+            last = ply + 1 == len(moves)
+            event = GameEvent(
+                self.game_id,
+                EVENT_MOVE,
+                ply + 1,
+                moves[ply],
+                clocks_ms if last else None,
+                result if last else GameResultEnum.ONGOING,
+            )
+            if not self.apply_event(event):
+                return False
+        if result != GameResultEnum.ONGOING:
+            self.apply_event(
+                GameEvent(
+                    self.game_id,
+                    EVENT_RESULT,
+                    len(self.moves),
+                    NULL_MOVE,
+                    clocks_ms,
+                    result,
+                )
+            )
+        return True
+
+    def broadcast(self, message: str, frame: bytes) -> None:
+        """Queue event to every subscriber, dropping closed ones.
+
+        Args:
+            message (str): Event as JSON for JSON subscribers.
+            frame (bytes): Event as delta frame for binary subscribers.
+
+        """
+        self.frames.append(frame)
+        catch_up = self.catch_up_frames
+        closed = [
+            subscriber
+            for subscriber in self.subscribers
+            if not (
+                subscriber.offer(frame, catch_up)
+                if subscriber.binary
+                else subscriber.offer(message)
+            )
+        ]
+        for subscriber in closed:
+            self.leave(subscriber)
+
+    def catch_up_frames(self) -> list[bytes]:
+        """Return snapshot and delta frames bringing subscriber to current state."""
+        return self.frames.catch_up(
+            lambda: encode_snapshot(
+                self.game_id,
+                self.moves,
+                self.initial_fen,
+                self.clock_times(),
+                self.result,
+            )
+        )
+
+    def delta_frame(self, move: int) -> bytes:
+        """Return binary event of move made in game, null move if none was."""
+        return encode_delta(len(self.moves), move, self.clock_times(), self.result)
+
+    def state_message(self) -> str:
+        """Return full state of game, sent to subscriber on join."""
+        return json.dumps(
+            {
+                "type": "state",
+                "game_id": self.game_id,
+                "initial_fen": self.initial_fen,
+                "moves": [move_to_uci(move) for move in self.moves],
+                "result": self.result.value,
+                "clocks": self.clock_times(),
+                "opening": self.opening_info(),
+            }
+        )
+
+    def move_message(self, move: int) -> str:
+        """Return event of move made in game."""
+        return json.dumps(
+            {
+                "type": "move",
+                "ply": len(self.moves),
+                "uci": move_to_uci(move),
+                "result": self.result.value,
+                "clocks": self.clock_times(),
+                "opening": self.opening_info(),
+            }
+        )
+
+    def result_message(self) -> str:
+        """Return event of game finished without move."""
+        return json.dumps(
+            {
+                "type": "result",
+                "result": self.result.value,
+                "clocks": self.clock_times(),
+            }
+        )
+
+    def opening_info(self) -> dict[str, str] | None:
+        """Return ECO code and name of opening, None if game is not in book."""
+        return None if self.opening is None else self.opening._asdict()
+
+    def clock_times(self) -> list[int] | None:
+        """Return milliseconds left of white and black, None for untimed game."""
+        if self.clock is None:
+            return None
+        now = time.monotonic()
+        return [
+            round(self.clock.time_left(color, now) * 1000) for color in (WHITE, BLACK)
+        ]
+
+    def _publish(self, kind: int, move: int) -> None:
+        """Pass event made on this replica to other workers."""
+        if self.on_event is None:
+            return
+        clocks_ms = None
+        if self.clock is not None:
+            white_ms, black_ms = (round(left * 1000) for left in self.clock.remaining)
+            clocks_ms = white_ms, black_ms
+        self.on_event(
+            GameEvent(self.game_id, kind, len(self.moves), move, clocks_ms, self.result)
+        )
+
+    def _schedule_flag(self) -> None:
+        """Put flag timer of side to move on wheel, stop clock of ended game."""
+        if self._flag_timer is not None:
+            self._flag_timer.cancel()
+            self._flag_timer = None
+        if self.clock is None:
+            return
+        if self.result != GameResultEnum.ONGOING:
+            self.clock.stop(time.monotonic())
+            return
+        deadline = self.clock.deadline()
+        if deadline is not None and self.timers is not None:
+            self._flag_timer = self.timers.schedule(deadline, self._check_flag)
+
+    @property
+    def clock_running(self) -> bool:
+        """Whether flag timer of side to move is pending."""
+        return self._flag_timer is not None and self._flag_timer.active
+
+    def _check_flag(self) -> None:
+        self._flag_timer = None
+        if self.result != GameResultEnum.ONGOING or self.clock is None:
+            return
+        if self.clock.flagged(time.monotonic()):
+            self._time_out()
+        else:
+            self._schedule_flag()
+
+    def _time_out(self) -> None:
+        """Finish game as loss of side to move, whose time ran out."""
+        self.result = (
+            GameResultEnum.BLACK_WIN
+            if self.position.side == WHITE
+            else GameResultEnum.WHITE_WIN
+        )
+        self._schedule_flag()
+        self.broadcast(self.result_message(), self.delta_frame(NULL_MOVE))
+        self._publish(EVENT_RESULT, NULL_MOVE)
+        if self.on_timeout is not None:
+            self.on_timeout(self)
+
+    def _mover(self, user_id: int) -> int:
+        """Return color of player allowed to move now.
+
+        Raises:
+            GameAccessError: If user is not player of game.
+            IllegalMoveError: If game is over or it is not user's turn.
+
+        """
+        color = self.color_of(user_id)
+        if color is None:
+            raise GameAccessError("Only players can make moves")
+        if self.result != GameResultEnum.ONGOING:
+            raise IllegalMoveError("Game is over")
+        if color != self.position.side:
+            raise IllegalMoveError("Not your turn")
+        return color
+
+    def _make_move(self, move: int) -> None:
+        self.position.make_move(move)
+        self.moves.append(move)
+        self.repetitions.push(self.position.key)
+        self._follow_book(move)
+
+    def _follow_book(self, move: int) -> None:
+        """Advance game in book trie, once per move until it leaves book."""
+        if self._book_node == OUT_OF_BOOK:
+            return
+        self._book_node = self.book.advance(self._book_node, move)
+        opening = self.book.opening_at(self._book_node)
+        if opening is not None:
+            self.opening = opening
+
+    def _move_made(self, move: int) -> None:
+        """Restart flag timer, broadcast and publish move just made."""
+        self._schedule_flag()
+        self.broadcast(self.move_message(move), self.delta_frame(move))
+        self._publish(EVENT_MOVE, move)
+
+    def _update_result(self) -> None:
+        self.result = adjudicate(self.position, self.repetitions, self.tablebase)
+
+
+class StoredState(NamedTuple):
+    """Moves, result and clocks of game as stored in database."""
+
+    moves: Sequence[int]
+    result: GameResultEnum
+    clocks_ms: tuple[int, int] | None
+
+
+class GameHub:
+    """Registry of live games served by this worker.
+
+    Flag timers of all clocks share one timer wheel, so tens of thousands of
+    running clocks cost one wakeup per tick instead of event loop timer each.
+
+    Attached `GameEventBus` connects replicas of games live on several
+    workers: events of local games are published to it and events of other
+    workers are applied to local replicas. Replica that missed events is
+    reloaded with `load_state` passed to `start`.
+
+    Attributes:
+        games (dict[int, LiveGame]): Live games by ID.
+        timers (TimerWheel): Wheel of flag timers of game clocks.
+        snapshot_interval (int): Moves after which snapshot for binary
+        subscribers is rebuilt.
+        idle_timeout (float): Time ongoing game whose clock is not running is
+        kept after its last subscriber leaves.
+        events (GameEventBus): Bus to other workers, None if not attached.
+        shards (ShardPool): Processes validating moves, None if moves are
+        validated in event loop.
+        book (OpeningBook): Book live games are classified by, None if not
+        attached.
+        tablebase (Tablebase): Tables adjudicating endgames of live games,
+        None if not attached.
+
+    """
+
+    def __init__(
+        self,
+        send_queue_size: int,
+        send_timeout: float,
+        max_spectators: int,
+        clock_tick: float = 0.05,
+        lag_quota_gain: float = 0.1,
+        max_lag_quota: float = 1.0,
+        snapshot_interval: int = 32,
+        idle_timeout: float = 300.0,
+    ):
+        self.send_queue_size = send_queue_size
+        self.send_timeout = send_timeout
+        self.max_spectators = max_spectators
+        self.lag_quota_gain = lag_quota_gain
+        self.max_lag_quota = max_lag_quota
+        self.snapshot_interval = snapshot_interval
+        self.idle_timeout = idle_timeout
+        self.games: dict[int, LiveGame] = {}
+        self.timers = TimerWheel("game_clocks", tick=clock_tick)
+        self.events: GameEventBus | None = None
+        self.shards: ShardPool | None = None
+        self.book: OpeningBook | None = None
+        self.tablebase: Tablebase | None = None
+        self._save_game: Callable[[LiveGame], Awaitable[None]] | None = None
+        self._load_state: Callable[[int], Awaitable[StoredState | None]] | None = None
+        self._resyncing: set[int] = set()
+        self._idle: dict[int, Timer] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._loads: SingleFlight[int, LiveGame | None] = SingleFlight("live_game")
+        registry.gauge("live_games", "Live games held in memory.").set_function(
+            lambda: len(self.games)
+        )
+        registry.gauge(
+            "live_game_connections", "WebSocket connections subscribed to live games."
+        ).set_function(
+            lambda: sum(len(game.subscribers) for game in self.games.values())
+        )
+
+    @classmethod
+    def from_settings(cls, config: LiveGameSettings) -> "GameHub":
+        """Create hub from live game settings."""
+        return cls(
+            send_queue_size=config.send_queue_size,
+            send_timeout=config.send_timeout_seconds,
+            max_spectators=config.max_spectators,
+            clock_tick=config.clock_tick_seconds,
+            lag_quota_gain=config.lag_quota_gain_seconds,
+            max_lag_quota=config.max_lag_quota_seconds,
+            snapshot_interval=config.snapshot_interval_plies,
+            idle_timeout=config.idle_game_timeout_seconds,
+        )
+
+    def start(
+        self,
+        save_game: Callable[[LiveGame], Awaitable[None]],
+        load_state: Callable[[int], Awaitable[StoredState | None]] | None = None,
+    ) -> None:
+        """Start flag timers.
+
+        Args:
+            save_game (Callable): Stores game lost on time.
+            load_state (Callable): Returns stored moves, result and clocks of
+            game by ID, used to reload replica that missed events (Optional).
+
+        """
+        self._save_game = save_game
+        self._load_state = load_state
+        self.timers.start()
+
+    def attach(self, events: GameEventBus) -> None:
+        """Exchange events of live games with other workers through bus."""
+        self.events = events
+        events.subscribe(self.apply_event)
+        events.on_resync(self.resync)
+
+    def attach_shards(self, shards: ShardPool) -> None:
+        """Validate moves of live games in shard processes from now on."""
+        self.shards = shards
+        for game in self.games.values():
+            shards.load(game.game_id, game.initial_fen, game.moves)
+
+    def attach_book(self, book: OpeningBook) -> None:
+        """Classify openings of games loaded from now on by opened book."""
+        self.book = book
+
+    def attach_tablebase(self, tablebase: Tablebase) -> None:
+        """Adjudicate endgames of games loaded from now on by tablebase."""
+        self.tablebase = tablebase
+
+    def hydrate(self, game_id: int) -> tuple[str | None, Sequence[int]] | None:
+        """Return initial FEN and moves of live game, to reload its shard."""
+        game = self.games.get(game_id)
+        return None if game is None else (game.initial_fen, game.moves)
+
+    async def play(
+        self, game: LiveGame, user_id: int, uci: str, lag: float = 0.0
+    ) -> int:
+        """Make move of player in game, on its shard if hub has shards.
+
+        Raises:
+            See `LiveGame.play_on`.
+
+        """
+        if self.shards is None:
+            return game.play(user_id, uci, lag)
+        return await game.play_on(self.shards, user_id, uci, lag)
+
+    def publish(self, event: GameEvent) -> None:
+        """Pass event of local replica to other workers."""
+        if self.events is not None:
+            self.events.publish(event)
+
+    def apply_event(self, event: GameEvent) -> None:
+        """Apply event of other worker to local replica of its game, if any."""
+        game = self.games.get(event.game_id)
+        if game is None:
+            return
+        if self.shards is None:
+            if not game.apply_event(event):
+                self._resync_game(event.game_id)
+            return
+        moves = len(game.moves)
+        if not game.apply_event(event, validate=False):
+            self._resync_game(event.game_id)
+        elif len(game.moves) > moves:
+            self.shards.apply(event.game_id, event.ply, event.move).add_done_callback(
+                lambda applied: self._check_applied(event.game_id, applied)
+            )
+
+    def _check_applied(self, game_id: int, applied: asyncio.Future[bool]) -> None:
+        """Resync game whose shard rejected move applied to replica."""
+        if applied.cancelled() or applied.exception() is not None:
+            return
+        if not applied.result():
+            log.warning("Shard rejected move of game %d made elsewhere", game_id)
+            self._resync_game(game_id)
+
+    def resync(self) -> None:
+        """Reload all local replicas, after events may have been lost."""
+        for game_id in list(self.games):
+            self._resync_game(game_id)
+
+    def subscriber(
+        self, connection: Connection, user_id: int, binary: bool = False
+    ) -> Subscriber:
+        """Create subscriber for connection with hub's limits."""
+        return Subscriber(
+            connection, user_id, self.send_queue_size, self.send_timeout, binary
+        )
+
+    def clock(
+        self,
+        initial: float,
+        increment: float,
+        mode: IncrementModeEnum,
+        remaining: tuple[float, float] | None = None,
+    ) -> GameClock:
+        """Create game clock with hub's lag compensation limits."""
+        return GameClock(
+            initial,
+            increment,
+            mode,
+            lag_quota_gain=self.lag_quota_gain,
+            max_lag_quota=self.max_lag_quota,
+            remaining=remaining,
+        )
+
+    def game_timed_out(self, game: LiveGame) -> None:
+        """Save game lost on time in background and drop it if nobody watches."""
+        if self._save_game is not None:
+            task = asyncio.create_task(self._save_game(game))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        self.release(game.game_id)
+
+    def _resync_game(self, game_id: int) -> None:
+        if self._load_state is None or game_id in self._resyncing:
+            return
+        self._resyncing.add(game_id)
+        task = asyncio.create_task(self._reload_state(game_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reload_state(self, game_id: int) -> None:
+        try:
+            state = await self._load_state(game_id)
+        except Exception:
+            log.exception("Reloading state of game %d failed", game_id)
+            return
+        finally:
+            self._resyncing.discard(game_id)
+        game = self.games.get(game_id)
+        if game is None or state is None:
+            return
+        if not game.merge(*state):
+            log.warning("Stored moves of game %d diverged from replica", game_id)
+        if self.shards is not None:
+            self.shards.load(game_id, game.initial_fen, game.moves)
+
+    async def get_or_load(
+        self, game_id: int, loader: Callable[[], Awaitable[LiveGame | None]]
+    ) -> LiveGame | None:
+        """Return live game, loading it once for concurrent callers if absent."""
+        if (game := self.games.get(game_id)) is not None:
+            return game
+        game = await self._loads.do(game_id, loader)
+        if game is None:
+            return None
+        # Concurrent load that finished earlier wins.
+        if game_id not in self.games:
+            self.games[game_id] = game
+            if self.shards is not None:
+                self.shards.load(game_id, game.initial_fen, game.moves)
+        return self.games[game_id]
+
+    def release(self, game_id: int) -> None:
+        """Drop game without subscribers from memory.
+
+        Finished game is dropped at once. Ongoing game whose clock is not
+        running, such as game before its first move, is dropped after
+        `idle_timeout` unless it is subscribed again meanwhile; game with
+        running clock is kept until it ends.
+        """
+        game = self.games.get(game_id)
+        if game is None or game.subscribers:
+            return
+        if game.result != GameResultEnum.ONGOING:
+            self._drop(game_id)
+        elif not game.clock_running:
+            if (timer := self._idle.pop(game_id, None)) is not None:
+                timer.cancel()
+            self._idle[game_id] = self.timers.call_later(
+                self.idle_timeout, lambda: self._evict_idle(game_id)
+            )
+
+    def _evict_idle(self, game_id: int) -> None:
+        """Drop game left idle, unless it was subscribed or clock started."""
+        self._idle.pop(game_id, None)
+        game = self.games.get(game_id)
+        if game is not None and not game.subscribers and not game.clock_running:
+            self._drop(game_id)
+
+    def _drop(self, game_id: int) -> None:
+        del self.games[game_id]
+        if (timer := self._idle.pop(game_id, None)) is not None:
+            timer.cancel()
+        if self.shards is not None:
+            self.shards.drop(game_id)
+
+    async def close(self) -> None:
+        """Stop clocks and close all connections as going away, on shutdown."""
+        await self.timers.stop()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        subscribers = [
+            subscriber
+            for game in self.games.values()
+            for subscriber in game.subscribers
+        ]
+        for subscriber in subscribers:
+            subscriber.close(1001)
+        await asyncio.gather(*(subscriber.wait_closed() for subscriber in subscribers))
+        self.games.clear()
+        self._idle.clear()
+
+
+game_hub = GameHub.from_settings(settings.live_game)
@@ -0,0 +1,120 @@
+"""Batch jobs of games, run by scheduler outside of API workers.
+
+Usage:
+    python -m api_v1.game.jobs rating-period
+    python -m api_v1.game.jobs leaderboard
+    python -m api_v1.game.jobs position-index
+    python -m api_v1.game.jobs tablebase
+    python -m api_v1.game.jobs opening-backfill
+    python -m api_v1.game.jobs player-stats
+"""
+
+import argparse
+import asyncio
+
+from core.config import BASE_DIR, settings
+from database.db_helper import db_helper
+from database.invalidation import invalidation_bus
+
+from .cache import PROFILE_EVENT
+from .constants import GENERATED_TABLEBASES
+from .openings import opening_book
+from .rating import run_rating_period
+from .retrograde import build_table
+from .services import backfill_openings, build_position_index
+from .stats import backfill_player_stats
+from .tablebase import TABLE_SUFFIX, Tablebase, write_table
+
+
+async def rating_period() -> None:
+    """Rate games finished since last rating period."""
+    async with db_helper.session_factory() as session:
+        summary = await run_rating_period(
+            session, tau=settings.rating.tau, batch_size=settings.rating.batch_size
+        )
+    print(f"Rated {summary.games} games, updated {summary.players} players")
+
+
+async def leaderboard() -> None:
+    """Make every worker rebuild its leaderboards from all profiles."""
+    async with db_helper.session_factory() as session:
+        await invalidation_bus.publish(session, PROFILE_EVENT)
+        await session.commit()
+    print("Requested leaderboard rebuild")
+
+
+async def position_index() -> None:
+    """Rebuild index of positions of finished games."""
+    async with db_helper.session_factory() as session:
+        rows = await build_position_index(session)
+    print(f"Indexed {rows} positions")
+
+
+async def tablebase() -> None:
+    """Generate pawnless endgame tables missing in tablebase directory."""
+    directory = BASE_DIR / settings.tablebase.directory
+    directory.mkdir(parents=True, exist_ok=True)
+    tables = Tablebase(directory)
+    for signature in GENERATED_TABLEBASES:
+        path = directory / f"{signature}{TABLE_SUFFIX}"
+        if path.exists():
+            continue
+        write_table(path, signature, build_table(signature, tables))
+        print(f"Generated {signature}")
+    tables.close()
+
+
+async def opening_backfill() -> None:
+    """Label stored games lacking opening with their ECO code."""
+    opening_book.open()
+    try:
+        async with db_helper.session_factory() as session:
+            games = await backfill_openings(
+                session, opening_book, settings.openings.backfill_batch_size
+            )
+    finally:
+        opening_book.close()
+    print(f"Labeled {games} games")
+
+
+async def player_stats() -> None:
+    """Count finished games not counted in player stats yet.
+
+    Games are counted under opening they are labeled with, so openings of
+    history are backfilled first.
+    """
+    await opening_backfill()
+    async with db_helper.session_factory() as session:
+        games = await backfill_player_stats(
+            session, settings.player_stats.backfill_batch_size
+        )
+    print(f"Counted {games} games")
+
+
+JOBS = {
+    "rating-period": rating_period,
+    "leaderboard": leaderboard,
+    "position-index": position_index,
+    "tablebase": tablebase,
+    "opening-backfill": opening_backfill,
+    "player-stats": player_stats,
+}
+
+
+def main() -> None:
+    """Run job given on command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("job", choices=sorted(JOBS))
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            await JOBS[args.job]()
+        finally:
+            await db_helper.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Durable journal of live game writes not yet stored in database.
+
+Every save of live game is appended to journal and synced to disk before it
+is acknowledged, then stored in database later in batch (see
+`write_behind`). Journal is split into numbered segment files; segment is
+deleted once all writes in it are stored, so journal holds only writes of
+last few flushes. After crash, writes left in journal are replayed.
+
+Each record holds full moves of game, so last record of game replaces all
+earlier ones and replay needs no ordering beyond file order:
+
+    record:  length u32 | CRC-32 of payload u32 | payload
+    payload: game ID u64 | result u8 | white ms i32 | black ms i32 |
+             moves (u16 each)
+
+Record cut short by crash fails its length or checksum and ends replay of
+its segment. Several workers on one host share journal directory: each
+takes first free slot subdirectory, held by file lock while worker runs, so
+slot of crashed worker is replayed by worker started after it.
+"""
+
+import asyncio
+import contextlib
+import fcntl
+import os
+import struct
+import zlib
+from collections.abc import Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+from logger import setup_logging
+
+from .encoding import MOVE_SIZE, decode_moves, encode_moves
+from .enums import GameResultEnum
+from .exceptions import JournalError
+from .frames import NO_CLOCK, RESULT_CODES, RESULTS
+
+log = setup_logging()
+
+_HEADER = struct.Struct("<II")
+_PAYLOAD = struct.Struct("<QBii")
+_SEGMENT_SUFFIX = ".journal"
+
+
+class GameWrite(NamedTuple):
+    """State of live game to store.
+
+    Attributes:
+        game_id (int): ID of game.
+        moves (Sequence[int]): All moves made in game.
+        result (GameResultEnum): Result of game.
+        clocks_ms (tuple[int, int]): Milliseconds left of white and black as of
+        last press of clock, None for untimed game.
+
+    """
+
+    game_id: int
+    moves: Sequence[int]
+    result: GameResultEnum
+    clocks_ms: tuple[int, int] | None
+
+
+def encode_record(write: GameWrite) -> bytes:
+    """Return journal record of write."""
+    white_ms, black_ms = write.clocks_ms or (NO_CLOCK, NO_CLOCK)
+    payload = _PAYLOAD.pack(
+        write.game_id, RESULT_CODES[write.result], white_ms, black_ms
+    ) + encode_moves(write.moves)
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_records(data: bytes) -> tuple[list[GameWrite], int]:
+    """Return writes of complete records in data and length they take."""
+    writes = []
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, checksum = _HEADER.unpack_from(data, offset)
+        payload = data[offset + _HEADER.size : offset + _HEADER.size + length]
+        if (
+            len(payload) != length
+            or length < _PAYLOAD.size
+            or (length - _PAYLOAD.size) % MOVE_SIZE
+            or zlib.crc32(payload) != checksum
+        ):
+            break
+        game_id, result, white_ms, black_ms = _PAYLOAD.unpack_from(payload)
+        if result >= len(RESULTS):
+            break
+        clocks_ms = None if white_ms == NO_CLOCK else (white_ms, black_ms)
+        moves = decode_moves(payload[_PAYLOAD.size :])
+        writes.append(GameWrite(game_id, moves, RESULTS[result], clocks_ms))
+        offset += _HEADER.size + length
+    return writes, offset
+
+
+class _Segment:
+    """Open segment file with group commit of appended records.
+
+    Records appended while sync runs are synced together by next one, so
+    concurrent writers share one `fsync` instead of queueing for their own.
+    """
+
+    __slots__ = ("_syncing", "fd", "number", "synced", "written")
+
+    def __init__(self, path: Path, number: int):
+        self.number = number
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self.written = 0
+        self.synced = 0
+        self._syncing: asyncio.Task[None] | None = None
+
+    def append(self, record: bytes) -> int:
+        """Write record to file, return its number to wait for in `sync`."""
+        os.write(self.fd, record)
+        self.written += 1
+        return self.written
+
+    async def sync(self, count: int) -> None:
+        """Wait until first `count` records are on disk."""
+        while self.synced < count:
+            if self._syncing is None:
+                self._syncing = asyncio.create_task(self._fsync())
+            await asyncio.shield(self._syncing)
+
+    async def _fsync(self) -> None:
+        written = self.written
+        try:
+            await asyncio.to_thread(os.fsync, self.fd)
+        finally:
+            self._syncing = None
+        self.synced = written
+
+
+class MoveJournal:
+    """Append-only journal of live game writes in directory on local disk.
+
+    Attributes:
+        directory (Path): Directory holding slot subdirectories.
+        fsync (bool): Whether append waits until record is on disk.
+        max_slots (int): Max workers sharing directory.
+        slot (Path): Subdirectory of this worker, None until opened.
+
+    """
+
+    def __init__(self, directory: str, fsync: bool = True, max_slots: int = 64):
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self.max_slots = max_slots
+        self.slot: Path | None = None
+        self._lock_fd: int | None = None
+        self._segment: _Segment | None = None
+
+    def open(self) -> list[GameWrite]:
+        """Take free slot and return writes left in it by previous worker.
+
+        Raises:
+            JournalError: If all `max_slots` slots are taken.
+
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for index in range(self.max_slots):
+            slot = self.directory / f"slot-{index}"
+            slot.mkdir(exist_ok=True)
+            fd = os.open(slot / "lock", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            self.slot, self._lock_fd = slot, fd
+            break
+        else:
+            raise JournalError(f"All {self.max_slots} journal slots are taken")
+        writes = []
+        segments = self._segments()
+        for _, path in segments:
+            data = path.read_bytes()
+            segment_writes, length = decode_records(data)
+            if length != len(data):
+                log.warning("Journal %s is cut at byte %d", path, length)
+            writes += segment_writes
+        number = segments[-1][0] + 1 if segments else 1
+        self._segment = _Segment(self._path(number), number)
+        return writes
+
+    async def append(self, write: GameWrite) -> None:
+        """Append write to journal, waiting until it is on disk if syncing.
+
+        Record is written before first suspension, so writes are journaled
+        in order of calls.
+        """
+        if self._segment is None:
+            raise RuntimeError("Journal is not open")
+        segment = self._segment
+        count = segment.append(encode_record(write))
+        if self.fsync:
+            await segment.sync(count)
+
+    async def rotate(self) -> int:
+        """Start new segment, return number of last closed one.
+
+        Records appended before call go to closed segment, later ones to new
+        one; closed segment is synced and closed before return.
+        """
+        if self._segment is None:
+            raise RuntimeError("Journal is not open")
+        closed = self._segment
+        self._segment = _Segment(self._path(closed.number + 1), closed.number + 1)
+        try:
+            if self.fsync:
+                await closed.sync(closed.written)
+        finally:
+            os.close(closed.fd)
+        return closed.number
+
+    def discard(self, number: int) -> None:
+        """Delete segments up to `number`, their writes are stored."""
+        for segment_number, path in self._segments():
+            if segment_number <= number:
+                path.unlink()
+
+    async def close(self) -> None:
+        """Sync and close current segment and release slot."""
+        if self._segment is not None:
+            segment, self._segment = self._segment, None
+            try:
+                if self.fsync:
+                    await segment.sync(segment.written)
+            finally:
+                os.close(segment.fd)
+        if self._lock_fd is not None:
+            with contextlib.suppress(OSError):
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            self.slot = None
+
+    def _segments(self) -> list[tuple[int, Path]]:
+        """Return numbers and paths of segment files in slot, oldest first."""
+        if self.slot is None:
+            return []
+        return sorted(
+            (int(path.stem), path)
+            for path in self.slot.glob(f"*{_SEGMENT_SUFFIX}")
+            if path.stem.isdigit()
+        )
+
+    def _path(self, number: int) -> Path:
+        return self.slot / f"{number:012d}{_SEGMENT_SUFFIX}"
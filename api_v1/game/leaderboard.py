@@ -0,0 +1,207 @@
+"""Leaderboards kept as order-statistic trees in worker memory.
+
+Players of leaderboard are kept in `SortedList` ordered by rating, highest
+first, with user ID breaking ties. `SortedList` is a B-tree-like list of
+sorted sublists with positional index, so rank of player, inserting,
+removing and locating page start all take O(log n).
+
+Pages are addressed by keyset cursor, `(rating, user_id)` of last player of
+previous page, instead of offset: next page starts right after that key
+even if players above it moved in between.
+"""
+
+import base64
+import binascii
+import math
+from collections.abc import Iterable
+from itertools import islice
+from typing import NamedTuple
+
+from sortedcontainers import SortedList
+
+from .exceptions import LeaderboardCursorError
+
+
+class LeaderboardEntry(NamedTuple):
+    """Player on leaderboard with their 1-based rank."""
+
+    rank: int
+    user_id: int
+    rating: float
+
+
+class PlayerRank(NamedTuple):
+    """Ranks of player on global leaderboard and leaderboard of their country."""
+
+    user_id: int
+    rating: float
+    rank: int
+    country_id: int
+    country_rank: int
+
+
+class Leaderboard:
+    """Players of one leaderboard sorted by rating, highest first."""
+
+    def __init__(self, ratings: Iterable[tuple[int, float]] = ()):
+        self._ratings: dict[int, float] = dict(ratings)
+        self._keys: SortedList = SortedList(
+            (-rating, user_id) for user_id, rating in self._ratings.items()
+        )
+
+    @classmethod
+    def from_sorted_keys(cls, keys: list[tuple[float, int]]) -> "Leaderboard":
+        """Create leaderboard from sorted `(-rating, user_id)` keys."""
+        board = cls()
+        board._ratings = {user_id: -negative for negative, user_id in keys}
+        board._keys.update(keys)
+        return board
+
+    def __len__(self):
+        return len(self._ratings)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._ratings
+
+    def update(self, user_id: int, rating: float) -> None:
+        """Add player or move them to new rating."""
+        old_rating = self._ratings.get(user_id)
+        if old_rating == rating:
+            return
+        if old_rating is not None:
+            self._keys.remove((-old_rating, user_id))
+        self._ratings[user_id] = rating
+        self._keys.add((-rating, user_id))
+
+    def remove(self, user_id: int) -> bool:
+        """Remove player, return False if they were not on leaderboard."""
+        rating = self._ratings.pop(user_id, None)
+        if rating is None:
+            return False
+        self._keys.remove((-rating, user_id))
+        return True
+
+    def rank(self, user_id: int) -> LeaderboardEntry | None:
+        """Return entry of player, None if they are not on leaderboard."""
+        rating = self._ratings.get(user_id)
+        if rating is None:
+            return None
+        return LeaderboardEntry(
+            self._keys.index((-rating, user_id)) + 1, user_id, rating
+        )
+
+    def page(
+        self, limit: int, after: tuple[float, int] | None = None
+    ) -> list[LeaderboardEntry]:
+        """Return up to `limit` players ranked below `after` cursor key.
+
+        Args:
+            limit (int): Max number of entries.
+            after (tuple[float, int], Optional): `(rating, user_id)` of last
+            entry of previous page, first page is returned if omitted.
+
+        """
+        start = 0 if after is None else self._keys.bisect_right((-after[0], after[1]))
+        return [
+            LeaderboardEntry(rank, user_id, -negative_rating)
+            for rank, (negative_rating, user_id) in enumerate(
+                islice(self._keys.islice(start), limit), start=start + 1
+            )
+        ]
+
+
+class Leaderboards:
+    """Global leaderboard and leaderboard of each country.
+
+    Attributes:
+        global_board (Leaderboard): All players.
+        countries (dict[int, Leaderboard]): Players by country ID.
+
+    """
+
+    def __init__(self, players: Iterable[tuple[int, int, float]] = ()):
+        self._countries: dict[int, int] = {}
+        keys = []
+        for user_id, country_id, rating in players:
+            self._countries[user_id] = country_id
+            keys.append((-rating, user_id))
+        # Sorted once here, so every leaderboard is built from sorted keys.
+        keys.sort()
+        by_country: dict[int, list[tuple[float, int]]] = {}
+        countries = self._countries
+        for key in keys:
+            by_country.setdefault(countries[key[1]], []).append(key)
+        self.global_board = Leaderboard.from_sorted_keys(keys)
+        self.countries = {
+            country_id: Leaderboard.from_sorted_keys(country_keys)
+            for country_id, country_keys in by_country.items()
+        }
+
+    def __len__(self):
+        return len(self.global_board)
+
+    def board(self, country_id: int | None = None) -> Leaderboard:
+        """Return leaderboard of country, or global one if country is None."""
+        if country_id is None:
+            return self.global_board
+        return self.countries.get(country_id) or Leaderboard()
+
+    def rank(self, user_id: int) -> PlayerRank | None:
+        """Return ranks of player, None if they are not on leaderboards."""
+        country_id = self._countries.get(user_id)
+        if country_id is None:
+            return None
+        entry = self.global_board.rank(user_id)
+        country_entry = self.countries[country_id].rank(user_id)
+        if entry is None or country_entry is None:
+            return None
+        return PlayerRank(
+            user_id, entry.rating, entry.rank, country_id, country_entry.rank
+        )
+
+    def update(self, user_id: int, country_id: int, rating: float) -> None:
+        """Add player or apply their new rating and country."""
+        old_country_id = self._countries.get(user_id)
+        if old_country_id is not None and old_country_id != country_id:
+            self._remove_from_country(user_id, old_country_id)
+        self._countries[user_id] = country_id
+        self.global_board.update(user_id, rating)
+        board = self.countries.get(country_id)
+        if board is None:
+            board = self.countries[country_id] = Leaderboard()
+        board.update(user_id, rating)
+
+    def remove(self, user_id: int) -> bool:
+        """Remove player from all leaderboards, return False if absent."""
+        country_id = self._countries.pop(user_id, None)
+        if country_id is None:
+            return False
+        self.global_board.remove(user_id)
+        self._remove_from_country(user_id, country_id)
+        return True
+
+    def _remove_from_country(self, user_id: int, country_id: int) -> None:
+        board = self.countries[country_id]
+        board.remove(user_id)
+        if not board:
+            del self.countries[country_id]
+
+
+def encode_cursor(entry: LeaderboardEntry) -> str:
+    """Return opaque cursor of page following given entry."""
+    # repr() of float round-trips exactly, so cursor key matches stored key.
+    raw = f"{entry.rating!r}:{entry.user_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    """Return `(rating, user_id)` key encoded in cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rating, user_id = raw.decode().split(":")
+        key = float(rating), int(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise LeaderboardCursorError("Invalid leaderboard cursor") from exc
+    if not math.isfinite(key[0]):
+        raise LeaderboardCursorError("Invalid leaderboard cursor")
+    return key
@@ -0,0 +1,342 @@
+"""Lobby of open seeks, pushed to connected players as diffs.
+
+Seek is open challenge: player waits for anyone of rating within seek's range
+to accept it with given time control. Seeks are kept in `SortedList` ordered
+by time control, then rating, so seeks of time control within rating range
+are found by one range scan, O(log n + k).
+
+Players browse lobby over WebSocket with filter of time control and rating
+range. On connect they receive all seeks matching filter, then only diffs:
+seek added or removed. Seek belongs to connection that posted it and is
+removed when that connection closes, so abandoned seeks never linger.
+
+Lobby is per worker process, like matchmaking queues: players see seeks
+posted on the same worker.
+"""
+
+import itertools
+import json
+import math
+import random
+from collections.abc import Awaitable, Callable, Iterator
+from typing import NamedTuple
+
+from sortedcontainers import SortedList
+
+from core.metrics import registry
+from logger import setup_logging
+
+from .exceptions import SeekError
+from .hub import Subscriber
+from .matchmaking import Match, TimeControl
+
+log = setup_logging()
+
+_seeks_counter = registry.counter(
+    "lobby_seeks_total", "Lobby seeks by how they were closed."
+)
+
+
+class SeekFilter(NamedTuple):
+    """Seeks shown to lobby subscriber.
+
+    Attributes:
+        time_control (TimeControl): Only seeks of this time control, all if
+        None (Optional).
+        min_rating (float): Min rating of seeking player (Optional).
+        max_rating (float): Max rating of seeking player (Optional).
+
+    """
+
+    time_control: TimeControl | None = None
+    min_rating: float | None = None
+    max_rating: float | None = None
+
+    def accepts(self, seek: "Seek") -> bool:
+        """Whether seek passes filter."""
+        return (
+            (self.time_control is None or seek.time_control == self.time_control)
+            and (self.min_rating is None or seek.rating >= self.min_rating)
+            and (self.max_rating is None or seek.rating <= self.max_rating)
+        )
+
+
+class Seek:
+    """Open challenge of player, waiting in lobby.
+
+    Attributes:
+        seek_id (int): ID of seek, unique in worker.
+        user_id (int): ID of seeking player.
+        username (str): Username of seeking player.
+        rating (float): Rating of seeking player.
+        time_control (TimeControl): Time control of game.
+        min_rating (float): Min rating of opponent (Optional).
+        max_rating (float): Max rating of opponent (Optional).
+        subscriber (Subscriber): Connection that posted seek.
+
+    """
+
+    __slots__ = (
+        "max_rating",
+        "min_rating",
+        "rating",
+        "seek_id",
+        "subscriber",
+        "time_control",
+        "user_id",
+        "username",
+    )
+
+    def __init__(
+        self,
+        seek_id: int,
+        user_id: int,
+        username: str,
+        rating: float,
+        time_control: TimeControl,
+        subscriber: Subscriber,
+        min_rating: float | None = None,
+        max_rating: float | None = None,
+    ):
+        self.seek_id = seek_id
+        self.user_id = user_id
+        self.username = username
+        self.rating = rating
+        self.time_control = time_control
+        self.subscriber = subscriber
+        self.min_rating = min_rating
+        self.max_rating = max_rating
+
+    @property
+    def key(self) -> tuple[int, int, float, int]:
+        """Sort key of seek in index."""
+        initial, increment = self.time_control
+        return initial, increment, self.rating, self.seek_id
+
+    def admits(self, rating: float) -> bool:
+        """Whether player of rating may accept seek."""
+        return (self.min_rating is None or rating >= self.min_rating) and (
+            self.max_rating is None or rating <= self.max_rating
+        )
+
+    def as_dict(self) -> dict:
+        """Return seek as sent to lobby subscribers."""
+        return {
+            "seek_id": self.seek_id,
+            "user_id": self.user_id,
+            "username": self.username,
+            "rating": round(self.rating),
+            "initial": self.time_control.initial,
+            "increment": self.time_control.increment,
+            "min_rating": self.min_rating,
+            "max_rating": self.max_rating,
+        }
+
+
+class SeekIndex:
+    """Seeks sorted by time control and rating."""
+
+    def __init__(self):
+        self._keys: SortedList = SortedList()
+        self._seeks: dict[int, Seek] = {}
+        self._time_controls: dict[TimeControl, int] = {}
+
+    def __len__(self):
+        return len(self._seeks)
+
+    def get(self, seek_id: int) -> Seek | None:
+        """Return seek by ID, None if it is not open."""
+        return self._seeks.get(seek_id)
+
+    def add(self, seek: Seek) -> None:
+        """Add seek to index."""
+        self._seeks[seek.seek_id] = seek
+        self._keys.add(seek.key)
+        count = self._time_controls.get(seek.time_control, 0)
+        self._time_controls[seek.time_control] = count + 1
+
+    def remove(self, seek_id: int) -> Seek | None:
+        """Remove seek from index, return it or None if it was not open."""
+        seek = self._seeks.pop(seek_id, None)
+        if seek is None:
+            return None
+        self._keys.remove(seek.key)
+        count = self._time_controls.pop(seek.time_control) - 1
+        if count:
+            self._time_controls[seek.time_control] = count
+        return seek
+
+    def query(self, seek_filter: SeekFilter) -> Iterator[Seek]:
+        """Yield seeks passing filter, by time control then rating.
+
+        Each time control costs one range scan of seeks within rating range.
+        """
+        if seek_filter.time_control is not None:
+            time_controls = [seek_filter.time_control]
+        else:
+            time_controls = sorted(self._time_controls)
+        low = -math.inf if seek_filter.min_rating is None else seek_filter.min_rating
+        high = math.inf if seek_filter.max_rating is None else seek_filter.max_rating
+        for initial, increment in time_controls:
+            for key in self._keys.irange(
+                (initial, increment, low), (initial, increment, high, math.inf)
+            ):
+                yield self._seeks[key[-1]]
+
+
+class Lobby:
+    """Open seeks of this worker and connections browsing them.
+
+    Attributes:
+        seeks (SeekIndex): Open seeks.
+
+    """
+
+    def __init__(self, rng: random.Random | None = None):
+        self.seeks = SeekIndex()
+        self._ids = itertools.count(1)
+        self._rng = rng or random.Random()
+        self._subscribers: dict[Subscriber, SeekFilter] = {}
+        self._user_seeks: dict[int, int] = {}
+        self._create_game: Callable[[Match], Awaitable[int]] | None = None
+        registry.gauge("lobby_seeks", "Open seeks in lobby.").set_function(
+            lambda: len(self.seeks)
+        )
+        registry.gauge(
+            "lobby_connections", "WebSocket connections browsing lobby."
+        ).set_function(lambda: len(self._subscribers))
+
+    def start(self, create_game: Callable[[Match], Awaitable[int]]) -> None:
+        """Accept seeks, `create_game` stores game and returns ID."""
+        self._create_game = create_game
+
+    def stop(self) -> None:
+        """Close all lobby connections, dropping their seeks."""
+        for subscriber in list(self._subscribers):
+            subscriber.close(1001)
+            self.leave(subscriber)
+
+    def join(self, subscriber: Subscriber, seek_filter: SeekFilter) -> None:
+        """Subscribe connection and queue seeks passing its filter to it."""
+        self._subscribers[subscriber] = seek_filter
+        seeks = [seek.as_dict() for seek in self.seeks.query(seek_filter)]
+        subscriber.offer(json.dumps({"type": "seeks", "seeks": seeks}))
+
+    def leave(self, subscriber: Subscriber) -> None:
+        """Unsubscribe connection and remove seek it posted."""
+        if self._subscribers.pop(subscriber, None) is None:
+            return
+        seek_id = self._user_seeks.get(subscriber.user_id)
+        if seek_id is not None and self.seeks.get(seek_id).subscriber is subscriber:
+            self._close(seek_id, "expired")
+
+    def seek(
+        self,
+        subscriber: Subscriber,
+        username: str,
+        rating: float,
+        time_control: TimeControl,
+        min_rating: float | None = None,
+        max_rating: float | None = None,
+    ) -> Seek:
+        """Post seek of subscribed player, replacing their previous one.
+
+        Raises:
+            SeekError: If connection is not subscribed or rating range is
+            empty.
+
+        """
+        if subscriber not in self._subscribers:
+            raise SeekError("Connection is not in lobby")
+        if None not in (min_rating, max_rating) and min_rating > max_rating:
+            raise SeekError("Rating range is empty")
+        self.cancel(subscriber.user_id)
+        seek = Seek(
+            next(self._ids),
+            subscriber.user_id,
+            username,
+            rating,
+            time_control,
+            subscriber,
+            min_rating,
+            max_rating,
+        )
+        self._add(seek)
+        return seek
+
+    def cancel(self, user_id: int) -> bool:
+        """Remove seek of player, return False if they had none."""
+        seek_id = self._user_seeks.get(user_id)
+        if seek_id is None:
+            return False
+        self._close(seek_id, "cancelled")
+        return True
+
+    async def accept(self, subscriber: Subscriber, rating: float, seek_id: int) -> int:
+        """Accept seek, create game and notify both players, return game ID.
+
+        Seek is removed before game is created, so it is accepted once. If
+        game can not be created, seek is put back while its connection is
+        open and player's own seek is kept.
+
+        Raises:
+            SeekError: If seek is not open, is player's own, player's rating
+            is out of its range or game can not be created.
+
+        """
+        if self._create_game is None:
+            raise RuntimeError("Lobby is not started")
+        seek = self.seeks.get(seek_id)
+        if seek is None:
+            raise SeekError("Seek is no longer open")
+        if seek.user_id == subscriber.user_id:
+            raise SeekError("Can not accept own seek")
+        if not seek.admits(rating):
+            raise SeekError("Rating is out of range of seek")
+        self._remove(seek_id)
+        players = [seek.user_id, subscriber.user_id]
+        self._rng.shuffle(players)
+        try:
+            game_id = await self._create_game(Match(*players, seek.time_control))
+        except Exception as exc:
+            log.exception("Game of seek %d could not be created", seek_id)
+            if (
+                seek.subscriber in self._subscribers
+                and seek.user_id not in self._user_seeks
+            ):
+                self._add(seek)
+            raise SeekError("Game could not be created, try again") from exc
+        _seeks_counter.inc(outcome="accepted")
+        self.cancel(subscriber.user_id)
+        message = json.dumps({"type": "game", "game_id": game_id})
+        for player in (seek.subscriber, subscriber):
+            player.offer(message)
+        return game_id
+
+    def _add(self, seek: Seek) -> None:
+        self.seeks.add(seek)
+        self._user_seeks[seek.user_id] = seek.seek_id
+        self._broadcast(seek, json.dumps({"type": "add", "seek": seek.as_dict()}))
+
+    def _remove(self, seek_id: int) -> None:
+        seek = self.seeks.remove(seek_id)
+        if self._user_seeks.get(seek.user_id) == seek_id:
+            del self._user_seeks[seek.user_id]
+        self._broadcast(seek, json.dumps({"type": "remove", "seek_id": seek_id}))
+
+    def _close(self, seek_id: int, outcome: str) -> None:
+        self._remove(seek_id)
+        _seeks_counter.inc(outcome=outcome)
+
+    def _broadcast(self, seek: Seek, message: str) -> None:
+        """Queue diff of seek to subscribers whose filter it passes."""
+        closed = [
+            subscriber
+            for subscriber, seek_filter in self._subscribers.items()
+            if seek_filter.accepts(seek) and not subscriber.offer(message)
+        ]
+        for subscriber in closed:
+            self.leave(subscriber)
+
+
+lobby = Lobby()
@@ -0,0 +1,345 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
+
+from sortedcontainers import SortedList
+
+from core.config import MatchmakingSettings, settings
+from core.metrics import registry
+
+_matches_counter = registry.counter(
+    "matchmaking_matches_total", "Pairs of players matched per time control."
+)
+
+
+class TimeControl(NamedTuple):
+    """Clock settings of game: initial time and increment per move in seconds."""
+
+    initial: int
+    increment: int
+
+    def __str__(self):
+        return f"{self.initial}+{self.increment}"
+
+
+class Match(NamedTuple):
+    """Pair of players found by matchmaking."""
+
+    white_id: int
+    black_id: int
+    time_control: TimeControl
+
+
+class Ticket:
+    """Player waiting in matchmaking queue.
+
+    Attributes:
+        user_id (int): ID of waiting user.
+        rating (float): Rating of user when queued.
+        joined_at (float): Monotonic time user was queued.
+        last_seen (float): Monotonic time user last polled for match.
+
+    """
+
+    __slots__ = ("joined_at", "last_seen", "rating", "user_id")
+
+    def __init__(self, user_id: int, rating: float, joined_at: float):
+        self.user_id = user_id
+        self.rating = rating
+        self.joined_at = joined_at
+        self.last_seen = joined_at
+
+    @property
+    def key(self) -> tuple[float, int]:
+        """Sort key of ticket in queue."""
+        return self.rating, self.user_id
+
+
+class MatchQueue:
+    """Players of one time control waiting for opponent, sorted by rating.
+
+    Players are paired when their ratings differ by no more than search window
+    of either of them; window grows with waiting time, so player who waits
+    longer accepts wider range of opponents. Opponent is always one of two
+    nearest neighbours by rating, so adding, removing and pairing player take
+    O(log n).
+
+    Attributes:
+        time_control (TimeControl): Time control of queued players.
+
+    """
+
+    def __init__(
+        self,
+        time_control: TimeControl,
+        initial_window: float,
+        window_growth: float,
+        max_window: float,
+        rng: random.Random | None = None,
+    ):
+        self.time_control = time_control
+        self.initial_window = initial_window
+        self.window_growth = window_growth
+        self.max_window = max_window
+        self._rng = rng or random.Random()
+        self._ratings: SortedList = SortedList()
+        self._tickets: dict[int, Ticket] = {}
+
+    def __len__(self):
+        return len(self._tickets)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._tickets
+
+    def window(self, ticket: Ticket, now: float) -> float:
+        """Return current search window of waiting player."""
+        window = self.initial_window + self.window_growth * (now - ticket.joined_at)
+        return min(window, self.max_window)
+
+    def add(self, user_id: int, rating: float, now: float) -> Match | None:
+        """Pair player with waiting opponent or queue them.
+
+        Player already in queue keeps their place and is only marked as seen.
+        """
+        if (ticket := self._tickets.get(user_id)) is not None:
+            ticket.last_seen = now
+            return None
+        ticket = Ticket(user_id, rating, now)
+        if (opponent := self._find_opponent(ticket, now)) is not None:
+            self._discard(opponent)
+            return self._match(ticket, opponent)
+        self._tickets[user_id] = ticket
+        self._ratings.add(ticket.key)
+        return None
+
+    def touch(self, user_id: int, now: float) -> bool:
+        """Mark waiting player as seen, return False if they are not queued."""
+        if (ticket := self._tickets.get(user_id)) is None:
+            return False
+        ticket.last_seen = now
+        return True
+
+    def remove(self, user_id: int) -> bool:
+        """Remove player from queue, return False if they were not queued."""
+        if (ticket := self._tickets.get(user_id)) is None:
+            return False
+        self._discard(ticket)
+        return True
+
+    def sweep(self, now: float) -> list[Match]:
+        """Pair waiting players whose search windows grew, oldest first."""
+        matches = []
+        for ticket in list(self._tickets.values()):
+            if ticket.user_id not in self._tickets:
+                continue
+            if (opponent := self._find_opponent(ticket, now)) is not None:
+                self._discard(ticket)
+                self._discard(opponent)
+                matches.append(self._match(ticket, opponent))
+        return matches
+
+    def expire(self, idle_before: float) -> list[int]:
+        """Remove players not seen since given time, return their IDs."""
+        expired = [
+            ticket
+            for ticket in self._tickets.values()
+            if ticket.last_seen < idle_before
+        ]
+        for ticket in expired:
+            self._discard(ticket)
+        return [ticket.user_id for ticket in expired]
+
+    def _find_opponent(self, ticket: Ticket, now: float) -> Ticket | None:
+        ratings = self._ratings
+        index = ratings.bisect_left(ticket.key)
+        window = self.window(ticket, now)
+        best = None
+        best_diff = 0.0
+        # Nearest neighbours: ticket itself may be at `index` if it is queued.
+        for position in (index - 1, index, index + 1):
+            if position < 0 or position >= len(ratings):
+                continue
+            rating, user_id = ratings[position]
+            if user_id == ticket.user_id:
+                continue
+            candidate = self._tickets[user_id]
+            diff = abs(rating - ticket.rating)
+            if diff > max(window, self.window(candidate, now)):
+                continue
+            if best is None or diff < best_diff:
+                best, best_diff = candidate, diff
+        return best
+
+    def _discard(self, ticket: Ticket) -> None:
+        del self._tickets[ticket.user_id]
+        self._ratings.remove(ticket.key)
+
+    def _match(self, first: Ticket, second: Ticket) -> Match:
+        _matches_counter.inc(time_control=str(self.time_control))
+        if self._rng.getrandbits(1):
+            first, second = second, first
+        return Match(first.user_id, second.user_id, self.time_control)
+
+
+class Matchmaker:
+    """Matchmaking queues of this worker, one per time control.
+
+    Players wait for match by long polling: `find_game` waits until player
+    is paired and game is created, or until timeout, keeping player's place
+    in queue between polls. Background task pairs waiting players as their
+    search windows grow and removes players who stopped polling.
+
+    Queues are per worker process, players are matched only with players
+    connected to the same worker.
+
+    Attributes:
+        queues (dict[TimeControl, MatchQueue]): Queues by time control.
+
+    """
+
+    def __init__(
+        self,
+        initial_window: float,
+        window_growth: float,
+        max_window: float,
+        sweep_interval: float,
+        idle_timeout: float,
+    ):
+        self.initial_window = initial_window
+        self.window_growth = window_growth
+        self.max_window = max_window
+        self.sweep_interval = sweep_interval
+        self.idle_timeout = idle_timeout
+        self.queues: dict[TimeControl, MatchQueue] = {}
+        self._queued: dict[int, TimeControl] = {}
+        self._waiters: dict[int, asyncio.Future[int | None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._create_game: Callable[[Match], Awaitable[int]] | None = None
+        self._sweeper: asyncio.Task[None] | None = None
+        registry.gauge(
+            "matchmaking_queued", "Players waiting in matchmaking queues."
+        ).set_function(lambda: len(self._queued))
+
+    @classmethod
+    def from_settings(cls, config: MatchmakingSettings) -> "Matchmaker":
+        """Create matchmaker from matchmaking settings."""
+        return cls(
+            initial_window=config.initial_window,
+            window_growth=config.window_growth,
+            max_window=config.max_window,
+            sweep_interval=config.sweep_interval_seconds,
+            idle_timeout=config.idle_timeout_seconds,
+        )
+
+    def start(self, create_game: Callable[[Match], Awaitable[int]]) -> None:
+        """Start background pairing, `create_game` stores game and returns ID."""
+        self._create_game = create_game
+        self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self) -> None:
+        """Stop background pairing and wake waiting players with no game."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for future in self._waiters.values():
+            if not future.done():
+                future.set_result(None)
+        self._waiters.clear()
+        self._queued.clear()
+        self.queues.clear()
+
+    async def find_game(
+        self, user_id: int, rating: float, time_control: TimeControl, timeout: float
+    ) -> int | None:
+        """Queue player (or keep them queued) and wait for game.
+
+        Returns:
+            ID of created game, or None if no opponent was found within timeout.
+
+        """
+        if self._queued.get(user_id) not in (None, time_control):
+            self.leave(user_id)
+        future = self._waiters.get(user_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[user_id] = future
+            self._queued[user_id] = time_control
+            match = self._queue(time_control).add(user_id, rating, time.monotonic())
+            if match is not None:
+                self._start_game(match)
+        else:
+            self._queue(time_control).touch(user_id, time.monotonic())
+        try:
+            async with asyncio.timeout(timeout):
+                return await asyncio.shield(future)
+        except TimeoutError:
+            return None
+        finally:
+            if future.done() and self._waiters.get(user_id) is future:
+                del self._waiters[user_id]
+
+    def leave(self, user_id: int) -> bool:
+        """Remove player from queue, return False if they were not queued."""
+        time_control = self._queued.pop(user_id, None)
+        if time_control is None:
+            return False
+        self.queues[time_control].remove(user_id)
+        self._wake(user_id)
+        return True
+
+    def _wake(self, user_id: int) -> None:
+        """Finish wait of player removed from queue without game."""
+        future = self._waiters.pop(user_id, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def _queue(self, time_control: TimeControl) -> MatchQueue:
+        queue = self.queues.get(time_control)
+        if queue is None:
+            queue = MatchQueue(
+                time_control, self.initial_window, self.window_growth, self.max_window
+            )
+            self.queues[time_control] = queue
+        return queue
+
+    def _start_game(self, match: Match) -> None:
+        for user_id in (match.white_id, match.black_id):
+            del self._queued[user_id]
+        task = asyncio.create_task(self._notify(match))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _notify(self, match: Match) -> None:
+        futures = [
+            self._waiters.get(user_id) for user_id in (match.white_id, match.black_id)
+        ]
+        try:
+            if self._create_game is None:
+                raise RuntimeError("Matchmaker is not started")
+            game_id = await self._create_game(match)
+        except Exception as exc:  # Delivered to both players.
+            for future in futures:
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+            return
+        for future in futures:
+            if future is not None and not future.done():
+                future.set_result(game_id)
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            now = time.monotonic()
+            for queue in list(self.queues.values()):
+                for user_id in queue.expire(now - self.idle_timeout):
+                    self._queued.pop(user_id, None)
+                    self._wake(user_id)
+                for match in queue.sweep(now):
+                    self._start_game(match)
+
+
+matchmaker = Matchmaker.from_settings(settings.matchmaking)
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from api_v1.auth.models import Profile, User
+from database.base import Base
+from mixins import TimestampMixin
+
+from .constants import MAX_LENGTH_ECO, MAX_LENGTH_FEN, MAX_LENGTH_PGN_SOURCE
+from .enums import ColorEnum, GameResultEnum, GameSpeedEnum, IncrementModeEnum
+
+
+class Game(TimestampMixin, Base):
+    """Represents chess game played between two users.
+
+    Moves are stored as packed 16-bit move codes (see `encoding`) instead of
+    PGN text: two bytes per ply and no parsing on read.
+
+    Attributes:
+        white_id (int): ID of user playing white.
+        black_id (int): ID of user playing black.
+        result (GameResultEnum): Result of game. Default is ongoing.
+        time_control_initial (int): Initial clock time in seconds.
+        time_control_increment (int): Increment per move in seconds.
+        increment_mode (IncrementModeEnum): How increment is added to clock.
+        Default is Fischer.
+        white_clock_ms (int): Milliseconds left of white after their last
+        move, None until game is saved with clock (Optional).
+        black_clock_ms (int): Milliseconds left of black after their last
+        move, None until game is saved with clock (Optional).
+        initial_fen (str): Starting position if it is not standard (Optional).
+        is_private (bool): Whether game is hidden from everyone but its
+        players. Default is False.
+        moves (bytes): Packed little-endian 16-bit move codes.
+        version (int): Incremented by every write of live game, so worker
+        updates row only if nobody wrote it since worker read it. Default
+        is 0.
+        eco (str): ECO code of deepest book opening game reached, None if
+        game is out of book or starts from other position.
+        stats_counted (bool): Whether finished game is counted in player
+        stats. Default is False.
+        rated_at (datetime): Timestamp of rating period that included finished
+        game, None until then.
+        created_at (datetime): Timestamp created game. Submitted from:
+        TimestampMixin.
+        updated_at (datetime): Timestamp updated game. Submitted from:
+        TimestampMixin.
+
+    Relationships:
+        white (User): Many-To-One relationship with `User` playing white.
+        black (User): Many-To-One relationship with `User` playing black.
+
+    Indexes:
+        idx_games_white_newest, idx_games_black_newest: Games of player,
+        newest first.
+        idx_games_unrated: Finished games waiting for rating period.
+        idx_games_uncounted: Finished games not counted in player stats.
+
+    """
+
+    __tablename__ = "games"
+
+    white_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    black_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    result: Mapped[GameResultEnum] = mapped_column(
+        Enum(GameResultEnum, name="game_result_enum"),
+        default=GameResultEnum.ONGOING,
+    )
+    time_control_initial: Mapped[int] = mapped_column()
+    time_control_increment: Mapped[int] = mapped_column(default=0)
+    increment_mode: Mapped[IncrementModeEnum] = mapped_column(
+        Enum(IncrementModeEnum, name="increment_mode_enum"),
+        default=IncrementModeEnum.FISCHER,
+        server_default=IncrementModeEnum.FISCHER.name,
+    )
+    white_clock_ms: Mapped[Optional[int]] = mapped_column(default=None)
+    black_clock_ms: Mapped[Optional[int]] = mapped_column(default=None)
+    initial_fen: Mapped[Optional[str]] = mapped_column(String(MAX_LENGTH_FEN))
+    is_private: Mapped[bool] = mapped_column(default=False, server_default="false")
+    moves: Mapped[bytes] = mapped_column(LargeBinary, default=b"")
+    version: Mapped[int] = mapped_column(default=0, server_default="0")
+    eco: Mapped[Optional[str]] = mapped_column(String(MAX_LENGTH_ECO), default=None)
+    stats_counted: Mapped[bool] = mapped_column(default=False, server_default="false")
+    rated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), default=None
+    )
+
+    white: Mapped[User] = relationship(foreign_keys=[white_id])
+    black: Mapped[User] = relationship(foreign_keys=[black_id])
+
+    def __repr__(self):
+        return f"<Game({self.id=}, {self.white_id=}, {self.black_id=}, {self.result})>"
+
+
+Index(
+    "idx_games_white_newest",
+    Game.white_id,
+    Game.created_at.desc(),
+    Game.id.desc(),
+)
+Index(
+    "idx_games_black_newest",
+    Game.black_id,
+    Game.created_at.desc(),
+    Game.id.desc(),
+)
+Index(
+    "idx_games_unrated",
+    Game.id,
+    postgresql_where=(Game.rated_at.is_(None))
+    & (Game.result != GameResultEnum.ONGOING),
+)
+Index(
+    "idx_games_uncounted",
+    Game.id,
+    postgresql_where=(Game.stats_counted.is_(False))
+    & (Game.result != GameResultEnum.ONGOING),
+)
+
+
+class GamePosition(Base):
+    """Represents position reached in game, keyed by Zobrist hash.
+
+    Index is built from stored games (see `services.build_position_index`)
+    so games containing position are found with one indexed lookup. Only
+    first occurrence of each position in game is stored, so
+    `(zobrist_key, game_id)` is primary key and no surrogate ID is kept.
+
+    Attributes:
+        zobrist_key (int): Zobrist key of position as signed 64-bit integer
+        (see `zobrist.to_signed`).
+        game_id (int): ID of game.
+        ply (int): Number of halfmoves made in game before position occurred.
+
+    Indexes:
+        Primary key: Games by position, newest first by backward scan.
+        idx_game_positions_game_id: Rows of game, for rebuilding and deletion.
+
+    """
+
+    __tablename__ = "game_positions"
+
+    id = None
+    zobrist_key: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    game_id: Mapped[int] = mapped_column(
+        ForeignKey("games.id", ondelete="CASCADE"), primary_key=True
+    )
+    ply: Mapped[int] = mapped_column(SmallInteger)
+
+    def __repr__(self):
+        return f"<GamePosition({self.zobrist_key=}, {self.game_id=}, {self.ply=})>"
+
+
+Index("idx_game_positions_game_id", GamePosition.game_id)
+
+
+class PlayerStats(Base):
+    """Represents results of player in games of one speed, color and opening.
+
+    Counters are incremented when game finishes (see `stats`), so stats of
+    player are read by one index range scan of their rows, however many
+    games they played.
+
+    Attributes:
+        profile_id (int): ID of player profile.
+        speed (GameSpeedEnum): Speed of games.
+        color (ColorEnum): Color player played.
+        eco (str): ECO code of opening, empty for games out of book.
+        wins (int): Games won. Default is 0.
+        draws (int): Games drawn. Default is 0.
+        losses (int): Games lost. Default is 0.
+
+    Relationships:
+        profile (Profile): Many-To-One relationship with `Profile` model.
+
+    """
+
+    __tablename__ = "player_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "profile_id", "speed", "color", "eco", name="idx_unique_player_stats"
+        ),
+    )
+
+    profile_id: Mapped[int] = mapped_column(
+        ForeignKey("profiles.id", ondelete="CASCADE")
+    )
+    speed: Mapped[GameSpeedEnum] = mapped_column(
+        Enum(GameSpeedEnum, name="game_speed_enum")
+    )
+    color: Mapped[ColorEnum] = mapped_column(Enum(ColorEnum, name="color_enum"))
+    eco: Mapped[str] = mapped_column(String(MAX_LENGTH_ECO), default="")
+    wins: Mapped[int] = mapped_column(default=0, server_default="0")
+    draws: Mapped[int] = mapped_column(default=0, server_default="0")
+    losses: Mapped[int] = mapped_column(default=0, server_default="0")
+
+    profile: Mapped[Profile] = relationship()
+
+    def __repr__(self):
+        return (
+            f"<PlayerStats({self.profile_id=}, {self.speed}, {self.color}, "
+            f"{self.eco=})>"
+        )
+
+
+class PgnImport(TimestampMixin, Base):
+    """Represents progress of importing PGN file into games.
+
+    Checkpoint is updated in the same transaction as games of each chunk, so
+    interrupted import resumes from `offset` without losing or duplicating
+    games.
+
+    Attributes:
+        source (str): Absolute path of imported file.
+        offset (int): Byte offset in file up to which games are imported.
+        games (int): Number of imported games.
+        skipped (int): Number of valid games not imported because player is
+        not registered or game is not finished.
+        rejected (int): Number of games that could not be parsed or contain
+        illegal moves.
+        created_at (datetime): Timestamp import started. Submitted from:
+        TimestampMixin.
+        updated_at (datetime): Timestamp of last checkpoint. Submitted from:
+        TimestampMixin.
+
+    """
+
+    __tablename__ = "pgn_imports"
+
+    source: Mapped[str] = mapped_column(String(MAX_LENGTH_PGN_SOURCE), unique=True)
+    offset: Mapped[int] = mapped_column(BigInteger, default=0)
+    games: Mapped[int] = mapped_column(default=0)
+    skipped: Mapped[int] = mapped_column(default=0)
+    rejected: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self):
+        return f"<PgnImport({self.source=}, {self.offset=}, {self.games=})>"
@@ -0,0 +1,59 @@
+from .constants import (
+    CAPTURE,
+    EN_PASSANT,
+    KNIGHT,
+    MOVE_FLAG_SHIFT,
+    MOVE_FROM_MASK,
+    MOVE_TO_SHIFT,
+    PROMOTION,
+    SQUARE_NAMES,
+)
+
+PROMOTION_SYMBOLS = "nbrq"
+
+
+def encode_move(from_square: int, to_square: int, flag: int = 0) -> int:
+    """Pack move into 16-bit code: from (6 bits), to (6 bits) and flag (4 bits)."""
+    return from_square | to_square << MOVE_TO_SHIFT | flag << MOVE_FLAG_SHIFT
+
+
+def move_from(move: int) -> int:
+    """Return origin square of move."""
+    return move & MOVE_FROM_MASK
+
+
+def move_to(move: int) -> int:
+    """Return destination square of move."""
+    return move >> MOVE_TO_SHIFT & MOVE_FROM_MASK
+
+
+def move_flag(move: int) -> int:
+    """Return 4-bit flag of move."""
+    return move >> MOVE_FLAG_SHIFT
+
+
+def is_capture(move: int) -> bool:
+    """Check whether move captures piece (including en passant)."""
+    return bool(move >> MOVE_FLAG_SHIFT & CAPTURE)
+
+
+def is_en_passant(move: int) -> bool:
+    """Check whether move is en passant capture."""
+    return move >> MOVE_FLAG_SHIFT == EN_PASSANT
+
+
+def promotion_piece_type(move: int) -> int | None:
+    """Return piece type pawn is promoted to, or None for other moves."""
+    flag = move >> MOVE_FLAG_SHIFT
+    if flag & PROMOTION:
+        return KNIGHT + (flag & 3)
+    return None
+
+
+def move_to_uci(move: int) -> str:
+    """Return move in UCI notation, e.g. `e2e4` or `e7e8q`."""
+    uci = SQUARE_NAMES[move & MOVE_FROM_MASK] + SQUARE_NAMES[move_to(move)]
+    promotion = promotion_piece_type(move)
+    if promotion is not None:
+        uci += PROMOTION_SYMBOLS[promotion - KNIGHT]
+    return uci
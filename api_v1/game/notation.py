@@ -0,0 +1,146 @@
+import re
+from collections.abc import Iterable
+
+from .constants import (
+    BLACK,
+    CAPTURE,
+    FILE_NAMES,
+    KING,
+    KING_CASTLE,
+    KNIGHT,
+    PAWN,
+    PROMOTION,
+    QUEEN_CASTLE,
+    SQUARE_NAMES,
+    START_FEN,
+    WHITE,
+)
+from .exceptions import IllegalMoveError, MoveNotationError
+from .position import Position
+
+PIECE_LETTERS = "PNBRQK"
+
+SAN_REGEX = re.compile(
+    r"^(?P<piece>[NBRQK])?(?P<file>[a-h])?(?P<rank>[1-8])?x?"
+    r"(?P<to>[a-h][1-8])(?:=?(?P<promotion>[NBRQ]))?$"
+)
+_CASTLING_SAN = {"O-O": KING_CASTLE, "O-O-O": QUEEN_CASTLE}
+_SAN_SUFFIXES = "+#!?"
+
+
+def move_to_san(position: Position, move: int) -> str:
+    """Return move in Standard Algebraic Notation, move must be legal."""
+    from_square = move & 63
+    to_square = move >> 6 & 63
+    flag = move >> 12
+
+    if flag == KING_CASTLE:
+        san = "O-O"
+    elif flag == QUEEN_CASTLE:
+        san = "O-O-O"
+    else:
+        piece_type = position.board[from_square] % 6
+        capture = "x" if flag & CAPTURE else ""
+        if piece_type == PAWN:
+            san = (FILE_NAMES[from_square & 7] + capture) if capture else ""
+            san += SQUARE_NAMES[to_square]
+            if flag & PROMOTION:
+                san += "=" + PIECE_LETTERS[KNIGHT + (flag & 3)]
+        else:
+            san = PIECE_LETTERS[piece_type]
+            if piece_type != KING:
+                san += _disambiguation(position, move, piece_type)
+            san += capture + SQUARE_NAMES[to_square]
+
+    position.make_move(move)
+    if position.is_check():
+        san += "+" if position.legal_moves() else "#"
+    position.unmake_move()
+    return san
+
+
+def _disambiguation(position: Position, move: int, piece_type: int) -> str:
+    from_square = move & 63
+    to_square = move >> 6 & 63
+    board = position.board
+    rivals = [
+        other & 63
+        for other in position.legal_moves()
+        if other >> 6 & 63 == to_square
+        and other & 63 != from_square
+        and board[other & 63] % 6 == piece_type
+    ]
+    if not rivals:
+        return ""
+    square_name = SQUARE_NAMES[from_square]
+    if all(rival & 7 != from_square & 7 for rival in rivals):
+        return square_name[0]
+    if all(rival >> 3 != from_square >> 3 for rival in rivals):
+        return square_name[1]
+    return square_name
+
+
+def parse_san(position: Position, san: str) -> int:
+    """Return legal move given in Standard Algebraic Notation.
+
+    Raises:
+        MoveNotationError: If notation is malformed.
+        IllegalMoveError: If no legal move or more than one matches.
+
+    """
+    text = san.rstrip(_SAN_SUFFIXES).replace("0", "O")
+    legal_moves = position.legal_moves()
+
+    castle_flag = _CASTLING_SAN.get(text)
+    if castle_flag is not None:
+        for move in legal_moves:
+            if move >> 12 == castle_flag:
+                return move
+        raise IllegalMoveError(f"Illegal move {san!r} in position {position.fen()!r}")
+
+    match = SAN_REGEX.match(text)
+    if match is None:
+        raise MoveNotationError(f"Invalid SAN move: {san!r}")
+    piece_type = PIECE_LETTERS.index(match["piece"] or "P")
+    to_square = SQUARE_NAMES.index(match["to"])
+    from_file = FILE_NAMES.index(match["file"]) if match["file"] else -1
+    from_rank = int(match["rank"]) - 1 if match["rank"] else -1
+    promotion = PIECE_LETTERS.index(match["promotion"]) if match["promotion"] else 0
+
+    board = position.board
+    found = -1
+    for move in legal_moves:
+        from_square = move & 63
+        flag = move >> 12
+        if (
+            move >> 6 & 63 != to_square
+            or board[from_square] % 6 != piece_type
+            or flag == KING_CASTLE
+            or flag == QUEEN_CASTLE
+            or (from_file >= 0 and from_square & 7 != from_file)
+            or (from_rank >= 0 and from_square >> 3 != from_rank)
+        ):
+            continue
+        move_promotion = KNIGHT + (flag & 3) if flag & PROMOTION else 0
+        if move_promotion != promotion:
+            continue
+        if found >= 0:
+            raise IllegalMoveError(f"Ambiguous move {san!r} in {position.fen()!r}")
+        found = move
+    if found < 0:
+        raise IllegalMoveError(f"Illegal move {san!r} in position {position.fen()!r}")
+    return found
+
+
+def moves_to_movetext(moves: Iterable[int], initial_fen: str | None = None) -> str:
+    """Return PGN movetext (`1. e4 e5 2. Nf3 ...`) for moves from initial position."""
+    position = Position(initial_fen or START_FEN)
+    tokens = []
+    for index, move in enumerate(moves):
+        if position.side == WHITE:
+            tokens.append(f"{position.fullmove_number}.")
+        elif index == 0 and position.side == BLACK:
+            tokens.append(f"{position.fullmove_number}...")
+        tokens.append(move_to_san(position, move))
+        position.make_move(move)
+    return " ".join(tokens)
@@ -0,0 +1,309 @@
+"""Classification of games by opening, over trie of book lines.
+
+Book lines are compiled once from tab-separated source (`eco`, `name`,
+`pgn` columns) into trie over move codes, stored as flat arrays:
+
+    header:  magic "OPB1" | version u8 | pad u24 | depth u32 | nodes u32 |
+             edges u32 | openings u32 | names size u32 | pad u32
+    edges:   keys (parent node << 16 | move, u64 each, sorted),
+             child node of each key (u32 each)
+    nodes:   opening of node (i32 each, -1 if no line ends there)
+    names:   ECO codes (3 bytes each), offsets of names (u32 each,
+             openings + 1), names as UTF-8
+
+Every section starts at multiple of 8 bytes. Node 0 is root, position
+before first move. Child of node is found by binary search of its key, so
+compiled book is used as it lies in file: it is memory-mapped read-only and
+its pages are shared by all workers of host.
+
+Game is labeled with opening of deepest book node its moves reach. Live
+game follows trie one move at a time; stored games are classified in
+batches, one vectorized search per ply for the whole batch.
+"""
+
+import csv
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from core.config import BASE_DIR, OpeningSettings, settings
+
+from .constants import MAX_LENGTH_ECO
+from .exceptions import IllegalMoveError, MoveNotationError, OpeningBookError
+from .notation import parse_san
+from .pgn import MOVE_NUMBER_REGEX
+from .position import Position
+
+ROOT_NODE = 0
+OUT_OF_BOOK = -1
+
+_MAGIC = b"OPB1"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBxxxIIIIIxxxx")
+_MOVE_BITS = np.uint64(16)
+
+
+class Opening(NamedTuple):
+    """Opening of book.
+
+    Attributes:
+        eco (str): ECO code, e.g. `C65`.
+        name (str): Name of opening and its variation.
+
+    """
+
+    eco: str
+    name: str
+
+
+def _aligned(size: int) -> int:
+    return -(-size // 8) * 8
+
+
+def compile_book(source: str | Path, target: str | Path) -> None:
+    """Compile book lines of source file into trie file.
+
+    Target is written to temporary file first and moved in place, so
+    workers compiling book at once never read half-written one.
+
+    Raises:
+        OpeningBookError: If line of source is malformed or repeated.
+
+    """
+    keys: dict[int, int] = {}
+    labels = [-1]
+    ecos: list[bytes] = []
+    names: list[bytes] = []
+    depth = 0
+    with open(source, newline="", encoding="utf-8") as file:
+        for number, row in enumerate(csv.DictReader(file, delimiter="\t"), 2):
+            eco, name, pgn = row.get("eco"), row.get("name"), row.get("pgn")
+            if not eco or len(eco) != MAX_LENGTH_ECO or not eco.isascii() or not name:
+                raise OpeningBookError(f"{source}:{number}: invalid opening")
+            position = Position()
+            node = ROOT_NODE
+            sans = MOVE_NUMBER_REGEX.sub(" ", pgn or "").split()
+            for san in sans:
+                try:
+                    move = parse_san(position, san)
+                except (IllegalMoveError, MoveNotationError) as exc:
+                    raise OpeningBookError(f"{source}:{number}: {exc}") from exc
+                position.make_move(move)
+                key = node << 16 | move
+                if key not in keys:
+                    keys[key] = len(labels)
+                    labels.append(-1)
+                node = keys[key]
+            if node == ROOT_NODE or labels[node] >= 0:
+                raise OpeningBookError(f"{source}:{number}: line is empty or repeated")
+            labels[node] = len(ecos)
+            ecos.append(eco.encode("ascii"))
+            names.append(name.encode("utf-8"))
+            depth = max(depth, len(sans))
+
+    edge_keys = sorted(keys)
+    name_offsets = np.cumsum([0] + [len(name) for name in names])
+    sections = [
+        np.array(edge_keys, dtype="<u8"),
+        np.array([keys[key] for key in edge_keys], dtype="<u4"),
+        np.array(labels, dtype="<i4"),
+        np.frombuffer(b"".join(ecos), dtype=np.uint8),
+        name_offsets.astype("<u4"),
+        np.frombuffer(b"".join(names), dtype=np.uint8),
+    ]
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        depth,
+        len(labels),
+        len(edge_keys),
+        len(ecos),
+        int(name_offsets[-1]),
+    )
+    target = Path(target)
+    temporary = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(temporary, "wb") as file:
+        file.write(header)
+        for section in sections:
+            data = section.tobytes()
+            file.write(data.ljust(_aligned(len(data)), b"\0"))
+    os.replace(temporary, target)
+
+
+class OpeningBook:
+    """Compiled trie of book lines, memory-mapped read-only.
+
+    Attributes:
+        path (Path): Compiled book file.
+        source (Path): Source of book lines, compiled into `path` on open when
+        newer than it (Optional).
+        depth (int): Plies of longest book line.
+
+    """
+
+    def __init__(self, path: str | Path, source: str | Path | None = None):
+        self.path = Path(path)
+        self.source = None if source is None else Path(source)
+        self._map: mmap.mmap | None = None
+        self._reset()
+
+    @classmethod
+    def from_settings(cls, config: OpeningSettings) -> "OpeningBook":
+        """Create book from opening settings, paths relative to project."""
+        return cls(BASE_DIR / config.book_path, BASE_DIR / config.source)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether book file is mapped."""
+        return self._map is not None
+
+    def open(self) -> None:
+        """Compile book if source is newer, then map it.
+
+        Raises:
+            OpeningBookError: If source or compiled book is malformed.
+
+        """
+        if self._map is not None:
+            return
+        if self.source is not None and (
+            not self.path.exists()
+            or self.path.stat().st_mtime < self.source.stat().st_mtime
+        ):
+            compile_book(self.source, self.path)
+        with open(self.path, "rb") as file:
+            book = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, depth, nodes, edges, openings, names_size = (
+                _HEADER.unpack_from(book)
+            )
+        except struct.error as exc:
+            book.close()
+            raise OpeningBookError(f"{self.path} is not opening book") from exc
+        layout = (
+            ("<u8", edges),
+            ("<u4", edges),
+            ("<i4", nodes),
+            ("u1", openings * MAX_LENGTH_ECO),
+            ("<u4", openings + 1),
+            ("u1", names_size),
+        )
+        size = _HEADER.size + sum(
+            _aligned(np.dtype(dtype).itemsize * count) for dtype, count in layout
+        )
+        if magic != _MAGIC or version != _VERSION or len(book) < size:
+            book.close()
+            raise OpeningBookError(f"{self.path} is not opening book")
+        sections = []
+        offset = _HEADER.size
+        for dtype, count in layout:
+            sections.append(np.frombuffer(book, dtype, count, offset))
+            offset += _aligned(sections[-1].nbytes)
+        self._map = book
+        self.depth = depth
+        (
+            self._keys,
+            self._children,
+            self._labels,
+            self._ecos,
+            self._name_offsets,
+            self._names,
+        ) = sections
+
+    def close(self) -> None:
+        """Unmap book file."""
+        if self._map is None:
+            return
+        book = self._map
+        # Arrays over map must be released before it is closed.
+        self._reset()
+        book.close()
+
+    def advance(self, node: int, move: int) -> int:
+        """Return node reached by move from node, `OUT_OF_BOOK` if none."""
+        if node < 0:
+            return OUT_OF_BOOK
+        key = np.uint64(node << 16 | move)
+        index = int(np.searchsorted(self._keys, key))
+        if index == len(self._keys) or self._keys[index] != key:
+            return OUT_OF_BOOK
+        return int(self._children[index])
+
+    def opening_at(self, node: int) -> Opening | None:
+        """Return opening whose line ends at node, None if none does."""
+        if node < 0:
+            return None
+        label = int(self._labels[node])
+        return None if label < 0 else self.opening(label)
+
+    def opening(self, label: int) -> Opening:
+        """Return opening by its index in book."""
+        offset = label * MAX_LENGTH_ECO
+        eco = self._ecos[offset : offset + MAX_LENGTH_ECO].tobytes()
+        start, end = self._name_offsets[label : label + 2]
+        name = self._names[start:end].tobytes()
+        return Opening(eco.decode("ascii"), name.decode("utf-8"))
+
+    def classify(self, moves: Sequence[int]) -> Opening | None:
+        """Return opening of deepest book line game follows, None if none."""
+        node = ROOT_NODE
+        found = None
+        for move in moves[: self.depth]:
+            node = self.advance(node, move)
+            if node < 0:
+                break
+            found = self.opening_at(node) or found
+        return found
+
+    def classify_many(self, games: Sequence[Sequence[int]]) -> list[Opening | None]:
+        """Return openings of games, like `classify`, searching all at once.
+
+        Moves of games within book depth are laid out as matrix, and each ply
+        children of all games still in book are found by one vectorized
+        binary search.
+        """
+        count = len(games)
+        if not len(self._keys):
+            return [None] * count
+        matrix = np.zeros((count, self.depth), dtype=np.uint64)
+        lengths = np.zeros(count, dtype=np.int64)
+        for row, moves in enumerate(games):
+            line = moves[: self.depth]
+            matrix[row, : len(line)] = line
+            lengths[row] = len(line)
+        labels = np.full(count, -1, dtype=np.int64)
+        nodes = np.zeros(count, dtype=np.uint64)
+        active = np.arange(count)
+        last = len(self._keys) - 1
+        for ply in range(self.depth):
+            active = active[lengths[active] > ply]
+            if not active.size:
+                break
+            keys = nodes[active] << _MOVE_BITS | matrix[active, ply]
+            found = np.minimum(np.searchsorted(self._keys, keys), last)
+            hit = self._keys[found] == keys
+            active = active[hit]
+            children = self._children[found[hit]]
+            nodes[active] = children
+            reached = self._labels[children]
+            labeled = reached >= 0
+            labels[active[labeled]] = reached[labeled]
+        return [None if label < 0 else self.opening(label) for label in labels.tolist()]
+
+    def _reset(self) -> None:
+        self._map = None
+        self.depth = 0
+        self._keys = np.empty(0, dtype="<u8")
+        self._children = np.empty(0, dtype="<u4")
+        self._labels = np.empty(0, dtype="<i4")
+        self._ecos = np.empty(0, dtype=np.uint8)
+        self._name_offsets = np.empty(0, dtype="<u4")
+        self._names = np.empty(0, dtype=np.uint8)
+
+
+opening_book = OpeningBook.from_settings(settings.openings)
@@ -0,0 +1,223 @@
+"""Streaming PGN reader for large archives.
+
+File is memory-mapped and cut into byte ranges of about `chunk_bytes`,
+each ending right before start of game, so ranges are parsed independently
+by process pool. Every worker maps the file itself and receives only
+offsets, so games are never copied between processes and memory of each
+process holds one range at a time; mapped pages are backed by file and
+dropped by OS under pressure, so memory stays flat on files larger than RAM.
+
+Game starts at tag line (`[`) following blank line. Games not separated by
+blank line are read as one game and rejected.
+"""
+
+import asyncio
+import mmap
+import os
+import re
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import NamedTuple
+
+from .constants import START_FEN
+from .encoding import encode_moves
+from .enums import GameResultEnum
+from .exceptions import (
+    FenValidationError,
+    IllegalMoveError,
+    MoveNotationError,
+    PgnFormatError,
+)
+from .notation import parse_san
+from .position import Position
+
+# Blank line followed by tag line: boundary between two games.
+GAME_BOUNDARY = re.compile(rb"\n[ \t\r]*\n(?=\[)")
+TEXT_GAME_BOUNDARY = re.compile(GAME_BOUNDARY.pattern.decode())
+TAG_REGEX = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]\s*$', re.MULTILINE)
+COMMENT_REGEX = re.compile(r"\{[^}]*\}|;[^\n]*|^%[^\n]*", re.MULTILINE)
+VARIATION_REGEX = re.compile(r"\([^()]*\)")
+NAG_REGEX = re.compile(r"\$\d+")
+MOVE_NUMBER_REGEX = re.compile(r"\d+\.(?:\.\.)?")
+RESULTS = {result.value: result for result in GameResultEnum}
+
+
+class ParsedGame(NamedTuple):
+    """Game read from PGN with moves validated and encoded for storage."""
+
+    white: str
+    black: str
+    result: GameResultEnum
+    played_on: date | None
+    time_control_initial: int
+    time_control_increment: int
+    initial_fen: str | None
+    moves: bytes
+
+
+class ParsedChunk(NamedTuple):
+    """Games of byte range `[start, end)` of file and number of rejected."""
+
+    start: int
+    end: int
+    games: list[ParsedGame]
+    rejected: int
+
+
+def game_start(data: mmap.mmap | bytes, offset: int) -> int:
+    """Return offset of first game starting at or after `offset`."""
+    if offset <= 0:
+        return 0
+    match = GAME_BOUNDARY.search(data, offset)
+    return len(data) if match is None else match.end()
+
+
+def chunk_ranges(
+    data: mmap.mmap | bytes, start: int, chunk_bytes: int
+) -> Iterator[tuple[int, int]]:
+    """Cut data from `start` into ranges of whole games of about `chunk_bytes`."""
+    size = len(data)
+    while start < size:
+        end = game_start(data, start + chunk_bytes)
+        yield start, end
+        start = end
+
+
+def split_games(text: str) -> list[str]:
+    """Split PGN text into games."""
+    games = TEXT_GAME_BOUNDARY.split(text.lstrip("\ufeff"))
+    return [game for game in games if game.strip()]
+
+
+def parse_game(text: str) -> ParsedGame:
+    """Parse and validate one PGN game.
+
+    Raises:
+        PgnFormatError: If game has no result or player tags.
+        FenValidationError: If FEN tag is invalid.
+        MoveNotationError: If move is malformed.
+        IllegalMoveError: If move is illegal.
+
+    """
+    tags = {}
+    movetext_start = 0
+    for match in TAG_REGEX.finditer(text):
+        tags[match[1]] = match[2].replace('\\"', '"').replace("\\\\", "\\")
+        movetext_start = match.end()
+    if "White" not in tags or "Black" not in tags:
+        raise PgnFormatError("Game has no White or Black tag")
+
+    movetext = COMMENT_REGEX.sub(" ", text[movetext_start:])
+    while "(" in movetext:
+        stripped = VARIATION_REGEX.sub(" ", movetext)
+        if stripped == movetext:
+            raise PgnFormatError("Unbalanced variation")
+        movetext = stripped
+    movetext = MOVE_NUMBER_REGEX.sub(" ", NAG_REGEX.sub(" ", movetext))
+    tokens = movetext.split()
+    if not tokens or tokens[-1] not in RESULTS:
+        raise PgnFormatError("Game has no result")
+    result = RESULTS[tokens.pop()]
+
+    initial_fen = tags.get("FEN") if tags.get("SetUp", "1") == "1" else None
+    if initial_fen == START_FEN:
+        initial_fen = None
+    position = Position(initial_fen or START_FEN)
+    moves = []
+    for san in tokens:
+        move = parse_san(position, san)
+        position.make_move(move)
+        moves.append(move)
+
+    initial, increment = _parse_time_control(tags.get("TimeControl", ""))
+    return ParsedGame(
+        white=tags["White"],
+        black=tags["Black"],
+        result=result,
+        played_on=_parse_date(tags.get("Date", "")),
+        time_control_initial=initial,
+        time_control_increment=increment,
+        initial_fen=initial_fen,
+        moves=encode_moves(moves),
+    )
+
+
+def _parse_time_control(value: str) -> tuple[int, int]:
+    """Return `(initial, increment)` of `N+M` time control, zeros if unknown."""
+    initial, _, increment = value.partition("+")
+    if not initial.isdigit() or (increment and not increment.isdigit()):
+        return 0, 0
+    return int(initial), int(increment or 0)
+
+
+def _parse_date(value: str) -> date | None:
+    """Return date of `YYYY.MM.DD` tag, None if any part is unknown."""
+    try:
+        year, month, day = (int(part) for part in value.split("."))
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+# Source file mapped by each worker process, see `_open_source`.
+_source: mmap.mmap | None = None
+
+
+def _open_source(path: str) -> None:
+    global _source
+    with open(path, "rb") as file:
+        _source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_range(start: int, end: int) -> ParsedChunk:
+    """Parse games of byte range of source file, run in worker process."""
+    if _source is None:
+        raise RuntimeError("PGN source is not opened in worker")
+    text = _source[start:end].decode("utf-8", errors="replace")
+    games = []
+    rejected = 0
+    for game_text in split_games(text):
+        try:
+            games.append(parse_game(game_text))
+        except (
+            PgnFormatError,
+            FenValidationError,
+            MoveNotationError,
+            IllegalMoveError,
+        ):
+            rejected += 1
+    return ParsedChunk(start, end, games, rejected)
+
+
+async def parse_file(
+    path: str, start: int, chunk_bytes: int, processes: int
+) -> AsyncIterator[ParsedChunk]:
+    """Parse games of PGN file from byte offset `start` in process pool.
+
+    Chunks are yielded in file order, so end of last consumed chunk is safe
+    resume offset. At most two chunks per process are parsed ahead of
+    consumer, which bounds memory held by finished but unconsumed chunks.
+    Zero `processes` means one per CPU.
+    """
+    loop = asyncio.get_running_loop()
+    processes = processes or os.cpu_count() or 1
+    with open(path, "rb") as file:
+        if not file.seek(0, 2):
+            return
+        with (
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+            ProcessPoolExecutor(
+                processes, initializer=_open_source, initargs=(path,)
+            ) as pool,
+        ):
+            pending: deque[asyncio.Future[ParsedChunk]] = deque()
+            for chunk_start, chunk_end in chunk_ranges(data, start, chunk_bytes):
+                pending.append(
+                    loop.run_in_executor(pool, _parse_range, chunk_start, chunk_end)
+                )
+                if len(pending) >= 2 * processes:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
@@ -0,0 +1,205 @@
+"""Import games of PGN archive into game storage.
+
+Games are parsed in process pool (see `pgn`) and each chunk is written by one
+COPY together with checkpoint of the file, so rerunning import of the same
+file resumes after last committed chunk. Games whose player is not registered
+under name given in PGN, or whose result is unknown, are skipped. Imported
+games are marked as rated so rating periods do not count historical games;
+they are counted in player stats by `player-stats` job.
+
+Usage:
+    python -m api_v1.game.pgn_import archive.pgn
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+from datetime import time as day_time
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.auth.models import User
+from core.config import settings
+from database.db_helper import db_helper
+from utils import now_with_tz_utc
+
+from .enums import GameResultEnum
+from .exceptions import PgnImportConflictError
+from .models import PgnImport
+from .pgn import ParsedChunk, ParsedGame, parse_file
+
+GAME_COLUMNS = [
+    "white_id",
+    "black_id",
+    "result",
+    "time_control_initial",
+    "time_control_increment",
+    "initial_fen",
+    "moves",
+    "rated_at",
+    "created_at",
+    "updated_at",
+]
+
+
+class ImportSummary(NamedTuple):
+    """Counts of games of one import run."""
+
+    games: int
+    skipped: int
+    rejected: int
+    bytes: int
+    seconds: float
+
+
+async def import_pgn(
+    session: AsyncSession, path: str, chunk_bytes: int, processes: int
+) -> ImportSummary:
+    """Import games of PGN file, resuming from its checkpoint.
+
+    Raises:
+        PgnImportConflictError: If checkpoint was moved by another import of
+        the same file.
+
+    """
+    source = os.path.abspath(path)
+    offset = await session.scalar(
+        select(PgnImport.offset).where(PgnImport.source == source)
+    )
+    start = offset or 0
+    player_ids: dict[str, int | None] = {}
+    games = skipped = rejected = 0
+    end = start
+    started = time.perf_counter()
+    async for chunk in parse_file(source, start, chunk_bytes, processes):
+        await _resolve_players(session, chunk.games, player_ids)
+        records = []
+        imported_at = now_with_tz_utc()
+        for game in chunk.games:
+            white_id = player_ids[game.white]
+            black_id = player_ids[game.black]
+            if (
+                white_id is None
+                or black_id is None
+                or game.result is GameResultEnum.ONGOING
+            ):
+                continue
+            records.append(_game_record(game, white_id, black_id, imported_at))
+        if records:
+            connection = await (await session.connection()).get_raw_connection()
+            await connection.driver_connection.copy_records_to_table(
+                "games", records=records, columns=GAME_COLUMNS
+            )
+        await _save_checkpoint(session, source, chunk, len(records))
+        await session.commit()
+        games += len(records)
+        skipped += len(chunk.games) - len(records)
+        rejected += chunk.rejected
+        end = chunk.end
+    return ImportSummary(
+        games, skipped, rejected, end - start, time.perf_counter() - started
+    )
+
+
+async def _resolve_players(
+    session: AsyncSession, games: list[ParsedGame], player_ids: dict[str, int | None]
+) -> None:
+    """Add IDs of players of games not yet in `player_ids`, None if unknown."""
+    names = {game.white for game in games} | {game.black for game in games}
+    missing = list(names - player_ids.keys())
+    if not missing:
+        return
+    stmt = select(User.username, User.id).where(User.username.in_(missing))
+    found = dict((await session.execute(stmt)).tuples().all())
+    for name in missing:
+        player_ids[name] = found.get(name)
+
+
+def _game_record(
+    game: ParsedGame, white_id: int, black_id: int, imported_at: datetime
+) -> tuple:
+    """Return row of `GAME_COLUMNS` for game, dated by its Date tag."""
+    played_at = imported_at
+    if game.played_on is not None:
+        played_at = datetime.combine(game.played_on, day_time(), ZoneInfo("UTC"))
+    return (
+        white_id,
+        black_id,
+        game.result.name,
+        game.time_control_initial,
+        game.time_control_increment,
+        game.initial_fen,
+        game.moves,
+        imported_at,
+        played_at,
+        imported_at,
+    )
+
+
+async def _save_checkpoint(
+    session: AsyncSession, source: str, chunk: ParsedChunk, imported: int
+) -> None:
+    """Move checkpoint of file to end of chunk if it still is at its start."""
+    skipped = len(chunk.games) - imported
+    stmt = (
+        insert(PgnImport)
+        .values(
+            source=source,
+            offset=chunk.end,
+            games=imported,
+            skipped=skipped,
+            rejected=chunk.rejected,
+        )
+        .on_conflict_do_update(
+            index_elements=[PgnImport.source],
+            set_={
+                "offset": chunk.end,
+                "games": PgnImport.games + imported,
+                "skipped": PgnImport.skipped + skipped,
+                "rejected": PgnImport.rejected + chunk.rejected,
+                "updated_at": now_with_tz_utc(),
+            },
+            where=PgnImport.offset == chunk.start,
+        )
+        .returning(PgnImport.id)
+    )
+    if await session.scalar(stmt) is None:
+        await session.rollback()
+        raise PgnImportConflictError(f"Checkpoint of {source} was moved")
+
+
+def main() -> None:
+    """Import PGN file given on command line and print throughput."""
+    config = settings.pgn_import
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    parser.add_argument("--chunk-bytes", type=int, default=config.chunk_bytes)
+    parser.add_argument("--processes", type=int, default=config.processes)
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            async with db_helper.session_factory() as session:
+                summary = await import_pgn(
+                    session, args.path, args.chunk_bytes, args.processes
+                )
+        finally:
+            await db_helper.dispose()
+        rate = summary.games / summary.seconds if summary.seconds else 0.0
+        print(
+            f"Imported {summary.games} games ({rate:.0f} games/s, "
+            f"{summary.bytes / 2**20:.1f} MiB), skipped {summary.skipped}, "
+            f"rejected {summary.rejected}"
+        )
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
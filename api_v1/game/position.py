@@ -0,0 +1,653 @@
+from .bitboard import (
+    BETWEEN,
+    BISHOP_MASKS,
+    BISHOP_TABLES,
+    FILE_A,
+    FILE_H,
+    FULL,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE,
+    PAWN_ATTACKS,
+    RANK_1,
+    RANK_8,
+    ROOK_MASKS,
+    ROOK_TABLES,
+    lsb,
+)
+from .constants import (
+    A1,
+    A8,
+    BISHOP,
+    BLACK,
+    BLACK_KINGSIDE,
+    BLACK_QUEENSIDE,
+    CAPTURE,
+    CASTLING_SYMBOLS,
+    DOUBLE_PAWN_PUSH,
+    E1,
+    E8,
+    EMPTY,
+    EN_PASSANT,
+    H1,
+    H8,
+    KING,
+    KING_CASTLE,
+    KNIGHT,
+    PAWN,
+    PIECE_SYMBOLS,
+    PROMOTION,
+    QUEEN,
+    QUEEN_CASTLE,
+    ROOK,
+    SQUARE_NAMES,
+    START_FEN,
+    WHITE,
+    WHITE_KINGSIDE,
+    WHITE_QUEENSIDE,
+)
+from .exceptions import FenValidationError, IllegalMoveError, MoveNotationError
+from .move import move_to_uci
+from .zobrist import CASTLING_KEYS, PIECE_KEYS, SIDE_KEY, compute_key, en_passant_key
+
+RANK_3 = RANK_1 << 16
+RANK_6 = RANK_1 << 40
+NOT_FILE_A = FULL ^ FILE_A
+NOT_FILE_H = FULL ^ FILE_H
+
+# Castling rights kept after move touches square (king or rook moved/captured).
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[A1] = 15 ^ WHITE_QUEENSIDE
+CASTLING_MASK[H1] = 15 ^ WHITE_KINGSIDE
+CASTLING_MASK[E1] = 15 ^ (WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[A8] = 15 ^ BLACK_QUEENSIDE
+CASTLING_MASK[H8] = 15 ^ BLACK_KINGSIDE
+CASTLING_MASK[E8] = 15 ^ (BLACK_KINGSIDE | BLACK_QUEENSIDE)
+
+# Squares of king and rook each castling right requires: right -> (piece, square).
+CASTLING_PIECES = {
+    WHITE_KINGSIDE: ((KING, E1), (ROOK, H1)),
+    WHITE_QUEENSIDE: ((KING, E1), (ROOK, A1)),
+    BLACK_KINGSIDE: ((6 + KING, E8), (6 + ROOK, H8)),
+    BLACK_QUEENSIDE: ((6 + KING, E8), (6 + ROOK, A8)),
+}
+
+# Rook move for castling: king destination -> (rook from, rook to).
+CASTLING_ROOK = {6: (7, 5), 2: (0, 3), 62: (63, 61), 58: (56, 59)}
+
+_PROMOTION_FLAGS = (PROMOTION | 3, PROMOTION | 2, PROMOTION | 1, PROMOTION)
+
+
+class Position:
+    """Chess position on bitboards with make/unmake of moves in place.
+
+    Piece code is `color * 6 + piece type` (see `constants`), `pieces[code]`
+    is bitboard of that piece, `board` is 64-square mailbox with piece code or
+    `EMPTY` for fast lookup of piece on square. Moves are 16-bit codes (see
+    `move`). `make_move` changes position in place and pushes only what it
+    can not restore to undo stack, so `unmake_move` reverts it without copy.
+    Zobrist `key` is updated incrementally by `make_move` (see `zobrist`).
+
+    Attributes:
+        pieces (list[int]): Bitboard per piece code.
+        occupancy (list[int]): Bitboard of all pieces per color.
+        board (list[int]): Piece code per square.
+        side (int): Color to move.
+        castling (int): Castling rights bits.
+        ep_square (int): En passant target square or -1.
+        halfmove_clock (int): Halfmoves since last capture or pawn move.
+        fullmove_number (int): Number of full move, starts at 1.
+        key (int): Unsigned 64-bit Zobrist key of position.
+
+    """
+
+    __slots__ = (
+        "_stack",
+        "board",
+        "castling",
+        "ep_square",
+        "fullmove_number",
+        "halfmove_clock",
+        "key",
+        "occupancy",
+        "pieces",
+        "side",
+    )
+
+    def __init__(self, fen: str = START_FEN):
+        self.set_fen(fen)
+
+    def set_fen(self, fen: str) -> None:
+        """Set up position from FEN string.
+
+        Raises:
+            FenValidationError: If FEN is malformed, pawn is on back rank,
+            castling right is given while king or rook is off its home
+            square, en passant square is not behind pawn that just made
+            double push, or king of side not to move is attacked.
+
+        """
+        fields = fen.split()
+        if len(fields) == 4:
+            fields += ["0", "1"]
+        if len(fields) != 6:
+            raise FenValidationError(f"FEN must have 6 fields: {fen!r}")
+        placement, side, castling, ep, halfmove, fullmove = fields
+
+        pieces = [0] * 12
+        board = [EMPTY] * 64
+        ranks = placement.split("/")
+        if len(ranks) != 8:
+            raise FenValidationError(f"FEN must have 8 ranks: {fen!r}")
+        for rank_index, rank in enumerate(ranks):
+            rank_number = 7 - rank_index
+            file = 0
+            for char in rank:
+                if char.isdigit():
+                    file += int(char)
+                    continue
+                piece = PIECE_SYMBOLS.find(char)
+                if piece < 0 or file > 7:
+                    raise FenValidationError(f"Invalid piece placement: {fen!r}")
+                square = rank_number * 8 + file
+                pieces[piece] |= 1 << square
+                board[square] = piece
+                file += 1
+            if file != 8:
+                raise FenValidationError(f"Rank must have 8 squares: {fen!r}")
+        if pieces[KING].bit_count() != 1 or pieces[6 + KING].bit_count() != 1:
+            raise FenValidationError(f"Each side must have one king: {fen!r}")
+        if (pieces[PAWN] | pieces[6 + PAWN]) & (RANK_1 | RANK_8):
+            raise FenValidationError(f"Pawn on back rank: {fen!r}")
+
+        if side not in ("w", "b"):
+            raise FenValidationError(f"Invalid side to move: {fen!r}")
+        rights = 0
+        if castling != "-":
+            for char in castling:
+                if char not in CASTLING_SYMBOLS:
+                    raise FenValidationError(f"Invalid castling rights: {fen!r}")
+                rights |= 1 << CASTLING_SYMBOLS.index(char)
+        for right, required in CASTLING_PIECES.items():
+            if rights & right and any(
+                board[square] != piece for piece, square in required
+            ):
+                raise FenValidationError(
+                    f"Castling rights without king and rook on home squares: {fen!r}"
+                )
+        if ep == "-":
+            ep_square = -1
+        elif ep in SQUARE_NAMES:
+            ep_square = SQUARE_NAMES.index(ep)
+        else:
+            raise FenValidationError(f"Invalid en passant square: {fen!r}")
+        if ep_square >= 0:
+            # Pawn of side not to move passed ep square on its double push.
+            if side == "w":
+                ep_rank, pawn_square, pawn = RANK_6, ep_square - 8, 6 + PAWN
+            else:
+                ep_rank, pawn_square, pawn = RANK_3, ep_square + 8, PAWN
+            if not ep_rank >> ep_square & 1 or board[pawn_square] != pawn:
+                raise FenValidationError(
+                    f"En passant square without pawn in front of it: {fen!r}"
+                )
+        try:
+            halfmove_clock, fullmove_number = int(halfmove), int(fullmove)
+        except ValueError:
+            raise FenValidationError(f"Invalid move counters: {fen!r}") from None
+
+        self.pieces = pieces
+        self.board = board
+        self.occupancy = [
+            pieces[0] | pieces[1] | pieces[2] | pieces[3] | pieces[4] | pieces[5],
+            pieces[6] | pieces[7] | pieces[8] | pieces[9] | pieces[10] | pieces[11],
+        ]
+        self.side = WHITE if side == "w" else BLACK
+        self.castling = rights
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.key = compute_key(board, pieces, self.side, rights, ep_square)
+        self._stack: list[tuple[int, int, int, int, int, int]] = []
+        if self.is_square_attacked(self.king_square(self.side ^ 1), self.side):
+            raise FenValidationError(f"King of side not to move in check: {fen!r}")
+
+    def fen(self) -> str:
+        """Return FEN string of position."""
+        rows = []
+        for rank in range(7, -1, -1):
+            row = ""
+            empty = 0
+            for file in range(8):
+                piece = self.board[rank * 8 + file]
+                if piece == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                row += PIECE_SYMBOLS[piece]
+            if empty:
+                row += str(empty)
+            rows.append(row)
+        castling = "".join(
+            symbol
+            for bit, symbol in enumerate(CASTLING_SYMBOLS)
+            if self.castling >> bit & 1
+        )
+        ep = SQUARE_NAMES[self.ep_square] if self.ep_square >= 0 else "-"
+        side = "w" if self.side == WHITE else "b"
+        return (
+            f"{'/'.join(rows)} {side} {castling or '-'} {ep} "
+            f"{self.halfmove_clock} {self.fullmove_number}"
+        )
+
+    def __repr__(self):
+        return f"<Position({self.fen()!r})>"
+
+    def copy(self) -> "Position":
+        """Return independent copy of position, without its move history."""
+        position = Position.__new__(Position)
+        position.pieces = self.pieces[:]
+        position.board = self.board[:]
+        position.occupancy = self.occupancy[:]
+        position.side = self.side
+        position.castling = self.castling
+        position.ep_square = self.ep_square
+        position.halfmove_clock = self.halfmove_clock
+        position.fullmove_number = self.fullmove_number
+        position.key = self.key
+        position._stack = []
+        return position
+
+    @property
+    def ply(self) -> int:
+        """Number of halfmoves made since position set up."""
+        return len(self._stack)
+
+    def king_square(self, color: int) -> int:
+        """Return square of king of given color."""
+        return lsb(self.pieces[color * 6 + KING])
+
+    def is_square_attacked(
+        self, square: int, by_color: int, occupied: int | None = None
+    ) -> bool:
+        """Check whether any piece of `by_color` attacks square."""
+        pieces = self.pieces
+        base = by_color * 6
+        if occupied is None:
+            occupied = self.occupancy[0] | self.occupancy[1]
+        if PAWN_ATTACKS[by_color ^ 1][square] & pieces[base]:
+            return True
+        if KNIGHT_ATTACKS[square] & pieces[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[square] & pieces[base + KING]:
+            return True
+        queens = pieces[base + QUEEN]
+        rooks = pieces[base + ROOK] | queens
+        if rooks and ROOK_TABLES[square][occupied & ROOK_MASKS[square]] & rooks:
+            return True
+        bishops = pieces[base + BISHOP] | queens
+        return bool(
+            bishops and BISHOP_TABLES[square][occupied & BISHOP_MASKS[square]] & bishops
+        )
+
+    def is_check(self) -> bool:
+        """Check whether side to move is in check."""
+        return self.is_square_attacked(self.king_square(self.side), self.side ^ 1)
+
+    def make_move(self, move: int) -> None:
+        """Make move in place, move must be pseudo-legal in position."""
+        pieces = self.pieces
+        board = self.board
+        occupancy = self.occupancy
+        us = self.side
+        them = us ^ 1
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        flag = move >> 12
+        piece = board[from_square]
+        captured = EMPTY
+        piece_keys = PIECE_KEYS[piece]
+        key = self.key ^ SIDE_KEY ^ piece_keys[from_square] ^ piece_keys[to_square]
+        if self.ep_square >= 0:
+            key ^= en_passant_key(pieces, us, self.ep_square)
+
+        if flag == EN_PASSANT:
+            captured_square = to_square - 8 if us == WHITE else to_square + 8
+            captured = board[captured_square]
+            captured_bit = 1 << captured_square
+            pieces[captured] ^= captured_bit
+            occupancy[them] ^= captured_bit
+            board[captured_square] = EMPTY
+            key ^= PIECE_KEYS[captured][captured_square]
+        elif flag & CAPTURE:
+            captured = board[to_square]
+            to_bit = 1 << to_square
+            pieces[captured] ^= to_bit
+            occupancy[them] ^= to_bit
+            key ^= PIECE_KEYS[captured][to_square]
+
+        move_bits = 1 << from_square | 1 << to_square
+        pieces[piece] ^= move_bits
+        occupancy[us] ^= move_bits
+        board[from_square] = EMPTY
+        board[to_square] = piece
+
+        if flag & PROMOTION:
+            to_bit = 1 << to_square
+            promoted = us * 6 + KNIGHT + (flag & 3)
+            pieces[piece] ^= to_bit
+            pieces[promoted] ^= to_bit
+            board[to_square] = promoted
+            key ^= piece_keys[to_square] ^ PIECE_KEYS[promoted][to_square]
+        elif flag == KING_CASTLE or flag == QUEEN_CASTLE:
+            rook_from, rook_to = CASTLING_ROOK[to_square]
+            rook = board[rook_from]
+            rook_bits = 1 << rook_from | 1 << rook_to
+            pieces[rook] ^= rook_bits
+            occupancy[us] ^= rook_bits
+            board[rook_from] = EMPTY
+            board[rook_to] = rook
+            key ^= PIECE_KEYS[rook][rook_from] ^ PIECE_KEYS[rook][rook_to]
+
+        castling = self.castling
+        self._stack.append(
+            (move, captured, castling, self.ep_square, self.halfmove_clock, self.key)
+        )
+        if castling:
+            self.castling &= CASTLING_MASK[from_square] & CASTLING_MASK[to_square]
+            key ^= CASTLING_KEYS[castling] ^ CASTLING_KEYS[self.castling]
+        if flag == DOUBLE_PAWN_PUSH:
+            self.ep_square = (from_square + to_square) >> 1
+            key ^= en_passant_key(pieces, them, self.ep_square)
+        else:
+            self.ep_square = -1
+        self.key = key
+        if captured != EMPTY or piece == us * 6 + PAWN:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if us == BLACK:
+            self.fullmove_number += 1
+        self.side = them
+
+    def unmake_move(self) -> int:
+        """Revert last made move and return it."""
+        move, captured, castling, ep_square, halfmove_clock, key = self._stack.pop()
+        pieces = self.pieces
+        board = self.board
+        occupancy = self.occupancy
+        them = self.side
+        us = them ^ 1
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        flag = move >> 12
+
+        if flag & PROMOTION:
+            to_bit = 1 << to_square
+            pawn = us * 6 + PAWN
+            pieces[board[to_square]] ^= to_bit
+            pieces[pawn] ^= to_bit
+            board[to_square] = pawn
+        elif flag == KING_CASTLE or flag == QUEEN_CASTLE:
+            rook_from, rook_to = CASTLING_ROOK[to_square]
+            rook = board[rook_to]
+            rook_bits = 1 << rook_from | 1 << rook_to
+            pieces[rook] ^= rook_bits
+            occupancy[us] ^= rook_bits
+            board[rook_to] = EMPTY
+            board[rook_from] = rook
+
+        piece = board[to_square]
+        move_bits = 1 << from_square | 1 << to_square
+        pieces[piece] ^= move_bits
+        occupancy[us] ^= move_bits
+        board[to_square] = EMPTY
+        board[from_square] = piece
+
+        if flag == EN_PASSANT:
+            captured_square = to_square - 8 if us == WHITE else to_square + 8
+            captured_bit = 1 << captured_square
+            pieces[captured] ^= captured_bit
+            occupancy[them] ^= captured_bit
+            board[captured_square] = captured
+        elif captured != EMPTY:
+            to_bit = 1 << to_square
+            pieces[captured] ^= to_bit
+            occupancy[them] ^= to_bit
+            board[to_square] = captured
+
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.key = key
+        if us == BLACK:
+            self.fullmove_number -= 1
+        self.side = us
+        return move
+
+    def pseudo_legal_moves(self) -> list[int]:
+        """Generate moves that obey piece movement but may leave king in check."""
+        return self._generate(self.is_check())
+
+    def legal_moves(self) -> list[int]:
+        """Generate all legal moves in position."""
+        us = self.side
+        them = us ^ 1
+        pieces = self.pieces
+        king = pieces[us * 6 + KING]
+        king_square = lsb(king)
+        occupied = self.occupancy[0] | self.occupancy[1]
+        in_check = self.is_square_attacked(king_square, them, occupied)
+        moves = self._generate(in_check)
+
+        if in_check:
+            legal = []
+            for move in moves:
+                self.make_move(move)
+                if not self.is_square_attacked(self.king_square(us), them):
+                    legal.append(move)
+                self.unmake_move()
+            return legal
+
+        pinned = self._pinned(king_square, us, occupied)
+        without_king = occupied ^ king
+        legal = []
+        for move in moves:
+            from_square = move & 63
+            if from_square == king_square:
+                flag = move >> 12
+                if (
+                    flag == KING_CASTLE
+                    or flag == QUEEN_CASTLE
+                    or not self.is_square_attacked(move >> 6 & 63, them, without_king)
+                ):
+                    legal.append(move)
+            elif move >> 12 == EN_PASSANT:
+                self.make_move(move)
+                if not self.is_square_attacked(king_square, them):
+                    legal.append(move)
+                self.unmake_move()
+            elif not pinned >> from_square & 1:
+                legal.append(move)
+            elif LINE[king_square][from_square] >> (move >> 6 & 63) & 1:
+                legal.append(move)
+        return legal
+
+    def is_legal(self, move: int) -> bool:
+        """Check whether move is legal in position."""
+        return move in self.legal_moves()
+
+    def parse_uci(self, uci: str) -> int:
+        """Return legal move matching UCI notation.
+
+        Raises:
+            MoveNotationError: If notation is malformed.
+            IllegalMoveError: If move is not legal in position.
+
+        """
+        if len(uci) not in (4, 5):
+            raise MoveNotationError(f"Invalid UCI move: {uci!r}")
+        for move in self.legal_moves():
+            if move_to_uci(move) == uci:
+                return move
+        raise IllegalMoveError(f"Illegal move {uci!r} in position {self.fen()!r}")
+
+    def push_uci(self, uci: str) -> int:
+        """Make move given in UCI notation and return its code."""
+        move = self.parse_uci(uci)
+        self.make_move(move)
+        return move
+
+    def _pinned(self, king_square: int, us: int, occupied: int) -> int:
+        """Return bitboard of pieces of `us` pinned to their king."""
+        pieces = self.pieces
+        base = (us ^ 1) * 6
+        queens = pieces[base + QUEEN]
+        snipers = ROOK_TABLES[king_square][0] & (pieces[base + ROOK] | queens)
+        snipers |= BISHOP_TABLES[king_square][0] & (pieces[base + BISHOP] | queens)
+        own = self.occupancy[us]
+        pinned = 0
+        while snipers:
+            bit = snipers & -snipers
+            snipers ^= bit
+            blockers = BETWEEN[king_square][bit.bit_length() - 1] & occupied
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pinned |= blockers
+        return pinned
+
+    def _generate(self, in_check: bool) -> list[int]:
+        us = self.side
+        them = us ^ 1
+        pieces = self.pieces
+        own = self.occupancy[us]
+        enemy = self.occupancy[them]
+        occupied = own | enemy
+        empty = FULL ^ occupied
+        base = us * 6
+        moves: list[int] = []
+        append = moves.append
+
+        pawns = pieces[base + PAWN]
+        if us == WHITE:
+            single = pawns << 8 & empty
+            double = (single & RANK_3) << 8 & empty
+            left = (pawns & NOT_FILE_A) << 7 & enemy
+            right = (pawns & NOT_FILE_H) << 9 & enemy
+            push, left_shift, right_shift = 8, 7, 9
+            promotion_rank = RANK_8
+        else:
+            single = pawns >> 8 & empty
+            double = (single & RANK_6) >> 8 & empty
+            left = (pawns & NOT_FILE_A) >> 9 & enemy
+            right = (pawns & NOT_FILE_H) >> 7 & enemy
+            push, left_shift, right_shift = -8, -9, -7
+            promotion_rank = RANK_1
+
+        for targets, shift, flag in (
+            (single, push, 0),
+            (left, left_shift, CAPTURE),
+            (right, right_shift, CAPTURE),
+        ):
+            promotions = targets & promotion_rank
+            targets ^= promotions
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                to_square = bit.bit_length() - 1
+                append(to_square - shift | to_square << 6 | flag << 12)
+            while promotions:
+                bit = promotions & -promotions
+                promotions ^= bit
+                to_square = bit.bit_length() - 1
+                code = to_square - shift | to_square << 6
+                for promotion_flag in _PROMOTION_FLAGS:
+                    append(code | (promotion_flag | flag) << 12)
+        while double:
+            bit = double & -double
+            double ^= bit
+            to_square = bit.bit_length() - 1
+            append(to_square - 2 * push | to_square << 6 | DOUBLE_PAWN_PUSH << 12)
+        if self.ep_square >= 0:
+            attackers = PAWN_ATTACKS[them][self.ep_square] & pawns
+            while attackers:
+                bit = attackers & -attackers
+                attackers ^= bit
+                append(bit.bit_length() - 1 | self.ep_square << 6 | EN_PASSANT << 12)
+
+        not_own = FULL ^ own
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            bb = pieces[base + piece_type]
+            while bb:
+                bit = bb & -bb
+                bb ^= bit
+                from_square = bit.bit_length() - 1
+                if piece_type == KNIGHT:
+                    attacks = KNIGHT_ATTACKS[from_square]
+                elif piece_type == BISHOP:
+                    attacks = BISHOP_TABLES[from_square][
+                        occupied & BISHOP_MASKS[from_square]
+                    ]
+                elif piece_type == ROOK:
+                    attacks = ROOK_TABLES[from_square][
+                        occupied & ROOK_MASKS[from_square]
+                    ]
+                elif piece_type == QUEEN:
+                    attacks = (
+                        ROOK_TABLES[from_square][occupied & ROOK_MASKS[from_square]]
+                        | BISHOP_TABLES[from_square][
+                            occupied & BISHOP_MASKS[from_square]
+                        ]
+                    )
+                else:
+                    attacks = KING_ATTACKS[from_square]
+                attacks &= not_own
+                captures = attacks & enemy
+                quiets = attacks ^ captures
+                while quiets:
+                    target = quiets & -quiets
+                    quiets ^= target
+                    append(from_square | (target.bit_length() - 1) << 6)
+                while captures:
+                    target = captures & -captures
+                    captures ^= target
+                    append(from_square | (target.bit_length() - 1) << 6 | CAPTURE << 12)
+
+        if self.castling and not in_check:
+            self._generate_castling(us, occupied, append)
+        return moves
+
+    def _generate_castling(self, us: int, occupied: int, append) -> None:
+        them = us ^ 1
+        if us == WHITE:
+            king_side, queen_side, king_square = WHITE_KINGSIDE, WHITE_QUEENSIDE, E1
+        else:
+            king_side, queen_side, king_square = BLACK_KINGSIDE, BLACK_QUEENSIDE, E8
+        if (
+            self.castling & king_side
+            and not occupied & (0b11 << king_square + 1)
+            and not self.is_square_attacked(king_square + 1, them, occupied)
+            and not self.is_square_attacked(king_square + 2, them, occupied)
+        ):
+            append(king_square | (king_square + 2) << 6 | KING_CASTLE << 12)
+        if (
+            self.castling & queen_side
+            and not occupied & (0b111 << king_square - 3)
+            and not self.is_square_attacked(king_square - 1, them, occupied)
+            and not self.is_square_attacked(king_square - 2, them, occupied)
+        ):
+            append(king_square | (king_square - 2) << 6 | QUEEN_CASTLE << 12)
+
+
+def perft(position: Position, depth: int) -> int:
+    """Count leaf nodes of legal move tree of given depth."""
+    moves = position.legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move()
+    return nodes
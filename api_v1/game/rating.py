@@ -0,0 +1,186 @@
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.auth.models import Profile, Rank
+from database.invalidation import invalidation_bus
+from utils import now_with_tz_utc
+
+from .cache import PROFILE_EVENT
+from .enums import GameResultEnum
+from .glicko import assign_ranks, game_sides, rate_period
+from .models import Game
+
+WHITE_SCORES = {
+    GameResultEnum.WHITE_WIN: 1.0,
+    GameResultEnum.DRAW: 0.5,
+    GameResultEnum.BLACK_WIN: 0.0,
+}
+
+_UPDATE_PROFILES = text(
+    """
+    UPDATE profiles
+    SET rating = data.rating,
+        rating_deviation = data.rating_deviation,
+        rating_volatility = data.rating_volatility,
+        rank_id = data.rank_id
+    FROM unnest(
+        CAST(:ids AS integer[]),
+        CAST(:ratings AS double precision[]),
+        CAST(:deviations AS double precision[]),
+        CAST(:volatilities AS double precision[]),
+        CAST(:rank_ids AS integer[])
+    ) AS data(id, rating, rating_deviation, rating_volatility, rank_id)
+    WHERE profiles.id = data.id
+    """
+)
+_MARK_GAMES_RATED = text(
+    "UPDATE games SET rated_at = :rated_at WHERE id = ANY(CAST(:ids AS integer[]))"
+)
+
+
+class RatingPeriodSummary(NamedTuple):
+    """Outcome of rating period: number of rated players and games."""
+
+    players: int
+    games: int
+
+
+async def run_rating_period(
+    session: AsyncSession, tau: float, batch_size: int
+) -> RatingPeriodSummary:
+    """Rate all finished games not rated yet as one Glicko-2 rating period.
+
+    Every profile is updated, players without games get larger deviation.
+    Rank of each player is reassigned by `Rank.min_rating` thresholds in the
+    same statement; ranks without threshold are assigned manually and kept.
+    Profiles and games are written with bulk UPDATEs of `batch_size` rows,
+    whole period is committed at once, then workers rebuild leaderboards.
+    """
+    rows = (
+        await session.execute(
+            select(
+                Profile.id,
+                Profile.user_id,
+                Profile.rating,
+                Profile.rating_deviation,
+                Profile.rating_volatility,
+                Profile.rank_id,
+            ).order_by(Profile.user_id)
+        )
+    ).all()
+    if not rows:
+        return RatingPeriodSummary(0, 0)
+    profile_ids, user_ids, ratings, deviations, volatilities, rank_ids = (
+        np.array(column) for column in zip(*rows, strict=True)
+    )
+    ratings = ratings.astype(np.float64)
+    deviations = deviations.astype(np.float64)
+    volatilities = volatilities.astype(np.float64)
+    current_ranks = np.array(
+        [-1 if rank_id is None else rank_id for rank_id in rank_ids], dtype=np.int64
+    )
+
+    game_ids, white, black, white_scores = await _load_unrated_games(
+        session, batch_size
+    )
+    white_index, white_found = _index_of(user_ids, white)
+    black_index, black_found = _index_of(user_ids, black)
+    rated = white_found & black_found
+    players, opponents, scores = game_sides(
+        white_index[rated], black_index[rated], white_scores[rated]
+    )
+    ratings, deviations, volatilities = rate_period(
+        ratings, deviations, volatilities, players, opponents, scores, tau
+    )
+    new_ranks = await _assign_ranks(session, ratings, current_ranks)
+
+    for start in range(0, len(profile_ids), batch_size):
+        chunk = slice(start, start + batch_size)
+        await session.execute(
+            _UPDATE_PROFILES,
+            {
+                "ids": profile_ids[chunk].tolist(),
+                "ratings": ratings[chunk].tolist(),
+                "deviations": deviations[chunk].tolist(),
+                "volatilities": volatilities[chunk].tolist(),
+                "rank_ids": [
+                    None if rank_id < 0 else rank_id
+                    for rank_id in new_ranks[chunk].tolist()
+                ],
+            },
+        )
+    rated_at = now_with_tz_utc()
+    for start in range(0, len(game_ids), batch_size):
+        await session.execute(
+            _MARK_GAMES_RATED,
+            {
+                "rated_at": rated_at,
+                "ids": game_ids[start : start + batch_size].tolist(),
+            },
+        )
+    await invalidation_bus.publish(session, PROFILE_EVENT)
+    await session.commit()
+    return RatingPeriodSummary(len(profile_ids), int(rated.sum()))
+
+
+async def _load_unrated_games(
+    session: AsyncSession, batch_size: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Stream finished unrated games into arrays of IDs, players and scores."""
+    stmt = (
+        select(Game.id, Game.white_id, Game.black_id, Game.result)
+        .where(Game.rated_at.is_(None), Game.result != GameResultEnum.ONGOING)
+        .execution_options(yield_per=batch_size)
+    )
+    chunks = []
+    result = await session.stream(stmt)
+    async for partition in result.partitions():
+        game_ids, white, black, results = zip(*partition, strict=True)
+        chunks.append(
+            (
+                np.array(game_ids, dtype=np.int64),
+                np.array(white, dtype=np.int64),
+                np.array(black, dtype=np.int64),
+                np.array([WHITE_SCORES[result] for result in results]),
+            )
+        )
+    if not chunks:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty, np.array([], dtype=np.float64)
+    game_ids, white, black, white_scores = (
+        np.concatenate(arrays) for arrays in zip(*chunks, strict=True)
+    )
+    return game_ids, white, black, white_scores
+
+
+def _index_of(
+    sorted_keys: np.ndarray, keys: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return positions of keys in sorted array and mask of keys present in it."""
+    index = np.searchsorted(sorted_keys, keys)
+    index = np.minimum(index, len(sorted_keys) - 1)
+    return index, sorted_keys[index] == keys
+
+
+async def _assign_ranks(
+    session: AsyncSession, ratings: np.ndarray, current_ranks: np.ndarray
+) -> np.ndarray:
+    """Return rank ID per player by rating, -1 for no rank."""
+    stmt = select(Rank.id, Rank.min_rating).order_by(Rank.min_rating)
+    ranks = (await session.execute(stmt)).all()
+    threshold_ranks = [
+        (rank_id, min_rating) for rank_id, min_rating in ranks if min_rating is not None
+    ]
+    if not threshold_ranks:
+        return current_ranks
+    rank_ids, min_ratings = (
+        np.array(column) for column in zip(*threshold_ranks, strict=True)
+    )
+    new_ranks = assign_ranks(ratings, rank_ids, min_ratings)
+    manual_rank_ids = [rank_id for rank_id, min_rating in ranks if min_rating is None]
+    manual = np.isin(current_ranks, manual_rank_ids)
+    new_ranks[manual] = current_ranks[manual]
+    return new_ranks
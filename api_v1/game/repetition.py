@@ -0,0 +1,46 @@
+from collections import Counter
+
+
+class RepetitionTracker:
+    """Counts occurrences of positions in game by Zobrist key.
+
+    Each move costs one dict update, so repetition check does not scan game
+    history. Irreversible moves need no special handling: position before
+    them can not occur again, so its key is simply never seen twice.
+
+    Attributes:
+        keys (list[int]): Keys of positions in game order, first is initial.
+
+    """
+
+    __slots__ = ("_counts", "keys")
+
+    def __init__(self, initial_key: int):
+        self.keys = [initial_key]
+        self._counts = Counter(self.keys)
+
+    def push(self, key: int) -> int:
+        """Record position reached by move, return its number of occurrences."""
+        self.keys.append(key)
+        self._counts[key] += 1
+        return self._counts[key]
+
+    def pop(self) -> int:
+        """Forget last recorded position (taken back move) and return its key."""
+        if len(self.keys) == 1:
+            raise IndexError("Can not pop initial position")
+        key = self.keys.pop()
+        self._counts[key] -= 1
+        return key
+
+    def count(self, key: int | None = None) -> int:
+        """Return occurrences of position, current position if key is omitted."""
+        return self._counts[self.keys[-1] if key is None else key]
+
+    def is_threefold(self) -> bool:
+        """Check whether current position occurred at least three times."""
+        return self.count() >= 3
+
+    def is_fivefold(self) -> bool:
+        """Check whether current position occurred at least five times."""
+        return self.count() >= 5
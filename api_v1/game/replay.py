@@ -0,0 +1,132 @@
+"""Positions of games at any ply, from cached snapshots.
+
+Moves of game are stored, not positions, so position at ply is found by
+making moves from start. Instead every `interval` plies snapshot of position
+is cached, keyed by game and ply bucket, and position at ply is reached by
+copying nearest cached snapshot at or below it and making at most `interval`
+moves forward. Moves already made never change, so snapshot stays valid for
+as long as game exists, whether game is over or not.
+
+Request for many plies of one game is answered in one forward pass: plies
+are sorted and each one continues from position of previous one, caching
+snapshots of buckets it crosses.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+from core.cache import TTLCache
+from core.config import ReplaySettings, settings
+
+from .exceptions import PlyOutOfRangeError
+from .position import Position
+
+
+class ReplayedPosition(NamedTuple):
+    """Position of game after ply.
+
+    Attributes:
+        ply (int): Number of moves made, 0 for initial position.
+        fen (str): Position in FEN.
+        move (int): Move that led to position, None for initial position.
+
+    """
+
+    ply: int
+    fen: str
+    move: int | None
+
+
+class PositionReplayer:
+    """Replays games to any ply from snapshots cached every few plies.
+
+    Attributes:
+        interval (int): Plies between cached snapshots.
+        snapshots (TTLCache): Snapshot positions by game ID and ply.
+
+    """
+
+    def __init__(self, interval: int = 16, maxsize: int = 20_000, ttl: float = 3600):
+        self.interval = interval
+        self.snapshots: TTLCache[tuple[int, int], Position] = TTLCache(
+            "replay_snapshots", maxsize, ttl
+        )
+
+    @classmethod
+    def from_settings(cls, config: ReplaySettings) -> "PositionReplayer":
+        """Create replayer from its settings."""
+        return cls(
+            interval=config.snapshot_interval_plies,
+            maxsize=config.cache_size,
+            ttl=config.cache_ttl_seconds,
+        )
+
+    def positions(
+        self,
+        game_id: int,
+        moves: Sequence[int],
+        plies: Iterable[int],
+        initial_fen: str | None = None,
+    ) -> list[ReplayedPosition]:
+        """Return positions of game after plies, in ascending order of plies.
+
+        Args:
+            game_id (int): ID of game, key of its snapshots.
+            moves (Sequence[int]): Moves made in game, at least up to last ply.
+            plies (Iterable[int]): Plies to return positions of.
+            initial_fen (str): Starting position of game, None for standard.
+
+        Raises:
+            PlyOutOfRangeError: If ply is negative or after last move.
+
+        """
+        targets = sorted(set(plies))
+        if targets and (targets[0] < 0 or targets[-1] > len(moves)):
+            raise PlyOutOfRangeError(
+                f"Ply must be between 0 and {len(moves)}, number of moves made"
+            )
+        replayed = []
+        position: Position | None = None
+        at = 0
+        for ply in targets:
+            bucket = ply - ply % self.interval
+            if position is None or at < bucket:
+                position, at = self._snapshot(
+                    game_id, bucket, initial_fen, position, at
+                )
+            while at < ply:
+                position.make_move(moves[at])
+                at += 1
+                if at % self.interval == 0:
+                    self.snapshots.set((game_id, at), position.copy())
+            replayed.append(
+                ReplayedPosition(ply, position.fen(), moves[ply - 1] if ply else None)
+            )
+        return replayed
+
+    def _snapshot(
+        self,
+        game_id: int,
+        bucket: int,
+        initial_fen: str | None,
+        position: Position | None,
+        at: int,
+    ) -> tuple[Position, int]:
+        """Return nearest position at or below bucket and its ply.
+
+        Cached snapshots are looked up from bucket down to current position,
+        which is kept if none is closer; without current position search
+        goes down to initial position.
+        """
+        lowest = 0 if position is None else at + 1
+        for ply in range(bucket, lowest - 1, -self.interval):
+            snapshot = self.snapshots.get((game_id, ply))
+            if snapshot is not None:
+                return snapshot.copy(), ply
+        if position is not None:
+            return position, at
+        position = Position(initial_fen) if initial_fen else Position()
+        return position, 0
+
+
+position_replayer = PositionReplayer.from_settings(settings.replay)
@@ -0,0 +1,165 @@
+"""Generation of pawnless tablebase tables by retrograde analysis.
+
+Every placement of table material is set up and its legal moves made once:
+captures lead to smaller material, whose outcome is probed in tables built
+before, and other moves lead to placements of same table, recorded as
+edges. Outcomes then spread backwards over edges in order of DTZ:
+placement with move to lost placement is won one ply later, and placement
+whose every move leads to won placement is lost one ply after the last of
+them. Placements never reached this way are drawn.
+
+Without pawns zeroing moves are captures only, so tables of material with
+pawns are not generated here. Work is pure Python per placement, practical
+for tables of up to four pieces.
+"""
+
+import numpy as np
+
+from .constants import EMPTY, PIECE_SYMBOLS
+from .exceptions import FenValidationError, TablebaseError
+from .position import Position
+from .tablebase import Tablebase, encode_entry, signature_pieces
+
+LOSS = -2
+DRAW = 0
+WIN = 2
+
+
+def placement_fen(pieces: list[int], squares: list[int], side: int) -> str:
+    """Return FEN of pieces on squares, without castling or en passant."""
+    board = ["1"] * 64
+    for piece, square in zip(pieces, squares, strict=True):
+        board[square] = PIECE_SYMBOLS[piece]
+    rows = ("".join(board[rank * 8 : rank * 8 + 8]) for rank in range(7, -1, -1))
+    placement = "/".join(rows)
+    for run in range(8, 1, -1):
+        placement = placement.replace("1" * run, str(run))
+    return f"{placement} {'wb'[side]} - - 0 1"
+
+
+def _predecessors(
+    sources: np.ndarray, targets: np.ndarray, size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return sources sorted by target and start of each target in them."""
+    order = np.argsort(targets, kind="stable")
+    starts = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(targets, minlength=size), out=starts[1:])
+    return sources[order], starts
+
+
+def _gather(
+    nodes: np.ndarray, predecessors: np.ndarray, starts: np.ndarray
+) -> np.ndarray:
+    """Return predecessors of all nodes, with repeats."""
+    lengths = starts[nodes + 1] - starts[nodes]
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=predecessors.dtype)
+    offsets = np.repeat(starts[nodes] - np.cumsum(lengths) + lengths, lengths)
+    return predecessors[offsets + np.arange(total)]
+
+
+def build_table(signature: str, tablebase: Tablebase) -> np.ndarray:
+    """Return entries of table of pawnless material signature.
+
+    Args:
+        signature (str): Material signature, e.g. `KRvK`.
+        tablebase (Tablebase): Tables of material reached by captures.
+
+    Raises:
+        TablebaseError: If material has pawns or table reached by capture is
+        missing.
+
+    """
+    pieces = signature_pieces(signature)
+    if "P" in signature:
+        raise TablebaseError(f"Tables with pawns are not generated: {signature}")
+    count = len(pieces)
+    size = 2 * 64**count
+    legal = np.zeros(size, dtype=bool)
+    wdl = np.zeros(size, dtype=np.int8)
+    dtz = np.zeros(size, dtype=np.int16)
+    resolved = np.zeros(size, dtype=bool)
+    has_draw = np.zeros(size, dtype=bool)
+    open_moves = np.zeros(size, dtype=np.int32)
+    sources: list[int] = []
+    targets: list[int] = []
+
+    for index in range(size):
+        squares = []
+        rest = index
+        for _ in range(count):
+            rest, square = divmod(rest, 64)
+            squares.append(square)
+        squares.reverse()
+        side = rest
+        if len(set(squares)) < count:
+            continue
+        try:
+            position = Position(placement_fen(pieces, squares, side))
+        except FenValidationError:
+            # King of side not to move is attacked.
+            continue
+        legal[index] = True
+        moves = position.legal_moves()
+        if not moves:
+            if position.is_check():
+                wdl[index], resolved[index] = LOSS, True
+            continue
+        quiet = 0
+        capture_wdl = None
+        for move in moves:
+            from_square, to_square = move & 63, move >> 6 & 63
+            if position.board[to_square] == EMPTY:
+                target = side ^ 1
+                for square in squares:
+                    moved = to_square if square == from_square else square
+                    target = target * 64 + moved
+                sources.append(index)
+                targets.append(target)
+                quiet += 1
+                continue
+            position.make_move(move)
+            entry = tablebase.probe(position)
+            position.unmake_move()
+            if entry is None:
+                raise TablebaseError(f"Table of capture in {signature} is missing")
+            if capture_wdl is None or -entry.wdl > capture_wdl:
+                capture_wdl = -entry.wdl
+        open_moves[index] = quiet
+        if capture_wdl == WIN:
+            wdl[index], dtz[index], resolved[index] = WIN, 1, True
+        elif capture_wdl == DRAW:
+            has_draw[index] = True
+        elif capture_wdl == LOSS and not quiet:
+            wdl[index], dtz[index], resolved[index] = LOSS, 1, True
+
+    predecessors, starts = _predecessors(
+        np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64), size
+    )
+    depth = 0
+    frontier = np.flatnonzero(resolved & (dtz == 0))
+    pending = np.flatnonzero(resolved & (dtz == 1))
+    while frontier.size or pending.size:
+        lost = frontier[wdl[frontier] == LOSS]
+        won = frontier[wdl[frontier] == WIN]
+        # Placement with move to lost one is won.
+        winners = _gather(lost, predecessors, starts)
+        winners = np.unique(winners[~resolved[winners]])
+        wdl[winners], dtz[winners], resolved[winners] = WIN, depth + 1, True
+        # Placement whose every move leads to won one is lost.
+        losers = _gather(won, predecessors, starts)
+        losers = losers[~resolved[losers]]
+        np.subtract.at(open_moves, losers, 1)
+        losers = np.unique(losers)
+        losers = losers[(open_moves[losers] == 0) & ~has_draw[losers]]
+        wdl[losers], dtz[losers], resolved[losers] = LOSS, depth + 1, True
+        frontier = np.concatenate((pending, winners, losers))
+        pending = np.empty(0, dtype=np.int64)
+        depth += 1
+
+    entries = np.zeros(size, dtype=np.uint16)
+    for value in (LOSS, DRAW, WIN):
+        mask = legal & (wdl == value)
+        entries[mask] = encode_entry(value, dtz[mask].astype(np.uint16))
+    return entries
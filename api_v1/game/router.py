@@ -0,0 +1,435 @@
+import json
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    WebSocketException,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from api_v1.auth.dependencies import get_current_active_user
+from api_v1.auth.models import User
+from api_v1.auth.services import get_user_rating, get_usernames
+from core.config import settings
+from database.db_helper import db_helper
+
+from .cache import leaderboard_cache
+from .constants import (
+    DEFAULT_LEADERBOARD_PAGE_SIZE,
+    MAX_LEADERBOARD_PAGE_SIZE,
+    MAX_REPLAY_PLIES,
+)
+from .dependencies import get_websocket_user
+from .encoding import decode_moves
+from .enums import ExportFormatEnum
+from .exceptions import (
+    GameAccessError,
+    IllegalMoveError,
+    LeaderboardCursorError,
+    LeaderboardUnavailableError,
+    MoveNotationError,
+    PlyOutOfRangeError,
+    SeekError,
+    ShardError,
+)
+from .export import MEDIA_TYPES, stream_games
+from .hub import LiveGame, Subscriber, game_hub
+from .leaderboard import Leaderboards, decode_cursor, encode_cursor
+from .lobby import SeekFilter, lobby
+from .matchmaking import TimeControl, matchmaker
+from .move import move_to_uci
+from .replay import position_replayer
+from .schemas import (
+    GameCommandSchema,
+    LeaderboardEntrySchema,
+    LeaderboardPageSchema,
+    LeaderboardRankSchema,
+    LobbyCommandSchema,
+    MatchSchema,
+    PlayerStatsRowSchema,
+    PlayerStatsSchema,
+    ReplayPositionSchema,
+    ReplaySchema,
+    SeekSchema,
+)
+from .services import get_game, load_live_game, save_live_game
+from .stats import get_player_stats
+
+router = APIRouter(prefix="/games", tags=["Games"])
+
+
+@router.post(
+    "/matchmaking/",
+    response_model=MatchSchema,
+    responses={204: {"description": "No opponent found yet, poll again"}},
+)
+async def find_game(
+    seek: SeekSchema,
+    user: Annotated[User, Depends(get_current_active_user)],
+) -> MatchSchema | Response:
+    """Wait in matchmaking queue for opponent of similar rating (long poll).
+
+    Endpoint returns created game as soon as opponent is found, or 204 after
+    poll timeout; client repeats request to keep its place in queue. Player
+    who stops polling is removed from queue after idle timeout.
+    """
+    async with db_helper.session_factory() as session:
+        rating = await get_user_rating(session, user.id)
+    game_id = await matchmaker.find_game(
+        user_id=user.id,
+        rating=rating,
+        time_control=TimeControl(seek.initial, seek.increment),
+        timeout=settings.matchmaking.poll_timeout_seconds,
+    )
+    if game_id is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return MatchSchema(game_id=game_id)
+
+
+@router.delete("/matchmaking/", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_matchmaking(
+    user: Annotated[User, Depends(get_current_active_user)],
+) -> None:
+    """Remove current user from matchmaking queue."""
+    matchmaker.leave(user.id)
+
+
+@router.get("/leaderboard/", response_model=LeaderboardPageSchema)
+async def get_leaderboard(
+    country_id: int | None = None,
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_LEADERBOARD_PAGE_SIZE)
+    ] = DEFAULT_LEADERBOARD_PAGE_SIZE,
+    cursor: str | None = None,
+) -> LeaderboardPageSchema:
+    """Return page of global or country leaderboard, highest rating first.
+
+    Next page is requested with `next_cursor` of current page, which points
+    right after its last player, so pages do not skip or repeat players
+    when ratings change between requests.
+    """
+    try:
+        after = None if cursor is None else decode_cursor(cursor)
+    except LeaderboardCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    boards = await ready_leaderboards()
+    entries = boards.board(country_id).page(limit + 1, after)
+    next_cursor = encode_cursor(entries[limit - 1]) if len(entries) > limit else None
+    entries = entries[:limit]
+    async with db_helper.session_factory() as session:
+        usernames = await get_usernames(session, [entry.user_id for entry in entries])
+    return LeaderboardPageSchema(
+        entries=[
+            LeaderboardEntrySchema(
+                rank=entry.rank,
+                user_id=entry.user_id,
+                username=usernames.get(entry.user_id, ""),
+                rating=entry.rating,
+            )
+            for entry in entries
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/leaderboard/{user_id}/", response_model=LeaderboardRankSchema)
+async def get_leaderboard_rank(user_id: int) -> LeaderboardRankSchema:
+    """Return ranks of player on global leaderboard and in their country."""
+    boards = await ready_leaderboards()
+    rank = boards.rank(user_id)
+    if rank is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Player not ranked"
+        )
+    return LeaderboardRankSchema(**rank._asdict())
+
+
+async def ready_leaderboards() -> Leaderboards:
+    """Return leaderboards of worker, 503 if they are not built in time."""
+    try:
+        return await leaderboard_cache.wait_ready()
+    except LeaderboardUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+
+
+@router.get("/stats/{user_id}/", response_model=PlayerStatsSchema)
+async def get_stats(user_id: int) -> PlayerStatsSchema:
+    """Return results of player by speed, color and opening, with totals.
+
+    Stats are counted as games finish, so they are read from few rows of
+    player whatever number of games they played.
+    """
+    async with db_helper.session_factory() as session:
+        stats = await get_player_stats(session, user_id)
+    return PlayerStatsSchema(
+        user_id=user_id,
+        wins=sum(row.wins for row in stats),
+        draws=sum(row.draws for row in stats),
+        losses=sum(row.losses for row in stats),
+        rows=[
+            PlayerStatsRowSchema(
+                speed=row.speed,
+                color=row.color,
+                eco=row.eco or None,
+                wins=row.wins,
+                draws=row.draws,
+                losses=row.losses,
+            )
+            for row in stats
+        ],
+    )
+
+
+@router.get(
+    "/export/{user_id}/",
+    response_class=StreamingResponse,
+)
+async def export_games(
+    user_id: int,
+    user: Annotated[User, Depends(get_current_active_user)],
+    export_format: Annotated[ExportFormatEnum, Query(alias="format")] = (
+        ExportFormatEnum.PGN
+    ),
+    gzip: bool = False,
+) -> StreamingResponse:
+    """Download all finished games of player, newest first, as PGN or NDJSON.
+
+    Response is streamed chunk by chunk and compressed with gzip if asked,
+    so history of any length is exported in constant memory. Private games
+    are exported only to player themselves.
+    """
+    config = settings.export
+    headers = {
+        "Content-Disposition": (
+            f'attachment; filename="games-{user_id}.{export_format.value}"'
+        )
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_games(
+            user_id,
+            export_format,
+            config.chunk_size,
+            config.gzip_level if gzip else None,
+            include_private=user.id == user_id,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@router.get("/{game_id}/replay/", response_model=ReplaySchema)
+async def replay_game(
+    game_id: int,
+    user: Annotated[User, Depends(get_current_active_user)],
+    ply: Annotated[list[int], Query(max_length=MAX_REPLAY_PLIES)],
+) -> ReplaySchema:
+    """Return positions of game after given plies, e.g. `?ply=40&ply=41`.
+
+    Positions are reached from snapshots cached every few plies, so ply deep
+    in long game costs few moves, and all plies of request are replayed in
+    one pass. Live game served by this worker is replayed up to its latest
+    move. Private game may be replayed by its players only.
+    """
+    game = game_hub.games.get(game_id)
+    if game is not None:
+        moves, initial_fen = game.moves, game.initial_fen
+        allowed = game.can_watch(user.id)
+    else:
+        async with db_helper.session_factory() as session:
+            stored = await get_game(session, game_id)
+        if stored is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Game not found"
+            )
+        moves, initial_fen = decode_moves(stored.moves), stored.initial_fen
+        allowed = not stored.is_private or user.id in (
+            stored.white_id,
+            stored.black_id,
+        )
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Game is private"
+        )
+    try:
+        positions = position_replayer.positions(game_id, moves, ply, initial_fen)
+    except PlyOutOfRangeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    return ReplaySchema(
+        game_id=game_id,
+        plies=len(moves),
+        positions=[
+            ReplayPositionSchema(
+                ply=position.ply,
+                fen=position.fen,
+                uci=None if position.move is None else move_to_uci(position.move),
+            )
+            for position in positions
+        ],
+    )
+
+
+@router.websocket("/lobby/ws/")
+async def browse_lobby(
+    websocket: WebSocket,
+    user: Annotated[User, Depends(get_websocket_user)],
+    initial: int | None = None,
+    increment: int | None = None,
+    min_rating: float | None = None,
+    max_rating: float | None = None,
+) -> None:
+    """Browse open seeks and post or accept seek over WebSocket.
+
+    Connection is authenticated once at handshake. After connecting, client
+    receives `seeks` message with open seeks passing its filter (time control
+    if both `initial` and `increment` are given, rating range of seeking
+    player), then `add` and `remove` diffs. Client sends
+    `{"type": "seek", "initial": 180, "increment": 2}` with optional rating
+    range of opponent, answered with `seeking`, `{"type": "cancel"}` or
+    `{"type": "accept", "seek_id": 7}`; both players of accepted seek receive
+    `game` message with ID of created game. Seek is removed when connection
+    that posted it closes.
+    """
+    async with db_helper.session_factory() as session:
+        rating = await get_user_rating(session, user.id)
+    time_control = None
+    if initial is not None and increment is not None:
+        time_control = TimeControl(initial, increment)
+    await websocket.accept()
+    subscriber = game_hub.subscriber(websocket, user.id)
+    lobby.join(subscriber, SeekFilter(time_control, min_rating, max_rating))
+    subscriber.start()
+    try:
+        while not subscriber.closed:
+            await handle_lobby_command(
+                user, rating, subscriber, await websocket.receive_text()
+            )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        lobby.leave(subscriber)
+        await subscriber.wait_closed()
+
+
+async def handle_lobby_command(
+    user: User, rating: float, subscriber: Subscriber, text: str
+) -> None:
+    """Apply lobby command of subscriber."""
+    try:
+        command = LobbyCommandSchema.model_validate_json(text)
+        if command.type == "ping":
+            subscriber.offer(json.dumps({"type": "pong"}))
+        elif command.type == "seek":
+            if command.initial is None or command.increment is None:
+                raise SeekError("Seek requires initial time and increment")
+            seek = lobby.seek(
+                subscriber,
+                user.username,
+                rating,
+                TimeControl(command.initial, command.increment),
+                command.min_rating,
+                command.max_rating,
+            )
+            subscriber.offer(json.dumps({"type": "seeking", "seek_id": seek.seek_id}))
+        elif command.type == "cancel":
+            lobby.cancel(user.id)
+        else:
+            if command.seek_id is None:
+                raise SeekError("Accept requires seek ID")
+            await lobby.accept(subscriber, rating, command.seek_id)
+    except ValidationError:
+        subscriber.offer(json.dumps({"type": "error", "detail": "Invalid command"}))
+    except SeekError as exc:
+        subscriber.offer(json.dumps({"type": "error", "detail": str(exc)}))
+
+
+@router.websocket("/{game_id}/ws/")
+async def play_game(
+    websocket: WebSocket,
+    game_id: int,
+    user: Annotated[User, Depends(get_websocket_user)],
+    binary: bool = False,
+) -> None:
+    """Play or watch live game over WebSocket.
+
+    Connection is authenticated once at handshake. After connecting, client
+    receives `state` message with all moves, then `move` and `result` events.
+    Players send `{"type": "move", "uci": "e2e4", "lag_ms": 40}` or
+    `{"type": "resign"}`, rejected commands are answered with `error` message
+    to sender only. Any client may send `{"type": "ping"}` to measure its
+    lag, answered with `pong`.
+
+    With `binary=true` game state and events are sent as binary snapshot and
+    delta frames (see `frames`), encoded once for all spectators; client
+    that falls behind receives fresh snapshot instead of being disconnected.
+    Private game may be watched by its players only.
+    """
+    game = await game_hub.get_or_load(game_id, lambda: load_live_game(game_id))
+    if game is None:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Game not found"
+        )
+    # Game loaded only to refuse connection is released as well.
+    try:
+        if not game.can_watch(user.id):
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION, reason="Game is private"
+            )
+        await websocket.accept()
+        subscriber = game_hub.subscriber(websocket, user.id, binary)
+        if not game.join(subscriber):
+            await websocket.close(
+                code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many spectators"
+            )
+            return
+        subscriber.start()
+        try:
+            while not subscriber.closed:
+                await handle_command(game, subscriber, await websocket.receive_text())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            game.leave(subscriber)
+            await subscriber.wait_closed()
+    finally:
+        game_hub.release(game_id)
+
+
+async def handle_command(game: LiveGame, subscriber: Subscriber, text: str) -> None:
+    """Apply command of subscriber to game and save made move."""
+    try:
+        command = GameCommandSchema.model_validate_json(text)
+        if command.type == "ping":
+            subscriber.offer(json.dumps({"type": "pong"}))
+            return
+        if command.type == "resign":
+            game.resign(subscriber.user_id)
+        else:
+            await game_hub.play(
+                game,
+                subscriber.user_id,
+                command.uci or "",
+                (command.lag_ms or 0) / 1000,
+            )
+    except ValidationError:
+        subscriber.offer(json.dumps({"type": "error", "detail": "Invalid command"}))
+        return
+    except (GameAccessError, IllegalMoveError, MoveNotationError, ShardError) as exc:
+        subscriber.offer(json.dumps({"type": "error", "detail": str(exc)}))
+        return
+    await save_live_game(game)
@@ -0,0 +1,126 @@
+from collections.abc import Iterable
+
+from logger import setup_logging
+
+from .constants import (
+    FIFTY_MOVE_RULE_PLIES,
+    MAX_ADJUDICATED_PIECES,
+    START_FEN,
+    WHITE,
+)
+from .enums import GameResultEnum
+from .exceptions import IllegalMoveError, TablebaseError
+from .position import Position
+from .repetition import RepetitionTracker
+from .tablebase import Tablebase
+
+log = setup_logging()
+
+
+def adjudicate(
+    position: Position,
+    repetitions: RepetitionTracker,
+    tablebase: Tablebase | None = None,
+) -> GameResultEnum:
+    """Return result decided by rules in position, ongoing if game goes on.
+
+    Game ends by checkmate, stalemate, threefold repetition or fifty-move
+    rule. Costs one legal move generation. With tablebase, position held by
+    its tables is decided by them: drawn one is draw, won one is win of
+    side to move or its opponent unless zeroing move would come after
+    fifty-move rule.
+    """
+    if not position.legal_moves():
+        if not position.is_check():
+            return GameResultEnum.DRAW
+        if position.side == WHITE:
+            return GameResultEnum.BLACK_WIN
+        return GameResultEnum.WHITE_WIN
+    if repetitions.is_threefold() or position.halfmove_clock >= FIFTY_MOVE_RULE_PLIES:
+        return GameResultEnum.DRAW
+    if (
+        tablebase is None
+        or (position.occupancy[0] | position.occupancy[1]).bit_count()
+        > MAX_ADJUDICATED_PIECES
+    ):
+        return GameResultEnum.ONGOING
+    try:
+        entry = tablebase.probe(position)
+    except TablebaseError:
+        # Corrupt table must not break game, it goes on unadjudicated.
+        log.exception("Tablebase probe failed")
+        return GameResultEnum.ONGOING
+    if entry is None:
+        return GameResultEnum.ONGOING
+    if (
+        entry.wdl == 0
+        or position.halfmove_clock + abs(entry.dtz) > FIFTY_MOVE_RULE_PLIES
+    ):
+        return GameResultEnum.DRAW
+    if (entry.wdl > 0) == (position.side == WHITE):
+        return GameResultEnum.WHITE_WIN
+    return GameResultEnum.BLACK_WIN
+
+
+class GameRules:
+    """Position of game with its history, judged by rules of chess.
+
+    Result covers only ends decided by rules: resignation and time are
+    tracked by live game itself.
+
+    Attributes:
+        position (Position): Current position.
+        repetitions (RepetitionTracker): Keys of positions reached in game.
+        moves (list[int]): Moves made in game.
+        result (GameResultEnum): Result decided by rules.
+        tablebase (Tablebase): Tables adjudicating endgames, None if they
+        are not consulted (Optional).
+
+    """
+
+    __slots__ = ("moves", "position", "repetitions", "result", "tablebase")
+
+    def __init__(
+        self,
+        initial_fen: str | None = None,
+        moves: Iterable[int] = (),
+        tablebase: Tablebase | None = None,
+    ):
+        self.tablebase = tablebase
+        self.position = Position(initial_fen or START_FEN)
+        self.repetitions = RepetitionTracker(self.position.key)
+        self.moves: list[int] = []
+        for move in moves:
+            self._push(move)
+        self.result = adjudicate(self.position, self.repetitions, self.tablebase)
+
+    def play(self, uci: str) -> int:
+        """Make move given in UCI notation and return its code.
+
+        Raises:
+            IllegalMoveError: If game is over or move is illegal.
+            MoveNotationError: If notation is malformed.
+
+        """
+        if self.result != GameResultEnum.ONGOING:
+            raise IllegalMoveError("Game is over")
+        move = self.position.parse_uci(uci)
+        self._push(move)
+        self.result = adjudicate(self.position, self.repetitions, self.tablebase)
+        return move
+
+    def apply(self, move: int) -> bool:
+        """Make move given by code, return False if it is not legal."""
+        if (
+            self.result != GameResultEnum.ONGOING
+            or move not in self.position.legal_moves()
+        ):
+            return False
+        self._push(move)
+        self.result = adjudicate(self.position, self.repetitions, self.tablebase)
+        return True
+
+    def _push(self, move: int) -> None:
+        self.position.make_move(move)
+        self.repetitions.push(self.position.key)
+        self.moves.append(move)
@@ -0,0 +1,200 @@
+from typing import Literal, Optional
+
+from pydantic import Field, NonNegativeInt, PositiveInt
+
+from schemas import ChessBaseSchema
+
+from .constants import (
+    MAX_REPORTED_LAG_MS,
+    MAX_TIME_CONTROL_INCREMENT,
+    MAX_TIME_CONTROL_INITIAL,
+)
+from .enums import ColorEnum, GameSpeedEnum
+
+
+class GameCommandSchema(ChessBaseSchema):
+    """Schema for command sent by client over live game WebSocket.
+
+    Attributes:
+        type (str): Command, `move`, `resign` or `ping`; `ping` is answered
+        with `pong` so client can measure its lag.
+        uci (str): Move in UCI notation, required for `move` (Optional).
+        lag_ms (int): Network lag of move measured by client, compensated
+        within lag quota (Optional).
+
+    """
+
+    type: Literal["move", "resign", "ping"]
+    uci: Optional[str] = Field(default=None, min_length=4, max_length=5)
+    lag_ms: Optional[NonNegativeInt] = Field(default=None, le=MAX_REPORTED_LAG_MS)
+
+
+class SeekSchema(ChessBaseSchema):
+    """Schema for joining matchmaking queue.
+
+    Attributes:
+        initial (int): Initial clock time in seconds.
+        increment (int): Increment per move in seconds.
+
+    """
+
+    initial: PositiveInt = Field(le=MAX_TIME_CONTROL_INITIAL)
+    increment: NonNegativeInt = Field(le=MAX_TIME_CONTROL_INCREMENT)
+
+
+class LobbyCommandSchema(ChessBaseSchema):
+    """Schema for command sent by client over lobby WebSocket.
+
+    Attributes:
+        type (str): Command, `seek` posts seek replacing previous one,
+        `cancel` removes it, `accept` accepts seek of other player and
+        `ping` is answered with `pong`.
+        initial (int): Initial clock time in seconds, required for `seek`
+        (Optional).
+        increment (int): Increment per move in seconds, required for `seek`
+        (Optional).
+        min_rating (float): Min rating of opponent for `seek` (Optional).
+        max_rating (float): Max rating of opponent for `seek` (Optional).
+        seek_id (int): ID of seek, required for `accept` (Optional).
+
+    """
+
+    type: Literal["seek", "cancel", "accept", "ping"]
+    initial: Optional[PositiveInt] = Field(default=None, le=MAX_TIME_CONTROL_INITIAL)
+    increment: Optional[NonNegativeInt] = Field(
+        default=None, le=MAX_TIME_CONTROL_INCREMENT
+    )
+    min_rating: Optional[float] = None
+    max_rating: Optional[float] = None
+    seek_id: Optional[int] = None
+
+
+class MatchSchema(ChessBaseSchema):
+    """Schema for game found by matchmaking.
+
+    Attributes:
+        game_id (int): ID of created game.
+
+    """
+
+    game_id: int
+
+
+class LeaderboardEntrySchema(ChessBaseSchema):
+    """Schema for player on leaderboard.
+
+    Attributes:
+        rank (int): 1-based position of player on leaderboard.
+        user_id (int): ID of player.
+        username (str): Username of player.
+        rating (float): Rating of player.
+
+    """
+
+    rank: int
+    user_id: int
+    username: str
+    rating: float
+
+
+class LeaderboardPageSchema(ChessBaseSchema):
+    """Schema for page of leaderboard.
+
+    Attributes:
+        entries (list[LeaderboardEntrySchema]): Players of page, highest first.
+        next_cursor (str): Cursor of next page, None on last page (Optional).
+
+    """
+
+    entries: list[LeaderboardEntrySchema]
+    next_cursor: Optional[str] = None
+
+
+class LeaderboardRankSchema(ChessBaseSchema):
+    """Schema for ranks of player on leaderboards.
+
+    Attributes:
+        user_id (int): ID of player.
+        rating (float): Rating of player.
+        rank (int): Rank on global leaderboard.
+        country_id (int): ID of player country.
+        country_rank (int): Rank on leaderboard of player country.
+
+    """
+
+    user_id: int
+    rating: float
+    rank: int
+    country_id: int
+    country_rank: int
+
+
+class ReplayPositionSchema(ChessBaseSchema):
+    """Schema for position of game after ply.
+
+    Attributes:
+        ply (int): Number of moves made, 0 for initial position.
+        fen (str): Position in FEN.
+        uci (str): Move that led to position, None for initial position
+        (Optional).
+
+    """
+
+    ply: int
+    fen: str
+    uci: Optional[str] = None
+
+
+class ReplaySchema(ChessBaseSchema):
+    """Schema for positions of game at requested plies.
+
+    Attributes:
+        game_id (int): ID of game.
+        plies (int): Number of moves made in game.
+        positions (list[ReplayPositionSchema]): Positions, ascending by ply.
+
+    """
+
+    game_id: int
+    plies: int
+    positions: list[ReplayPositionSchema]
+
+
+class PlayerStatsRowSchema(ChessBaseSchema):
+    """Schema for results of player in games of one speed, color and opening.
+
+    Attributes:
+        speed (GameSpeedEnum): Speed of games.
+        color (ColorEnum): Color player played.
+        eco (str): ECO code of opening, None for games out of book (Optional).
+        wins (int): Games won.
+        draws (int): Games drawn.
+        losses (int): Games lost.
+
+    """
+
+    speed: GameSpeedEnum
+    color: ColorEnum
+    eco: Optional[str] = None
+    wins: int
+    draws: int
+    losses: int
+
+
+class PlayerStatsSchema(ChessBaseSchema):
+    """Schema for results of player.
+
+    Attributes:
+        user_id (int): ID of player.
+        wins (int): Games won in total.
+        draws (int): Games drawn in total.
+        losses (int): Games lost in total.
+        rows (list[PlayerStatsRowSchema]): Results by speed, color and opening.
+
+    """
+
+    user_id: int
+    wins: int
+    draws: int
+    losses: int
+    rows: list[PlayerStatsRowSchema]
@@ -0,0 +1,404 @@
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import (
+    LargeBinary,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db_helper import db_helper
+
+from .constants import START_FEN
+from .encoding import MOVE_SIZE, decode_moves, encode_moves
+from .enums import GameResultEnum
+from .hub import LiveGame, StoredState, game_hub
+from .journal import GameWrite
+from .matchmaking import Match
+from .models import Game, GamePosition
+from .openings import OpeningBook
+from .position import Position
+from .stats import count_games
+from .write_behind import StoredVersion, move_writer
+from .zobrist import to_signed
+
+
+async def get_game(session: AsyncSession, game_id: int) -> Game | None:
+    """Search game by ID in database."""
+    return await session.get(Game, game_id)
+
+
+async def get_player_games(
+    session: AsyncSession,
+    user_id: int,
+    limit: int,
+    before: tuple[datetime, int] | None = None,
+    include_private: bool = False,
+) -> list[Game]:
+    """Return finished games of player, newest first.
+
+    Next chunk is read with `before` set to `(created_at, id)` of last game
+    of previous one. Games as white and as black are read from their own
+    index and merged, so chunk costs two index range scans however long
+    history is.
+    """
+    branches = []
+    for player_column in (Game.white_id, Game.black_id):
+        branch = select(Game.id).where(
+            player_column == user_id, Game.result != GameResultEnum.ONGOING
+        )
+        if not include_private:
+            branch = branch.where(Game.is_private.is_(False))
+        if before is not None:
+            branch = branch.where(tuple_(Game.created_at, Game.id) < before)
+        branches.append(
+            branch.order_by(Game.created_at.desc(), Game.id.desc()).limit(limit)
+        )
+    ids = union_all(*branches).subquery()
+    stmt = (
+        select(Game)
+        .join(ids, Game.id == ids.c.id)
+        .order_by(Game.created_at.desc(), Game.id.desc())
+        .limit(limit)
+    )
+    return list(await session.scalars(stmt))
+
+
+async def create_game(
+    session: AsyncSession,
+    white_id: int,
+    black_id: int,
+    time_control_initial: int,
+    time_control_increment: int,
+    is_private: bool = False,
+) -> Game:
+    """Create new game between two users in database."""
+    game = Game(
+        white_id=white_id,
+        black_id=black_id,
+        time_control_initial=time_control_initial,
+        time_control_increment=time_control_increment,
+        is_private=is_private,
+    )
+    session.add(game)
+    await session.commit()
+    return game
+
+
+async def create_matched_game(match: Match) -> int:
+    """Create game for players paired by matchmaking, return its ID."""
+    async with db_helper.session_factory() as session:
+        game = await create_game(
+            session,
+            white_id=match.white_id,
+            black_id=match.black_id,
+            time_control_initial=match.time_control.initial,
+            time_control_increment=match.time_control.increment,
+        )
+        return game.id
+
+
+async def update_game_moves(
+    session: AsyncSession,
+    writes: list[GameWrite],
+    stored: dict[int, StoredVersion],
+    attempts: int = 3,
+) -> list[GameWrite]:
+    """Store moves, results and clocks of live games in one transaction.
+
+    All rows are updated by one statement from list of values. Moves are
+    concatenated in database (`moves || new`), so stored moves are not read
+    back nor rewritten: `stored` holds version and number of moves of each
+    row as last seen, and row is updated only if its version is unchanged.
+    Rows of unknown or conflicting version are read and updated again, with
+    only moves they lack; write with fewer moves than stored is dropped.
+    `stored` is updated with new versions. Games from standard position are
+    labeled with opening by book attached to game hub, if any, and games
+    finished by writes are counted in player stats in the same transaction.
+
+    Returns:
+        Writes still conflicting after `attempts` updates.
+
+    """
+    pending = {write.game_id: write for write in writes}
+    ecos = dict.fromkeys(pending)
+    if game_hub.book is not None:
+        openings = game_hub.book.classify_many(
+            [write.moves for write in pending.values()]
+        )
+        for game_id, opening in zip(pending, openings, strict=True):
+            ecos[game_id] = None if opening is None else opening.eco
+    finished = []
+    for _ in range(attempts):
+        unknown = [game_id for game_id in pending if game_id not in stored]
+        if unknown:
+            stmt = select(Game.id, Game.version, func.octet_length(Game.moves)).where(
+                Game.id.in_(unknown)
+            )
+            for game_id, version, size in await session.execute(stmt):
+                stored[game_id] = StoredVersion(version, size // MOVE_SIZE)
+        rows = []
+        for game_id, write in list(pending.items()):
+            state = stored.get(game_id)
+            if state is None or state.plies > len(write.moves):
+                del pending[game_id]
+                continue
+            white_ms, black_ms = write.clocks_ms or (None, None)
+            rows.append(
+                (
+                    game_id,
+                    state.version,
+                    encode_moves(write.moves[state.plies :]),
+                    write.result,
+                    white_ms,
+                    black_ms,
+                    ecos[game_id],
+                )
+            )
+        if not rows:
+            break
+        table = Game.__table__.c
+        updates = values(
+            *(
+                column(name, table[name].type)
+                for name in (
+                    "id",
+                    "version",
+                    "moves",
+                    "result",
+                    "white_clock_ms",
+                    "black_clock_ms",
+                    "eco",
+                )
+            ),
+            name="writes",
+        ).data(rows)
+        stmt = (
+            update(Game)
+            .where(Game.id == updates.c.id, Game.version == updates.c.version)
+            .values(
+                moves=Game.moves.op("||")(updates.c.moves),
+                # Result reached by other replica is never reverted.
+                result=case(
+                    (updates.c.result == GameResultEnum.ONGOING, Game.result),
+                    else_=updates.c.result,
+                ),
+                white_clock_ms=func.coalesce(
+                    updates.c.white_clock_ms, Game.white_clock_ms
+                ),
+                black_clock_ms=func.coalesce(
+                    updates.c.black_clock_ms, Game.black_clock_ms
+                ),
+                # Moves of game from other position are not book lines.
+                eco=case(
+                    (
+                        Game.initial_fen.is_(None),
+                        func.coalesce(updates.c.eco, Game.eco),
+                    ),
+                    else_=Game.eco,
+                ),
+                version=Game.version + 1,
+            )
+            .returning(Game.id, Game.version, func.octet_length(Game.moves))
+        )
+        for game_id, version, size in await session.execute(stmt):
+            stored[game_id] = StoredVersion(version, size // MOVE_SIZE)
+            if pending.pop(game_id).result != GameResultEnum.ONGOING:
+                finished.append(game_id)
+        # Row was written by other worker, read it again.
+        for game_id in pending:
+            stored.pop(game_id, None)
+        if not pending:
+            break
+    if finished:
+        await count_games(session, Game.id.in_(finished))
+    await session.commit()
+    return list(pending.values())
+
+
+async def store_game_writes(
+    writes: list[GameWrite], stored: dict[int, StoredVersion]
+) -> list[GameWrite]:
+    """Store writes of live games, in its own short session.
+
+    See `update_game_moves`.
+    """
+    async with db_helper.session_factory() as session:
+        return await update_game_moves(session, writes, stored)
+
+
+async def load_live_game(game_id: int) -> LiveGame | None:
+    """Load stored game into live state, in its own short session."""
+    async with db_helper.session_factory() as session:
+        game = await get_game(session, game_id)
+    if game is None:
+        return None
+    remaining = None
+    if game.white_clock_ms is not None and game.black_clock_ms is not None:
+        remaining = (game.white_clock_ms / 1000, game.black_clock_ms / 1000)
+    return LiveGame(
+        game_id=game.id,
+        white_id=game.white_id,
+        black_id=game.black_id,
+        initial_fen=game.initial_fen,
+        moves=decode_moves(game.moves),
+        max_spectators=game_hub.max_spectators,
+        clock=game_hub.clock(
+            game.time_control_initial,
+            game.time_control_increment,
+            game.increment_mode,
+            remaining,
+        ),
+        timers=game_hub.timers,
+        on_timeout=game_hub.game_timed_out,
+        is_private=game.is_private,
+        snapshot_interval=game_hub.snapshot_interval,
+        on_event=game_hub.publish,
+        book=game_hub.book,
+        result=game.result,
+        tablebase=game_hub.tablebase,
+    )
+
+
+async def load_game_state(game_id: int) -> StoredState | None:
+    """Return stored moves, result and clocks of game, in short session."""
+    async with db_helper.session_factory() as session:
+        game = await get_game(session, game_id)
+    if game is None:
+        return None
+    clocks_ms = None
+    if game.white_clock_ms is not None and game.black_clock_ms is not None:
+        clocks_ms = game.white_clock_ms, game.black_clock_ms
+    return StoredState(decode_moves(game.moves), game.result, clocks_ms)
+
+
+async def save_live_game(game: LiveGame) -> None:
+    """Journal moves, result and clocks of live game, stored in next flush."""
+    clocks_ms = None
+    if game.clock is not None:
+        white_ms, black_ms = (round(left * 1000) for left in game.clock.remaining)
+        clocks_ms = white_ms, black_ms
+    await move_writer.write(
+        GameWrite(game.game_id, tuple(game.moves), game.result, clocks_ms)
+    )
+
+
+def first_position_plies(
+    moves: Iterable[int], initial_fen: str | None = None
+) -> dict[int, int]:
+    """Return ply of first occurrence of each position in game by its key."""
+    position = Position(initial_fen or START_FEN)
+    plies = {position.key: 0}
+    make_move = position.make_move
+    for ply, move in enumerate(moves, 1):
+        make_move(move)
+        plies.setdefault(position.key, ply)
+    return plies
+
+
+async def build_position_index(session: AsyncSession, batch_size: int = 500) -> int:
+    """Rebuild position index for all finished games, return number of rows.
+
+    Games are read in batches by primary key and each batch is committed
+    on its own, so index can be rebuilt on live database without holding
+    long transaction. Rows of batch are replaced, rebuilding is idempotent.
+    """
+    last_id = 0
+    total = 0
+    while True:
+        stmt = (
+            select(Game.id, Game.moves, Game.initial_fen)
+            .where(Game.id > last_id, Game.result != GameResultEnum.ONGOING)
+            .order_by(Game.id)
+            .limit(batch_size)
+        )
+        games = (await session.execute(stmt)).all()
+        if not games:
+            return total
+        rows = [
+            {"zobrist_key": to_signed(key), "game_id": game_id, "ply": ply}
+            for game_id, moves, initial_fen in games
+            for key, ply in first_position_plies(
+                decode_moves(moves), initial_fen
+            ).items()
+        ]
+        game_ids = [game_id for game_id, _, _ in games]
+        await session.execute(
+            delete(GamePosition).where(GamePosition.game_id.in_(game_ids))
+        )
+        await session.execute(insert(GamePosition), rows)
+        await session.commit()
+        total += len(rows)
+        last_id = game_ids[-1]
+
+
+async def backfill_openings(
+    session: AsyncSession, book: OpeningBook, batch_size: int = 1000
+) -> int:
+    """Label stored games lacking opening, return number of games labeled.
+
+    Games from standard position are read in batches by primary key, with
+    only moves within book depth, and each batch is classified at once and
+    committed on its own. Games out of book stay unlabeled.
+    """
+    last_id = 0
+    total = 0
+    while True:
+        stmt = (
+            select(
+                Game.id,
+                func.substr(Game.moves, 1, book.depth * MOVE_SIZE, type_=LargeBinary),
+            )
+            .where(Game.id > last_id, Game.eco.is_(None), Game.initial_fen.is_(None))
+            .order_by(Game.id)
+            .limit(batch_size)
+        )
+        games = (await session.execute(stmt)).all()
+        if not games:
+            return total
+        openings = book.classify_many([decode_moves(moves) for _, moves in games])
+        rows = [
+            {"id": game_id, "eco": opening.eco}
+            for (game_id, _), opening in zip(games, openings, strict=True)
+            if opening is not None
+        ]
+        if rows:
+            await session.execute(update(Game), rows)
+        await session.commit()
+        total += len(rows)
+        last_id = games[-1][0]
+
+
+async def find_games_by_key(
+    session: AsyncSession, key: int, limit: int = 50
+) -> list[tuple[int, int]]:
+    """Return `(game_id, ply)` of newest games where position occurred."""
+    stmt = (
+        select(GamePosition.game_id, GamePosition.ply)
+        .where(GamePosition.zobrist_key == to_signed(key))
+        .order_by(GamePosition.game_id.desc())
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return [(game_id, ply) for game_id, ply in result]
+
+
+async def find_games_by_fen(
+    session: AsyncSession, fen: str, limit: int = 50
+) -> list[tuple[int, int]]:
+    """Return `(game_id, ply)` of newest games where FEN position occurred.
+
+    Raises:
+        FenValidationError: If FEN is malformed.
+
+    """
+    return await find_games_by_key(session, Position(fen).key, limit)
@@ -0,0 +1,387 @@
+"""Rules of live games sharded across worker processes.
+
+Parsing move and adjudicating position after it cost two legal move
+generations, which for thousands of concurrent games saturates event loop of
+web worker. With `ShardPool` each live game is owned by shard process
+`game_id % processes`, holding its position and repetition history as
+`GameRules`; web worker keeps cheap state (moves, clocks, subscribers) and
+awaits shard's verdict on each move.
+
+Shard is connected to web worker by socket pair. Requests made in one event
+loop iteration are sent as one pickled batch, shard answers each batch with
+one batch of replies in request order:
+
+    request: request ID | operation | game ID | two arguments
+    reply:   request ID | success flag | value or exception
+
+When shard process dies, it is restarted with its games reloaded from web
+worker replicas, then unanswered requests are sent again. Requests are
+idempotent by ply, so request shard processed before dying is not applied
+twice.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import multiprocessing
+import os
+import pickle
+import signal
+import socket
+import struct
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+from core.config import BASE_DIR, GameShardSettings, TablebaseSettings, settings
+from core.metrics import registry
+from exceptions import BaseExceptionError
+from logger import setup_logging
+
+from .encoding import decode_moves, encode_moves
+from .enums import GameResultEnum
+from .exceptions import GameNotFoundError, IllegalMoveError, ShardError
+from .rules import GameRules
+from .tablebase import Tablebase
+
+log = setup_logging()
+
+OP_LOAD = 1
+OP_PLAY = 2
+OP_APPLY = 3
+OP_DROP = 4
+
+# Length prefix of batch on socket.
+_LENGTH = struct.Struct("<I")
+
+_requests_counter = registry.counter(
+    "game_shard_requests_total", "Requests sent to game shard processes."
+)
+_batches_counter = registry.counter(
+    "game_shard_batches_total", "Batches of requests sent to game shard processes."
+)
+_restarts_counter = registry.counter(
+    "game_shard_restarts_total", "Game shard processes restarted after exit."
+)
+
+Request = tuple[int, int, int, Any, Any]
+Hydrate = Callable[[int], tuple[str | None, Sequence[int]] | None]
+
+
+def _handle(
+    games: dict[int, GameRules], tablebase: Tablebase | None, request: Request
+) -> Any:
+    """Perform request on games of shard and return its value."""
+    _, operation, game_id, first, second = request
+    if operation == OP_LOAD:
+        game = games[game_id] = GameRules(first, decode_moves(second), tablebase)
+        return game.result
+    if operation == OP_DROP:
+        games.pop(game_id, None)
+        return None
+    game = games.get(game_id)
+    if game is None:
+        raise GameNotFoundError(f"Game {game_id} is not loaded on shard")
+    ply = first
+    if operation == OP_PLAY:
+        if ply != len(game.moves) + 1:
+            raise IllegalMoveError("Not your turn")
+        return game.play(second), game.result
+    # Move already applied is acknowledged only if it is the same move.
+    if ply <= len(game.moves):
+        return game.moves[ply - 1] == second
+    return ply == len(game.moves) + 1 and game.apply(second)
+
+
+def serve(
+    connection: socket.socket,
+    tablebase_directory: Path | None = None,
+    tablebase_blocks: int = 1024,
+) -> None:
+    """Serve batches of requests until web worker closes connection.
+
+    Endgames are adjudicated by tables of `tablebase_directory` if given.
+    """
+    # Interrupt from terminal reaches whole process group, shard exits when
+    # its web worker closes connection instead.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    games: dict[int, GameRules] = {}
+    tablebase = None
+    if tablebase_directory is not None:
+        tablebase = Tablebase(tablebase_directory, tablebase_blocks)
+    with connection, connection.makefile("rb") as stream:
+        while len(header := stream.read(_LENGTH.size)) == _LENGTH.size:
+            (length,) = _LENGTH.unpack(header)
+            replies = []
+            for request in pickle.loads(stream.read(length)):
+                try:
+                    replies.append(
+                        (request[0], True, _handle(games, tablebase, request))
+                    )
+                except BaseExceptionError as exc:
+                    replies.append((request[0], False, exc))
+                except Exception as exc:
+                    log.exception("Game shard failed request %s", request[:3])
+                    replies.append((request[0], False, ShardError(str(exc))))
+            data = pickle.dumps(replies, pickle.HIGHEST_PROTOCOL)
+            connection.sendall(_LENGTH.pack(len(data)) + data)
+
+
+class _Shard:
+    """Shard process with its connection and state kept for restart."""
+
+    __slots__ = ("games", "in_flight", "index", "outbox", "process", "writer")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: multiprocessing.process.BaseProcess | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        self.games: set[int] = set()
+        self.in_flight: dict[int, Request] = {}
+        self.outbox: list[Request] = []
+
+
+class ShardPool:
+    """Fixed set of shard processes owning rules state of live games.
+
+    Methods return futures resolved when shard replies, so they may be
+    awaited by request handlers or watched with callbacks by synchronous
+    event handlers.
+
+    Attributes:
+        processes (int): Number of shard processes.
+        batch_size (int): Max requests per batch.
+        restart_delay (float): Delay before restarting exited shard.
+        tablebase_directory (Path): Tables adjudicating endgames in shards,
+        None if they are not consulted (Optional).
+        tablebase_blocks (int): Max decoded table blocks kept by each shard.
+
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        batch_size: int = 256,
+        restart_delay: float = 1.0,
+        tablebase_directory: Path | None = None,
+        tablebase_blocks: int = 1024,
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.restart_delay = restart_delay
+        self.tablebase_directory = tablebase_directory
+        self.tablebase_blocks = tablebase_blocks
+        self._shards = [_Shard(index) for index in range(self.processes)]
+        self._futures: dict[int, asyncio.Future[Any]] = {}
+        self._ids = itertools.count(1)
+        self._hydrate: Hydrate | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        # Forked child would inherit event loop and sockets of web worker.
+        self._context = multiprocessing.get_context("spawn")
+
+    @classmethod
+    def from_settings(
+        cls, config: GameShardSettings, tablebase_config: TablebaseSettings
+    ) -> "ShardPool":
+        """Create shard pool from its settings, adjudicating by tablebase if set."""
+        return cls(
+            config.processes,
+            batch_size=config.batch_size,
+            restart_delay=config.restart_delay_seconds,
+            tablebase_directory=(
+                BASE_DIR / tablebase_config.directory
+                if tablebase_config.adjudicate_games
+                else None
+            ),
+            tablebase_blocks=tablebase_config.max_cached_blocks,
+        )
+
+    async def start(self, hydrate: Hydrate) -> None:
+        """Start shard processes.
+
+        Args:
+            hydrate (Callable): Returns initial FEN and moves of live game by
+            ID, None if game is gone; used to reload games of restarted shard.
+
+        """
+        if self._tasks:
+            return
+        self._hydrate = hydrate
+        for shard in self._shards:
+            reader = await self._spawn(shard)
+            self._tasks.append(asyncio.create_task(self._serve(shard, reader)))
+
+    async def stop(self) -> None:
+        """Stop shard processes, pending requests fail with `ShardError`."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        for shard in self._shards:
+            await self._close(shard)
+            shard.games.clear()
+            shard.in_flight.clear()
+            shard.outbox.clear()
+        for future in self._futures.values():
+            if not future.done():
+                future.set_exception(ShardError("Game shards stopped"))
+        self._futures.clear()
+
+    def shard_of(self, game_id: int) -> int:
+        """Return index of shard owning game."""
+        return game_id % self.processes
+
+    def load(self, game_id: int, initial_fen: str | None, moves: Sequence[int]) -> None:
+        """Load game onto its shard, replacing state shard had for it."""
+        self._shards[self.shard_of(game_id)].games.add(game_id)
+        self._send(OP_LOAD, game_id, initial_fen, encode_moves(moves))
+
+    def play(
+        self, game_id: int, ply: int, uci: str
+    ) -> asyncio.Future[tuple[int, GameResultEnum]]:
+        """Make move given in UCI notation as `ply`-th move of game.
+
+        Resolved to code of move and result decided by rules; fails with
+        `IllegalMoveError` if game is over, move is illegal or game already
+        has `ply` moves, `MoveNotationError` if notation is malformed.
+        """
+        return self._request(OP_PLAY, game_id, ply, uci)
+
+    def apply(self, game_id: int, ply: int, move: int) -> asyncio.Future[bool]:
+        """Make move accepted elsewhere as `ply`-th move of game.
+
+        Resolved to False if move is illegal, moves before it are missing or
+        different move was made as `ply`-th.
+        """
+        return self._request(OP_APPLY, game_id, ply, move)
+
+    def drop(self, game_id: int) -> None:
+        """Forget game on its shard."""
+        self._shards[self.shard_of(game_id)].games.discard(game_id)
+        self._send(OP_DROP, game_id, None, None)
+
+    def _request(
+        self, operation: int, game_id: int, first: Any, second: Any
+    ) -> asyncio.Future[Any]:
+        """Queue request whose reply resolves returned future."""
+        future = asyncio.get_running_loop().create_future()
+        request_id = self._send(operation, game_id, first, second)
+        if request_id is None:
+            future.set_exception(ShardError("Game shards are not running"))
+        else:
+            self._futures[request_id] = future
+        return future
+
+    def _send(
+        self, operation: int, game_id: int, first: Any, second: Any
+    ) -> int | None:
+        """Queue request to shard of game, return its ID if shards run."""
+        if not self._tasks:
+            return None
+        request_id = next(self._ids)
+        shard = self._shards[self.shard_of(game_id)]
+        request = (request_id, operation, game_id, first, second)
+        shard.in_flight[request_id] = request
+        shard.outbox.append(request)
+        if len(shard.outbox) == 1:
+            asyncio.get_running_loop().call_soon(self._flush, shard)
+        return request_id
+
+    def _flush(self, shard: _Shard) -> None:
+        requests, shard.outbox = shard.outbox, []
+        # Requests queued while shard restarts are sent after reload.
+        if shard.writer is not None:
+            self._write(shard, requests)
+
+    def _write(self, shard: _Shard, requests: list[Request]) -> None:
+        if shard.writer is None:
+            return
+        for start in range(0, len(requests), self.batch_size):
+            data = pickle.dumps(
+                requests[start : start + self.batch_size], pickle.HIGHEST_PROTOCOL
+            )
+            shard.writer.write(_LENGTH.pack(len(data)) + data)
+            _batches_counter.inc()
+        _requests_counter.inc(len(requests))
+
+    async def _spawn(self, shard: _Shard) -> asyncio.StreamReader:
+        own, other = socket.socketpair()
+        with other:
+            shard.process = self._context.Process(
+                target=serve,
+                args=(other, self.tablebase_directory, self.tablebase_blocks),
+                name=f"game-shard-{shard.index}",
+                daemon=True,
+            )
+            shard.process.start()
+        reader, shard.writer = await asyncio.open_unix_connection(sock=own)
+        return reader
+
+    async def _serve(self, shard: _Shard, reader: asyncio.StreamReader | None) -> None:
+        while True:
+            try:
+                if reader is None:
+                    reader = await self._restart(shard)
+                while True:
+                    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                    self._resolve(shard, pickle.loads(await reader.readexactly(length)))
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.IncompleteReadError) as exc:
+                log.error("Game shard %d lost: %s", shard.index, exc)
+            except Exception:
+                log.exception("Game shard %d failed", shard.index)
+            reader = None
+            await self._close(shard)
+            _restarts_counter.inc()
+            await asyncio.sleep(self.restart_delay)
+
+    async def _restart(self, shard: _Shard) -> asyncio.StreamReader:
+        """Spawn shard again, reload its games and resend pending requests."""
+        reader = await self._spawn(shard)
+        hydrate = []
+        for game_id in list(shard.games):
+            state = self._hydrate(game_id) if self._hydrate is not None else None
+            if state is None:
+                shard.games.discard(game_id)
+                continue
+            initial_fen, moves = state
+            hydrate.append(
+                (next(self._ids), OP_LOAD, game_id, initial_fen, encode_moves(moves))
+            )
+        # Replayed requests follow reloaded state: ply checks skip moves it
+        # already contains.
+        shard.outbox.clear()
+        self._write(shard, hydrate + list(shard.in_flight.values()))
+        log.warning("Game shard %d restarted with %d games", shard.index, len(hydrate))
+        return reader
+
+    def _resolve(self, shard: _Shard, replies: list[tuple[int, bool, Any]]) -> None:
+        for request_id, ok, value in replies:
+            shard.in_flight.pop(request_id, None)
+            future = self._futures.pop(request_id, None)
+            if future is None:
+                if not ok:
+                    log.error("Game shard %d failed load: %s", shard.index, value)
+                continue
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def _close(self, shard: _Shard) -> None:
+        if shard.writer is not None:
+            shard.writer.close()
+            shard.writer = None
+        if shard.process is not None:
+            process, shard.process = shard.process, None
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(asyncio.to_thread(process.join), 5.0)
+            if process.is_alive():
+                process.kill()
+                await asyncio.to_thread(process.join)
+
+
+game_shards = ShardPool.from_settings(settings.game_shards, settings.tablebase)
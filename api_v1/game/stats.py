@@ -0,0 +1,177 @@
+"""Per-player results by speed, color and opening, counted as games finish.
+
+Game is counted exactly once: the statement that counts it also sets its
+`stats_counted` flag, and counters are incremented in the same transaction.
+Live games are counted when their result is stored (see
+`services.update_game_moves`); games stored otherwise, such as imported
+ones, and history before stats existed are counted by `backfill_player_stats`.
+"""
+
+from collections import Counter
+from collections.abc import Sequence
+
+from sqlalchemy import ColumnElement, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.auth.models import Profile
+
+from .constants import (
+    BLITZ_MAX_SECONDS,
+    BULLET_MAX_SECONDS,
+    ESTIMATED_GAME_MOVES,
+    RAPID_MAX_SECONDS,
+)
+from .enums import ColorEnum, GameResultEnum, GameSpeedEnum
+from .models import Game, PlayerStats
+
+# Counter of result by color: wins, draws or losses.
+_RESULT_COUNTERS = {
+    GameResultEnum.WHITE_WIN: {ColorEnum.WHITE: "wins", ColorEnum.BLACK: "losses"},
+    GameResultEnum.BLACK_WIN: {ColorEnum.WHITE: "losses", ColorEnum.BLACK: "wins"},
+    GameResultEnum.DRAW: {ColorEnum.WHITE: "draws", ColorEnum.BLACK: "draws"},
+}
+_COUNTERS = ("wins", "draws", "losses")
+
+StatsKey = tuple[int, GameSpeedEnum, ColorEnum, str]
+
+
+def game_speed(initial: int, increment: int) -> GameSpeedEnum:
+    """Return speed of time control by estimated duration of game.
+
+    Time control `0+0` is how games without known one are stored (see
+    `pgn`), they are of unknown speed.
+    """
+    if not initial and not increment:
+        return GameSpeedEnum.UNKNOWN
+    seconds = initial + ESTIMATED_GAME_MOVES * increment
+    if seconds <= BULLET_MAX_SECONDS:
+        return GameSpeedEnum.BULLET
+    if seconds <= BLITZ_MAX_SECONDS:
+        return GameSpeedEnum.BLITZ
+    if seconds <= RAPID_MAX_SECONDS:
+        return GameSpeedEnum.RAPID
+    return GameSpeedEnum.CLASSICAL
+
+
+def aggregate_results(
+    games: Sequence[tuple[int, int, GameResultEnum, int, int, str | None]],
+) -> dict[StatsKey, Counter[str]]:
+    """Return counters of players by user ID, speed, color and opening.
+
+    Args:
+        games: White ID, black ID, result, initial time, increment and ECO
+        code of finished games.
+
+    """
+    stats: dict[StatsKey, Counter[str]] = {}
+    for white_id, black_id, result, initial, increment, eco in games:
+        speed = game_speed(initial, increment)
+        for user_id, color in (
+            (white_id, ColorEnum.WHITE),
+            (black_id, ColorEnum.BLACK),
+        ):
+            key = (user_id, speed, color, eco or "")
+            stats.setdefault(key, Counter())[_RESULT_COUNTERS[result][color]] += 1
+    return stats
+
+
+async def count_games(session: AsyncSession, where: ColumnElement[bool]) -> int:
+    """Count finished games matching condition not counted yet, return number.
+
+    Games are flagged and their players' counters incremented in session
+    transaction, which caller commits; players without profile are not
+    counted. Rows of counters are upserted in order of their key, so
+    concurrent transactions do not deadlock.
+    """
+    stmt = (
+        update(Game)
+        .where(
+            where,
+            Game.stats_counted.is_(False),
+            Game.result != GameResultEnum.ONGOING,
+        )
+        .values(stats_counted=True)
+        .returning(
+            Game.white_id,
+            Game.black_id,
+            Game.result,
+            Game.time_control_initial,
+            Game.time_control_increment,
+            Game.eco,
+        )
+    )
+    games = (await session.execute(stmt)).tuples().all()
+    if not games:
+        return 0
+    stats = aggregate_results(games)
+    user_ids = {user_id for user_id, _, _, _ in stats}
+    stmt = select(Profile.user_id, Profile.id).where(Profile.user_id.in_(user_ids))
+    profile_ids = dict((await session.execute(stmt)).tuples().all())
+    rows = sorted(
+        (
+            {
+                "profile_id": profile_ids[user_id],
+                "speed": speed,
+                "color": color,
+                "eco": eco,
+                **{name: counters[name] for name in _COUNTERS},
+            }
+            for (user_id, speed, color, eco), counters in stats.items()
+            if user_id in profile_ids
+        ),
+        key=lambda row: (row["profile_id"], row["speed"], row["color"], row["eco"]),
+    )
+    if rows:
+        stmt = insert(PlayerStats)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                constraint="idx_unique_player_stats",
+                set_={
+                    name: getattr(PlayerStats, name) + getattr(stmt.excluded, name)
+                    for name in _COUNTERS
+                },
+            ),
+            rows,
+        )
+    return len(games)
+
+
+async def backfill_player_stats(session: AsyncSession, batch_size: int = 1000) -> int:
+    """Count all finished games not counted yet, return number of games.
+
+    Games are walked by primary key in batches over index of uncounted
+    games, and each batch is committed on its own, so history of any size
+    is counted in bounded memory while games keep finishing. Rerunning is
+    safe, counted games are skipped.
+    """
+    last_id = 0
+    total = 0
+    while True:
+        stmt = (
+            select(Game.id)
+            .where(
+                Game.id > last_id,
+                Game.stats_counted.is_(False),
+                Game.result != GameResultEnum.ONGOING,
+            )
+            .order_by(Game.id)
+            .limit(batch_size)
+        )
+        game_ids = list(await session.scalars(stmt))
+        if not game_ids:
+            return total
+        total += await count_games(session, Game.id.in_(game_ids))
+        await session.commit()
+        last_id = game_ids[-1]
+
+
+async def get_player_stats(session: AsyncSession, user_id: int) -> list[PlayerStats]:
+    """Return stats rows of player, by speed, color and opening."""
+    stmt = (
+        select(PlayerStats)
+        .join(Profile, Profile.id == PlayerStats.profile_id)
+        .where(Profile.user_id == user_id)
+        .order_by(PlayerStats.speed, PlayerStats.color, PlayerStats.eco)
+    )
+    return list(await session.scalars(stmt))
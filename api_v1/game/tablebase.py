@@ -0,0 +1,316 @@
+"""Probing of endgame tablebase files, memory-mapped and decoded by block.
+
+Table holds outcome of every placement of its material with either side to
+move, one 16-bit entry each:
+
+    entry: WDL + 3 (3 bits) | DTZ (13 bits), 0 for illegal placement
+
+WDL is -2 (loss), 0 (draw) or 2 (win) for side to move and DTZ is number of
+plies to next capture, pawn move or mate with best play. Entry of placement
+is at index `side * 64 ** n + square_1 * 64 ** (n - 1) + ... + square_n`,
+squares of pieces taken in order of table material: white king, queens,
+rooks, bishops, knights and pawns, then black ones. Placements differing
+only in order of like pieces have equal entries.
+
+Table files are tens of GB for larger material, so entries are stored in
+zlib-compressed blocks of `block_entries` entries:
+
+    header:  magic "CTB1" | version u8 | pieces u8 | pad u16 |
+             block entries u32 | blocks u32
+             piece codes (u8 each), padded to 8 bytes
+             block offsets (u64 each, blocks + 1)
+    blocks:  zlib-compressed entries (u16 each)
+
+File is memory-mapped and only blocks probes touch are read and decoded;
+decoded blocks are kept in bounded LRU cache shared by all tables. Table of
+material is looked up as `KQvK.ctb` in tablebase directory, mirrored one
+(`KvKQ`) is probed by flipping board and colors.
+"""
+
+import math
+import mmap
+import struct
+import zlib
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from core.config import BASE_DIR, TablebaseSettings, settings
+from core.metrics import registry
+
+from .constants import (
+    BISHOP,
+    BLACK,
+    KING,
+    KNIGHT,
+    PAWN,
+    PIECE_SYMBOLS,
+    QUEEN,
+    ROOK,
+    WHITE,
+)
+from .exceptions import TablebaseError
+from .position import Position
+
+TABLE_SUFFIX = ".ctb"
+
+_MAGIC = b"CTB1"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBxxII")
+_OFFSET = struct.Struct("<Q")
+_ENTRY = struct.Struct("<H")
+_DTZ_SHIFT = 3
+_SIGNATURE_ORDER = (KING, QUEEN, ROOK, BISHOP, KNIGHT, PAWN)
+_SIGNATURE_SYMBOLS = "".join(PIECE_SYMBOLS[piece] for piece in _SIGNATURE_ORDER)
+
+_probes_counter = registry.counter(
+    "tablebase_probes_total", "Tablebase probes by whether table was found."
+)
+_blocks_counter = registry.counter(
+    "tablebase_blocks_total", "Tablebase block reads by whether block was cached."
+)
+
+
+class TablebaseEntry(NamedTuple):
+    """Outcome of position for side to move.
+
+    Attributes:
+        wdl (int): 2 for win, 0 for draw, -2 for loss.
+        dtz (int): Plies to next capture, pawn move or mate, negative when
+        losing, 0 for draw.
+
+    """
+
+    wdl: int
+    dtz: int
+
+
+def encode_entry(wdl: int, dtz: int) -> int:
+    """Return table entry of legal placement."""
+    return (wdl + 3) | abs(dtz) << _DTZ_SHIFT
+
+
+def signature_pieces(signature: str) -> list[int]:
+    """Return piece codes of material signature such as `KQvK`, in order.
+
+    Raises:
+        TablebaseError: If signature is malformed.
+
+    """
+    white, separator, black = signature.partition("v")
+    if not separator or not white.startswith("K") or not black.startswith("K"):
+        raise TablebaseError(f"Invalid material signature: {signature!r}")
+    pieces = []
+    for color, side in ((WHITE, white), (BLACK, black)):
+        if (
+            side.count("K") != 1
+            or not set(side) <= set(_SIGNATURE_SYMBOLS)
+            or sorted(side, key=_SIGNATURE_SYMBOLS.index) != list(side)
+        ):
+            raise TablebaseError(f"Invalid material signature: {signature!r}")
+        pieces += [color * 6 + PIECE_SYMBOLS.index(char) for char in side]
+    return pieces
+
+
+def material_signature(position: Position, mirror: bool = False) -> str:
+    """Return material signature of position, colors swapped if mirrored."""
+    sides = []
+    for color in (BLACK, WHITE) if mirror else (WHITE, BLACK):
+        side = ""
+        for piece_type in _SIGNATURE_ORDER:
+            count = position.pieces[color * 6 + piece_type].bit_count()
+            side += PIECE_SYMBOLS[piece_type] * count
+        sides.append(side)
+    return "v".join(sides)
+
+
+def table_index(position: Position, pieces: Sequence[int], mirror: bool) -> int:
+    """Return index of position in table of given piece codes.
+
+    Mirrored position is indexed with colors swapped and board flipped.
+    """
+    index = position.side ^ mirror
+    flip = 56 if mirror else 0
+    for code in dict.fromkeys(pieces):
+        bitboard = position.pieces[(code + 6) % 12 if mirror else code]
+        for _ in range(pieces.count(code)):
+            square = (bitboard & -bitboard).bit_length() - 1
+            bitboard &= bitboard - 1
+            index = index * 64 + (square ^ flip)
+    return index
+
+
+def write_table(
+    path: Path, signature: str, entries: np.ndarray, block_entries: int = 32768
+) -> None:
+    """Write entries of material signature to table file.
+
+    Raises:
+        TablebaseError: If number of entries does not match material.
+
+    """
+    pieces = signature_pieces(signature)
+    if len(entries) != 2 * 64 ** len(pieces):
+        raise TablebaseError(
+            f"Table {signature} must have {2 * 64 ** len(pieces)} entries"
+        )
+    data = entries.astype("<u2").tobytes()
+    blocks = math.ceil(len(entries) / block_entries)
+    header = _HEADER.pack(_MAGIC, _VERSION, len(pieces), block_entries, blocks)
+    header += bytes(pieces).ljust(-(-len(pieces) // 8) * 8, b"\0")
+    offset = len(header) + (blocks + 1) * _OFFSET.size
+    offsets = [offset]
+    compressed = []
+    block_bytes = block_entries * _ENTRY.size
+    for start in range(0, len(data), block_bytes):
+        block = zlib.compress(data[start : start + block_bytes], 9)
+        compressed.append(block)
+        offsets.append(offsets[-1] + len(block))
+    with open(path, "wb") as file:
+        file.write(header)
+        file.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+        file.writelines(compressed)
+
+
+class Table:
+    """Memory-mapped table file of one material signature.
+
+    Attributes:
+        signature (str): Material signature, e.g. `KQvK`.
+        pieces (list[int]): Piece codes in index order.
+        block_entries (int): Entries per compressed block.
+
+    """
+
+    __slots__ = ("_map", "_offsets", "block_entries", "pieces", "signature")
+
+    def __init__(self, path: Path):
+        self.signature = path.stem
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count, self.block_entries, blocks = _HEADER.unpack_from(
+                self._map
+            )
+            if magic != _MAGIC or version != _VERSION:
+                raise TablebaseError(f"{path} is not tablebase file")
+            start = _HEADER.size
+            self.pieces = list(self._map[start : start + count])
+            if self.pieces != signature_pieces(self.signature):
+                raise TablebaseError(f"{path} does not hold {self.signature}")
+            start += -(-count // 8) * 8
+            self._offsets = struct.unpack_from(f"<{blocks + 1}Q", self._map, start)
+        except (struct.error, TablebaseError):
+            self._map.close()
+            raise
+
+    def block(self, number: int) -> bytes:
+        """Read and decompress block, only its bytes are read from file."""
+        try:
+            return zlib.decompress(
+                self._map[self._offsets[number] : self._offsets[number + 1]]
+            )
+        except (IndexError, zlib.error) as exc:
+            raise TablebaseError(f"{self.signature} block {number} is corrupt") from exc
+
+    def close(self) -> None:
+        """Unmap file."""
+        self._map.close()
+
+
+class Tablebase:
+    """Tables of directory, opened on first probe of their material.
+
+    Attributes:
+        directory (Path): Directory of table files.
+        max_blocks (int): Max decoded blocks kept in memory.
+
+    """
+
+    def __init__(self, directory: str | Path, max_blocks: int = 1024):
+        self.directory = Path(directory)
+        self.max_blocks = max_blocks
+        self._tables: dict[str, Table | None] = {}
+        self._blocks: OrderedDict[tuple[str, int], bytes] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, config: TablebaseSettings) -> "Tablebase":
+        """Create tablebase from its settings, directory relative to project."""
+        return cls(BASE_DIR / config.directory, config.max_cached_blocks)
+
+    def probe(self, position: Position) -> TablebaseEntry | None:
+        """Return outcome of position, None if no table holds it.
+
+        Positions with castling rights or en passant square are not in
+        tables; halfmove clock is ignored, so outcome does not account for
+        fifty-move rule.
+
+        Raises:
+            TablebaseError: If table file is corrupt.
+
+        """
+        if position.castling or position.ep_square >= 0:
+            return None
+        signature = material_signature(position)
+        if signature == "KvK":
+            _probes_counter.inc(result="hit")
+            return TablebaseEntry(0, 0)
+        mirror = False
+        table = self._table(signature)
+        if table is None:
+            mirror = True
+            table = self._table(material_signature(position, mirror=True))
+        if table is None:
+            _probes_counter.inc(result="miss")
+            return None
+        _probes_counter.inc(result="hit")
+        entry = self._entry(table, table_index(position, table.pieces, mirror))
+        if not entry:
+            raise TablebaseError(f"{table.signature} has no entry of {position!r}")
+        wdl = (entry & 7) - 3
+        dtz = entry >> _DTZ_SHIFT
+        return TablebaseEntry(wdl, -dtz if wdl < 0 else dtz)
+
+    def probe_wdl(self, position: Position) -> int | None:
+        """Return WDL of position for side to move, None if it is not in tables."""
+        entry = self.probe(position)
+        return None if entry is None else entry.wdl
+
+    def probe_dtz(self, position: Position) -> int | None:
+        """Return DTZ of position for side to move, None if it is not in tables."""
+        entry = self.probe(position)
+        return None if entry is None else entry.dtz
+
+    def close(self) -> None:
+        """Unmap all open tables and drop decoded blocks."""
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        self._tables.clear()
+        self._blocks.clear()
+
+    def _table(self, signature: str) -> Table | None:
+        if signature not in self._tables:
+            path = self.directory / f"{signature}{TABLE_SUFFIX}"
+            self._tables[signature] = Table(path) if path.is_file() else None
+        return self._tables[signature]
+
+    def _entry(self, table: Table, index: int) -> int:
+        number, offset = divmod(index, table.block_entries)
+        key = (table.signature, number)
+        block = self._blocks.get(key)
+        if block is None:
+            _blocks_counter.inc(result="decoded")
+            block = self._blocks[key] = table.block(number)
+            if len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        else:
+            _blocks_counter.inc(result="cached")
+            self._blocks.move_to_end(key)
+        return _ENTRY.unpack_from(block, offset * _ENTRY.size)[0]
+
+
+tablebase = Tablebase.from_settings(settings.tablebase)
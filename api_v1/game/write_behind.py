@@ -0,0 +1,179 @@
+"""Write-behind storage of live games.
+
+Saving live game after every move in its own transaction turns each move
+into database commit, a write storm at peak. Instead each save is appended
+to local `MoveJournal` and acknowledged once on disk, and pending writes
+are stored in database by background task: every `flush_interval`, or as
+soon as `batch_size` games wait. Saves of one game between flushes are
+coalesced into its latest state, so busy game costs one row update per
+flush whatever number of moves it made.
+
+Game row carries version incremented by each write. Flush updates row only
+if its version is the one this worker last saw, so moves appended by
+replica of game on other worker are never overwritten: on version conflict
+row is read again and only moves it lacks are appended.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
+
+from core.config import WriteBehindSettings, settings
+from core.metrics import registry
+from logger import setup_logging
+
+from .enums import GameResultEnum
+from .journal import GameWrite, MoveJournal
+
+log = setup_logging()
+
+_flushes_counter = registry.counter(
+    "game_write_flushes_total", "Batches of live game writes stored in database."
+)
+_stored_counter = registry.counter(
+    "game_writes_stored_total", "Coalesced live game writes stored in database."
+)
+
+
+class StoredVersion(NamedTuple):
+    """Version of game row and number of moves stored in it."""
+
+    version: int
+    plies: int
+
+
+Store = Callable[
+    [list[GameWrite], dict[int, StoredVersion]], Awaitable[list[GameWrite]]
+]
+
+
+class WriteBehind:
+    """Journals saves of live games and stores them in database in batches.
+
+    Attributes:
+        journal (MoveJournal): Journal of writes not stored yet.
+        flush_interval (float): Max seconds write waits in journal.
+        batch_size (int): Number of waiting games that triggers flush, and max
+        games stored in one transaction.
+
+    """
+
+    def __init__(
+        self,
+        journal: MoveJournal,
+        flush_interval: float = 1.0,
+        batch_size: int = 500,
+    ):
+        self.journal = journal
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: dict[int, GameWrite] = {}
+        self._stored: dict[int, StoredVersion] = {}
+        self._store: Store | None = None
+        self._due = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        registry.gauge(
+            "game_writes_pending", "Live games with writes waiting in journal."
+        ).set_function(lambda: len(self._pending))
+
+    @classmethod
+    def from_settings(cls, config: WriteBehindSettings) -> "WriteBehind":
+        """Create write-behind from its settings."""
+        return cls(
+            MoveJournal(config.journal_directory, config.fsync, config.max_workers),
+            flush_interval=config.flush_interval_seconds,
+            batch_size=config.batch_size,
+        )
+
+    async def start(self, store: Store) -> None:
+        """Open journal and start flush task, replaying writes left in journal.
+
+        Args:
+            store (Callable): Stores writes given versions of their rows seen
+            last, updating them; returns writes it could not store.
+
+        """
+        if self._task is not None:
+            return
+        self._store = store
+        for write in self.journal.open():
+            self._pending[write.game_id] = write
+        if self._pending:
+            log.warning("Replaying %d game writes from journal", len(self._pending))
+            self._due.set()
+        self._task = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        """Stop flush task, store pending writes and close journal."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        try:
+            await self.flush()
+        finally:
+            await self.journal.close()
+
+    async def write(self, write: GameWrite) -> None:
+        """Journal state of game, returns once it is on disk."""
+        # Pending state and journal record change together, before journal
+        # waits for disk, so flush never splits them.
+        self._pending[write.game_id] = write
+        if len(self._pending) >= self.batch_size:
+            self._due.set()
+        await self.journal.append(write)
+
+    async def flush(self) -> None:
+        """Store all pending writes, keeping journal of ones not stored."""
+        if not self._pending or self._store is None:
+            return
+        writes = list(self._pending.values())
+        self._pending = {}
+        failed: list[GameWrite] = []
+        try:
+            segment = await self.journal.rotate()
+            for start in range(0, len(writes), self.batch_size):
+                batch = writes[start : start + self.batch_size]
+                try:
+                    failed += await self._store(batch, self._stored)
+                except Exception:
+                    log.exception("Storing %d game writes failed", len(batch))
+                    failed += batch
+                    continue
+                _flushes_counter.inc()
+        except asyncio.CancelledError:
+            # Storing writes again is harmless: rows are read back on
+            # version conflict and only missing moves are appended.
+            for write in writes:
+                self._pending.setdefault(write.game_id, write)
+            raise
+        _stored_counter.inc(len(writes) - len(failed))
+        for write in failed:
+            # Newer write of the same game made during flush supersedes it.
+            self._pending.setdefault(write.game_id, write)
+        failed_ids = {write.game_id for write in failed}
+        for write in writes:
+            if (
+                write.result != GameResultEnum.ONGOING
+                and write.game_id not in failed_ids
+                and write.game_id not in self._pending
+            ):
+                self._stored.pop(write.game_id, None)
+        # Failed writes are kept in old segments until later flush stores them.
+        if not failed:
+            self.journal.discard(segment)
+
+    async def _flush_forever(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._due.wait(), self.flush_interval)
+            self._due.clear()
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Flushing game writes failed")
+
+
+move_writer = WriteBehind.from_settings(settings.write_behind)
@@ -0,0 +1,50 @@
+import random
+
+from .bitboard import PAWN_ATTACKS
+from .constants import EMPTY, PAWN
+
+# Seed must never change: keys are persisted in position index.
+ZOBRIST_SEED = 0x5EED_C4E55
+
+_rng = random.Random(ZOBRIST_SEED)
+PIECE_KEYS = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(16)]
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+SIDE_KEY = _rng.getrandbits(64)
+del _rng
+
+_SIGN_BIT = 1 << 63
+
+
+def en_passant_key(pieces: list[int], side: int, ep_square: int) -> int:
+    """Return en passant part of key.
+
+    File is hashed only when side to move has pawn attacking target square,
+    so positions differing only in unusable en passant right get same key.
+    """
+    if ep_square >= 0 and PAWN_ATTACKS[side ^ 1][ep_square] & pieces[side * 6 + PAWN]:
+        return EN_PASSANT_KEYS[ep_square & 7]
+    return 0
+
+
+def compute_key(
+    board: list[int], pieces: list[int], side: int, castling: int, ep_square: int
+) -> int:
+    """Compute Zobrist key of position from scratch."""
+    key = CASTLING_KEYS[castling] ^ en_passant_key(pieces, side, ep_square)
+    if side:
+        key ^= SIDE_KEY
+    for square, piece in enumerate(board):
+        if piece != EMPTY:
+            key ^= PIECE_KEYS[piece][square]
+    return key
+
+
+def to_signed(key: int) -> int:
+    """Convert unsigned 64-bit key to signed value fitting PostgreSQL BIGINT."""
+    return key - (1 << 64) if key & _SIGN_BIT else key
+
+
+def to_unsigned(key: int) -> int:
+    """Convert signed BIGINT value back to unsigned 64-bit key."""
+    return key & 0xFFFF_FFFF_FFFF_FFFF
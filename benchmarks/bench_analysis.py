@@ -0,0 +1,95 @@
+"""Latency of engine analysis requests over popular and rare positions.
+
+Users request positions of random opening lines concurrently; few early
+positions are requested by almost everyone, so most requests are answered
+from evaluation cache or join search already running. Uses built-in stub
+engine unless `--engine` is given.
+
+Usage:
+    python -m benchmarks.bench_analysis --users 200 --requests 20
+    python -m benchmarks.bench_analysis --engine /usr/bin/stockfish --depth 12
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from api_v1.analysis.exceptions import AnalysisQuotaError
+from api_v1.analysis.pool import STUB_ENGINE_COMMAND, AnalysisPool
+from api_v1.game.position import Position
+
+
+def opening_positions(rng: random.Random, lines: int, plies: int) -> list[list[str]]:
+    """Return FENs along random lines, the earlier the more shared."""
+    positions = []
+    for _ in range(lines):
+        position = Position()
+        line = []
+        for _ in range(plies):
+            moves = position.legal_moves()
+            # Few first moves keep early positions shared between lines.
+            position.make_move(rng.choice(moves[:3]))
+            line.append(position.fen())
+        positions.append(line)
+    return positions
+
+
+async def run(
+    pool: AnalysisPool, users: int, requests: int, depth: int, seed: int
+) -> tuple[list[float], int]:
+    """Send requests of all users, return latencies and rejected requests."""
+    rng = random.Random(seed)
+    lines = opening_positions(rng, 64, 12)
+    latencies: list[float] = []
+    rejected = 0
+
+    async def user(user_id: int) -> None:
+        nonlocal rejected
+        user_rng = random.Random(user_id)
+        for _ in range(requests):
+            line = user_rng.choice(lines)
+            fen = line[min(int(user_rng.expovariate(0.4)), len(line) - 1)]
+            started = time.perf_counter()
+            try:
+                await pool.analyse(user_id, fen, depth)
+            except AnalysisQuotaError:
+                rejected += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    await pool.start()
+    await asyncio.gather(*(user(user_id) for user_id in range(users)))
+    await pool.stop()
+    return latencies, rejected
+
+
+def main() -> None:
+    """Print request latency percentiles and share of cached answers."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--engine")
+    args = parser.parse_args()
+
+    command = (args.engine,) if args.engine else STUB_ENGINE_COMMAND
+    pool = AnalysisPool(command, workers=args.workers, timeout=60.0)
+    started = time.perf_counter()
+    latencies, rejected = asyncio.run(
+        run(pool, args.users, args.requests, args.depth, seed=0)
+    )
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    searched = len(pool.cache)
+    print(f"requests    {len(latencies):>10} ({len(latencies) / elapsed:.0f}/s)")
+    print(f"rejected    {rejected:>10}")
+    print(f"searches    {searched:>10} ({1 - searched / len(latencies):.0%} free)")
+    print(f"p50         {statistics.median(latencies) * 1000:>10.1f} ms")
+    print(f"p99         {latencies[int(len(latencies) * 0.99)] * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Flag timer accuracy and CPU cost of game clocks on timer wheel.
+
+Runs clocks of many concurrent games: random games move at given rate,
+pressing clock and rescheduling flag timer of opponent, until players run
+out of time. Lateness of flag detection and CPU time used by process are
+measured with timers on `TimerWheel`, or on per-game event loop timers with
+`--baseline`.
+
+Usage:
+    python -m benchmarks.bench_clocks --games 50000 --duration 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from api_v1.game.clock import GameClock
+from core.timer_wheel import Timer, TimerWheel
+
+
+class BenchGame:
+    """Clock of one game with its pending flag timer."""
+
+    __slots__ = ("clock", "deadline", "flagged", "timer")
+
+    def __init__(self, clock: GameClock):
+        self.clock = clock
+        self.timer: asyncio.TimerHandle | Timer | None = None
+        self.deadline = 0.0
+        self.flagged = False
+
+
+async def run(
+    games: int, duration: float, move_rate: float, tick: float, baseline: bool
+) -> None:
+    """Run clocks until all flag or duration passes, print measurements."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel("bench_clocks", tick=tick)
+    rng = random.Random(0)
+    lateness: list[float] = []
+    moves = 0
+
+    def schedule(game: BenchGame) -> None:
+        if game.timer is not None:
+            game.timer.cancel()
+        deadline = game.clock.deadline()
+        if deadline is None:
+            return
+        game.deadline = deadline
+        if baseline:
+            game.timer = loop.call_at(deadline, check, game)
+        else:
+            game.timer = wheel.schedule(deadline, lambda: check(game))
+
+    def check(game: BenchGame) -> None:
+        game.timer = None
+        now = time.monotonic()
+        if game.clock.flagged(now):
+            game.flagged = True
+            lateness.append(now - game.deadline)
+        else:
+            schedule(game)
+
+    started = time.monotonic()
+    pool = []
+    for _ in range(games):
+        clock = GameClock(rng.uniform(1.0, duration), 0.0, max_lag_quota=0.0)
+        game = BenchGame(clock)
+        clock.press(clock.side, started)
+        schedule(game)
+        pool.append(game)
+
+    wheel.start()
+    cpu_started = time.process_time()
+    interval = 0.01
+    per_interval = max(1, round(games * move_rate * interval))
+    while len(lateness) < games and time.monotonic() - started < duration + 1:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        for game in rng.sample(pool, per_interval):
+            if not game.flagged and game.clock.press(game.clock.side, now):
+                moves += 1
+                schedule(game)
+    wall = time.monotonic() - started
+    cpu = time.process_time() - cpu_started
+    await wheel.stop()
+
+    lateness.sort()
+    print(f"{'event loop timers' if baseline else 'timer wheel'}, games {games}")
+    print(f"moves       {moves:>10} ({moves / wall:.0f}/s)")
+    print(f"flags       {len(lateness):>10}")
+    if lateness:
+        print(f"p50 late    {statistics.median(lateness) * 1000:>10.3f} ms")
+        print(f"p99 late    {lateness[int(len(lateness) * 0.99)] * 1000:>10.3f} ms")
+        print(f"max late    {lateness[-1] * 1000:>10.3f} ms")
+    print(f"cpu         {cpu / wall * 100:>10.1f} %")
+
+
+def main() -> None:
+    """Parse arguments and run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=50_000)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--move-rate", type=float, default=0.5)
+    parser.add_argument("--tick", type=float, default=0.05)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(
+        run(args.games, args.duration, args.move_rate, args.tick, args.baseline)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Cross-worker latency of game events through Unix socket broker.
+
+Two worker processes hold replicas of the same games, one plays white and
+the other black: each move is published on `GameEventBus`, applied to
+replica of other worker, which answers with its own move. Half of round
+trip between own move and reply is reported as one-hop latency; it covers
+batching, broker relay, decoding and move validation of replica.
+
+Usage:
+    python -m benchmarks.bench_game_events --games 1000 --plies 40
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import statistics
+import tempfile
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.synchronize import Barrier
+from pathlib import Path
+
+from api_v1.game.constants import BLACK, WHITE
+from api_v1.game.enums import GameResultEnum
+from api_v1.game.events import GameEvent, GameEventBus
+from api_v1.game.hub import GameHub, LiveGame
+from api_v1.game.move import move_to_uci
+from core.pubsub import UnixSocketBroker, UnixSocketTransport
+
+
+def run_broker(path: str) -> None:
+    """Run broker process until terminated."""
+
+    async def serve() -> None:
+        broker = UnixSocketBroker(path)
+        await broker.start()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+async def play(
+    color: int,
+    path: str,
+    games: int,
+    plies: int,
+    flush_interval: float,
+    barrier: Barrier,
+) -> list[float]:
+    """Play moves of one color in all games, return round trip times."""
+    hub = GameHub(send_queue_size=64, send_timeout=5.0, max_spectators=0)
+    bus = GameEventBus(UnixSocketTransport(path), flush_interval=flush_interval)
+    rng = random.Random(color)
+    user_id = color
+    round_trips: list[float] = []
+    moved_at: dict[int, float] = {}
+    connected = asyncio.Event()
+    finished = asyncio.Event()
+    playing = games
+
+    def over(game: LiveGame) -> bool:
+        return game.result != GameResultEnum.ONGOING or len(game.moves) >= plies
+
+    def move(game: LiveGame) -> None:
+        nonlocal playing
+        if not over(game):
+            choice = rng.choice(game.position.legal_moves())
+            moved_at[game.game_id] = time.perf_counter()
+            game.play(user_id, move_to_uci(choice))
+        if over(game):
+            playing -= 1
+            if not playing:
+                finished.set()
+
+    def on_event(event: GameEvent) -> None:
+        now = time.perf_counter()
+        if event.game_id in moved_at:
+            round_trips.append(now - moved_at.pop(event.game_id))
+        move(hub.games[event.game_id])
+
+    for game_id in range(games):
+        hub.games[game_id] = LiveGame(
+            game_id, white_id=WHITE, black_id=BLACK, on_event=hub.publish
+        )
+    hub.attach(bus)
+    bus.subscribe(on_event)
+    bus.on_resync(connected.set)
+    await bus.start()
+    await connected.wait()
+    await asyncio.to_thread(barrier.wait)
+    if color == WHITE:
+        for game in hub.games.values():
+            move(game)
+    try:
+        await asyncio.wait_for(finished.wait(), timeout=plies * 2 + 10)
+    except TimeoutError:
+        print(f"{'white' if color == WHITE else 'black'} timed out, {playing} left")
+    # Let last moves reach opponent before disconnecting.
+    await asyncio.sleep(0.2)
+    await bus.stop()
+    return round_trips
+
+
+def run_player(
+    color: int,
+    path: str,
+    games: int,
+    plies: int,
+    flush_interval: float,
+    barrier: Barrier,
+    results: Connection,
+) -> None:
+    """Run player process and send its round trip times to parent."""
+    results.send(asyncio.run(play(color, path, games, plies, flush_interval, barrier)))
+
+
+def main() -> None:
+    """Start broker and two players, print latency of event hops."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--plies", type=int, default=40)
+    parser.add_argument("--flush-interval", type=float, default=0.002)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "broker.sock")
+        broker = multiprocessing.Process(target=run_broker, args=(path,))
+        broker.start()
+        while not Path(path).exists():
+            time.sleep(0.01)
+        barrier = multiprocessing.Barrier(2)
+        players = []
+        receivers = []
+        for color in (WHITE, BLACK):
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            player = multiprocessing.Process(
+                target=run_player,
+                args=(
+                    color,
+                    path,
+                    args.games,
+                    args.plies,
+                    args.flush_interval,
+                    barrier,
+                    sender,
+                ),
+            )
+            player.start()
+            players.append(player)
+            receivers.append(receiver)
+        started = time.perf_counter()
+        round_trips = [trip for receiver in receivers for trip in receiver.recv()]
+        elapsed = time.perf_counter() - started
+        for player in players:
+            player.join()
+        broker.terminate()
+        broker.join()
+
+    hops = sorted(trip / 2 for trip in round_trips)
+    print(f"games {args.games}, flush interval {args.flush_interval * 1000:.1f} ms")
+    print(f"hops        {len(hops) * 2:>10} ({len(hops) * 2 / elapsed:.0f}/s)")
+    if hops:
+        print(f"p50         {statistics.median(hops) * 1000:>10.3f} ms")
+        print(f"p99         {hops[int(len(hops) * 0.99)] * 1000:>10.3f} ms")
+        print(f"max         {hops[-1] * 1000:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Event loop cost of moves validated in place or on game shards.
+
+Plays random games concurrently: in each round every game makes one move,
+through `GameHub.play`. Reported event loop CPU time per move is what move
+costs web worker; with shards, legal move generation and adjudication run in
+shard processes and web worker only batches requests and applies verdicts.
+
+Usage:
+    python -m benchmarks.bench_game_shards --games 2000 --plies 60
+    python -m benchmarks.bench_game_shards --games 2000 --processes 4
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from api_v1.game.constants import WHITE
+from api_v1.game.enums import GameResultEnum
+from api_v1.game.hub import GameHub, LiveGame
+from api_v1.game.move import move_to_uci
+from api_v1.game.rules import GameRules
+from api_v1.game.shards import ShardPool
+
+
+def random_game(rng: random.Random, plies: int) -> list[str]:
+    """Return moves of random game in UCI notation, ending before its result."""
+    rules = GameRules()
+    moves = []
+    while len(moves) < plies:
+        uci = move_to_uci(rng.choice(rules.position.legal_moves()))
+        rules.play(uci)
+        if rules.result != GameResultEnum.ONGOING:
+            break
+        moves.append(uci)
+    return moves
+
+
+async def run(games: int, plies: int, processes: int) -> tuple[int, float, float]:
+    """Play all games, return moves made, wall and event loop CPU seconds."""
+    rng = random.Random(0)
+    lines = [random_game(rng, plies) for _ in range(games)]
+    hub = GameHub(send_queue_size=64, send_timeout=5.0, max_spectators=0)
+    shards = None
+    if processes:
+        shards = ShardPool(processes)
+        await shards.start(hub.hydrate)
+        hub.attach_shards(shards)
+    for game_id in range(games):
+        game = LiveGame(game_id, white_id=1, black_id=2)
+        await hub.get_or_load(game_id, lambda game=game: asyncio.sleep(0, game))
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    made = 0
+    for ply in range(plies):
+        plays = [
+            hub.play(
+                hub.games[game_id],
+                1 if hub.games[game_id].position.side == WHITE else 2,
+                line[ply],
+            )
+            for game_id, line in enumerate(lines)
+            if ply < len(line)
+        ]
+        if not plays:
+            break
+        await asyncio.gather(*plays)
+        made += len(plays)
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    if shards is not None:
+        await shards.stop()
+    return made, elapsed, cpu
+
+
+def main() -> None:
+    """Compare moves validated in event loop with moves validated on shards."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--plies", type=int, default=60)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'moves/s':>10}{'loop µs/move':>14}")
+    for processes in (0, args.processes):
+        made, elapsed, cpu = asyncio.run(run(args.games, args.plies, processes))
+        mode = f"{processes} shards" if processes else "in place"
+        print(f"{mode:<12}{made / elapsed:>10.0f}{cpu / made * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Vectorized Glicko-2 rating period on synthetic players and games.
+
+Usage:
+    python -m benchmarks.bench_glicko --players 1000000 --games 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from api_v1.game.glicko import assign_ranks, game_sides, rate_period
+
+
+def main() -> None:
+    """Generate rating period and print time of each stage."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--games", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ratings = rng.normal(1500, 300, args.players)
+    deviations = rng.uniform(50, 350, args.players)
+    volatilities = np.full(args.players, 0.06)
+    white = rng.integers(0, args.players, args.games)
+    black = (white + rng.integers(1, args.players, args.games)) % args.players
+    white_scores = rng.choice([0.0, 0.5, 1.0], args.games)
+    rank_ids = np.arange(1, 6)
+    min_ratings = np.array([1200.0, 1600.0, 2000.0, 2300.0, 2500.0])
+
+    started = time.perf_counter()
+    players, opponents, scores = game_sides(white, black, white_scores)
+    sides = time.perf_counter()
+    new_ratings, _, _ = rate_period(
+        ratings, deviations, volatilities, players, opponents, scores
+    )
+    rated = time.perf_counter()
+    assign_ranks(new_ratings, rank_ids, min_ratings)
+    ranked = time.perf_counter()
+
+    print(f"players {args.players}, games {args.games}")
+    print(f"game sides   {sides - started:>8.3f} s")
+    print(f"rate period  {rated - sides:>8.3f} s")
+    print(f"assign ranks {ranked - rated:>8.3f} s")
+    print(f"games/s      {args.games / (ranked - started):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
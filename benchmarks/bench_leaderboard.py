@@ -0,0 +1,66 @@
+"""Leaderboard build, rating updates, rank lookups and keyset pages.
+
+Usage:
+    python -m benchmarks.bench_leaderboard --players 1000000 --countries 200
+"""
+
+import argparse
+import random
+import time
+
+from api_v1.game.leaderboard import Leaderboards
+
+
+def timed(label: str, count: int, function) -> None:
+    """Run `function` and print its time per operation."""
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<14} {elapsed:>8.3f} s {elapsed / count * 1e6:>10.2f} us/op")
+
+
+def main() -> None:
+    """Generate players and print time of each leaderboard operation."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--operations", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    players = [
+        (user_id, rng.randrange(args.countries), rng.gauss(1500, 300))
+        for user_id in range(args.players)
+    ]
+    sample = [rng.randrange(args.players) for _ in range(args.operations)]
+    boards = Leaderboards()
+
+    def build() -> None:
+        nonlocal boards
+        boards = Leaderboards(players)
+
+    def update() -> None:
+        for user_id in sample:
+            boards.update(user_id, players[user_id][1], rng.gauss(1500, 300))
+
+    def rank() -> None:
+        for user_id in sample:
+            boards.rank(user_id)
+
+    def page() -> None:
+        board = boards.global_board
+        for user_id in sample:
+            entry = board.rank(user_id)
+            if entry is not None:
+                board.page(args.page_size, (entry.rating, entry.user_id))
+
+    print(f"players {args.players}, countries {args.countries}")
+    timed("build", args.players, build)
+    timed("update", args.operations, update)
+    timed("rank", args.operations, rank)
+    timed("cursor page", args.operations, page)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Move delivery latency of live game hub under load.
+
+Runs many concurrent games with spectators on in-process fake connections,
+so measured time covers move validation, serialization, fan-out through
+per-connection queues and writer tasks, but not network. With `--binary`
+spectators receive binary delta frames instead of JSON.
+
+Usage:
+    python -m benchmarks.bench_live_game --games 2000 --spectators 5
+    python -m benchmarks.bench_live_game --games 10 --spectators 10000 --binary
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from api_v1.game.constants import WHITE
+from api_v1.game.enums import GameResultEnum
+from api_v1.game.hub import GameHub, LiveGame
+from api_v1.game.move import move_to_uci
+
+
+class FakeConnection:
+    """Connection that yields to event loop on every write, like real socket."""
+
+    def __init__(self):
+        self.waiter: asyncio.Future[float] | None = None
+        self.sent_bytes = 0
+
+    async def send_text(self, data: str) -> None:
+        """Accept message and resolve pending waiter with delivery time."""
+        await self._deliver(len(data.encode()))
+
+    async def send_bytes(self, data: bytes) -> None:
+        """Accept binary message and resolve pending waiter with delivery time."""
+        await self._deliver(len(data))
+
+    async def _deliver(self, size: int) -> None:
+        await asyncio.sleep(0)
+        self.sent_bytes += size
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(time.perf_counter())
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        """Close nothing."""
+
+
+async def play(
+    game: LiveGame,
+    white: FakeConnection,
+    black: FakeConnection,
+    rng: random.Random,
+    plies: int,
+    latencies: list[float],
+) -> None:
+    """Play random moves, measuring time until opponent receives each one."""
+    loop = asyncio.get_running_loop()
+    for _ in range(plies):
+        if game.result != GameResultEnum.ONGOING:
+            return
+        if game.position.side == WHITE:
+            user_id, opponent = game.white_id, black
+        else:
+            user_id, opponent = game.black_id, white
+        move = rng.choice(game.position.legal_moves())
+        opponent.waiter = loop.create_future()
+        started = time.perf_counter()
+        game.play(user_id, move_to_uci(move))
+        latencies.append(await opponent.waiter - started)
+
+
+async def run(
+    games: int, spectators: int, plies: int, queue_size: int, binary: bool
+) -> None:
+    """Run games concurrently and print latency percentiles."""
+    hub = GameHub(
+        send_queue_size=queue_size, send_timeout=5.0, max_spectators=spectators
+    )
+    rng = random.Random(0)
+    latencies: list[float] = []
+    drivers = []
+    subscribers = []
+    audience = FakeConnection()
+    for game_id in range(games):
+        game = LiveGame(
+            game_id,
+            white_id=2 * game_id,
+            black_id=2 * game_id + 1,
+            max_spectators=spectators,
+        )
+        hub.games[game_id] = game
+        white, black = FakeConnection(), FakeConnection()
+        connections = [(white, game.white_id), (black, game.black_id)]
+        connections += [(audience, -1)] * spectators
+        for connection, user_id in connections:
+            subscriber = hub.subscriber(connection, user_id, binary and user_id < 0)
+            subscriber.start()
+            game.join(subscriber)
+            subscribers.append(subscriber)
+        drivers.append(play(game, white, black, rng, plies, latencies))
+
+    started = time.perf_counter()
+    await asyncio.gather(*drivers)
+    elapsed = time.perf_counter() - started
+    await hub.close()
+
+    latencies.sort()
+    dropped = sum(
+        subscriber.close_code not in (None, 1001) for subscriber in subscribers
+    )
+    print(f"games {games}, connections {len(subscribers)}, moves {len(latencies)}")
+    print(f"throughput  {len(latencies) / elapsed:>10.0f} moves/s")
+    print(f"p50         {statistics.median(latencies) * 1000:>10.3f} ms")
+    print(f"p99         {latencies[int(len(latencies) * 0.99)] * 1000:>10.3f} ms")
+    print(f"max         {latencies[-1] * 1000:>10.3f} ms")
+    if spectators:
+        per_move = audience.sent_bytes / (spectators * len(latencies))
+        print(f"spectator   {per_move:>10.1f} bytes/move, state included")
+    print(f"slow consumers dropped {dropped}")
+
+
+def main() -> None:
+    """Parse arguments and run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--spectators", type=int, default=5)
+    parser.add_argument("--plies", type=int, default=40)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--binary", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(
+        run(args.games, args.spectators, args.plies, args.queue_size, args.binary)
+    )
+
+
+if __name__ == "__main__":
+    main()
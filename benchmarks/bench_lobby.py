@@ -0,0 +1,73 @@
+"""Latency of filtered lobby queries: sorted seek index against linear scan.
+
+Seeks of random players are spread over common time controls; each query
+asks for seeks of one time control within rating window, as lobby filter
+of connecting player does.
+
+Usage:
+    python -m benchmarks.bench_lobby --seeks 100000 --queries 2000
+"""
+
+import argparse
+import random
+import time
+
+from api_v1.game.lobby import Seek, SeekFilter, SeekIndex
+from api_v1.game.matchmaking import TimeControl
+
+TIME_CONTROLS = [
+    TimeControl(60, 0),
+    TimeControl(180, 0),
+    TimeControl(180, 2),
+    TimeControl(300, 3),
+    TimeControl(600, 5),
+    TimeControl(900, 10),
+]
+
+
+def main() -> None:
+    """Print microseconds per query of index and of linear scan."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seeks", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--window", type=float, default=100.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    index = SeekIndex()
+    seeks = []
+    for seek_id in range(1, args.seeks + 1):
+        seek = Seek(
+            seek_id,
+            seek_id,
+            f"player{seek_id}",
+            rng.gauss(1500, 300),
+            rng.choice(TIME_CONTROLS),
+            None,
+        )
+        index.add(seek)
+        seeks.append(seek)
+    filters = []
+    for _ in range(args.queries):
+        low = rng.gauss(1500, 300)
+        filters.append(SeekFilter(rng.choice(TIME_CONTROLS), low, low + args.window))
+
+    started = time.perf_counter()
+    indexed = [[seek.seek_id for seek in index.query(f)] for f in filters]
+    sorted_index = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scanned = [[seek.seek_id for seek in seeks if f.accepts(seek)] for f in filters]
+    linear = time.perf_counter() - started
+
+    if [sorted(ids) for ids in indexed] != scanned:
+        raise SystemExit("Index and scan disagree on seeks")
+    found = sum(map(len, indexed)) / len(filters)
+    print(f"seeks       {len(seeks):>10} ({found:.0f} per query)")
+    print(f"{'mode':<12}{'us/query':>10}")
+    print(f"{'index':<12}{sorted_index / len(filters) * 1e6:>10.1f}")
+    print(f"{'scan':<12}{linear / len(filters) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
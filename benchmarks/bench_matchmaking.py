@@ -0,0 +1,77 @@
+"""Simulation of matchmaking queue with large number of waiting players.
+
+Queue is first filled with `--players` waiting players (search windows are
+disabled while filling, so nobody is paired), then windows are enabled and
+players keep arriving at fixed rate on simulated clock while queue is swept
+once per simulated second. Prints insert rate at full queue, median and p90
+wait of matched players in simulated seconds and pairing throughput measured
+on wall clock.
+
+Usage:
+    python -m benchmarks.bench_matchmaking --players 100000 --arrivals 5000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from api_v1.game.matchmaking import Match, MatchQueue, TimeControl
+
+
+def main() -> None:
+    """Run simulation and print wait times and pairing throughput."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--arrivals", type=int, default=5_000, help="per second")
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--initial-window", type=float, default=50.0)
+    parser.add_argument("--window-growth", type=float, default=10.0)
+    parser.add_argument("--max-window", type=float, default=400.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    queue = MatchQueue(TimeControl(300, 0), 0.0, 0.0, 0.0, rng=rng)
+    joined: dict[int, float] = {}
+    waits: list[float] = []
+    pairings = 0
+
+    def record(match: Match | None, now: float) -> None:
+        nonlocal pairings
+        if match is not None:
+            pairings += 1
+            waits.append(now - joined.pop(match.white_id))
+            waits.append(now - joined.pop(match.black_id))
+
+    started = time.perf_counter()
+    for user_id in range(args.players):
+        joined[user_id] = 0.0
+        record(queue.add(user_id, rng.gauss(1500, 300), 0.0), 0.0)
+    elapsed = time.perf_counter() - started
+    print(f"filled {len(queue)} players, {args.players / elapsed:.0f} inserts/s")
+
+    queue.initial_window = args.initial_window
+    queue.window_growth = args.window_growth
+    queue.max_window = args.max_window
+    user_id = args.players
+    elapsed = 0.0
+    for second in range(args.seconds):
+        started = time.perf_counter()
+        for index in range(args.arrivals):
+            now = second + index / args.arrivals
+            user_id += 1
+            joined[user_id] = now
+            record(queue.add(user_id, rng.gauss(1500, 300), now), now)
+        for match in queue.sweep(second + 1):
+            record(match, second + 1)
+        elapsed += time.perf_counter() - started
+
+    waits.sort()
+    print(f"queued at end {len(queue)}, matched players {len(waits)}")
+    print(f"median wait {statistics.median(waits):>10.2f} s")
+    print(f"p90 wait    {waits[int(len(waits) * 0.9)]:>10.2f} s")
+    print(f"pairings    {pairings / elapsed:>10.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
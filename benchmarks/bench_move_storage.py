@@ -0,0 +1,59 @@
+"""Size and decode speed of packed move storage compared to PGN movetext.
+
+Usage:
+    python -m benchmarks.bench_move_storage --games 2000
+"""
+
+import argparse
+import time
+
+from api_v1.game.encoding import decode_moves, encode_moves
+from api_v1.game.notation import moves_to_movetext, parse_san
+from api_v1.game.position import Position
+from benchmarks.utils import random_games
+
+
+def _decode_pgn(movetext: str) -> list[int]:
+    position = Position()
+    moves = []
+    for token in movetext.split():
+        if token[0].isdigit():
+            continue
+        move = parse_san(position, token)
+        position.make_move(move)
+        moves.append(move)
+    return moves
+
+
+def main() -> None:
+    """Encode random games both ways and print size and decode speed."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--plies", type=int, default=80)
+    args = parser.parse_args()
+
+    games = random_games(args.games, args.plies)
+    plies = sum(len(game) for game in games)
+    packed = [encode_moves(game) for game in games]
+    pgn = [moves_to_movetext(game).encode() for game in games]
+
+    started = time.perf_counter()
+    for data in packed:
+        list(decode_moves(data))
+    packed_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for text in pgn:
+        _decode_pgn(text.decode())
+    pgn_time = time.perf_counter() - started
+
+    packed_size = sum(map(len, packed))
+    pgn_size = sum(map(len, pgn))
+    print(f"games {len(games)}, plies {plies}")
+    print(f"{'format':<8} {'bytes/ply':>10} {'plies/s':>14}")
+    print(f"{'packed':<8} {packed_size / plies:>10.2f} {plies / packed_time:>14.0f}")
+    print(f"{'pgn':<8} {pgn_size / plies:>10.2f} {plies / pgn_time:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
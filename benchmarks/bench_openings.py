@@ -0,0 +1,117 @@
+"""Throughput of opening classification: string prefixes, trie and batches.
+
+Games follow random book line and go on with random moves. Prefix mode
+compares UCI moves of each game with every book line as string; trie mode
+walks compiled book one move at a time, as live games do; batch mode
+classifies games in batches with one vectorized search per ply, as backfill
+of stored games does.
+
+Usage:
+    python -m benchmarks.bench_openings --games 20000
+    python -m benchmarks.bench_openings --batch 5000
+"""
+
+import argparse
+import csv
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from api_v1.game.move import move_to_uci
+from api_v1.game.notation import parse_san
+from api_v1.game.openings import Opening, OpeningBook
+from api_v1.game.pgn import MOVE_NUMBER_REGEX
+from api_v1.game.position import Position
+from core.config import BASE_DIR, settings
+
+
+def book_lines(source: Path) -> list[tuple[list[int], Opening]]:
+    """Return moves and opening of every line of book source."""
+    lines = []
+    with open(source, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file, delimiter="\t"):
+            position = Position()
+            moves = []
+            for san in MOVE_NUMBER_REGEX.sub(" ", row["pgn"]).split():
+                moves.append(parse_san(position, san))
+                position.make_move(moves[-1])
+            lines.append((moves, Opening(row["eco"], row["name"])))
+    return lines
+
+
+def random_game(rng: random.Random, line: list[int], plies: int) -> list[int]:
+    """Return book line continued with random moves up to `plies` moves."""
+    position = Position()
+    moves = list(line)
+    for move in moves:
+        position.make_move(move)
+    while len(moves) < plies and (legal := position.legal_moves()):
+        moves.append(rng.choice(legal))
+        position.make_move(moves[-1])
+    return moves
+
+
+def classify_by_prefix(
+    prefixes: list[tuple[str, Opening]], moves: list[int]
+) -> Opening | None:
+    """Return opening of longest book line game string starts with."""
+    text = " ".join(move_to_uci(move) for move in moves) + " "
+    found, length = None, 0
+    for prefix, opening in prefixes:
+        if len(prefix) > length and text.startswith(prefix):
+            found, length = opening, len(prefix)
+    return found
+
+
+def main() -> None:
+    """Print games classified per second by each mode."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20_000)
+    parser.add_argument("--plies", type=int, default=60)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    source = BASE_DIR / settings.openings.source
+    lines = book_lines(source)
+    rng = random.Random(0)
+    games = [
+        random_game(rng, rng.choice(lines)[0][: rng.randint(0, 10)], args.plies)
+        for _ in range(args.games)
+    ]
+    prefixes = [
+        (" ".join(move_to_uci(move) for move in moves) + " ", opening)
+        for moves, opening in lines
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        book = OpeningBook(Path(directory) / "openings.book", source)
+        book.open()
+
+        started = time.perf_counter()
+        expected = [classify_by_prefix(prefixes, moves) for moves in games]
+        prefix = time.perf_counter() - started
+
+        started = time.perf_counter()
+        walked = [book.classify(moves) for moves in games]
+        trie = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batched = []
+        for start in range(0, len(games), args.batch):
+            batched += book.classify_many(games[start : start + args.batch])
+        batch = time.perf_counter() - started
+        book.close()
+
+    if not expected == walked == batched:
+        raise SystemExit("Modes disagree on openings")
+    labeled = sum(opening is not None for opening in expected)
+    print(f"games       {len(games):>10} ({labeled} in book)")
+    print(f"{'mode':<12}{'games/s':>10}")
+    print(f"{'prefix':<12}{len(games) / prefix:>10.0f}")
+    print(f"{'trie':<12}{len(games) / trie:>10.0f}")
+    print(f"{'batch':<12}{len(games) / batch:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
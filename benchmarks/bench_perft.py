@@ -0,0 +1,79 @@
+"""Perft benchmark of bitboard move generator.
+
+Counts leaf nodes of legal move tree for standard reference positions,
+checks them against known values and prints speed in nodes per second.
+
+Usage:
+    python -m benchmarks.bench_perft --max-depth 4
+"""
+
+import argparse
+import sys
+import time
+
+from api_v1.game.constants import START_FEN
+from api_v1.game.position import Position, perft
+
+# (name, FEN, node counts for depth 1, 2, ...)
+REFERENCE_POSITIONS = (
+    ("start", START_FEN, (20, 400, 8902, 197281, 4865609)),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        (48, 2039, 97862, 4085603),
+    ),
+    (
+        "position 3",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        (14, 191, 2812, 43238, 674624),
+    ),
+    (
+        "position 4",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        (6, 264, 9467, 422333),
+    ),
+    (
+        "position 5",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        (44, 1486, 62379, 2103487),
+    ),
+    (
+        "position 6",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        (46, 2079, 89890, 3894594),
+    ),
+)
+
+
+def main() -> None:
+    """Run perft for reference positions and print nodes per second."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-depth", type=int, default=3)
+    args = parser.parse_args()
+
+    total_nodes = 0
+    total_time = 0.0
+    failed = False
+    for name, fen, expected in REFERENCE_POSITIONS:
+        position = Position(fen)
+        depth = min(args.max_depth, len(expected))
+        started = time.perf_counter()
+        nodes = perft(position, depth)
+        elapsed = time.perf_counter() - started
+        total_nodes += nodes
+        total_time += elapsed
+        status = "ok" if nodes == expected[depth - 1] else "FAIL"
+        failed |= status == "FAIL"
+        print(
+            f"{name:<12} depth {depth} {nodes:>10} nodes "
+            f"{nodes / elapsed:>12.0f} nps  {status}"
+        )
+    print(
+        f"{'total':<12} {total_nodes:>18} nodes {total_nodes / total_time:>12.0f} nps"
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""PGN parsing throughput and memory of streaming import.
+
+Writes PGN file of given size from random games, then parses and validates
+it with `parse_file` as import does, without writing to database. Peak
+resident memory of importer and of worker processes is printed, it should
+not grow with file size.
+
+Usage:
+    python -m benchmarks.bench_pgn_import --megabytes 64 --processes 4
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import tempfile
+import time
+
+from api_v1.game.notation import moves_to_movetext
+from api_v1.game.pgn import parse_file
+from benchmarks.utils import random_games
+
+RESULTS = ["1-0", "0-1", "1/2-1/2"]
+
+
+def write_pgn(path: str, megabytes: int, templates: int) -> int:
+    """Write PGN of random games repeated up to size, return games written."""
+    texts = []
+    for index, moves in enumerate(random_games(templates)):
+        result = RESULTS[index % len(RESULTS)]
+        texts.append(
+            f'[Event "Benchmark"]\n[Date "2024.05.{index % 28 + 1:02}"]\n'
+            f'[White "player{index}"]\n[Black "player{index + 1}"]\n'
+            f'[Result "{result}"]\n[TimeControl "300+3"]\n\n'
+            f"{moves_to_movetext(moves)} {result}\n\n".encode()
+        )
+    size = megabytes * 2**20
+    written = games = 0
+    with open(path, "wb") as file:
+        while written < size:
+            text = texts[games % len(texts)]
+            file.write(text)
+            written += len(text)
+            games += 1
+    return games
+
+
+async def parse(path: str, chunk_bytes: int, processes: int) -> tuple[int, int]:
+    """Parse file, return numbers of parsed and rejected games."""
+    games = rejected = 0
+    async for chunk in parse_file(path, 0, chunk_bytes, processes):
+        games += len(chunk.games)
+        rejected += chunk.rejected
+    return games, rejected
+
+
+def main() -> None:
+    """Generate PGN file and print parsing throughput and peak memory."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=int, default=16)
+    parser.add_argument("--chunk-bytes", type=int, default=4 * 2**20)
+    parser.add_argument("--processes", type=int, default=0)
+    parser.add_argument("--templates", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "games.pgn")
+        written = write_pgn(path, args.megabytes, args.templates)
+        started = time.perf_counter()
+        games, rejected = asyncio.run(parse(path, args.chunk_bytes, args.processes))
+        elapsed = time.perf_counter() - started
+
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    workers = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"file        {args.megabytes:>10} MiB, {written} games")
+    print(f"parsed      {games:>10} games, rejected {rejected}")
+    print(f"elapsed     {elapsed:>10.2f} s")
+    print(f"throughput  {games / elapsed:>10.0f} games/s")
+    print(f"peak RSS    {own:>10.1f} MiB importer, {workers:.1f} MiB worker")
+
+
+if __name__ == "__main__":
+    main()
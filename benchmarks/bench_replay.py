@@ -0,0 +1,79 @@
+"""Cost of replaying stored games to random plies, with and without snapshots.
+
+Client stepping through game asks for positions at plies in random order.
+Without snapshots every request makes all moves from start of game; with
+`PositionReplayer` request makes at most `interval` moves from cached
+snapshot, and batch of plies is replayed in one pass.
+
+Usage:
+    python -m benchmarks.bench_replay --games 200 --plies 160
+    python -m benchmarks.bench_replay --interval 8 --batch 20
+"""
+
+import argparse
+import random
+import time
+
+from api_v1.game.enums import GameResultEnum
+from api_v1.game.move import move_to_uci
+from api_v1.game.position import Position
+from api_v1.game.replay import PositionReplayer
+from api_v1.game.rules import GameRules
+
+
+def random_game(rng: random.Random, plies: int) -> list[int]:
+    """Return moves of random game of at most `plies` moves."""
+    rules = GameRules()
+    while len(rules.moves) < plies and rules.result == GameResultEnum.ONGOING:
+        rules.play(move_to_uci(rng.choice(rules.position.legal_moves())))
+    return list(rules.moves)
+
+
+def replay_from_start(moves: list[int], plies: list[int]) -> list[str]:
+    """Return FEN after each ply, making all moves from start every time."""
+    fens = []
+    for ply in plies:
+        position = Position()
+        for move in moves[:ply]:
+            position.make_move(move)
+        fens.append(position.fen())
+    return fens
+
+
+def main() -> None:
+    """Print microseconds per replayed ply of both approaches."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--plies", type=int, default=160)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--interval", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    games = [random_game(rng, args.plies) for _ in range(args.games)]
+    requests = [
+        (game_id, [rng.randrange(len(moves) + 1) for _ in range(args.batch)])
+        for _ in range(args.requests)
+        for game_id, moves in enumerate(games)
+    ]
+    replied = sum(len(set(plies)) for _, plies in requests)
+
+    started = time.perf_counter()
+    for game_id, plies in requests:
+        replay_from_start(games[game_id], sorted(set(plies)))
+    from_start = time.perf_counter() - started
+
+    replayer = PositionReplayer(args.interval, maxsize=len(games) * args.plies)
+    started = time.perf_counter()
+    for game_id, plies in requests:
+        replayer.positions(game_id, games[game_id], plies)
+    snapshots = time.perf_counter() - started
+
+    print(f"{'mode':<12}{'µs/ply':>10}")
+    print(f"{'from start':<12}{from_start / replied * 1e6:>10.1f}")
+    print(f"{'snapshots':<12}{snapshots / replied * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Throughput benchmark for server launcher settings.
+
+Starts application with uvicorn twice (default asyncio/h11 stack and
+uvloop/httptools stack), loads it with keep-alive HTTP/1.1 clients and
+prints requests per second for each run.
+
+Usage:
+    python -m benchmarks.bench_server --workers 4 --duration 10
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+HOST = "127.0.0.1"
+
+
+async def _client(port: int, path: str, deadline: float, counter: list[int]) -> None:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    request = f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode()
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in headers.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            counter[0] += 1
+    finally:
+        writer.close()
+
+
+async def _load(port: int, path: str, connections: int, duration: float) -> float:
+    counter = [0]
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(_client(port, path, deadline, counter) for _ in range(connections))
+    )
+    return counter[0] / (time.perf_counter() - started)
+
+
+async def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(HOST, port)
+        except OSError:
+            await asyncio.sleep(0.2)
+            continue
+        writer.close()
+        return
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+def run_case(loop: str, http: str, args: argparse.Namespace) -> tuple[str, float]:
+    """Start server with given loop and http implementation and measure rps."""
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "main:app",
+        f"--host={HOST}",
+        f"--port={args.port}",
+        f"--workers={args.workers}",
+        f"--loop={loop}",
+        f"--http={http}",
+        f"--backlog={args.backlog}",
+        "--no-access-log",
+    ]
+    process = subprocess.Popen(command)
+    try:
+        asyncio.run(_wait_ready(args.port))
+        asyncio.run(_load(args.port, args.path, args.connections, 1.0))  # warm-up
+        rps = asyncio.run(_load(args.port, args.path, args.connections, args.duration))
+    finally:
+        process.terminate()
+        process.wait()
+    return f"{loop}/{http}", rps
+
+
+def main() -> None:
+    """Run benchmark for both server stacks and print comparison."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/openapi.json")
+    args = parser.parse_args()
+
+    results = [
+        run_case("asyncio", "h11", args),
+        run_case("uvloop", "httptools", args),
+    ]
+    baseline = results[0][1]
+    for name, rps in results:
+        print(f"{name:<20} {rps:>10.0f} req/s  x{rps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
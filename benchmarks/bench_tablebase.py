@@ -0,0 +1,84 @@
+"""Probes per second of memory-mapped tablebase, by size of block cache.
+
+Probes random legal placements of tables in directory. Small cache decodes
+block on almost every probe, large one holds all touched blocks after
+warm-up; neither reads more of file than blocks probes touch. Without
+`--directory`, KQvK table is generated first (about half a minute).
+
+Usage:
+    python -m benchmarks.bench_tablebase --directory tablebases
+    python -m benchmarks.bench_tablebase --probes 200000 --blocks 8 4096
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from api_v1.game.exceptions import FenValidationError
+from api_v1.game.position import Position
+from api_v1.game.retrograde import build_table, placement_fen
+from api_v1.game.tablebase import (
+    TABLE_SUFFIX,
+    Tablebase,
+    signature_pieces,
+    write_table,
+)
+
+
+def random_positions(
+    rng: random.Random, signatures: list[str], count: int
+) -> list[Position]:
+    """Return random legal placements of material of signatures."""
+    positions = []
+    while len(positions) < count:
+        pieces = signature_pieces(rng.choice(signatures))
+        side = rng.randrange(2)
+        squares = rng.sample(range(64), len(pieces))
+        try:
+            positions.append(Position(placement_fen(pieces, squares, side)))
+        except FenValidationError:
+            # King of side not to move is attacked.
+            continue
+    return positions
+
+
+def run(directory: Path, probes: int, blocks: list[int]) -> None:
+    """Print probe rate for each size of block cache."""
+    signatures = [path.stem for path in directory.glob(f"*{TABLE_SUFFIX}")]
+    positions = random_positions(random.Random(0), signatures, probes)
+    print(f"tables: {', '.join(sorted(signatures))}")
+    print(f"{'blocks':>8}{'probes/s':>12}")
+    for max_blocks in blocks:
+        tablebase = Tablebase(directory, max_blocks)
+        started = time.perf_counter()
+        for position in positions:
+            tablebase.probe(position)
+        elapsed = time.perf_counter() - started
+        tablebase.close()
+        print(f"{max_blocks:>8}{probes / elapsed:>12.0f}")
+
+
+def main() -> None:
+    """Probe tables of directory, generating KQvK table if none is given."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--directory", type=Path)
+    parser.add_argument("--probes", type=int, default=100_000)
+    parser.add_argument("--blocks", type=int, nargs="+", default=[4, 64, 4096])
+    args = parser.parse_args()
+
+    if args.directory is not None:
+        run(args.directory, args.probes, args.blocks)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory)
+        print("generating KQvK")
+        write_table(
+            path / f"KQvK{TABLE_SUFFIX}", "KQvK", build_table("KQvK", Tablebase(path))
+        )
+        run(path, args.probes, args.blocks)
+
+
+if __name__ == "__main__":
+    main()
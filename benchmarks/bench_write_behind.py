@@ -0,0 +1,91 @@
+"""Journal latency and coalescing of write-behind storage of live games.
+
+Many games make moves concurrently; every move is saved through
+`WriteBehind.write`, which returns once journal record is on disk. Store
+counts rows instead of writing to database, so benchmark measures group
+commit of journal and how many saves one stored row update covers.
+
+Usage:
+    python -m benchmarks.bench_write_behind --games 2000 --moves 20
+    python -m benchmarks.bench_write_behind --no-fsync
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+
+from api_v1.game.enums import GameResultEnum
+from api_v1.game.journal import GameWrite, MoveJournal
+from api_v1.game.write_behind import StoredVersion, WriteBehind
+
+
+async def run(
+    directory: str, games: int, moves: int, move_interval: float, fsync: bool
+) -> tuple[list[float], int, int, int]:
+    """Play games, return save latencies, saves, row updates and flushes."""
+    rows = 0
+    batches = 0
+
+    async def store(
+        writes: list[GameWrite], stored: dict[int, StoredVersion]
+    ) -> list[GameWrite]:
+        nonlocal rows, batches
+        rows += len(writes)
+        batches += 1
+        return []
+
+    writer = WriteBehind(MoveJournal(directory, fsync), flush_interval=0.5)
+    await writer.start(store)
+    latencies: list[float] = []
+
+    async def play(game_id: int) -> None:
+        rng = random.Random(game_id)
+        made: list[int] = []
+        for _ in range(moves):
+            await asyncio.sleep(rng.expovariate(1 / move_interval))
+            made.append(rng.randrange(1 << 12))
+            started = time.perf_counter()
+            await writer.write(
+                GameWrite(game_id, tuple(made), GameResultEnum.ONGOING, None)
+            )
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(play(game_id) for game_id in range(games)))
+    await writer.stop()
+    return latencies, games * moves, rows, batches
+
+
+def main() -> None:
+    """Print save latency percentiles and coalescing ratio."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--moves", type=int, default=20)
+    parser.add_argument("--move-interval", type=float, default=0.2)
+    parser.add_argument("--no-fsync", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        latencies, saves, rows, flushes = asyncio.run(
+            run(
+                directory,
+                args.games,
+                args.moves,
+                args.move_interval,
+                not args.no_fsync,
+            )
+        )
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(f"saves       {saves:>10} ({saves / elapsed:.0f}/s)")
+    print(f"row updates {rows:>10} ({saves / rows:.1f} saves per update)")
+    print(f"flushes     {flushes:>10} ({rows / flushes:.0f} rows per flush)")
+    print(f"p50         {statistics.median(latencies) * 1000:>10.3f} ms")
+    print(f"p99         {latencies[int(len(latencies) * 0.99)] * 1000:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import random
+
+from api_v1.game.position import Position
+
+
+def random_game(rng: random.Random, max_plies: int = 120) -> list[int]:
+    """Play random legal moves from start position, return move codes."""
+    position = Position()
+    moves = []
+    for _ in range(max_plies):
+        legal_moves = position.legal_moves()
+        if not legal_moves:
+            break
+        move = rng.choice(legal_moves)
+        position.make_move(move)
+        moves.append(move)
+    return moves
+
+
+def random_games(count: int, max_plies: int = 120, seed: int = 0) -> list[list[int]]:
+    """Return `count` reproducible random games."""
+    rng = random.Random(seed)
+    return [random_game(rng, max_plies) for _ in range(count)]
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from core.metrics import registry
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_lookups_counter = registry.counter(
+    "cache_lookups_total", "In-process cache lookups by cache and result."
+)
+_size_gauge = registry.gauge("cache_entries", "Entries held by in-process cache.")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-process cache with per-entry time to live.
+
+    Least recently used entry is evicted when cache is full. Cache is local
+    to worker process, so entries that must not outlive database changes
+    should be dropped through invalidation bus.
+
+    Value loaded while invalidation arrives may be stale: loader reads
+    `generation` before loading and passes it to `set`, which skips storing
+    if any entry was invalidated meanwhile.
+
+    Attributes:
+        name (str): Cache name, used as metric label.
+        maxsize (int): Max number of entries.
+        ttl (float): Lifetime of entry in seconds.
+        generation (int): Number of invalidations so far.
+
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        _size_gauge.set_function(lambda: len(self._data), cache=name)
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """Return cached value or None if it is missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            _lookups_counter.inc(cache=self.name, result="miss")
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            _lookups_counter.inc(cache=self.name, result="miss")
+            return None
+        self._data.move_to_end(key)
+        _lookups_counter.inc(cache=self.name, result="hit")
+        return value
+
+    def set(self, key: K, value: V, generation: int | None = None) -> None:
+        """Store value, evicting least recently used entry if cache is full.
+
+        Value is not stored if `generation` is given and cache was
+        invalidated since it was read.
+        """
+        if generation is not None and generation != self.generation:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Drop entry for key if present."""
+        self.generation += 1
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.generation += 1
+        self._data.clear()
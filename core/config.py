@@ -1,8 +1,9 @@
 from pathlib import Path
+from typing import Literal
 
 import yaml
 from argon2 import PasswordHasher
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,11 +27,58 @@ class DatabaseSettings(BaseModel):
     Attributes:
         url (str): URL of database connection.
         echo (bool): Flag to enable logging of SQL queries in console.
+        connection_budget (int): Total number of connections all workers on
+        node may hold open at once.
+        pool_timeout (float): Seconds to wait for free connection from pool.
+        invalidation_channel (str): Postgres channel for cache invalidation.
+
+    Methods:
+        pool_size_per_worker(workers: int, listeners: int): Share of budget
+        for one worker.
 
     """
 
     url: str
     echo: bool
+    connection_budget: int = 100
+    pool_timeout: float = 30.0
+    invalidation_channel: str = "cache_invalidation"
+
+    def pool_size_per_worker(self, workers: int, listeners: int = 1) -> int:
+        """Return number of pooled connections one worker process may open.
+
+        One connection of each worker share is reserved for every Postgres
+        listener of worker, such as invalidation and game event listeners.
+        """
+        return max(1, self.connection_budget // max(1, workers) - listeners)
+
+
+class ServerSettings(BaseModel):
+    """Settings for production ASGI server.
+
+    Attributes:
+        host (str): Interface to bind.
+        port (int): Port to bind.
+        workers (int): Number of worker processes.
+        loop (str): Event loop implementation used by uvicorn.
+        http (str): HTTP protocol implementation used by uvicorn.
+        backlog (int): Max number of pending connections in listen queue.
+        timeout_keep_alive (int): Seconds to keep idle connection open.
+        timeout_graceful_shutdown (int): Seconds to wait for in-flight requests
+        on shutdown before they are cancelled.
+        ws_max_size (int): Max size of incoming WebSocket message in bytes.
+
+    """
+
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    loop: Literal["auto", "asyncio", "uvloop"] = "uvloop"
+    http: Literal["auto", "h11", "httptools"] = "httptools"
+    backlog: int = 2048
+    timeout_keep_alive: int = 5
+    timeout_graceful_shutdown: int = 30
+    ws_max_size: int = 16_384
 
 
 class AuthenticationJWT(BaseModel):
@@ -90,6 +138,363 @@ class HashPassword(BaseModel):
         )
 
 
+class ConcurrencyLimitSettings(BaseModel):
+    """Settings of adaptive concurrency limiter for one route class.
+
+    Attributes:
+        initial_limit (int): Concurrency limit at startup.
+        min_limit (int): Lower bound for limit.
+        max_limit (int): Upper bound for limit.
+        target_queue_delay_ms (float): Queueing delay after which limit is
+        decreased and excess requests are rejected.
+        backoff_ratio (float): Multiplier applied to limit on congestion.
+
+    """
+
+    initial_limit: int
+    min_limit: int = 1
+    max_limit: int
+    target_queue_delay_ms: float
+    backoff_ratio: float = 0.9
+
+
+class LimiterSettings(BaseModel):
+    """Adaptive concurrency limits per route class.
+
+    Attributes:
+        login (ConcurrencyLimitSettings): Password login (CPU-bound Argon2).
+        authenticated (ConcurrencyLimitSettings): Routes with verified token.
+
+    """
+
+    login: ConcurrencyLimitSettings = ConcurrencyLimitSettings(
+        initial_limit=4,
+        max_limit=16,
+        target_queue_delay_ms=100,
+    )
+    authenticated: ConcurrencyLimitSettings = ConcurrencyLimitSettings(
+        initial_limit=64,
+        max_limit=512,
+        target_queue_delay_ms=500,
+    )
+
+
+class CacheSettings(BaseModel):
+    """Settings for in-process caches.
+
+    Attributes:
+        user_maxsize (int): Max number of cached users per worker.
+        user_ttl_seconds (float): Lifetime of cached user.
+
+    """
+
+    user_maxsize: int = 10_000
+    user_ttl_seconds: float = 600.0
+
+
+class SharedCacheSettings(BaseModel):
+    """Settings for host-local shared memory cache of verified tokens.
+
+    Memory footprint is `buckets * ways * slot_size` bytes per host.
+
+    Attributes:
+        enabled (bool): Flag to enable cache.
+        name (str): Name of shared memory segment.
+        buckets (int): Number of hash buckets.
+        ways (int): Slots per bucket.
+        slot_size (int): Size of one slot in bytes.
+        ttl_seconds (float): Max lifetime of entry, never beyond token expiry.
+
+    """
+
+    enabled: bool = False
+    name: str = "chess-auth-cache"
+    buckets: int = 16_384
+    ways: int = 4
+    slot_size: int = 512
+    ttl_seconds: float = 300.0
+
+
+class LiveGameSettings(BaseModel):
+    """Settings for live games served over WebSocket.
+
+    Per-connection memory is bounded by `send_queue_size` outgoing messages
+    plus one incoming message of at most `ServerSettings.ws_max_size` bytes.
+
+    Attributes:
+        send_queue_size (int): Max outgoing messages buffered per connection,
+        connection is closed as slow consumer when it overflows.
+        send_timeout_seconds (float): Max time to write one message to socket.
+        max_spectators (int): Max spectators connected to one game per worker.
+        clock_tick_seconds (float): Resolution of flag timers of game clocks.
+        lag_quota_gain_seconds (float): Lag compensation quota added to player
+        with every move.
+        max_lag_quota_seconds (float): Max lag compensation quota of player.
+        snapshot_interval_plies (int): Moves after which snapshot sent to
+        binary subscribers that join or fall behind is rebuilt, must be less
+        than `send_queue_size`.
+        idle_game_timeout_seconds (float): Time ongoing game whose clock is
+        not running, such as game before first move, is kept in memory after
+        its last subscriber leaves.
+
+    """
+
+    send_queue_size: int = 64
+    send_timeout_seconds: float = 10.0
+    max_spectators: int = 1_000
+    clock_tick_seconds: float = 0.05
+    lag_quota_gain_seconds: float = 0.1
+    max_lag_quota_seconds: float = 1.0
+    snapshot_interval_plies: int = 32
+    idle_game_timeout_seconds: float = 300.0
+
+
+class GameEventSettings(BaseModel):
+    """Settings for exchanging live game events between workers.
+
+    Attributes:
+        enabled (bool): Flag to enable exchange, not needed with one worker.
+        transport (str): `postgres` for LISTEN/NOTIFY, or `unix` for local
+        broker started with `python -m core.pubsub <socket_path>`.
+        channel (str): Postgres channel of events.
+        socket_path (str): Path of Unix broker socket.
+        batch_size (int): Max events per message.
+        flush_interval_seconds (float): Time events are collected into batch.
+        retry_delay_seconds (float): Delay before resending failed batch or
+        reconnecting.
+        max_pending_events (int): Max unsent events kept while sends fail,
+        oldest are dropped beyond it.
+
+    """
+
+    enabled: bool = True
+    transport: Literal["postgres", "unix"] = "postgres"
+    channel: str = "game_events"
+    socket_path: str = "/tmp/chess-game-events.sock"
+    batch_size: int = 200
+    flush_interval_seconds: float = 0.002
+    retry_delay_seconds: float = 0.5
+    max_pending_events: int = 100_000
+
+
+class GameShardSettings(BaseModel):
+    """Settings for validating moves of live games in shard processes.
+
+    Every web worker starts its own shards, so total number of shard
+    processes is `processes` times number of workers.
+
+    Attributes:
+        enabled (bool): Flag to validate moves in shards instead of event
+        loop of web worker.
+        processes (int): Shard processes per worker, zero for one per CPU.
+        batch_size (int): Max requests sent to shard in one message.
+        restart_delay_seconds (float): Delay before restarting exited shard.
+
+    """
+
+    enabled: bool = False
+    processes: int = 2
+    batch_size: int = 256
+    restart_delay_seconds: float = 1.0
+
+
+class WriteBehindSettings(BaseModel):
+    """Settings for write-behind storage of live game moves.
+
+    Attributes:
+        journal_directory (str): Local directory of journal of writes not
+        stored yet, must survive restart of workers.
+        fsync (bool): Flag to acknowledge save only once journal is on disk.
+        flush_interval_seconds (float): Max time write waits in journal.
+        batch_size (int): Waiting games that trigger flush, and max games
+        stored in one transaction.
+        max_workers (int): Max workers sharing journal directory.
+
+    """
+
+    journal_directory: str = "journal"
+    fsync: bool = True
+    flush_interval_seconds: float = 1.0
+    batch_size: int = 500
+    max_workers: int = 64
+
+
+class MatchmakingSettings(BaseModel):
+    """Settings for matchmaking queue.
+
+    Player accepts opponents whose rating differs by at most search window,
+    which starts at `initial_window` and grows by `window_growth` rating
+    points per second of waiting, up to `max_window`.
+
+    Attributes:
+        initial_window (float): Search window of just queued player.
+        window_growth (float): Growth of search window per second.
+        max_window (float): Max search window.
+        sweep_interval_seconds (float): Interval of re-pairing waiting players.
+        poll_timeout_seconds (float): Max duration of one long-poll request.
+        idle_timeout_seconds (float): Player who did not poll for this long is
+        removed from queue.
+
+    """
+
+    initial_window: float = 50.0
+    window_growth: float = 10.0
+    max_window: float = 400.0
+    sweep_interval_seconds: float = 1.0
+    poll_timeout_seconds: float = 25.0
+    idle_timeout_seconds: float = 60.0
+
+
+class RatingSettings(BaseModel):
+    """Settings for Glicko-2 rating periods.
+
+    Attributes:
+        tau (float): System constant constraining change of volatility, lower
+        values keep ratings steadier.
+        batch_size (int): Rows per streamed read and per bulk UPDATE.
+
+    """
+
+    tau: float = 0.5
+    batch_size: int = 50_000
+
+
+class LeaderboardSettings(BaseModel):
+    """Settings for in-memory leaderboards of each worker.
+
+    Attributes:
+        batch_size (int): Rows per streamed read when leaderboards are rebuilt
+        or changed players are reloaded.
+        retry_delay_seconds (float): Delay before retrying failed refresh.
+        ready_timeout_seconds (float): Max wait of request for first build of
+        leaderboards.
+
+    """
+
+    batch_size: int = 10_000
+    retry_delay_seconds: float = 5.0
+    ready_timeout_seconds: float = 10.0
+
+
+class PgnImportSettings(BaseModel):
+    """Settings for importing PGN archives.
+
+    Attributes:
+        chunk_bytes (int): Approximate size of file range parsed by one worker
+        process and written by one COPY, also interval between checkpoints.
+        processes (int): Parsing worker processes, 0 means one per CPU.
+
+    """
+
+    chunk_bytes: int = 4 * 1024 * 1024
+    processes: int = 0
+
+
+class ExportSettings(BaseModel):
+    """Settings for streaming export of game histories.
+
+    Attributes:
+        chunk_size (int): Games read per query and encoded per response chunk.
+        gzip_level (int): Compression level of gzip output, 1 (fastest) to 9.
+
+    """
+
+    chunk_size: int = 500
+    gzip_level: int = 6
+
+
+class ReplaySettings(BaseModel):
+    """Settings for replay of games to any ply.
+
+    Attributes:
+        snapshot_interval_plies (int): Plies between cached positions, max
+        moves made to reach any ply.
+        cache_size (int): Max cached positions, about 1 KiB each.
+        cache_ttl_seconds (float): Lifetime of cached position.
+
+    """
+
+    snapshot_interval_plies: int = 16
+    cache_size: int = 20_000
+    cache_ttl_seconds: float = 3600
+
+
+class AnalysisSettings(BaseModel):
+    """Settings for engine analysis of positions.
+
+    Attributes:
+        enabled (bool): Whether engines are started and analysis is served.
+        engine_path (str): Path of UCI engine binary, None runs built-in stub
+        engine, which searches two plies only.
+        engine_options (dict[str, str]): UCI options of engine, e.g. `Hash`.
+        workers (int): Number of engine processes.
+        user_quota (int): Max analysis jobs of one user queued or running.
+        quick_depth (int): Depth up to which jobs run before deeper ones.
+        timeout_seconds (float): Max seconds of one search.
+        cache_size (int): Max cached evaluations.
+        cache_ttl_seconds (float): Lifetime of cached evaluation.
+
+    """
+
+    enabled: bool = False
+    engine_path: str | None = None
+    engine_options: dict[str, str] = Field(default_factory=dict)
+    workers: int = 2
+    user_quota: int = 4
+    quick_depth: int = 12
+    timeout_seconds: float = 30.0
+    cache_size: int = 100_000
+    cache_ttl_seconds: float = 86400
+
+
+class TablebaseSettings(BaseModel):
+    """Settings for endgame tablebase probing by analysis engine and games.
+
+    Attributes:
+        directory (str): Directory of table files, relative to project
+        directory; missing one means no tables.
+        max_cached_blocks (int): Max decoded blocks kept in memory, 64 KiB
+        each.
+        adjudicate_games (bool): Whether live games reaching position held
+        by tables are ended with its outcome.
+
+    """
+
+    directory: str = "tablebases"
+    max_cached_blocks: int = 1024
+    adjudicate_games: bool = True
+
+
+class OpeningSettings(BaseModel):
+    """Settings for classification of games by opening.
+
+    Attributes:
+        source (str): Book lines as TSV with `eco`, `name` and `pgn`
+        columns, relative to project directory.
+        book_path (str): Compiled book, relative to project directory;
+        compiled from `source` when missing or older.
+        backfill_batch_size (int): Stored games labeled per transaction by
+        backfill job.
+
+    """
+
+    source: str = "api_v1/game/data/openings.tsv"
+    book_path: str = "openings.book"
+    backfill_batch_size: int = 1000
+
+
+class PlayerStatsSettings(BaseModel):
+    """Settings for per-player game stats.
+
+    Attributes:
+        backfill_batch_size (int): Games counted per transaction by backfill
+        job.
+
+    """
+
+    backfill_batch_size: int = 1000
+
+
 class Settings(BaseSettings):
     """Main class for application settings.
 
@@ -100,6 +505,24 @@ class Settings(BaseSettings):
         app (AppSettings): Application settings.
         database (DatabaseSettings): Database settings.
         jwt (AuthenticationJWT): JWT settings.
+        server (ServerSettings): Production server settings.
+        limiter (LimiterSettings): Concurrency limits per route class.
+        cache (CacheSettings): In-process cache settings.
+        shared_cache (SharedCacheSettings): Host-local shared cache settings.
+        live_game (LiveGameSettings): Live game WebSocket settings.
+        game_events (GameEventSettings): Cross-worker game event settings.
+        game_shards (GameShardSettings): Game shard process settings.
+        write_behind (WriteBehindSettings): Live game storage settings.
+        matchmaking (MatchmakingSettings): Matchmaking queue settings.
+        rating (RatingSettings): Glicko-2 rating period settings.
+        leaderboard (LeaderboardSettings): Leaderboard refresh settings.
+        pgn_import (PgnImportSettings): PGN archive import settings.
+        export (ExportSettings): Game history export settings.
+        replay (ReplaySettings): Game replay settings.
+        analysis (AnalysisSettings): Engine analysis settings.
+        tablebase (TablebaseSettings): Endgame tablebase settings.
+        openings (OpeningSettings): Opening classification settings.
+        player_stats (PlayerStatsSettings): Player stats settings.
 
     Methods:
         from_yaml(path:Path): Loads config from YAML file.
@@ -110,6 +533,24 @@ class Settings(BaseSettings):
     database: DatabaseSettings
     jwt: AuthenticationJWT
     hash_password: HashPassword
+    server: ServerSettings = Field(default_factory=ServerSettings)
+    limiter: LimiterSettings = Field(default_factory=LimiterSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    shared_cache: SharedCacheSettings = Field(default_factory=SharedCacheSettings)
+    live_game: LiveGameSettings = Field(default_factory=LiveGameSettings)
+    game_events: GameEventSettings = Field(default_factory=GameEventSettings)
+    game_shards: GameShardSettings = Field(default_factory=GameShardSettings)
+    write_behind: WriteBehindSettings = Field(default_factory=WriteBehindSettings)
+    matchmaking: MatchmakingSettings = Field(default_factory=MatchmakingSettings)
+    rating: RatingSettings = Field(default_factory=RatingSettings)
+    leaderboard: LeaderboardSettings = Field(default_factory=LeaderboardSettings)
+    pgn_import: PgnImportSettings = Field(default_factory=PgnImportSettings)
+    export: ExportSettings = Field(default_factory=ExportSettings)
+    replay: ReplaySettings = Field(default_factory=ReplaySettings)
+    analysis: AnalysisSettings = Field(default_factory=AnalysisSettings)
+    tablebase: TablebaseSettings = Field(default_factory=TablebaseSettings)
+    openings: OpeningSettings = Field(default_factory=OpeningSettings)
+    player_stats: PlayerStatsSettings = Field(default_factory=PlayerStatsSettings)
 
     model_config = SettingsConfigDict(validate_default=True)
 
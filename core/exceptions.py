@@ -0,0 +1,14 @@
+from exceptions import BaseInfraError
+
+
+class ConcurrencyLimitExceededError(BaseInfraError):
+    """Raised when concurrency limiter sheds request instead of queueing it.
+
+    Attributes:
+        retry_after (int): Suggested delay in seconds before client retries.
+
+    """
+
+    def __init__(self, limiter_name: str, retry_after: int):
+        super().__init__(f"Concurrency limit exceeded for {limiter_name!r}")
+        self.retry_after = retry_after
@@ -0,0 +1,181 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import NoReturn
+
+from core.config import ConcurrencyLimitSettings
+from core.exceptions import ConcurrencyLimitExceededError
+from core.metrics import registry
+
+_limit_gauge = registry.gauge(
+    "concurrency_limit", "Current adaptive concurrency limit per route class."
+)
+_inflight_gauge = registry.gauge(
+    "concurrency_inflight", "Requests holding concurrency slot per route class."
+)
+_queued_gauge = registry.gauge(
+    "concurrency_queued", "Requests waiting for concurrency slot per route class."
+)
+_rejected_counter = registry.counter(
+    "concurrency_rejected_total", "Requests shed by concurrency limiter."
+)
+
+
+class Permit:
+    """Slot granted by `AdaptiveConcurrencyLimiter`, released after request.
+
+    Attributes:
+        queue_delay (float): Seconds spent waiting for the slot.
+        saturated (bool): Whether limiter was at its limit when slot was asked.
+
+    """
+
+    __slots__ = ("_limiter", "_released", "granted_at", "queue_delay", "saturated")
+
+    def __init__(
+        self,
+        limiter: "AdaptiveConcurrencyLimiter",
+        queue_delay: float = 0.0,
+        saturated: bool = False,
+    ):
+        self._limiter = limiter
+        self._released = False
+        self.granted_at = time.monotonic()
+        self.queue_delay = queue_delay
+        self.saturated = saturated
+
+    def release(self) -> None:
+        """Return slot to limiter. Safe to call more than once."""
+        if not self._released:
+            self._released = True
+            self._limiter._release(self)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter with queueing-delay based load shedding.
+
+    Limit grows by one slot per limit's worth of requests that were queued
+    within target delay (additive increase) and is multiplied by
+    `backoff_ratio` whenever a request waited longer than target or was shed
+    (multiplicative decrease). Requests whose expected queueing delay is above
+    target are rejected immediately, requests that do not get a slot within
+    target delay are rejected on timeout; both with
+    `ConcurrencyLimitExceededError`.
+
+    Attributes:
+        name (str): Route class name, used as metric label.
+        limit (float): Current concurrency limit.
+        inflight (int): Number of granted and not yet released permits.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_queue_delay: float,
+        backoff_ratio: float = 0.9,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_queue_delay = target_queue_delay
+        self.backoff_ratio = backoff_ratio
+        self.inflight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._service_time = 0.0
+
+        _limit_gauge.set_function(lambda: self.limit, route_class=name)
+        _inflight_gauge.set_function(lambda: self.inflight, route_class=name)
+        _queued_gauge.set_function(lambda: len(self._waiters), route_class=name)
+
+    @classmethod
+    def from_settings(
+        cls, name: str, config: ConcurrencyLimitSettings
+    ) -> "AdaptiveConcurrencyLimiter":
+        """Create limiter for route class from its settings."""
+        return cls(
+            name=name,
+            initial_limit=config.initial_limit,
+            min_limit=config.min_limit,
+            max_limit=config.max_limit,
+            target_queue_delay=config.target_queue_delay_ms / 1000,
+            backoff_ratio=config.backoff_ratio,
+        )
+
+    async def acquire(self) -> Permit:
+        """Wait for free slot and return permit for it.
+
+        Raises:
+            ConcurrencyLimitExceededError: If request was shed.
+
+        """
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return Permit(self)
+
+        if self._expected_queue_delay() > self.target_queue_delay:
+            self._reject()
+
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.target_queue_delay)
+        except TimeoutError:
+            self._discard(waiter)
+            self._reject()
+        except BaseException:
+            if not self._discard(waiter):
+                # Slot was handed over right before cancellation.
+                self.inflight -= 1
+                self._wake_waiters()
+            raise
+        return Permit(self, queue_delay=time.monotonic() - started, saturated=True)
+
+    def _discard(self, waiter: asyncio.Future[None]) -> bool:
+        """Remove waiter from queue, return False if it was already granted."""
+        if waiter.done() and not waiter.cancelled():
+            return False
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        return True
+
+    def _expected_queue_delay(self) -> float:
+        """Estimate wait of new request from queue length and mean service time."""
+        return self._service_time * (len(self._waiters) + 1) / self.limit
+
+    def _reject(self) -> NoReturn:
+        self._decrease()
+        _rejected_counter.inc(route_class=self.name)
+        retry_after = max(1, math.ceil(self._expected_queue_delay()))
+        raise ConcurrencyLimitExceededError(self.name, retry_after=retry_after)
+
+    def _release(self, permit: Permit) -> None:
+        service_time = time.monotonic() - permit.granted_at
+        self._service_time = 0.8 * self._service_time + 0.2 * service_time
+
+        if permit.queue_delay > self.target_queue_delay:
+            self._decrease()
+        elif permit.saturated:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+        self.inflight -= 1
+        self._wake_waiters()
+
+    def _decrease(self) -> None:
+        self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.inflight += 1
+            waiter.set_result(None)
@@ -0,0 +1,184 @@
+import bisect
+import math
+from collections.abc import Callable
+from threading import Lock
+from typing import TypeVar
+
+LabelValues = tuple[tuple[str, str], ...]
+
+
+def _labels_key(labels: dict[str, str]) -> LabelValues:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: LabelValues) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in labels)
+    return f"{{{pairs}}}"
+
+
+class Metric:
+    """Base class for metric stored in process memory.
+
+    Attributes:
+        name (str): Metric name in Prometheus exposition format.
+        description (str): Help text of metric.
+        kind (str): Prometheus metric type.
+
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def samples(self) -> list[tuple[str, LabelValues, float]]:
+        """Return list of (sample name, labels, value) for exposition."""
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def inc(self, value: float = 1.0, **labels: str) -> None:
+        """Increase counter for given labels."""
+        key = _labels_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+
+class Gauge(Metric):
+    """Value that can go up and down, set directly or read from callback."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self._callbacks: dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set gauge value for given labels."""
+        with self._lock:
+            self._values[_labels_key(labels)] = value
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Read gauge value from `function` each time metrics are collected."""
+        with self._lock:
+            self._callbacks[_labels_key(labels)] = function
+
+    def samples(self) -> list[tuple[str, LabelValues, float]]:
+        """Return list of (sample name, labels, value) for exposition."""
+        samples = super().samples()
+        with self._lock:
+            callbacks = list(self._callbacks.items())
+        samples.extend((self.name, key, function()) for key, function in callbacks)
+        return samples
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(Metric):
+    """Distribution of observed values over cumulative buckets.
+
+    Attributes:
+        buckets (tuple[float, ...]): Upper bounds of buckets, ascending.
+
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description)
+        self.buckets = buckets
+        self._counts: dict[LabelValues, list[int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record observed value for given labels."""
+        key = _labels_key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def samples(self) -> list[tuple[str, LabelValues, float]]:
+        """Return list of (sample name, labels, value) for exposition."""
+        samples = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                total = 0
+                for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                    total += count
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    samples.append((f"{self.name}_bucket", (*key, ("le", le)), total))
+                samples.append((f"{self.name}_sum", key, self._values[key]))
+                samples.append((f"{self.name}_count", key, total))
+        return samples
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    """Registry of process metrics rendered in Prometheus text format.
+
+    Each worker process owns its registry, so scraper should collect every
+    worker separately (or aggregate by `instance` label).
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, description: str) -> Counter:
+        """Return registered counter, creating it on first call."""
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        """Return registered gauge, creating it on first call."""
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Return registered histogram, creating it on first call."""
+        return self._get_or_create(Histogram, name, description, buckets)
+
+    def _get_or_create(
+        self, cls: type[M], name: str, description: str, *args: object
+    ) -> M:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, description, *args)
+        if not isinstance(metric, cls):
+            raise TypeError(f"Metric {name!r} already registered as {metric.kind}")
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,198 @@
+"""Message transports broadcasting between worker processes.
+
+Transport delivers every sent message to all connected workers, in order of
+sending per sender; sender may receive its own messages. Delivery is
+best-effort: messages sent while receiver is disconnected are lost, so
+receivers resynchronize from database in `on_connect` callback.
+
+Unix socket broker is lightweight stand-in for message broker when all
+workers run on one host, e.g. in development and benchmarks:
+
+Usage:
+    python -m core.pubsub /tmp/game-events.sock
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import struct
+from collections.abc import Callable
+from typing import Protocol
+
+from logger import setup_logging
+
+log = setup_logging()
+
+# Length prefix of message on Unix socket.
+_LENGTH = struct.Struct("<I")
+
+Deliver = Callable[[bytes], None]
+
+
+class Transport(Protocol):
+    """Broadcast channel between workers.
+
+    Attributes:
+        max_message_size (int): Largest message transport can send.
+
+    """
+
+    max_message_size: int
+
+    async def start(self, deliver: Deliver, on_connect: Callable[[], None]) -> None:
+        """Start receiving messages, `on_connect()` is called on each connect."""
+
+    async def send(self, message: bytes) -> None:
+        """Send message to all workers, raise if it was not sent."""
+
+    async def stop(self) -> None:
+        """Stop receiving and close connections."""
+
+
+class UnixSocketTransport:
+    """Transport through `UnixSocketBroker` listening on socket `path`.
+
+    Attributes:
+        path (str): Path of broker socket.
+        max_message_size (int): Largest message transport can send.
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        reconnect_delay: float = 0.5,
+        max_message_size: int = 64 * 1024,
+    ):
+        self.path = path
+        self.reconnect_delay = reconnect_delay
+        self.max_message_size = max_message_size
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self, deliver: Deliver, on_connect: Callable[[], None]) -> None:
+        """Start task connecting to broker and delivering received messages."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever(deliver, on_connect))
+
+    async def send(self, message: bytes) -> None:
+        """Send message through broker.
+
+        Raises:
+            ConnectionError: If transport is not connected to broker.
+
+        """
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionError(f"Not connected to broker at {self.path}")
+        self._writer.write(_LENGTH.pack(len(message)) + message)
+        await self._writer.drain()
+
+    async def stop(self) -> None:
+        """Disconnect from broker."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run_forever(
+        self, deliver: Deliver, on_connect: Callable[[], None]
+    ) -> None:
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path)
+                on_connect()
+                while True:
+                    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                    deliver(await reader.readexactly(length))
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.IncompleteReadError) as exc:
+                log.warning("Broker connection to %s lost: %s", self.path, exc)
+            except Exception:
+                log.exception("Broker transport failed")
+            finally:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+            await asyncio.sleep(self.reconnect_delay)
+
+
+class UnixSocketBroker:
+    """Broker relaying each message to all other clients of Unix socket.
+
+    Client that does not read fast enough to keep its write buffer under
+    `max_buffer_size` bytes is disconnected, so one stuck worker can not make
+    broker memory grow.
+
+    Attributes:
+        path (str): Path of socket to listen on.
+
+    """
+
+    def __init__(self, path: str, max_buffer_size: int = 16 * 1024 * 1024):
+        self.path = path
+        self.max_buffer_size = max_buffer_size
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        """Listen on socket, replacing stale socket file."""
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._serve, self.path)
+
+    async def stop(self) -> None:
+        """Stop listening and disconnect clients."""
+        if self._server is not None:
+            self._server.close()
+            for client in list(self._clients):
+                client.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._clients.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(_LENGTH.size)
+                (length,) = _LENGTH.unpack(header)
+                frame = header + await reader.readexactly(length)
+                for client in list(self._clients):
+                    if client is writer:
+                        continue
+                    if client.transport.get_write_buffer_size() > self.max_buffer_size:
+                        log.warning("Broker client disconnected as slow consumer")
+                        self._clients.discard(client)
+                        client.close()
+                        continue
+                    client.write(frame)
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+
+def main() -> None:
+    """Run Unix socket broker until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    async def run() -> None:
+        broker = UnixSocketBroker(args.path)
+        await broker.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await broker.stop()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
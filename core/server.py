@@ -0,0 +1,58 @@
+import uvicorn
+
+from core.config import ServerSettings, settings
+from core.shm_cache import SharedMemoryCache
+
+
+def build_uvicorn_config(server: ServerSettings) -> dict:
+    """Build keyword arguments for `uvicorn.run` from server settings.
+
+    Graceful drain is handled by uvicorn itself: on SIGTERM every worker stops
+    accepting connections, waits up to `timeout_graceful_shutdown` seconds for
+    in-flight requests and only then runs lifespan shutdown, where
+    `db_helper.dispose()` is called.
+
+    Args:
+        server (ServerSettings): Production server settings.
+
+    Returns:
+        dict: Arguments for `uvicorn.run`.
+
+    """
+    return {
+        "host": server.host,
+        "port": server.port,
+        "workers": server.workers,
+        "loop": server.loop,
+        "http": server.http,
+        "backlog": server.backlog,
+        "timeout_keep_alive": server.timeout_keep_alive,
+        "timeout_graceful_shutdown": server.timeout_graceful_shutdown,
+        "ws_max_size": server.ws_max_size,
+        "proxy_headers": True,
+        "access_log": False,
+    }
+
+
+def run() -> None:
+    """Run application with production settings (multiple workers, no reload).
+
+    Shared memory cache, if enabled, is created here before workers start and
+    destroyed after all of them exit.
+    """
+    shared_cache = None
+    if settings.shared_cache.enabled:
+        config = settings.shared_cache
+        shared_cache = SharedMemoryCache.create(
+            config.name, config.buckets, config.ways, config.slot_size
+        )
+    try:
+        uvicorn.run("main:app", **build_uvicorn_config(settings.server))
+    finally:
+        if shared_cache is not None:
+            shared_cache.close()
+            shared_cache.unlink()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,206 @@
+import fcntl
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+from core.metrics import registry
+
+_MAGIC = 0x43485343  # "CHSC"
+_VERSION = 1
+# magic, version, buckets, ways, slot size, epoch
+_HEADER = struct.Struct("<IIIIIQ")
+_HEADER_SIZE = 64
+# seq, digest, epoch, expires at, value length, value crc32
+_SLOT = struct.Struct("<I16sQdHI")
+_SLOT_HEADER_SIZE = 48
+_SEQ = struct.Struct("<I")
+_EPOCH = struct.Struct("<Q")
+_EPOCH_OFFSET = 20
+_DIGEST_SIZE = 16
+
+_lookups_counter = registry.counter(
+    "shared_cache_lookups_total", "Host-local shared memory cache lookups by result."
+)
+
+
+class SharedMemoryCache:
+    """Host-local cache in shared memory, readable by all workers without locks.
+
+    Memory holds fixed number of fixed-size slots grouped into buckets of
+    `ways` slots (set-associative hash table), so footprint never exceeds
+    `buckets * ways * slot_size` bytes. Keys are hashed to 16-byte digests.
+
+    Reads take no locks: each slot is guarded by sequence counter which
+    writer makes odd while slot is being written (seqlock), and reader treats
+    slot changed under it as miss instead of retrying. Writers lock their
+    bucket with `lockf` byte-range lock, so writes to different buckets do
+    not contend.
+
+    Eviction: entry with same key is overwritten, otherwise empty, expired or
+    cleared slot is taken, otherwise slot of bucket expiring soonest is evicted.
+    `clear()` bumps epoch stored in header, which invalidates every slot at once.
+
+    Attributes:
+        name (str): Name of shared memory segment.
+        buckets (int): Number of buckets.
+        ways (int): Slots per bucket.
+        slot_size (int): Size of slot in bytes, including slot header.
+        max_value_size (int): Max length of stored value.
+        owner (bool): Whether this process created segment.
+
+    """
+
+    def __init__(self, shm: SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        self._buf = shm.buf
+        magic, version, buckets, ways, slot_size, _ = _HEADER.unpack_from(self._buf)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Segment {shm.name!r} is not shared cache")
+        self.name = shm.name
+        self.buckets = buckets
+        self.ways = ways
+        self.slot_size = slot_size
+        self.max_value_size = slot_size - _SLOT_HEADER_SIZE
+        lock_path = Path(tempfile.gettempdir()) / f"{self.name.lstrip('/')}.lock"
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_lock = threading.Lock()
+
+    @classmethod
+    def create(
+        cls, name: str, buckets: int, ways: int, slot_size: int
+    ) -> "SharedMemoryCache":
+        """Create new segment, caller owns it and should `unlink()` it."""
+        if slot_size <= _SLOT_HEADER_SIZE:
+            raise ValueError(f"Slot size must be above {_SLOT_HEADER_SIZE} bytes")
+        size = _HEADER_SIZE + buckets * ways * slot_size
+        shm = SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, buckets, ways, slot_size, 1)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMemoryCache":
+        """Attach to segment created by another process.
+
+        Workers share resource tracker of launcher process that created
+        segment, so segment is not unlinked when one of them exits.
+        """
+        return cls(SharedMemory(name=name), owner=False)
+
+    @classmethod
+    def open(
+        cls, name: str, buckets: int, ways: int, slot_size: int
+    ) -> "SharedMemoryCache":
+        """Attach to existing segment or create it if there is none."""
+        try:
+            return cls.attach(name)
+        except FileNotFoundError:
+            pass
+        try:
+            return cls.create(name, buckets, ways, slot_size)
+        except FileExistsError:
+            return cls.attach(name)
+
+    def get(self, key: bytes) -> bytes | None:
+        """Return value stored for key or None."""
+        digest = hashlib.blake2b(key, digest_size=_DIGEST_SIZE).digest()
+        (epoch,) = _EPOCH.unpack_from(self._buf, _EPOCH_OFFSET)
+        now = time.time()
+        for offset in self._bucket_slots(digest):
+            seq, slot_digest, slot_epoch, expires_at, length, crc = _SLOT.unpack_from(
+                self._buf, offset
+            )
+            if slot_digest != digest or seq & 1:
+                continue
+            start = offset + _SLOT_HEADER_SIZE
+            value = bytes(self._buf[start : start + length])
+            (seq_after,) = _SEQ.unpack_from(self._buf, offset)
+            if (
+                seq_after == seq
+                and slot_epoch == epoch
+                and expires_at > now
+                and zlib.crc32(value) == crc
+            ):
+                _lookups_counter.inc(result="hit")
+                return value
+        _lookups_counter.inc(result="miss")
+        return None
+
+    def set(self, key: bytes, value: bytes, ttl: float) -> bool:
+        """Store value for `ttl` seconds, return False if value does not fit."""
+        if len(value) > self.max_value_size:
+            return False
+        digest = hashlib.blake2b(key, digest_size=_DIGEST_SIZE).digest()
+        bucket = self._bucket(digest)
+        with self._thread_lock:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, bucket)
+            try:
+                offset = self._choose_slot(digest)
+                (seq,) = _SEQ.unpack_from(self._buf, offset)
+                (epoch,) = _EPOCH.unpack_from(self._buf, _EPOCH_OFFSET)
+                _SEQ.pack_into(self._buf, offset, seq + 1)
+                start = offset + _SLOT_HEADER_SIZE
+                self._buf[start : start + len(value)] = value
+                _SLOT.pack_into(
+                    self._buf,
+                    offset,
+                    seq + 1,
+                    digest,
+                    epoch,
+                    time.time() + ttl,
+                    len(value),
+                    zlib.crc32(value),
+                )
+                _SEQ.pack_into(self._buf, offset, (seq + 2) & 0xFFFFFFFF)
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, bucket)
+        return True
+
+    def clear(self) -> None:
+        """Invalidate all entries of all processes at once."""
+        with self._thread_lock:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, self.buckets)
+            try:
+                (epoch,) = _EPOCH.unpack_from(self._buf, _EPOCH_OFFSET)
+                _EPOCH.pack_into(self._buf, _EPOCH_OFFSET, epoch + 1)
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, self.buckets)
+
+    def close(self) -> None:
+        """Detach from segment."""
+        self._buf.release()
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Destroy segment, must be called by owner after all workers exit."""
+        self._shm.unlink()
+
+    def _bucket(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], "little") % self.buckets
+
+    def _bucket_slots(self, digest: bytes) -> range:
+        first = _HEADER_SIZE + self._bucket(digest) * self.ways * self.slot_size
+        return range(first, first + self.ways * self.slot_size, self.slot_size)
+
+    def _choose_slot(self, digest: bytes) -> int:
+        (epoch,) = _EPOCH.unpack_from(self._buf, _EPOCH_OFFSET)
+        now = time.time()
+        victim, victim_expires_at = -1, float("inf")
+        for offset in self._bucket_slots(digest):
+            _, slot_digest, slot_epoch, expires_at, _, _ = _SLOT.unpack_from(
+                self._buf, offset
+            )
+            if slot_digest == digest:
+                return offset
+            if slot_epoch != epoch or expires_at <= now:
+                expires_at = 0.0
+            if expires_at < victim_expires_at:
+                victim, victim_expires_at = offset, expires_at
+        return victim
@@ -0,0 +1,72 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from core.metrics import registry
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_calls_counter = registry.counter(
+    "singleflight_calls_total",
+    "Calls to single-flight groups by role (leader runs loader, shared awaits it).",
+)
+
+
+class _Call(Generic[V]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future[V]):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[K, V]):
+    """Coalesce identical concurrent calls into one in-flight coroutine.
+
+    First caller for key starts loader as separate task, callers that arrive
+    while it runs await the same task. Result or exception is delivered to all
+    of them and key is forgotten as soon as task is done, so nothing is cached:
+    place cache in front of `do` (call it on cache miss) to combine both.
+
+    Cancellation of one caller does not affect others, loader itself is
+    cancelled only when every caller waiting for it is gone.
+
+    Attributes:
+        name (str): Group name, used as metric label.
+
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[K, _Call[V]] = {}
+
+    async def do(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        """Return result of `loader`, sharing in-flight call for same key."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(loader()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._on_done(key, call, task))
+            _calls_counter.inc(group=self.name, role="leader")
+        else:
+            _calls_counter.inc(group=self.name, role="shared")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: K, call: _Call[V]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _on_done(self, key: K, call: _Call[V], task: asyncio.Future[V]) -> None:
+        self._forget(key, call)
+        if not task.cancelled():
+            # Mark exception as retrieved when every caller left before it.
+            task.exception()
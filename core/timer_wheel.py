@@ -0,0 +1,188 @@
+import asyncio
+import math
+import time
+from collections.abc import Callable
+
+from core.metrics import registry
+from logger import setup_logging
+
+log = setup_logging()
+
+
+class Timer:
+    """Callback scheduled on `TimerWheel`.
+
+    Attributes:
+        deadline (float): Monotonic time callback is due at.
+        callback (Callable[[], None]): Function called when timer fires.
+
+    """
+
+    __slots__ = ("_bucket", "_expires", "_wheel", "callback", "deadline")
+
+    def __init__(
+        self,
+        wheel: "TimerWheel",
+        deadline: float,
+        callback: Callable[[], None],
+        expires: int,
+    ):
+        self._wheel = wheel
+        self._bucket: set[Timer] | None = None
+        self._expires = expires
+        self.deadline = deadline
+        self.callback = callback
+
+    @property
+    def active(self) -> bool:
+        """Whether timer is still waiting to fire."""
+        return self._bucket is not None
+
+    def cancel(self) -> bool:
+        """Cancel timer, return False if it already fired or was cancelled."""
+        if self._bucket is None:
+            return False
+        self._bucket.discard(self)
+        self._bucket = None
+        self._wheel._count -= 1
+        return True
+
+
+class TimerWheel:
+    """Hierarchical timer wheel for many coarse timers.
+
+    Time is divided into ticks of `tick` seconds. Level 0 has one slot per
+    tick for the next `2**bits` ticks, each higher level has slots covering
+    `2**bits` times more ticks. Timer is put into slot of the lowest level
+    that covers its deadline; whenever level 0 wraps around, the next slot of
+    level above is cascaded, its timers moved to lower levels. Scheduling and
+    cancelling are O(1), each tick runs callbacks of one slot and each timer
+    is cascaded at most once per level, however many timers are pending.
+
+    Timers never fire early and fire at most one tick late plus event loop
+    latency. Timers beyond range of top level are parked in its farthest slot
+    and rescheduled when it is cascaded.
+
+    Attributes:
+        tick (float): Resolution in seconds.
+        name (str): Wheel name, used as metric label.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tick: float = 0.01,
+        bits: int = 6,
+        levels: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.tick = tick
+        self._bits = bits
+        self._mask = (1 << bits) - 1
+        self._range = 1 << (bits * levels)
+        self._clock = clock
+        self._wheels: list[list[set[Timer]]] = [
+            [set() for _ in range(1 << bits)] for _ in range(levels)
+        ]
+        # Next tick to process, every tick before it has been processed.
+        self._next = self._tick_of(clock())
+        self._count = 0
+        self._scheduled = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        registry.gauge(
+            "timer_wheel_timers", "Timers pending on timer wheel."
+        ).set_function(lambda: self._count, wheel=name)
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, deadline: float, callback: Callable[[], None]) -> Timer:
+        """Call `callback()` at monotonic time `deadline` or soon after."""
+        if not self._count:
+            # Skip ticks passed while wheel was empty.
+            self._next = max(self._next, self._tick_of(self._clock()))
+        timer = Timer(self, deadline, callback, math.ceil(deadline / self.tick))
+        self._insert(timer)
+        self._count += 1
+        self._scheduled.set()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Timer:
+        """Call `callback()` after `delay` seconds or soon after."""
+        return self.schedule(self._clock() + delay, callback)
+
+    def advance(self, now: float) -> int:
+        """Fire timers due by monotonic time `now`, return number fired."""
+        fired = 0
+        target = self._tick_of(now)
+        while self._next <= target:
+            fired += self._process_tick(self._next)
+        return fired
+
+    def start(self) -> None:
+        """Start task advancing wheel every tick while timers are pending."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop advancing wheel, pending timers are kept."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _tick_of(self, moment: float) -> int:
+        return math.floor(moment / self.tick)
+
+    def _insert(self, timer: Timer) -> None:
+        expires = max(timer._expires, self._next)
+        delta = expires - self._next
+        if delta >= self._range:
+            expires = self._next + self._range - 1
+            delta = self._range - 1
+        level = 0
+        while delta >> (self._bits * (level + 1)):
+            level += 1
+        bucket = self._wheels[level][(expires >> (self._bits * level)) & self._mask]
+        bucket.add(timer)
+        timer._bucket = bucket
+
+    def _process_tick(self, tick: int) -> int:
+        index = tick & self._mask
+        if index == 0:
+            for level in range(1, len(self._wheels)):
+                slot = (tick >> (self._bits * level)) & self._mask
+                self._cascade(level, slot)
+                if slot != 0:
+                    break
+        due = self._wheels[0][index]
+        self._wheels[0][index] = set()
+        # Timers scheduled by callbacks below belong to following ticks.
+        self._next = tick + 1
+        fired = 0
+        while due:
+            timer = due.pop()
+            timer._bucket = None
+            self._count -= 1
+            fired += 1
+            try:
+                timer.callback()
+            except Exception:
+                log.exception("Timer callback failed on wheel %s", self.name)
+        return fired
+
+    def _cascade(self, level: int, slot: int) -> None:
+        timers = self._wheels[level][slot]
+        self._wheels[level][slot] = set()
+        for timer in timers:
+            self._insert(timer)
+
+    async def _run_forever(self) -> None:
+        while True:
+            if not self._count:
+                self._scheduled.clear()
+                await self._scheduled.wait()
+            await asyncio.sleep(max(0.0, self._next * self.tick - self._clock()))
+            self.advance(self._clock())
@@ -1,4 +1,5 @@
-__all__ = ("Base", "DatabaseHelper", "db_helper")
+__all__ = ("Base", "DatabaseHelper", "InvalidationBus", "db_helper", "invalidation_bus")
 
 from .base import Base
 from .db_helper import DatabaseHelper, db_helper
+from .invalidation import InvalidationBus, invalidation_bus
@@ -22,15 +22,25 @@ class DatabaseHelper:
         session_factory (sessionmaker): Factory for creating async sessions.
 
     Methods:
-        __init__(url: str, echo: bool = False): Constructor of
-        class that initializes async engine and session factory.
+        __init__(url: str, echo: bool = False, pool_size: int = 5,
+        pool_timeout: float = 30.0): Constructor of class that initializes
+        async engine and session factory.
 
     """
 
-    def __init__(self, url: str, echo: bool = False):
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        pool_timeout: float = 30.0,
+    ):
         self.engine = create_async_engine(
             url=url,
             echo=echo,
+            pool_size=pool_size,
+            max_overflow=0,
+            pool_timeout=pool_timeout,
         )
         self.session_factory = async_sessionmaker(
             bind=self.engine,
@@ -86,7 +96,16 @@ class DatabaseHelper:
         await self.engine.dispose()
 
 
+# Invalidation listener, plus game event listener on Postgres transport.
+_listeners = 1 + (
+    settings.game_events.enabled and settings.game_events.transport == "postgres"
+)
+
 db_helper = DatabaseHelper(
     url=settings.database.url,
     echo=settings.database.echo,
+    pool_size=settings.database.pool_size_per_worker(
+        settings.server.workers, _listeners
+    ),
+    pool_timeout=settings.database.pool_timeout,
 )
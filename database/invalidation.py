@@ -0,0 +1,160 @@
+import asyncio
+import json
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from logger import setup_logging
+
+from .db_helper import db_helper
+from .listener import listen_forever
+
+log = setup_logging()
+
+_PENDING_EVENTS_KEY = "invalidation_events"
+
+Handler = Callable[[str | None], None]
+
+
+class InvalidationBus:
+    """Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+    Changes of watched ORM models are collected on flush and sent with
+    `pg_notify` in the same transaction, so Postgres delivers them only after
+    commit (and drops them on rollback). Every worker listens on its own
+    dedicated asyncpg connection and calls handlers subscribed to event kind.
+    After connection is (re)established all reconnect handlers are called,
+    because events sent while listener was offline are lost.
+
+    Attributes:
+        url (URL): Database URL, SQLAlchemy driver name is stripped for asyncpg.
+        channel (str): Postgres channel name.
+
+    Methods:
+        watch(model, kind, key_attr): Publish event when model row changes.
+        subscribe(kind, handler): Call handler with key of changed row.
+        on_reconnect(handler): Call handler after listener reconnects.
+        publish(session, kind, key): Publish event in session transaction.
+        start(), stop(): Run and stop listener of current worker.
+
+    """
+
+    def __init__(self, url: URL, channel: str, reconnect_delay: float = 1.0):
+        self.url = url
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._watched: dict[type, tuple[str, str | None]] = {}
+        self._handlers: defaultdict[str, list[Handler]] = defaultdict(list)
+        self._reconnect_handlers: list[Callable[[], None]] = []
+        self._task: asyncio.Task[None] | None = None
+
+        event.listen(Session, "after_flush", self._collect_events)
+        event.listen(Session, "after_flush_postexec", self._send_events)
+
+    def watch(self, model: type, kind: str, key_attr: str | None = None) -> None:
+        """Publish `kind` event whenever row of `model` is added, updated or deleted.
+
+        Args:
+            model (type): ORM model class.
+            kind (str): Event kind delivered to subscribers.
+            key_attr (str, Optional): Attribute sent as event key. If omitted,
+            subscribers receive None and should drop everything of this kind.
+
+        """
+        self._watched[model] = (kind, key_attr)
+
+    def subscribe(self, kind: str, handler: Handler) -> None:
+        """Call `handler(key)` for each received event of `kind`."""
+        self._handlers[kind].append(handler)
+
+    def on_reconnect(self, handler: Callable[[], None]) -> None:
+        """Call `handler()` each time listener connection is established."""
+        self._reconnect_handlers.append(handler)
+
+    async def publish(
+        self, session: AsyncSession, kind: str, key: str | None = None
+    ) -> None:
+        """Send event inside session transaction, delivered after commit.
+
+        Use it for changes made by bulk statements bypassing ORM unit of work.
+        """
+        await session.execute(self._notify_statement(kind, key))
+
+    async def start(self) -> None:
+        """Start listener task of current worker."""
+        if self._task is None:
+            self._task = asyncio.create_task(
+                listen_forever(
+                    self.url,
+                    self.channel,
+                    self._on_notify,
+                    self._flush_all,
+                    self.reconnect_delay,
+                )
+            )
+
+    async def stop(self) -> None:
+        """Stop listener task and close its connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _notify_statement(self, kind: str, key: str | None):
+        payload = json.dumps({"kind": kind, "key": key})
+        return select(func.pg_notify(self.channel, payload))
+
+    def _collect_events(self, session: Session, flush_context: Any) -> None:
+        pending = session.info.setdefault(_PENDING_EVENTS_KEY, set())
+        changed = [obj for obj in session.dirty if session.is_modified(obj)]
+        for obj in (*session.new, *changed, *session.deleted):
+            watched = self._watched.get(type(obj))
+            if watched is None:
+                continue
+            kind, key_attr = watched
+            key = None
+            if key_attr is not None:
+                # Old value is sent if key attribute itself was changed.
+                attr = inspect(obj).attrs[key_attr]
+                old_values = attr.history.deleted
+                key = str(old_values[0] if old_values else attr.value)
+            pending.add((kind, key))
+
+    def _send_events(self, session: Session, flush_context: Any) -> None:
+        pending = session.info.pop(_PENDING_EVENTS_KEY, None)
+        if not pending:
+            return
+        connection = session.connection()
+        for kind, key in pending:
+            connection.execute(self._notify_statement(kind, key))
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            log.error("Malformed invalidation event: %s", payload)
+            return
+        for handler in self._handlers.get(data["kind"], ()):
+            try:
+                handler(data.get("key"))
+            except Exception:
+                log.exception("Invalidation handler failed for event: %s", payload)
+
+    def _flush_all(self) -> None:
+        for handler in self._reconnect_handlers:
+            handler()
+
+
+invalidation_bus = InvalidationBus(
+    url=db_helper.engine.url,
+    channel=settings.database.invalidation_channel,
+)
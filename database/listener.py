@@ -0,0 +1,67 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import asyncpg
+from sqlalchemy.engine import URL
+
+from logger import setup_logging
+
+log = setup_logging()
+
+
+async def listen_forever(
+    url: URL,
+    channel: str,
+    on_notify: Callable[[str], None],
+    on_connect: Callable[[], None],
+    reconnect_delay: float = 1.0,
+) -> None:
+    """Listen on Postgres channel on dedicated connection until cancelled.
+
+    Connection is made with asyncpg outside of SQLAlchemy pool, because it is
+    held for the whole life of worker. When it is lost, new one is made after
+    `reconnect_delay` seconds; `on_connect` is called each time listening
+    starts, since notifications sent while listener was offline are lost.
+
+    Args:
+        url (URL): Database URL, SQLAlchemy driver name is stripped for asyncpg.
+        channel (str): Postgres channel name.
+        on_notify (Callable[[str], None]): Called with payload of notification.
+        on_connect (Callable[[], None]): Called after listening (re)starts.
+        reconnect_delay (float): Seconds between connection attempts.
+
+    """
+    dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    def notify(connection: Any, pid: int, channel: str, payload: str) -> None:
+        on_notify(payload)
+
+    while True:
+        try:
+            await _listen_once(dsn, channel, notify, on_connect)
+            log.warning("Listener connection of channel %s lost", channel)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            log.error("Listener of channel %s failed: %s", channel, exc)
+        await asyncio.sleep(reconnect_delay)
+
+
+async def _listen_once(
+    dsn: str,
+    channel: str,
+    notify: Callable[[Any, int, str, str], None],
+    on_connect: Callable[[], None],
+) -> None:
+    """Listen on new connection until it is terminated."""
+    connection = await asyncpg.connect(dsn)
+    closed = asyncio.Event()
+    try:
+        connection.add_termination_listener(lambda _: closed.set())
+        await connection.add_listener(channel, notify)
+        on_connect()
+        await closed.wait()
+    finally:
+        if not connection.is_closed():
+            await connection.close()
@@ -0,0 +1,75 @@
+import asyncio
+import base64
+from collections.abc import Callable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.pubsub import Deliver
+from logger import setup_logging
+
+from .listener import listen_forever
+
+log = setup_logging()
+
+# NOTIFY payload is text of at most 8000 bytes, binary messages are sent as
+# base64 which takes 4 bytes per 3.
+_MAX_PAYLOAD_SIZE = 7999
+_MAX_MESSAGE_SIZE = _MAX_PAYLOAD_SIZE // 4 * 3
+
+
+class PostgresTransport:
+    """Transport broadcasting messages over Postgres LISTEN/NOTIFY.
+
+    Messages are sent with `pg_notify` on pooled connection of `engine`, each
+    in its own transaction; every worker listens on its own dedicated asyncpg
+    connection, like `InvalidationBus`. Sender receives its own messages.
+
+    Attributes:
+        engine (AsyncEngine): Engine whose pool sends messages.
+        channel (str): Postgres channel name.
+        max_message_size (int): Largest message fitting into NOTIFY payload.
+
+    """
+
+    max_message_size = _MAX_MESSAGE_SIZE
+
+    def __init__(self, engine: AsyncEngine, channel: str, reconnect_delay: float = 1.0):
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self, deliver: Deliver, on_connect: Callable[[], None]) -> None:
+        """Start listener task delivering received messages."""
+        if self._task is None:
+            self._task = asyncio.create_task(
+                listen_forever(
+                    self.engine.url,
+                    self.channel,
+                    lambda payload: self._on_notify(deliver, payload),
+                    on_connect,
+                    self.reconnect_delay,
+                )
+            )
+
+    async def send(self, message: bytes) -> None:
+        """Send message with NOTIFY, delivered to listeners once committed."""
+        payload = base64.b64encode(message).decode()
+        async with self.engine.begin() as connection:
+            await connection.execute(select(func.pg_notify(self.channel, payload)))
+
+    async def stop(self) -> None:
+        """Stop listener task and close its connection."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _on_notify(self, deliver: Deliver, payload: str) -> None:
+        try:
+            message = base64.b64decode(payload, validate=True)
+        except ValueError:
+            log.error("Malformed message on channel %s", self.channel)
+            return
+        deliver(message)
@@ -3,20 +3,81 @@ from typing import AsyncGenerator
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
+from api_v1.analysis.pool import analysis_pool
+from api_v1.analysis.router import router as analysis_router
+from api_v1.auth.cache import token_cache
 from api_v1.auth.router import router as auth_router
+from api_v1.game.cache import leaderboard_cache
+from api_v1.game.event_bus import game_event_bus
+from api_v1.game.hub import game_hub
+from api_v1.game.lobby import lobby
+from api_v1.game.matchmaking import matchmaker
+from api_v1.game.openings import opening_book
+from api_v1.game.router import router as game_router
+from api_v1.game.services import (
+    create_matched_game,
+    load_game_state,
+    save_live_game,
+    store_game_writes,
+)
+from api_v1.game.shards import game_shards
+from api_v1.game.tablebase import tablebase
+from api_v1.game.write_behind import move_writer
+from core.config import settings
+from core.metrics import registry
 from database.db_helper import db_helper
+from database.invalidation import invalidation_bus
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """After application shutdown, database engine shutdown."""
+    """Run background services, release caches and engine on shutdown."""
+    await invalidation_bus.start()
+    opening_book.open()
+    game_hub.attach_book(opening_book)
+    if settings.tablebase.adjudicate_games:
+        game_hub.attach_tablebase(tablebase)
+    await move_writer.start(store_game_writes)
+    matchmaker.start(create_matched_game)
+    lobby.start(create_matched_game)
+    game_hub.start(save_live_game, load_game_state)
+    if settings.game_shards.enabled:
+        await game_shards.start(game_hub.hydrate)
+        game_hub.attach_shards(game_shards)
+    if settings.game_events.enabled:
+        game_hub.attach(game_event_bus)
+        await game_event_bus.start()
+    if settings.analysis.enabled:
+        await analysis_pool.start()
+    leaderboard_cache.start()
     yield
+    await analysis_pool.stop()
+    await leaderboard_cache.stop()
+    lobby.stop()
+    await matchmaker.stop()
+    await game_event_bus.stop()
+    await game_hub.close()
+    await game_shards.stop()
+    await move_writer.stop()
+    await invalidation_bus.stop()
+    token_cache.close()
+    opening_book.close()
+    tablebase.close()
     await db_helper.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
 app.include_router(auth_router)
+app.include_router(game_router)
+app.include_router(analysis_router)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """Expose metrics of current worker in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+import pytest
+
+from api_v1.game.exceptions import FenValidationError
+from api_v1.game.position import Position
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+        "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2",
+        "4k3/8/8/8/8/8/8/4R1K1 b - - 0 1",
+    ],
+)
+def test_valid_fen_round_trips(fen: str) -> None:
+    """Valid FEN is set up and written back unchanged."""
+    assert Position(fen).fen() == fen
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "P3k3/8/8/8/8/8/8/4K3 w - - 0 1",
+        "4k3/8/8/8/8/8/8/p3K3 b - - 0 1",
+    ],
+)
+def test_pawn_on_back_rank_is_rejected(fen: str) -> None:
+    """Pawn on first or eighth rank is rejected."""
+    with pytest.raises(FenValidationError, match="back rank"):
+        Position(fen)
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e6 0 1",
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e3 0 1",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq e3 0 1",
+        "rnbqkbnr/pppp1ppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2",
+    ],
+)
+def test_en_passant_square_without_pawn_is_rejected(fen: str) -> None:
+    """En passant square off third or sixth rank, or without pawn, is rejected."""
+    with pytest.raises(FenValidationError, match="En passant"):
+        Position(fen)
+
+
+def test_side_not_to_move_in_check_is_rejected() -> None:
+    """Position where king of side not to move is attacked is rejected."""
+    with pytest.raises(FenValidationError, match="not to move in check"):
+        Position("4k3/8/8/8/8/8/8/4R1K1 w - - 0 1")
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "4k3/8/8/8/8/8/8/4K3 w K - 0 1",
+        "r3k2r/8/8/8/8/8/8/R4K1R w K - 0 1",
+        "1r2k3/8/8/8/8/8/8/4K3 b q - 0 1",
+    ],
+)
+def test_castling_without_pieces_on_home_squares_is_rejected(fen: str) -> None:
+    """Castling right whose king or rook left its home square is rejected."""
+    with pytest.raises(FenValidationError, match="Castling rights"):
+        Position(fen)